@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Backend Benchmark - Same Song, Different Amps.
+
+Compares MessageBroker storage backends in one process: enqueue
+throughput/latency, then dequeue+ack throughput/latency as the
+worker would drain them.
+
+Usage:
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --backends sqlite memory --messages 5000
+    python benchmarks/bench_backends.py --mode batch --output backends.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+DEFAULT_BACKENDS = ["persist", "sqlite", "memory"]
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _summary(latencies, wall):
+    """Throughput and latency percentiles for one phase."""
+    return {
+        "throughput_msgs_per_s": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def run_case(backend, messages, mode, batch_size, synchronous):
+    """Benchmark one backend and return its summary."""
+    from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+    with tempfile.TemporaryDirectory() as tmp:
+        broker = MessageBroker(
+            queue_path=str(Path(tmp) / "bench_queue"),
+            synchronous=synchronous,
+            backend=backend,
+        )
+        payload = [
+            VoiceMessage(message_type=MessageType.SPEAK, text=f"Benchmark message {i}")
+            for i in range(messages)
+        ]
+
+        enqueue_latencies = []
+        wall_start = time.perf_counter()
+        if mode == "batch":
+            for i in range(0, messages, batch_size):
+                chunk = payload[i:i + batch_size]
+                t0 = time.perf_counter()
+                broker.enqueue_many(chunk)
+                per_message = (time.perf_counter() - t0) / len(chunk)
+                enqueue_latencies.extend([per_message] * len(chunk))
+        else:
+            for message in payload:
+                t0 = time.perf_counter()
+                broker.enqueue(message)
+                enqueue_latencies.append(time.perf_counter() - t0)
+        enqueue_wall = time.perf_counter() - wall_start
+
+        dequeue_latencies = []
+        wall_start = time.perf_counter()
+        for _ in range(messages):
+            t0 = time.perf_counter()
+            message = broker.dequeue(timeout=1.0)
+            if message is None:
+                break
+            broker.ack(message)
+            dequeue_latencies.append(time.perf_counter() - t0)
+        dequeue_wall = time.perf_counter() - wall_start
+
+        broker.close()
+
+    return {
+        "backend": backend,
+        "messages": messages,
+        "mode": mode,
+        "synchronous": synchronous,
+        "enqueue": _summary(enqueue_latencies, enqueue_wall),
+        "dequeue_ack": _summary(dequeue_latencies or [0.0], dequeue_wall),
+        "drained": len(dequeue_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MessageBroker backend comparison")
+    parser.add_argument("--backends", nargs="+", choices=DEFAULT_BACKENDS, default=DEFAULT_BACKENDS,
+                        help="Backends to compare")
+    parser.add_argument("--messages", type=int, default=1000,
+                        help="Messages per backend")
+    parser.add_argument("--mode", choices=["single", "batch"], default="single",
+                        help="enqueue() per message or enqueue_many() batches")
+    parser.add_argument("--batch-size", type=int, default=16,
+                        help="Batch size for --mode batch")
+    parser.add_argument("--synchronous", choices=["OFF", "NORMAL", "FULL"], default="NORMAL",
+                        help="SQLite synchronous pragma for disk backends")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    print(f"🎸 Backend benchmark ({args.mode}, synchronous={args.synchronous})")
+    print(f"{'backend':>8} {'enq msg/s':>10} {'enq p99':>9} {'deq msg/s':>10} {'deq p99':>9}")
+
+    results = []
+    for backend in args.backends:
+        summary = run_case(backend, args.messages, args.mode, args.batch_size, args.synchronous)
+        results.append(summary)
+        print(
+            f"{backend:>8} {summary['enqueue']['throughput_msgs_per_s']:>10} "
+            f"{summary['enqueue']['p99_ms']:>9} "
+            f"{summary['dequeue_ack']['throughput_msgs_per_s']:>10} "
+            f"{summary['dequeue_ack']['p99_ms']:>9}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
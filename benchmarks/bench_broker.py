@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Broker Benchmark - Load Testing the Backstage Door.
+
+Measures MessageBroker enqueue throughput and latency with 1-64
+concurrent producer processes, like a crowd of hooks firing at once.
+
+Usage:
+    python benchmarks/bench_broker.py
+    python benchmarks/bench_broker.py --producers 1 8 64 --messages 200
+    python benchmarks/bench_broker.py --mode batch --synchronous FULL
+    python benchmarks/bench_broker.py --output bench_output.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+DEFAULT_PRODUCERS = [1, 2, 4, 8, 16, 32, 64]
+
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of a list of floats."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def _producer(queue_path, messages, mode, batch_size, synchronous, ready, start_event, results):
+    """Producer process: enqueue messages and report per-call latencies."""
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+    broker = MessageBroker(queue_path=queue_path, synchronous=synchronous)
+    payload = [
+        VoiceMessage(message_type=MessageType.SPEAK, text=f"Benchmark message {i}")
+        for i in range(messages)
+    ]
+
+    ready.put(True)
+    start_event.wait()
+    latencies = []
+    if mode == "batch":
+        for i in range(0, messages, batch_size):
+            chunk = payload[i:i + batch_size]
+            t0 = time.perf_counter()
+            broker.enqueue_many(chunk)
+            per_message = (time.perf_counter() - t0) / len(chunk)
+            latencies.extend([per_message] * len(chunk))
+    else:
+        for message in payload:
+            t0 = time.perf_counter()
+            broker.enqueue(message)
+            latencies.append(time.perf_counter() - t0)
+
+    results.put(latencies)
+
+
+def run_case(producers, messages, mode, batch_size, synchronous):
+    """Run one benchmark case and return its summary."""
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_path = str(Path(tmp) / "bench_queue")
+
+        # Create the schema once so producers don't race on CREATE TABLE
+        from voice_handler.queue.broker import MessageBroker
+        MessageBroker(queue_path=queue_path).close()
+
+        ready = ctx.Queue()
+        start_event = ctx.Event()
+        results = ctx.Queue()
+        procs = [
+            ctx.Process(
+                target=_producer,
+                args=(queue_path, messages, mode, batch_size, synchronous, ready, start_event, results),
+            )
+            for _ in range(producers)
+        ]
+        for proc in procs:
+            proc.start()
+
+        # Wait until every producer has imported and opened its connection
+        for _ in procs:
+            ready.get()
+        wall_start = time.perf_counter()
+        start_event.set()
+
+        latencies = []
+        for _ in procs:
+            latencies.extend(results.get())
+        wall = time.perf_counter() - wall_start
+
+        for proc in procs:
+            proc.join()
+
+    total = producers * messages
+    return {
+        "producers": producers,
+        "messages": total,
+        "mode": mode,
+        "synchronous": synchronous,
+        "throughput_msgs_per_s": round(total / wall, 1) if wall else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MessageBroker enqueue benchmark")
+    parser.add_argument("--producers", type=int, nargs="+", default=DEFAULT_PRODUCERS,
+                        help="Concurrent producer process counts to test")
+    parser.add_argument("--messages", type=int, default=50,
+                        help="Messages per producer")
+    parser.add_argument("--mode", choices=["single", "batch"], default="single",
+                        help="enqueue() per message or enqueue_many() batches")
+    parser.add_argument("--batch-size", type=int, default=16,
+                        help="Batch size for --mode batch")
+    parser.add_argument("--synchronous", choices=["OFF", "NORMAL", "FULL"], default="NORMAL",
+                        help="SQLite synchronous pragma")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    print(f"🎸 Broker benchmark ({args.mode}, synchronous={args.synchronous})")
+    print(f"{'producers':>9} {'messages':>9} {'msg/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+
+    results = []
+    for producers in args.producers:
+        summary = run_case(producers, args.messages, args.mode, args.batch_size, args.synchronous)
+        results.append(summary)
+        print(
+            f"{summary['producers']:>9} {summary['messages']:>9} "
+            f"{summary['throughput_msgs_per_s']:>10} {summary['p50_ms']:>9} {summary['p99_ms']:>9}"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
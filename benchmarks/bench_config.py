@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Config Benchmark - Reading the Setlist Before Every Song.
+
+Times what each hook process pays to get its configuration:
+
+- revalidate: find and parse .env, read config.json and validate it
+  with pydantic, then model_dump() (every hook, before the snapshot)
+- snapshot: stat the source files and load the marshal snapshot
+- settings: get_voice_settings() on an already loaded snapshot
+
+The sources are the repository's own config.json and .env (if any).
+
+Usage:
+    python benchmarks/bench_config.py
+    python benchmarks/bench_config.py --repeats 2000
+    python benchmarks/bench_config.py --output results/config.json
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from harness import summarize, write_results
+
+
+def timed(fn: Callable[[], object], repeats: int) -> Dict:
+    """Latency summary of repeated calls."""
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Config snapshot vs per-hook validation")
+    parser.add_argument("--repeats", type=int, default=500, help="Loads per strategy")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from voice_handler import config_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "config.snapshot"
+        config_snapshot.write_snapshot(snapshot_path, config_snapshot.build_snapshot())
+
+        results = {
+            "snapshot_bytes": snapshot_path.stat().st_size,
+            "revalidate": timed(lambda: config_snapshot.build_snapshot(), args.repeats),
+            "snapshot": timed(lambda: config_snapshot.read_snapshot(snapshot_path), args.repeats),
+        }
+        config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        results["settings"] = timed(config_snapshot.get_voice_settings, args.repeats)
+
+    print(f"🎸 Config load per hook (snapshot {results['snapshot_bytes']} bytes)")
+    print(f"{'strategy':>11} {'p50 ms':>8} {'p90 ms':>8}")
+    for name in ("revalidate", "snapshot", "settings"):
+        print(f"{name:>11} {results[name]['p50_ms']:>8} {results[name]['p90_ms']:>8}")
+
+    write_results("config", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Event Query Benchmark - Finding the Night It Went Wrong.
+
+Builds days of synthetic pipeline history twice: as free-text log lines
+(the old "Hook Event - Like a song request! | {json}" journal) and as
+rows in the EventStore, then times the questions asked after an
+incident:
+
+- session: every event of one session
+- slow: spoken messages slower than 5 seconds in the last day
+- message: one message's timeline
+
+The log is answered by scanning and parsing every line, as grep + jq
+would; the store by its indexes.
+
+Usage:
+    python benchmarks/bench_events.py
+    python benchmarks/bench_events.py --days 7 --hooks-per-day 20000
+    python benchmarks/bench_events.py --output results/events.json
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from harness import summarize, write_results
+
+HOOKS = ("PreToolUse", "PostToolUse", "Stop", "UserPromptSubmit", "Notification")
+TOOLS = ("Edit", "Bash", "Read", "Grep", "Write")
+
+
+def synthesize(days: int, hooks_per_day: int, sessions: int, now: float, seed: int = 7) -> List[Dict]:
+    """A hook event plus dequeued/spoken events for each announced message."""
+    rng = random.Random(seed)
+    events = []
+    start = now - days * 86400
+    total = days * hooks_per_day
+    for i in range(total):
+        ts = start + i * (days * 86400 / total)
+        session = f"session-{rng.randrange(sessions):04d}"
+        hook = rng.choice(HOOKS)
+        tool = rng.choice(TOOLS) if hook.endswith("ToolUse") else None
+        message_id = f"{i:032x}"
+        announced = rng.random() < 0.4
+        events.append({"stage": "hook", "ts": ts, "session_id": session, "hook": hook, "tool": tool,
+                       "message_id": message_id, "status": "queued" if announced else "silent",
+                       "latency_ms": round(rng.uniform(40, 400), 2)})
+        if announced:
+            wait = rng.expovariate(1 / 800)
+            events.append({"stage": "dequeued", "ts": ts + wait / 1000, "session_id": session, "hook": hook,
+                           "tool": tool, "message_id": message_id, "latency_ms": round(wait, 2)})
+            total_ms = wait + rng.uniform(1500, 6000)
+            events.append({"stage": "spoken", "ts": ts + total_ms / 1000, "session_id": session, "hook": hook,
+                           "tool": tool, "message_id": message_id, "status": "ok", "latency_ms": round(total_ms, 2)})
+    return events
+
+
+def write_log(events: List[Dict], path: Path):
+    """The same history as journal lines."""
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event["ts"]))
+            context = {k: v for k, v in event.items() if k not in ("stage", "ts") and v is not None}
+            f.write(f"{when} | INFO     | log_info             | Event: {event['stage']} | {json.dumps(context)}\n")
+
+
+def scan_log(path: Path, keep: Callable[[str, Dict], bool]) -> int:
+    """Parse every line and count those matching, as a grep/jq pipeline would."""
+    found = 0
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split(" | ")
+            if len(parts) < 5 or not parts[3].startswith("Event: "):
+                continue
+            if keep(parts[3][len("Event: "):], json.loads(parts[4])):
+                found += 1
+    return found
+
+
+def timed(fn: Callable[[], object], repeats: int) -> Dict:
+    """Latency summary of repeated runs of one query."""
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Structured event store vs log scanning")
+    parser.add_argument("--days", type=int, default=3, help="Days of history")
+    parser.add_argument("--hooks-per-day", type=int, default=10000, help="Hook invocations per day")
+    parser.add_argument("--sessions", type=int, default=200, help="Distinct sessions")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per query")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from voice_handler.utils.events import EventStore
+
+    now = time.time()
+    events = synthesize(args.days, args.hooks_per_day, args.sessions, now)
+    session = events[len(events) // 2]["session_id"]
+    message_id = events[len(events) // 2]["message_id"]
+    day_ago = now - 86400
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "claude_voice.log"
+        write_log(events, log_path)
+        store = EventStore(Path(tmp) / "events.db", retention_days=None)
+        t0 = time.perf_counter()
+        for i in range(0, len(events), 5000):
+            store.record_many(events[i:i + 5000])
+        load_s = time.perf_counter() - t0
+
+        log_queries = {
+            "session": lambda: scan_log(log_path, lambda stage, ctx: ctx.get("session_id") == session),
+            "slow": lambda: scan_log(log_path, lambda stage, ctx: stage == "spoken" and ctx.get("latency_ms", 0) >= 5000),
+            "message": lambda: scan_log(log_path, lambda stage, ctx: ctx.get("message_id") == message_id),
+        }
+        store_queries = {
+            "session": lambda: store.query(session_id=session, limit=100000),
+            "slow": lambda: store.query(stage="spoken", since=day_ago, min_latency_ms=5000, limit=100000),
+            "message": lambda: store.timeline(message_id),
+        }
+
+        results: Dict[str, object] = {
+            "events": len(events),
+            "log_mb": round(log_path.stat().st_size / 1024 / 1024, 2),
+            "db_mb": round(sum(p.stat().st_size for p in Path(tmp).glob("events.db*")) / 1024 / 1024, 2),
+            "store_load_s": round(load_s, 3),
+            "queries": {},
+        }
+        for name in log_queries:
+            results["queries"][name] = {
+                "log_scan": timed(log_queries[name], args.repeats),
+                "event_store": timed(store_queries[name], args.repeats),
+            }
+        store.close()
+
+    print(f"🎸 {results['events']} events over {args.days} days "
+          f"(log {results['log_mb']} MB, store {results['db_mb']} MB)")
+    print(f"{'query':>8} {'log scan p50 ms':>16} {'store p50 ms':>13}")
+    for name, row in results["queries"].items():
+        print(f"{name:>8} {row['log_scan']['p50_ms']:>16} {row['event_store']['p50_ms']:>13}")
+
+    write_results("events", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
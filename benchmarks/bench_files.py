@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+File I/O Benchmark - Hauling the Road Cases.
+
+Measures the per-hook file work that grows with the session:
+
+- transcript scan time vs transcript size (TranscriptReader.get_last_message
+  from the start of the file, as on the first Stop of a session)
+- state-file write cost vs session length (StateManager.update_context,
+  which rewrites the whole state file)
+
+Usage:
+    python benchmarks/bench_files.py
+    python benchmarks/bench_files.py --transcript-lines 100 1000 10000 --operations 10 100 1000
+    python benchmarks/bench_files.py --output results/files.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+from harness import isolated_paths, summarize, write_results
+
+DEFAULT_LINES = [100, 1000, 5000, 20000]
+DEFAULT_OPERATIONS = [10, 100, 1000, 5000]
+
+
+def write_transcript(path: Path, lines: int):
+    """Write a synthetic Claude Code transcript of alternating user/assistant/tool entries."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            if i % 3 == 0:
+                entry = {"type": "user", "message": {"role": "user", "content": f"Prompt {i}"}}
+            elif i % 3 == 1:
+                entry = {"type": "tool_use", "name": "Read", "input": {"file_path": f"/src/module_{i}.py"}}
+            else:
+                entry = {
+                    "type": "assistant",
+                    "uuid": str(uuid.uuid4()),
+                    "timestamp": "2025-01-01T00:00:00Z",
+                    "message": {
+                        "role": "assistant",
+                        "content": [{
+                            "type": "text",
+                            "text": f"Updated module {i}. The tests pass and the config loads. "
+                                    "Next I will refactor the handler for clarity.",
+                        }],
+                    },
+                }
+            f.write(json.dumps(entry) + "\n")
+
+
+def bench_transcript(sizes: List[int], repeats: int) -> List[Dict]:
+    """Time a full transcript scan at each size."""
+    from voice_handler.utils.transcript import TranscriptReader
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, isolated_paths(Path(tmp)):
+        for lines in sizes:
+            transcript = Path(tmp) / f"transcript_{lines}.jsonl"
+            write_transcript(transcript, lines)
+            timings = []
+            for _ in range(repeats):
+                reader = TranscriptReader(str(transcript), session_id="bench")
+                reader.last_positions = {}
+                t0 = time.perf_counter()
+                reader.get_last_message()
+                timings.append(time.perf_counter() - t0)
+            results.append({
+                "lines": lines,
+                "bytes": transcript.stat().st_size,
+                **summarize(timings),
+            })
+    return results
+
+
+def bench_state(operations: List[int], repeats: int) -> List[Dict]:
+    """Time one update_context() (full state rewrite) at each session length."""
+    from voice_handler.core.state import StateManager
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp, isolated_paths(Path(tmp)):
+        for count in operations:
+            state_file = Path(tmp) / f"state_{count}.json"
+            manager = StateManager(state_file_path=str(state_file))
+            for i in range(count):
+                manager.task_context["files_modified"].append(f"/src/module_{i}.py")
+                manager.task_context["commands_run"].append(f"pytest tests/test_{i}.py -q")
+            manager.save_state()
+
+            timings = []
+            for i in range(repeats):
+                t0 = time.perf_counter()
+                manager.update_context("PostToolUse", tool_name="Edit", file_path=f"/src/extra_{i}.py")
+                timings.append(time.perf_counter() - t0)
+            results.append({
+                "operations": count,
+                "state_bytes": state_file.stat().st_size,
+                **summarize(timings),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript scan and state write benchmark")
+    parser.add_argument("--transcript-lines", type=int, nargs="+", default=DEFAULT_LINES,
+                        help="Transcript sizes (JSONL lines)")
+    parser.add_argument("--operations", type=int, nargs="+", default=DEFAULT_OPERATIONS,
+                        help="Session lengths (tracked operations)")
+    parser.add_argument("--repeats", type=int, default=20, help="Samples per size")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    transcript = bench_transcript(args.transcript_lines, args.repeats)
+    state = bench_state(args.operations, args.repeats)
+
+    print("🎸 Transcript scan")
+    print(f"{'lines':>8} {'KB':>9} {'p50 ms':>9} {'p90 ms':>9}")
+    for row in transcript:
+        print(f"{row['lines']:>8} {row['bytes'] // 1024:>9} {row['p50_ms']:>9} {row['p90_ms']:>9}")
+    print("\n🎸 State write")
+    print(f"{'ops':>8} {'KB':>9} {'p50 ms':>9} {'p90 ms':>9}")
+    for row in state:
+        print(f"{row['operations']:>8} {row['state_bytes'] // 1024:>9} {row['p50_ms']:>9} {row['p90_ms']:>9}")
+
+    write_results("files", {"transcript_scan": transcript, "state_write": state}, args.output)
+
+
+if __name__ == "__main__":
+    main()
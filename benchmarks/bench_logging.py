@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Logging Benchmark - Counting the Pages in the Tour Journal.
+
+Replays the log calls one hook invocation makes (cli.main plus a tool
+announcement) against a fresh VoiceLogger per hook, for every log mode
+with debug logging on and off, and reports:
+
+- hot path: time spent inside the log calls while the hook runs
+- exit: time to write what was held back (close(), run at exit)
+- volume: records and bytes each hook adds to the log file
+
+With --sink, a writer logger and LogSinkServer stand in for the daemon,
+so hooks ship their records instead of appending to the file.
+
+Usage:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --hooks 50 --modes sync buffered
+    python benchmarks/bench_logging.py --sink
+    python benchmarks/bench_logging.py --output results/logging.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from harness import summarize, write_results
+
+STDIN = json.dumps({
+    "session_id": "3f2a9c1e-bench",
+    "transcript_path": "/home/user/.claude/projects/bench/transcript.jsonl",
+    "hook_event_name": "PostToolUse",
+    "tool_name": "Edit",
+    "tool_input": {"file_path": "/src/voice_handler/tts/provider.py", "old_string": "a" * 400, "new_string": "b" * 400},
+})
+
+
+def replay_hook(logger):
+    """The log calls of one PostToolUse hook, in order."""
+    logger.log_info("Voice handler invoked - The show begins!", hook="PostToolUse", tool="Edit",
+                    file=None, command=None, query=None, has_message=False)
+    logger.log_info("Using ASYNC mode (from config: USE_ASYNC_QUEUE=True)")
+    logger.log_debug("Raw stdin received", length=len(STDIN), first_chars=STDIN[:200])
+    data = json.loads(STDIN)
+    logger.log_stdin_data(data)
+    logger.log_hook_event("PostToolUse", tool="Edit", stdin_data=data)
+    logger.log_debug(f"Session ID captured: {data['session_id'][:8]}...")
+    logger.log_debug("Tool announcement rate check", tool="Edit", elapsed=4.2, interval=3.0)
+    logger.log_message_flow("Generated", "Archivo python provider editado, seguimos tocando", provider="qwen")
+    logger.log_message_flow("Speaking", "Archivo python provider editado, seguimos tocando")
+
+
+def bench_mode(mode: str, debug: bool, hooks: int, directory: Path, sink: bool = False) -> Dict:
+    """Run hooks in one mode; each hook gets its own VoiceLogger, as each hook is its own process."""
+    from voice_handler.utils.log_sink import LogSinkServer
+    from voice_handler.utils.logger import VoiceLogger
+
+    log_file = directory / f"{mode}_{'debug' if debug else 'info'}.log"
+    writer = server = None
+    if sink:
+        writer = VoiceLogger(log_file=str(log_file), debug_mode=True, mode="async", writer=True)
+        server = LogSinkServer(log_file, writer.handle_record)
+        server.start()
+
+    hot, exits = [], []
+    try:
+        for _ in range(hooks):
+            logger = VoiceLogger(log_file=str(log_file), debug_mode=debug, mode=mode)
+            t0 = time.perf_counter()
+            replay_hook(logger)
+            t1 = time.perf_counter()
+            logger.close()
+            exits.append(time.perf_counter() - t1)
+            hot.append(t1 - t0)
+    finally:
+        if server:
+            time.sleep(0.2)  # Let the sink take in the last hook's records
+            server.stop()
+            writer.close()
+
+    text = log_file.read_text(encoding="utf-8") if log_file.exists() else ""
+    records = sum(1 for line in text.splitlines() if " | " in line and line[:4].isdigit())
+    return {
+        "mode": mode,
+        "debug": debug,
+        "sink": sink,
+        "records_per_hook": round(records / hooks, 1),
+        "bytes_per_hook": len(text.encode("utf-8")) // hooks,
+        "hot_path": summarize(hot),
+        "exit": summarize(exits),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook logging cost and volume benchmark")
+    parser.add_argument("--hooks", type=int, default=200, help="Hook invocations per mode")
+    parser.add_argument("--modes", nargs="+", default=["sync", "async", "buffered"],
+                        choices=["sync", "async", "buffered"], help="Log modes to measure")
+    parser.add_argument("--sink", action="store_true", help="Ship records to an in-process daemon log sink")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for debug in (False, True):
+            for mode in args.modes:
+                results.append(bench_mode(mode, debug, args.hooks, Path(tmp), sink=args.sink))
+
+    print(f"🎸 Hook logging ({'shipped to a log sink' if args.sink else 'appended directly'})")
+    print(f"{'mode':>9} {'debug':>6} {'records':>8} {'bytes':>7} {'hot p50 ms':>11} {'hot p90 ms':>11} {'exit p50 ms':>12}")
+    for row in results:
+        print(f"{row['mode']:>9} {str(row['debug']):>6} {row['records_per_hook']:>8} {row['bytes_per_hook']:>7} "
+              f"{row['hot_path']['p50_ms']:>11} {row['hot_path']['p90_ms']:>11} {row['exit']['p50_ms']:>12}")
+
+    write_results("logging", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
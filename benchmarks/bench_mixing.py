@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Mixing Benchmark - One Stage, Many Bands.
+
+Every session queues a burst of announcements at once, then the queue
+is drained the way the consumer drains it:
+
+- fifo: broker.dequeue(), every message spoken on its own (no mixer)
+- mixer: SessionMixer.next(), turns and digests across sessions
+
+Speech time is modelled from the words spoken (WORDS_PER_SECOND plus a
+fixed per-utterance gap), so the run takes milliseconds while showing
+how long the listener would be talked at; the mixer's own cost per
+item is timed for real.
+
+Usage:
+    python benchmarks/bench_mixing.py
+    python benchmarks/bench_mixing.py --sessions 1 4 16 --messages 8
+    python benchmarks/bench_mixing.py --output results/mixing.json
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+from harness import summarize, write_results
+
+WORDS_PER_SECOND = 2.6
+UTTERANCE_GAP = 0.6
+
+PHRASES = (
+    "Editando el archivo de configuración del servidor",
+    "Ejecutando los tests de integración",
+    "Leyendo el módulo de autenticación",
+    "Tests pasaron sin errores",
+    "Buscando referencias a la función principal",
+)
+
+
+def speech_seconds(text: str) -> float:
+    """Modelled time to speak one utterance."""
+    return len(text.split()) / WORDS_PER_SECOND + UTTERANCE_GAP
+
+
+def drain(sessions: int, messages: int, mixed: bool) -> Dict:
+    """Queue a burst from every session, then speak it all."""
+    from voice_handler.queue.broker import MessageBroker, MessageType, VoiceMessage
+    from voice_handler.queue.mixer import SessionMixer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        broker = MessageBroker(queue_path=str(Path(tmp) / "queue.db"))
+        broker.enqueue_many(
+            VoiceMessage(message_type=MessageType.SPEAK, text=PHRASES[(s + i) % len(PHRASES)],
+                         session_id=f"session-{s}")
+            for i in range(messages) for s in range(sessions)
+        )
+        mixer = SessionMixer(broker, session_label=lambda sid: f"[{sid.split('-')[1]}]") if mixed else None
+
+        utterances, speech, merged = 0, 0.0, 0
+        pick_timings = []
+        while True:
+            t0 = time.perf_counter()
+            message = mixer.next(timeout=0) if mixer else broker.dequeue(timeout=0)
+            pick_timings.append(time.perf_counter() - t0)
+            if message is None:
+                break
+            utterances += 1
+            speech += speech_seconds(message.text)
+            merged += message.metadata.get("digest", 1)
+            broker.ack(message)
+        broker.close()
+
+    return {
+        "messages": merged,
+        "utterances": utterances,
+        "speech_seconds": round(speech, 1),
+        "pick": summarize(pick_timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech time for concurrent sessions with and without the mixer")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="Concurrent sessions")
+    parser.add_argument("--messages", type=int, default=10, help="Messages each session queues")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict] = {}
+    for count in args.sessions:
+        results[str(count)] = {
+            "fifo": drain(count, args.messages, mixed=False),
+            "mixer": drain(count, args.messages, mixed=True),
+        }
+
+    print(f"🎸 Speaking {args.messages} messages per session")
+    print(f"{'sessions':>9} {'fifo utt':>9} {'fifo s':>8} {'mixer utt':>10} {'mixer s':>8} {'pick p50 ms':>12}")
+    for count, row in results.items():
+        fifo, mixer = row["fifo"], row["mixer"]
+        print(f"{count:>9} {fifo['utterances']:>9} {fifo['speech_seconds']:>8} {mixer['utterances']:>10} "
+              f"{mixer['speech_seconds']:>8} {mixer['pick']['p50_ms']:>12}")
+
+    write_results("mixing", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
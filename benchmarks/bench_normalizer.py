@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Speech Normalizer Benchmark - Reading the Lyric Sheet.
+
+Compares the old chained str.replace() formatting with the compiled
+SpeechNormalizer on typical hook messages:
+
+- legacy: six str.replace() calls (fast, but wrong on .json/.jsx/-5)
+- compiled: one regex pass with the full lexicon (no cache)
+- cached: the same through the normalizer's LRU cache (repeated phrases)
+
+Usage:
+    python benchmarks/bench_normalizer.py
+    python benchmarks/bench_normalizer.py --repeats 2000 --language en
+    python benchmarks/bench_normalizer.py --output results/normalizer.json
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from harness import summarize, write_results
+
+MESSAGES = [
+    "Terminé de editar config.json y provider.py",
+    "Ejecutando pytest tests/test_tts.py -q --no-cov",
+    "Leyendo src/voice_handler/queue/consumer.py",
+    "Compilación terminada en 200ms con 98% de cobertura",
+    "Renombré get_user_name a getUserName en el módulo de sesiones",
+    "Publicada la versión v1.4.2 con el arreglo del #128",
+    "Listo, todo funcionando - ¿quieres que siga con los tests?",
+    "Actualicé package.jsonl, App.jsx y README.md",
+    "Error de red al llamar a https://api.openai.com/v1/audio/speech",
+    "Preparando el escenario para la siguiente canción",
+]
+
+
+def legacy_format(message: str) -> str:
+    """The chained str.replace() formatting replaced by SpeechNormalizer."""
+    message = message.replace('_', ' ').replace('-', ' ')
+    message = message.replace('.py', ' python file')
+    message = message.replace('.json', ' JSON file')
+    message = message.replace('.js', ' javascript file')
+    message = message.replace('.md', ' markdown file')
+    return message
+
+
+def bench(format_message: Callable[[str], str], repeats: int) -> Dict:
+    """Time repeated passes over the whole message set (milliseconds per pass)."""
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for message in MESSAGES:
+            format_message(message)
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speech normalization benchmark")
+    parser.add_argument("--repeats", type=int, default=1000, help="Passes over the message set")
+    parser.add_argument("--language", choices=["es", "en"], default="es", help="Lexicon language")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from voice_handler.tts.normalizer import SpeechNormalizer
+
+    t0 = time.perf_counter()
+    normalizer = SpeechNormalizer(args.language)
+    compile_ms = round((time.perf_counter() - t0) * 1000, 3)
+
+    results: Dict[str, object] = {
+        "language": args.language,
+        "messages": len(MESSAGES),
+        "compile_ms": compile_ms,
+        "legacy": bench(legacy_format, args.repeats),
+        "compiled": bench(normalizer._normalize, args.repeats),
+        "cached": bench(normalizer.normalize, args.repeats),
+    }
+
+    print(f"🎸 Speech normalization ({args.language}, lexicon compiled in {compile_ms} ms)")
+    print(f"{'variant':>10} {'p50 us/msg':>11} {'p90 us/msg':>11}")
+    for variant in ("legacy", "compiled", "cached"):
+        row = results[variant]
+        per_message = 1000 / len(MESSAGES)
+        print(f"{variant:>10} {row['p50_ms'] * per_message:>11.2f} {row['p90_ms'] * per_message:>11.2f}")
+
+    samples: List[Dict[str, str]] = [
+        {"text": message, "legacy": legacy_format(message), "normalized": normalizer.normalize(message)}
+        for message in MESSAGES
+    ]
+    results["samples"] = samples
+
+    write_results("normalizer", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
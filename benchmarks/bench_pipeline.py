@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark - The Full Run-Through.
+
+Drives the real producer → broker → consumer → TTSProvider path against
+a local stub OpenAI server and a null audio sink, and reports:
+
+- consumer throughput (messages/s with no speech spacing)
+- end-to-end latency distribution (enqueue → playback end)
+- per-stage latency from the traces each message carries
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --messages 200 --llm-latency 0.05 --audio-latency 0.1
+    python benchmarks/bench_pipeline.py --basic --output results/pipeline.json
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from harness import (
+    StubAPIServer,
+    isolated_paths,
+    null_audio_sink,
+    stub_openai_env,
+    summarize,
+    write_results,
+)
+
+
+def _stage_deltas(traces) -> Dict[str, Dict[str, float]]:
+    """Latency between consecutive stages across all traces."""
+    from voice_handler.utils.tracing import STAGES
+
+    deltas: Dict[str, List[float]] = {}
+    for trace in traces:
+        reached = [stage for stage in STAGES if stage in trace.spans]
+        for previous, stage in zip(reached, reached[1:]):
+            key = f"{previous}->{stage}"
+            deltas.setdefault(key, []).append(trace.spans[stage] - trace.spans[previous])
+    order = {stage: i for i, stage in enumerate(STAGES)}
+    return {
+        key: summarize(values)
+        for key, values in sorted(deltas.items(), key=lambda kv: order[kv[0].split("->")[0]])
+    }
+
+
+def run(messages: int, steerable: bool, llm_latency: float, audio_latency: float, text: str) -> Dict:
+    """Queue messages, drain them through the consumer and collect timings."""
+    from voice_handler.config_schema import VoiceConfig
+    from voice_handler.queue.broker import MessageBroker
+    from voice_handler.queue.consumer import QueueConsumer
+    from voice_handler.queue.producer import QueueProducer
+    from voice_handler.tts.provider import TTSProvider
+    from voice_handler.utils import tracing
+    from voice_handler.utils.metrics import DaemonMetrics
+
+    with tempfile.TemporaryDirectory() as tmp, isolated_paths(Path(tmp)), \
+            StubAPIServer(llm_latency=llm_latency, audio_latency=audio_latency) as stub, \
+            stub_openai_env(stub), null_audio_sink() as sink:
+        config = VoiceConfig().model_dump()
+        config["voice_settings"]["tts_provider"] = "openai"
+        config["voice_settings"]["use_steerable_tts"] = steerable
+        # Only the OpenAI provider: never fall through to a real system voice
+        tts = TTSProvider(config=config)
+        tts.providers = [p for p in tts.providers if p.provider_name.startswith("OpenAI")]
+        if not tts.providers:
+            raise SystemExit("OpenAI provider unavailable (is the openai package installed?)")
+
+        broker = MessageBroker(queue_path=str(Path(tmp) / "queue"))
+        producer = QueueProducer(broker=broker)
+        ring = tracing.TraceRing(Path(tmp) / "traces.ring", capacity=max(messages, 16))
+        metrics = DaemonMetrics()
+
+        for i in range(messages):
+            tracing.start_trace(label="bench")
+            producer.speak(f"{text} #{i}")
+        tracing.activate(None)
+
+        consumer = QueueConsumer(
+            broker=broker,
+            min_speech_delay=0,
+            metrics=metrics,
+            trace_ring=ring,
+        )
+        consumer.set_speak_callback(lambda t, v, s=None: tts.speak(t, v, s))
+        consumer.set_prepare_callback(lambda t, v, s=None: tts.prefetch(t, v, s))
+
+        t0 = time.perf_counter()
+        consumer.start()
+        while metrics.snapshot()["messages_processed"] + \
+                metrics.snapshot()["counters"]["messages_expired"] < messages:
+            time.sleep(0.01)
+        wall = time.perf_counter() - t0
+        consumer.stop(wait=True)
+        broker.close()
+
+        traces = ring.read()
+        end_to_end = [
+            trace.spans["playback_end"] - trace.spans["enqueued"]
+            for trace in traces
+            if "playback_end" in trace.spans and "enqueued" in trace.spans
+        ]
+        snapshot = metrics.snapshot()
+
+        return {
+            "messages": messages,
+            "mode": "steerable" if steerable else "basic",
+            "llm_latency_s": llm_latency,
+            "audio_latency_s": audio_latency,
+            "consumer_throughput_msgs_per_s": round(messages / wall, 2) if wall else 0.0,
+            "processed": snapshot["messages_processed"],
+            "played": sink.plays,
+            "api_requests": len(stub.requests),
+            "end_to_end": summarize(end_to_end),
+            "stages": _stage_deltas(traces),
+            "histograms": {
+                name: {k: hist[k] for k in ("count", "p50", "p90", "p99")}
+                for name, hist in snapshot["histograms"].items()
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end voice pipeline benchmark")
+    parser.add_argument("--messages", type=int, default=100, help="Messages to push through")
+    parser.add_argument("--basic", action="store_true", help="Use basic TTS (compression + tts-1)")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Stub LLM latency (s)")
+    parser.add_argument("--audio-latency", type=float, default=0.0, help="Stub TTS latency (s)")
+    parser.add_argument("--text", default="Terminé de editar el archivo de configuración y corrí las pruebas",
+                        help="Message text")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    result = run(args.messages, not args.basic, args.llm_latency, args.audio_latency, args.text)
+
+    e2e = result["end_to_end"]
+    print(f"🎸 Pipeline ({result['mode']}, {result['messages']} messages)")
+    print(f"  consumer throughput  {result['consumer_throughput_msgs_per_s']} msg/s")
+    print(f"  end-to-end           p50 {e2e['p50_ms']} ms  p90 {e2e['p90_ms']} ms  p99 {e2e['p99_ms']} ms")
+    for stage, summary in result["stages"].items():
+        print(f"  {stage:<34} p50 {summary['p50_ms']:>9} ms")
+
+    write_results("pipeline", result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Session Benchmark - Checking the Guest List at the Door.
+
+Times what one hook pays to find its session's voice when the session
+file already holds many concurrent and historical sessions:
+
+- legacy: load the indented JSON, scan every session for expiry, bump
+  last_used and rewrite the whole file with indent=2 (every hook, before
+  the registry)
+- registry_hook: a fresh SessionVoiceManager (one hook process) loading
+  the compact file and looking up an existing session; last_used is
+  only written once it drifts past the touch interval
+- registry_daemon: lookups on a long-lived manager (the daemon), one
+  stat() to notice other writers plus heap/counter bookkeeping
+
+Usage:
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sessions 100 1000 10000
+    python benchmarks/bench_sessions.py --output results/sessions.json
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+from harness import summarize, write_results
+
+VOICES = ("nova", "alloy", "echo", "fable", "onyx", "shimmer")
+CONFIG = {"timing": {"session_expiry_hours": 4, "session_touch_interval": 60.0}}
+
+
+def timed(fn: Callable[[], object], repeats: int) -> Dict:
+    """Latency summary of repeated calls."""
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return summarize(timings)
+
+
+def history(count: int, now: float) -> Dict[str, Dict]:
+    """Sessions spread over the last three hours (none expired)."""
+    return {
+        f"session-{i:06d}": {"voice": VOICES[i % len(VOICES)], "created_at": now - 3 * 3600,
+                             "last_used": now - (i % 10800), "project_name": f"project-{i % 50}"}
+        for i in range(count)
+    }
+
+
+def legacy_hook(path: Path, session_id: str, expiry: float):
+    """The pre-registry per-hook path."""
+    with open(path) as f:
+        sessions = json.load(f).get("sessions", {})
+    now = time.time()
+    expired = [sid for sid, data in sessions.items() if now - data.get("last_used", 0) > expiry]
+    for sid in expired:
+        del sessions[sid]
+    sessions[session_id]["last_used"] = time.time()
+    with open(path, "w") as f:
+        json.dump({"sessions": sessions, "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f, indent=2)
+    return sessions[session_id]["voice"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session registry vs full scan and rewrite")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 1000, 10000], help="Sessions on file")
+    parser.add_argument("--repeats", type=int, default=50, help="Lookups per strategy")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    from voice_handler.core.session import SessionVoiceManager
+
+    results: Dict[str, Dict] = {}
+    for count in args.sessions:
+        now = time.time()
+        sessions = history(count, now)
+        target = f"session-{count // 2:06d}"
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy_path = Path(tmp) / "legacy.json"
+            legacy_path.write_text(json.dumps({"sessions": sessions}, indent=2))
+            registry_path = Path(tmp) / "sessions.json"
+            registry_path.write_text(json.dumps({"sessions": sessions}))
+            SessionVoiceManager(storage_path=str(registry_path), config=CONFIG).registry.save()
+
+            daemon = SessionVoiceManager(storage_path=str(registry_path), config=CONFIG)
+            results[str(count)] = {
+                "legacy_bytes": legacy_path.stat().st_size,
+                "compact_bytes": registry_path.stat().st_size,
+                "legacy": timed(lambda: legacy_hook(legacy_path, target, 4 * 3600), args.repeats),
+                "registry_hook": timed(
+                    lambda: SessionVoiceManager(storage_path=str(registry_path), config=CONFIG)
+                    .get_voice_for_session(target), args.repeats),
+                "registry_daemon": timed(lambda: daemon.get_voice_for_session(target), args.repeats),
+            }
+
+    print("🎸 Session lookup per hook")
+    print(f"{'sessions':>9} {'legacy p50 ms':>14} {'hook p50 ms':>12} {'daemon p50 ms':>14} {'file KB':>14}")
+    for count, row in results.items():
+        size = f"{row['legacy_bytes'] // 1024}->{row['compact_bytes'] // 1024}"
+        print(f"{count:>9} {row['legacy']['p50_ms']:>14} {row['registry_hook']['p50_ms']:>12} "
+              f"{row['registry_daemon']['p50_ms']:>14} {size:>14}")
+
+    write_results("sessions", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
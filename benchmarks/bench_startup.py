@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark - Time to First Chord.
+
+Measures what every hook pays before doing any work:
+
+- cold start: wall time of a fresh `voice_handler.cli` process for a
+  logged-only hook and for a Stop hook in sync mode with voice disabled
+  (LLM calls go to a local stub server)
+- import time per module, from `python -X importtime`
+
+Note: the Stop run updates the real state file in the temp directory,
+exactly as a hook would.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --output results/startup.json
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from harness import SRC_DIR, StubAPIServer, summarize, write_results
+
+
+SCENARIOS = {
+    # Not a voice hook: exits right after should_announce()
+    "logged_only_hook": ["--hook", "PreToolUse", "--tool", "Read"],
+    # Full Stop processing, no speech
+    "stop_hook_sync": ["--hook", "Stop", "--sync"],
+}
+
+
+def _env(stub: StubAPIServer) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    env.update({
+        "VOICE_ENABLED": "false",
+        "OPENAI_API_KEY": "sk-stub",
+        "OPENAI_BASE_URL": stub.openai_base_url,
+        "OLLAMA_HOST": stub.base_url,
+    })
+    return env
+
+
+def measure_cold_start(runs: int, stub: StubAPIServer) -> Dict[str, Dict[str, float]]:
+    """Wall time of fresh hook processes per scenario."""
+    env = _env(stub)
+    results = {}
+    for name, args in SCENARIOS.items():
+        timings = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "-m", "voice_handler.cli", *args],
+                input=b'{"session_id": "bench-session"}',
+                env=env,
+                capture_output=True,
+                timeout=120,
+            )
+            timings.append(time.perf_counter() - t0)
+        results[name] = summarize(timings)
+    return results
+
+
+def measure_imports(module: str, stub: StubAPIServer, top: int) -> List[Dict[str, float]]:
+    """
+    Per-module import cost from `-X importtime`.
+
+    Returns:
+        The slowest modules by cumulative time, in milliseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(stub),
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    rows: Dict[str, Dict[str, float]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        try:
+            self_part, cumulative_part, name = line.split("|", 2)
+            self_us = int(self_part.split(":", 1)[1])
+            cumulative_us = int(cumulative_part)
+            name = name.strip()
+        except (ValueError, IndexError):
+            continue
+        # A module can be listed more than once (nested re-imports); keep the largest
+        previous = rows.get(name)
+        if previous is None or cumulative_us > previous["cumulative_ms"] * 1000:
+            rows[name] = {
+                "module": name,
+                "self_ms": round(self_us / 1000, 3),
+                "cumulative_ms": round(cumulative_us / 1000, 3),
+            }
+    ordered = sorted(rows.values(), key=lambda row: row["cumulative_ms"], reverse=True)
+    return ordered[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook cold-start and import-time benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Cold starts per scenario")
+    parser.add_argument("--module", default="voice_handler.cli", help="Module to profile imports for")
+    parser.add_argument("--top", type=int, default=25, help="Slowest imports to report")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    with StubAPIServer() as stub:
+        cold = measure_cold_start(args.runs, stub)
+        imports = measure_imports(args.module, stub, args.top)
+
+    print("🎸 Cold start")
+    for name, summary in cold.items():
+        print(f"  {name:<18} p50 {summary['p50_ms']:>9} ms   p90 {summary['p90_ms']:>9} ms")
+    print(f"\n🎸 Slowest imports ({args.module})")
+    for row in imports[:10]:
+        print(f"  {row['cumulative_ms']:>9} ms  {row['module']}")
+
+    write_results("startup", {"cold_start": cold, "imports": imports}, args.output)
+
+
+if __name__ == "__main__":
+    main()
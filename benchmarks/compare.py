@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark Comparison - Before and After the Mix.
+
+Diffs two result files written by run_all.py (or any single benchmark)
+and flags regressions beyond a threshold. Latencies (*_ms) are better
+when lower, throughputs (*_per_s) when higher; other numbers are shown
+but never flagged.
+
+Usage:
+    python benchmarks/compare.py results/abc123.json results/def456.json
+    python benchmarks/compare.py base.json head.json --threshold 0.15 --metric p50_ms p90_ms
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_METRICS = ["p50_ms", "p90_ms", "p99_ms", "throughput_msgs_per_s", "consumer_throughput_msgs_per_s"]
+
+
+def flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    """
+    Flatten nested results into dotted keys with numeric leaves.
+
+    List items are keyed by a distinguishing field when one exists
+    (backend, producers, lines, operations, module) so rows line up
+    across runs even when their order changes.
+    """
+    flat: Dict[str, float] = {}
+    if isinstance(value, bool):
+        return flat
+    if isinstance(value, (int, float)):
+        flat[prefix] = float(value)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            flat.update(flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            label = str(index)
+            if isinstance(item, dict):
+                for field in ("backend", "producers", "lines", "operations", "module"):
+                    if field in item:
+                        label = f"{field}={item[field]}"
+                        break
+            flat.update(flatten(item, f"{prefix}[{label}]"))
+    return flat
+
+
+def direction(key: str) -> Optional[int]:
+    """+1 when higher is better, -1 when lower is better, None when unknown."""
+    leaf = key.rsplit(".", 1)[-1]
+    if leaf.endswith("_per_s"):
+        return 1
+    if leaf.endswith("_ms"):
+        return -1
+    return None
+
+
+def compare(base: Dict, head: Dict, metrics: List[str], threshold: float) -> List[Dict[str, Any]]:
+    """
+    Compare matching metrics between two result documents.
+
+    Args:
+        base: Baseline document (wrapped or bare results)
+        head: Candidate document
+        metrics: Leaf names to compare
+        threshold: Relative change that counts as a regression (0.1 = 10%)
+
+    Returns:
+        Rows with key, base, head, change and regression flag
+    """
+    base_flat = flatten(base.get("results", base))
+    head_flat = flatten(head.get("results", head))
+    rows = []
+    for key in sorted(base_flat.keys() & head_flat.keys()):
+        if key.rsplit(".", 1)[-1] not in metrics:
+            continue
+        before, after = base_flat[key], head_flat[key]
+        change = (after - before) / before if before else 0.0
+        sign = direction(key)
+        regression = sign is not None and -sign * change > threshold
+        rows.append({
+            "key": key,
+            "base": before,
+            "head": after,
+            "change": round(change, 4),
+            "regression": regression,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("base", help="Baseline result JSON")
+    parser.add_argument("head", help="Candidate result JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change flagged as a regression (default 0.10)")
+    parser.add_argument("--metric", nargs="+", default=DEFAULT_METRICS, help="Leaf metrics to compare")
+    parser.add_argument("--all", action="store_true", help="Show unchanged rows too")
+    args = parser.parse_args()
+
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    head = json.loads(Path(args.head).read_text(encoding="utf-8"))
+    rows = compare(base, head, args.metric, args.threshold)
+
+    print(f"🎸 {base.get('revision', args.base)} → {head.get('revision', args.head)} "
+          f"(threshold {args.threshold:.0%})")
+    for row in rows:
+        if not args.all and not row["regression"] and abs(row["change"]) <= args.threshold:
+            continue
+        flag = "❌" if row["regression"] else "  "
+        print(f"{flag} {row['key']:<70} {row['base']:>12.3f} → {row['head']:>12.3f} ({row['change']:+.1%})")
+
+    regressions = [row for row in rows if row["regression"]]
+    print(f"\n{len(rows)} metrics compared, {len(regressions)} regression(s)")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness - The Rehearsal Room.
+
+Shared gear for the benchmark suite: a local stub of the OpenAI and
+Ollama HTTP APIs, a null audio sink, isolated temp paths, latency
+summaries and JSON result files tagged with the commit they ran on.
+"""
+
+import base64
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).parent.parent
+SRC_DIR = REPO_ROOT / "src"
+
+# Add src to path
+sys.path.insert(0, str(SRC_DIR))
+
+
+# ==================== Statistics ====================
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of floats."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    """Latency distribution in milliseconds."""
+    if not seconds:
+        return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p90_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(seconds),
+        "mean_ms": round(statistics.fmean(seconds) * 1000, 3),
+        "p50_ms": round(statistics.median(seconds) * 1000, 3),
+        "p90_ms": round(percentile(seconds, 90) * 1000, 3),
+        "p99_ms": round(percentile(seconds, 99) * 1000, 3),
+        "max_ms": round(max(seconds) * 1000, 3),
+    }
+
+
+# ==================== Results ====================
+
+def git_revision() -> str:
+    """Short commit hash of the tree being measured ('unknown' outside git)."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(REPO_ROOT), capture_output=True, text=True, timeout=10,
+        )
+        revision = result.stdout.strip() or "unknown"
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=str(REPO_ROOT), capture_output=True, text=True, timeout=10,
+        ).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except Exception:
+        return "unknown"
+
+
+def environment() -> Dict[str, Any]:
+    """Machine details recorded next to every result."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(name: str, results: Any, output: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Wrap results with commit/environment info and optionally write JSON.
+
+    Args:
+        name: Benchmark name
+        results: Benchmark-specific payload
+        output: File to write (skipped when None)
+
+    Returns:
+        The wrapped document
+    """
+    document = {
+        "benchmark": name,
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "environment": environment(),
+        "results": results,
+    }
+    if output:
+        path = Path(output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"\nResults written to {output}")
+    return document
+
+
+# ==================== Isolation ====================
+
+@contextmanager
+def isolated_paths(temp_dir: Path) -> Iterator[Path]:
+    """
+    Point every voice handler path (queue, state, traces...) at temp_dir.
+
+    Only affects this process; subprocesses still use the real paths.
+    """
+    from voice_handler.utils import paths as paths_module
+
+    class _TempPaths(paths_module.VoiceHandlerPaths):
+        @staticmethod
+        def _get_temp_dir() -> Path:
+            return Path(temp_dir)
+
+    previous = paths_module._paths_instance
+    paths_module._paths_instance = _TempPaths()
+    try:
+        yield Path(temp_dir)
+    finally:
+        paths_module._paths_instance = previous
+
+
+# ==================== Null audio sink ====================
+
+class NullAudioSink:
+    """sounddevice stand-in: accepts audio, plays nothing, counts frames."""
+
+    def __init__(self):
+        self.plays = 0
+        self.frames = 0
+
+    def play(self, data, samplerate, **kwargs):
+        self.plays += 1
+        self.frames += len(data)
+
+    def wait(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@contextmanager
+def null_audio_sink() -> Iterator[NullAudioSink]:
+    """Route shared TTS playback into a NullAudioSink (any platform)."""
+    from voice_handler.tts import playback
+
+    sink = NullAudioSink()
+    saved = (playback.sd, playback.platform)
+    playback.sd = sink
+    # Skip the macOS afplay branch so playback always goes through the sink
+    playback.platform = SimpleNamespace(system=lambda: "Linux")
+    try:
+        yield sink
+    finally:
+        playback.sd, playback.platform = saved
+
+
+# ==================== Stub servers ====================
+
+def make_wav(duration: float = 0.2, rate: int = 24000) -> bytes:
+    """Silent 16-bit mono WAV of the given duration."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x00" * int(duration * rate))
+    return buffer.getvalue()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI (/v1/...) and Ollama (/api/...) endpoints."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload: Dict[str, Any]):
+        self._send(200, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("", "/api/tags", "/api/version"):
+            self._send_json({"models": [{"name": self.server.stub.model}], "version": "stub"})
+        else:
+            self._send(404, b"{}", "application/json")
+
+    def do_POST(self):
+        stub = self.server.stub
+        request = self._read_json()
+        stub.requests.append((self.path, request))
+
+        if self.path.endswith("/chat/completions"):
+            wants_audio = "audio" in (request.get("modalities") or [])
+            time.sleep(stub.audio_latency if wants_audio else stub.llm_latency)
+            message = {"role": "assistant", "content": stub.reply}
+            if wants_audio:
+                message["content"] = None
+                message["audio"] = {
+                    "id": "audio_stub",
+                    "data": base64.b64encode(stub.wav).decode("ascii"),
+                    "expires_at": 0,
+                    "transcript": stub.reply,
+                }
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            })
+        elif self.path.endswith("/audio/speech"):
+            time.sleep(stub.audio_latency)
+            self._send(200, stub.wav, "audio/wav")
+        elif self.path in ("/api/generate", "/api/chat"):
+            time.sleep(stub.llm_latency)
+            if self.path == "/api/chat":
+                payload = {"message": {"role": "assistant", "content": stub.reply}}
+            else:
+                payload = {"response": stub.reply}
+            self._send_json({"model": stub.model, "done": True, **payload})
+        else:
+            self._send(404, b"{}", "application/json")
+
+
+class StubAPIServer:
+    """
+    Local stand-in for the OpenAI and Ollama APIs with tunable latency.
+
+    Usage:
+        with StubAPIServer(llm_latency=0.05) as stub:
+            os.environ["OPENAI_BASE_URL"] = stub.openai_base_url
+    """
+
+    def __init__(
+        self,
+        llm_latency: float = 0.0,
+        audio_latency: float = 0.0,
+        reply: str = "Listo, todo bien.",
+        audio_seconds: float = 0.2,
+        model: str = "stub-model",
+    ):
+        self.llm_latency = llm_latency
+        self.audio_latency = audio_latency
+        self.reply = reply
+        self.wav = make_wav(audio_seconds)
+        self.model = model
+        self.requests: List[tuple] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def start(self) -> "StubAPIServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="StubAPI", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> "StubAPIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def stub_openai_env(stub: StubAPIServer) -> Iterator[None]:
+    """Point the OpenAI SDK (and Ollama settings) at a stub server."""
+    overrides = {
+        "OPENAI_API_KEY": "sk-stub",
+        "OPENAI_BASE_URL": stub.openai_base_url,
+        "OLLAMA_HOST": stub.base_url,
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner - The Full Soundcheck.
+
+Runs every benchmark in the suite as a fresh process and collects the
+results into one JSON file per commit under benchmarks/results/, so two
+revisions can be compared with compare.py.
+
+Usage:
+    python benchmarks/run_all.py
+    python benchmarks/run_all.py --quick
+    python benchmarks/run_all.py --only startup pipeline --output results/mine.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from harness import git_revision, write_results
+
+BENCH_DIR = Path(__file__).parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+# name -> (script, full args, --quick args)
+SUITE: Dict[str, tuple] = {
+    "startup": ("bench_startup.py", ["--runs", "10"], ["--runs", "3"]),
+    "enqueue": ("bench_broker.py", ["--producers", "1", "4", "8"], ["--producers", "1", "4", "--messages", "20"]),
+    "backends": ("bench_backends.py", [], ["--messages", "200"]),
+    "pipeline_steerable": ("bench_pipeline.py", ["--messages", "100"], ["--messages", "20"]),
+    "pipeline_basic": ("bench_pipeline.py", ["--basic", "--messages", "100"], ["--basic", "--messages", "20"]),
+    "files": ("bench_files.py", [], ["--repeats", "5", "--transcript-lines", "100", "5000",
+                                     "--operations", "10", "1000"]),
+    "normalizer": ("bench_normalizer.py", [], ["--repeats", "200"]),
+    "logging": ("bench_logging.py", [], ["--hooks", "30"]),
+    "logging_sink": ("bench_logging.py", ["--sink"], ["--sink", "--hooks", "30"]),
+    "events": ("bench_events.py", [], ["--days", "1", "--hooks-per-day", "2000", "--repeats", "2"]),
+    "config": ("bench_config.py", [], ["--repeats", "100"]),
+    "sessions": ("bench_sessions.py", [], ["--sessions", "10", "1000", "--repeats", "10"]),
+    "mixing": ("bench_mixing.py", [], ["--sessions", "1", "4", "16", "--messages", "5"]),
+}
+
+
+def run_benchmark(name: str, quick: bool) -> Dict:
+    """
+    Run one benchmark script and load its JSON output.
+
+    Returns:
+        The benchmark's results payload (unwrapped), or an error record
+    """
+    script, full_args, quick_args = SUITE[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / f"{name}.json"
+        command = [sys.executable, str(BENCH_DIR / script), *(quick_args if quick else full_args),
+                   "--output", str(output)]
+        print(f"\n🎸 {name}: {' '.join(command[1:])}", flush=True)
+        result = subprocess.run(command, cwd=str(BENCH_DIR))
+        if result.returncode != 0 or not output.exists():
+            return {"error": f"exit code {result.returncode}"}
+        document = json.loads(output.read_text(encoding="utf-8"))
+    # Suite scripts wrap their payload; the older broker scripts write it bare
+    if isinstance(document, dict) and "results" in document and "benchmark" in document:
+        return document["results"]
+    return document
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the whole benchmark suite")
+    parser.add_argument("--only", nargs="+", choices=list(SUITE), help="Benchmarks to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a fast smoke run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<revision>.json)")
+    args = parser.parse_args()
+
+    names: List[str] = args.only or list(SUITE)
+    results = {name: run_benchmark(name, args.quick) for name in names}
+    results["quick"] = args.quick
+
+    output = args.output or str(RESULTS_DIR / f"{git_revision()}.json")
+    write_results("suite", results, output)
+
+    failed = [name for name in names if isinstance(results[name], dict) and "error" in results[name]]
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
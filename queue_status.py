@@ -3,8 +3,11 @@
 Quick CLI to check voice queue status.
 
 Usage:
-    python queue_status.py           # Show queue status
-    python queue_status.py --clear   # Clear all pending messages
+    python queue_status.py                    # Show queue status with breakdown
+    python queue_status.py --list             # List pending messages
+    python queue_status.py --list --page 2    # Next page of pending messages
+    python queue_status.py --clear            # Clear all pending messages
+    python queue_status.py --clear --session <id> --type speak
 """
 
 import sys
@@ -17,27 +20,59 @@ from voice_handler.queue.broker import get_broker
 from voice_handler.utils.logger import VoiceLogger
 
 
+PAGE_SIZE = 20
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Voice Queue Status")
-    parser.add_argument("--clear", action="store_true", help="Clear all pending messages")
+    parser.add_argument("--clear", action="store_true", help="Clear pending messages")
+    parser.add_argument("--list", action="store_true", help="List pending messages")
+    parser.add_argument("--page", type=int, default=1, help="Page number for --list")
+    parser.add_argument("--session", help="Only act on messages from this session")
+    parser.add_argument("--type", dest="message_type", help="Only act on this message type")
     args = parser.parse_args()
 
     logger = VoiceLogger()
     broker = get_broker(logger=logger)
 
     if args.clear:
-        queue_size = broker.size()
-        broker.clear()
-        print(f"🧹 Cleared {queue_size} pending messages from queue")
+        cleared = broker.clear(session_id=args.session, message_type=args.message_type)
+        print(f"🧹 Cleared {cleared} pending messages from queue")
+    elif args.list:
+        offset = (max(args.page, 1) - 1) * PAGE_SIZE
+        total = broker.size(session_id=args.session, message_type=args.message_type)
+        messages = broker.peek(
+            limit=PAGE_SIZE,
+            offset=offset,
+            session_id=args.session,
+            message_type=args.message_type,
+        )
+        print(f"🎵 Pending messages {offset + 1}-{offset + len(messages)} of {total}")
+        print("=" * 40)
+        for msg in messages:
+            session = (msg.get("session_id") or "none")[:8]
+            text = msg.get("text", "")
+            preview = text[:60] + "..." if len(text) > 60 else text
+            print(f"#{msg['id']:<6} {msg['message_type']:<10} p{msg.get('priority', 5):<3} {session:<8} {preview}")
     else:
-        queue_size = broker.size()
+        summary = broker.breakdown()
         print("🎵 Voice Queue Status")
         print("=" * 40)
-        print(f"Pending messages: {queue_size}")
+        print(f"Pending messages: {summary['pending']}")
+        print(f"In flight:        {summary['in_flight']}")
+
+        if summary["by_type"]:
+            print("\nBy type:")
+            for message_type, count in sorted(summary["by_type"].items()):
+                print(f"  {message_type:<12} {count}")
+        if summary["by_session"]:
+            print("\nBy session:")
+            for session_id, count in sorted(summary["by_session"].items(), key=lambda x: -x[1]):
+                print(f"  {session_id[:8]:<12} {count}")
 
-        if queue_size > 0:
-            print(f"\n💡 Tip: Use --clear to clear the queue if needed")
+        if summary["pending"] > 0:
+            print(f"\n💡 Tip: Use --list to inspect or --clear to clear the queue")
             print(f"   Example: python {Path(__file__).name} --clear")
 
 
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Hedged Generation - The Understudy Waiting in the Wings.
+
+The show can't wait for a late singer. Each message type gets a latency
+budget; the first LLM provider goes on at once, and if it hasn't
+answered by its usual (p90) latency the next one is sent on too. The
+first acceptable answer takes the stage and everyone else is told to go
+home. When the budget runs out the caller falls back to its canned
+phrase, so a message is never later than its budget.
+
+Races run on asyncio (the blocking provider calls run in daemon threads),
+so one event loop can race many messages at once.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional
+
+DEFAULT_BUDGETS_MS = {
+    "greeting": 3000,
+    "acknowledgment": 2000,
+    "tool": 1500,
+    "completion": 4000,
+    "approval": 3000,
+    "error": 2000,
+    "enrich": 2000,
+}
+
+
+class LatencyStats:
+    """
+    Recent successful latencies per provider.
+
+    Kept in a small JSON file so short-lived hook processes share what
+    earlier ones learned.
+    """
+
+    def __init__(self, path: Optional[Path] = None, window: int = 50):
+        """
+        Initialize and load saved latencies.
+
+        Args:
+            path: JSON file to load from and save to (None: in memory only)
+            window: Latencies kept per provider
+        """
+        self.path = Path(path) if path else None
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        for name, samples in data.items():
+            self._samples[name] = deque((float(s) for s in samples), maxlen=self.window)
+
+    def _save(self):
+        data = {name: list(samples) for name, samples in self._samples.items()}
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            temp_path.write_text(json.dumps(data))
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def record(self, name: str, seconds: float):
+        """Record one successful call."""
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(round(seconds, 4))
+            if self.path:
+                self._save()
+
+    def count(self, name: str) -> int:
+        """Number of samples for a provider."""
+        return len(self._samples.get(name, ()))
+
+    def quantile(self, name: str, q: float) -> Optional[float]:
+        """
+        Latency quantile for a provider.
+
+        Args:
+            name: Provider name
+            q: Quantile (0-1)
+
+        Returns:
+            Seconds, or None without samples
+        """
+        samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+@dataclass
+class Candidate:
+    """One provider in a race. call() gets an Event that is set when it lost."""
+    name: str
+    call: Callable[[threading.Event], Optional[str]]
+
+
+@dataclass
+class RaceResult:
+    """The winning answer."""
+    provider: str
+    text: str
+    latency: float
+    elapsed: float
+    hedged: bool
+
+
+def _settle(future: asyncio.Future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _run_in_thread(call: Callable[[threading.Event], Optional[str]], cancelled: threading.Event) -> asyncio.Future:
+    """
+    Run a blocking call in a daemon thread.
+
+    Not an executor: a losing call may still be waiting on the network,
+    and nothing (asyncio.run or interpreter exit) should wait for it.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def runner():
+        result, error = None, None
+        try:
+            result = call(cancelled)
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(_settle, future, result, error)
+        except RuntimeError:
+            pass  # Loop already closed - the race was decided without us
+
+    threading.Thread(target=runner, name="VoiceLLMRace", daemon=True).start()
+    return future
+
+
+class LLMRacer:
+    """
+    Runs deadline-driven races between LLM providers.
+
+    - The first candidate starts at once
+    - The next starts when the running one passes its hedge_quantile
+      latency (half the budget until min_samples are known), or as soon
+      as every running candidate has failed
+    - The first acceptable answer wins; the others get their cancel Event
+    - Nothing acceptable within the budget returns None
+    """
+
+    def __init__(self, settings: Optional[dict] = None, stats: Optional[LatencyStats] = None, logger=None):
+        """
+        Initialize the racer.
+
+        Args:
+            settings: llm_hedging config section
+            stats: Shared latency stats (default: in memory)
+            logger: Logger instance
+        """
+        settings = settings or {}
+        self.logger = logger
+        self.default_budget = settings.get("default_budget_ms", 3000) / 1000.0
+        budgets = dict(DEFAULT_BUDGETS_MS)
+        budgets.update(settings.get("budgets_ms", {}))
+        self.budgets = {name: ms / 1000.0 for name, ms in budgets.items()}
+        self.hedge_quantile = settings.get("hedge_quantile", 0.9)
+        self.min_samples = settings.get("min_samples", 5)
+        self.stats = stats or LatencyStats(window=settings.get("latency_window", 50))
+
+    def budget_for(self, message_type: str) -> float:
+        """Latency budget in seconds for a message type."""
+        return self.budgets.get(message_type, self.default_budget)
+
+    def hedge_delay(self, name: str, budget: float) -> float:
+        """Seconds to give a provider before starting the next one."""
+        if self.stats.count(name) >= self.min_samples:
+            return min(budget, self.stats.quantile(name, self.hedge_quantile))
+        return budget / 2
+
+    async def race(
+        self,
+        candidates: List[Candidate],
+        budget: float,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[RaceResult]:
+        """
+        Race candidates (in preference order) against a budget.
+
+        Args:
+            candidates: Providers, most preferred first
+            budget: Seconds until the race is given up
+            accept: Predicate for an acceptable answer (default: non-empty)
+
+        Returns:
+            The winner, or None if nothing acceptable arrived in time
+        """
+        accept = accept or (lambda text: bool(text and text.strip()))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + budget
+        waiting = list(candidates)
+        running: Dict[asyncio.Future, tuple] = {}
+        next_hedge = deadline
+
+        def launch():
+            candidate = waiting.pop(0)
+            cancelled = threading.Event()
+            now = loop.time()
+            running[_run_in_thread(candidate.call, cancelled)] = (candidate, cancelled, now)
+            return now + self.hedge_delay(candidate.name, budget)
+
+        try:
+            while running or waiting:
+                now = loop.time()
+                if now >= deadline:
+                    break
+                if waiting and (not running or now >= next_hedge):
+                    next_hedge = launch()
+                    continue
+
+                wake = min(deadline, next_hedge) if waiting else deadline
+                done, _ = await asyncio.wait(
+                    list(running), timeout=max(0.0, wake - now), return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    candidate, _, launched = running.pop(future)
+                    text = None if future.exception() else future.result()
+                    if text and accept(text):
+                        finished = loop.time()
+                        return RaceResult(
+                            provider=candidate.name,
+                            text=text,
+                            latency=finished - launched,
+                            elapsed=finished - started,
+                            hedged=candidate is not candidates[0],
+                        )
+                    if self.logger:
+                        self.logger.log_debug(f"LLM race: {candidate.name} gave no usable answer")
+                    next_hedge = loop.time()  # A failure hedges right away
+            return None
+        finally:
+            for future, (_, cancelled, _) in running.items():
+                cancelled.set()
+                future.cancel()
+
+    async def run(
+        self,
+        candidates: List[Candidate],
+        message_type: str = "default",
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[RaceResult]:
+        """
+        Race candidates with the budget of a message type and record the winner's latency.
+
+        Args:
+            candidates: Providers, most preferred first
+            message_type: Budget key (greeting, tool, completion, ...)
+            accept: Predicate for an acceptable answer
+
+        Returns:
+            The winner, or None
+        """
+        if not candidates:
+            return None
+        budget = self.budget_for(message_type)
+        result = await self.race(candidates, budget, accept)
+        if result:
+            self.stats.record(result.provider, result.latency)
+        if self.logger:
+            if result:
+                self.logger.log_debug(
+                    f"LLM race ({message_type}): {result.provider} won in {result.elapsed * 1000:.0f}ms"
+                    f"{' (hedge)' if result.hedged else ''}"
+                )
+            else:
+                self.logger.log_debug(f"LLM race ({message_type}): nothing within {budget * 1000:.0f}ms")
+        return result
+
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Ollama Backend - The Local Jam Room.
+
+Like rehearsing in the garage instead of booking a studio, this backend
+talks to a local Ollama-compatible server: no network round-trip to the
+cloud, no API key, predictable latency. Responses are streamed and cut
+off as soon as the message has enough words, and the daemon keeps the
+model loaded with a periodic keep-alive ping so the first message after
+a quiet spell doesn't pay for a cold start.
+"""
+
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+class OllamaClient:
+    """
+    Streaming client for Ollama's /api/chat with a pooled HTTP connection.
+
+    Features:
+    - One httpx.Client per process (keep-alive connections are reused)
+    - Token streaming with early stop at max_words
+    - Cheap availability check, remembered for recheck_interval seconds
+    - keep_alive on every request, plus ping() to load/keep the model warm
+    """
+
+    def __init__(
+        self,
+        host: str = "http://localhost:11434",
+        model: str = "qwen2.5:0.5b",
+        timeout: float = 5.0,
+        keep_alive: str = "30m",
+        connect_timeout: float = 0.5,
+        recheck_interval: float = 30.0,
+        logger=None,
+    ):
+        """
+        Initialize the client (no connection is made until first use).
+
+        Args:
+            host: Server base URL
+            model: Model name
+            timeout: Longest wait for a whole response (seconds)
+            keep_alive: How long the server keeps the model loaded after a request
+            connect_timeout: Connect timeout, so a stopped server fails fast
+            recheck_interval: Seconds before an unreachable server is tried again
+            logger: Logger instance
+        """
+        self.host = host.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.recheck_interval = recheck_interval
+        self.logger = logger
+
+        self._client = None
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+
+    def _http(self):
+        """The pooled httpx client (created on first use)."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        base_url=self.host,
+                        timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                        limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                    )
+        return self._client
+
+    def available(self) -> bool:
+        """True unless the server failed recently (or httpx is missing)."""
+        return HTTPX_AVAILABLE and time.monotonic() >= self._down_until
+
+    def _mark_down(self, error: Exception):
+        self._down_until = time.monotonic() + self.recheck_interval
+        if self.logger:
+            self.logger.log_warning(f"Ollama unavailable at {self.host}: {error}")
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_words: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[str]:
+        """
+        Stream a chat completion, stopping early once max_words are in.
+
+        Args:
+            messages: Chat messages (role/content dicts)
+            max_words: Stop reading (and drop the connection) past this many words
+            max_tokens: num_predict limit for the model
+            temperature: Sampling temperature
+            cancelled: Polled per chunk; once it returns True the stream is dropped
+
+        Returns:
+            Response text (at most max_words words) or None on failure
+        """
+        if not self.available():
+            return None
+
+        options = {}
+        if max_tokens is not None:
+            options["num_predict"] = max_tokens
+        if temperature is not None:
+            options["temperature"] = temperature
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": True,
+            "keep_alive": self.keep_alive,
+            "options": options,
+        }
+
+        deadline = time.monotonic() + self.timeout
+        text = ""
+        try:
+            with self._http().stream("POST", "/api/chat", json=payload) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise RuntimeError(chunk["error"])
+                    text += chunk.get("message", {}).get("content", "")
+                    if max_words is not None:
+                        words = text.split()
+                        # One word past the limit means the last kept word is complete
+                        if len(words) > max_words:
+                            return " ".join(words[:max_words])
+                    if chunk.get("done"):
+                        break
+                    if cancelled is not None and cancelled():
+                        return None
+                    if time.monotonic() > deadline:
+                        # Keep what we have rather than waiting any longer
+                        break
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            self._mark_down(e)
+            return None
+        except Exception as e:
+            if self.logger:
+                self.logger.log_warning(f"Ollama chat failed: {e}")
+            return None
+
+        return text.strip() or None
+
+    def ping(self) -> bool:
+        """
+        Load the model (or keep it loaded) without generating anything.
+
+        Returns:
+            True if the server acknowledged
+        """
+        if not HTTPX_AVAILABLE:
+            return False
+        try:
+            response = self._http().post(
+                "/api/generate",
+                json={"model": self.model, "prompt": "", "stream": False, "keep_alive": self.keep_alive},
+            )
+            response.raise_for_status()
+        except Exception as e:
+            self._mark_down(e)
+            return False
+        self._down_until = 0.0
+        return True
+
+    def close(self):
+        """Close pooled connections."""
+        client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+
+class OllamaKeepAlive:
+    """Background thread that pings the local model so it stays loaded."""
+
+    def __init__(self, client: OllamaClient, interval: float = 240.0, logger=None):
+        """
+        Initialize the pinger.
+
+        Args:
+            client: OllamaClient to ping
+            interval: Seconds between pings (keep below the server's keep_alive)
+            logger: Optional logger instance
+        """
+        self.client = client
+        self.interval = interval
+        self.logger = logger
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while True:
+            if self.client.ping():
+                if self.logger:
+                    self.logger.log_debug(f"Ollama keep-alive ping ok ({self.client.model})")
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self):
+        """Ping now (warming the model) and then every interval."""
+        self._thread = threading.Thread(target=self._run, name="VoiceOllamaKeepAlive", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop pinging."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.client.timeout + 1.0)
+
+
+def create_ollama_client(timeout: float = 5.0, logger=None) -> OllamaClient:
+    """
+    OllamaClient configured from LLMConfig (OLLAMA_HOST, OLLAMA_MODEL, ...).
+
+    Args:
+        timeout: Longest wait for a whole response (seconds)
+        logger: Logger instance
+    """
+    from voice_handler.config import get_config
+
+    llm = get_config().llm
+    return OllamaClient(
+        host=llm.ollama_host,
+        model=llm.ollama_model,
+        timeout=timeout,
+        keep_alive=llm.ollama_keep_alive,
+        logger=logger,
+    )
@@ -6,18 +6,24 @@ Like having a legendary songwriter who crafts perfect lyrics for every moment,
 this module generates contextual, rock-infused voice messages.
 
 Cosmic Eddie speaks through OpenAI (primary) or Qwen (fallback),
-bringing the spirit of psychedelic rock to every announcement!
+bringing the spirit of psychedelic rock to every announcement! With
+LLM_PROVIDER=ollama, a local Ollama model goes first instead, so
+messages are generated fully offline.
 """
 
+import asyncio
 import os
+import shutil
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import random
+from voice_handler.ai.hedging import Candidate, LatencyStats, LLMRacer
 from voice_handler.ai.prompts import RockPersonality, get_rock_personality
+from voice_handler.utils import tracing
 
 
 class QwenContextGenerator:
@@ -29,6 +35,9 @@ class QwenContextGenerator:
     Falls back to qwen-code CLI if OpenAI is unavailable.
     Falls back to pre-defined phrases if both fail.
 
+    With LLM_PROVIDER=ollama the local model (see OllamaClient) is tried
+    before OpenAI.
+
     Cosmic Eddie's voice comes through here!
     """
 
@@ -56,6 +65,15 @@ class QwenContextGenerator:
         self.openai_client = self._init_openai()
         self.openai_available = self.openai_client is not None
         self.qwen_available = self._check_qwen_available()
+        self.ollama = self._init_ollama()
+
+        # Deadline-driven provider racing (serial fallback chain when disabled)
+        hedging = self.config.get("llm_hedging", {})
+        self.racer: Optional[LLMRacer] = None
+        if hedging.get("enabled", True):
+            from voice_handler.utils.paths import get_paths
+            stats = LatencyStats(get_paths().llm_latency, window=hedging.get("latency_window", 50))
+            self.racer = LLMRacer(settings=hedging, stats=stats, logger=self.logger)
 
         # Get user nickname and personality from config
         self.user_nickname = self.config.get("voice_settings", {}).get("user_nickname", "rockstar")
@@ -72,6 +90,7 @@ class QwenContextGenerator:
             self.logger.log_info(
                 f"AI Context Generator ready! "
                 f"(openai={self.openai_available}, qwen={self.qwen_available}, "
+                f"ollama={self.ollama is not None}, "
                 f"history_msgs={len(self.chat_history)})"
             )
 
@@ -146,26 +165,76 @@ class QwenContextGenerator:
                 self.logger.log_warning(f"Failed to init OpenAI: {e}")
             return None
 
+    def _init_ollama(self):
+        """Create the local Ollama client if LLM_PROVIDER=ollama."""
+        from voice_handler.config import get_config
+
+        if get_config().llm.provider != "ollama":
+            return None
+        from voice_handler.ai.ollama import HTTPX_AVAILABLE, create_ollama_client
+
+        if not HTTPX_AVAILABLE:
+            if self.logger:
+                self.logger.log_warning("LLM_PROVIDER=ollama but httpx is not installed")
+            return None
+        return create_ollama_client(timeout=self.timeout, logger=self.logger)
+
     def _check_qwen_available(self) -> bool:
         """Check if qwen-code is available on the system."""
-        try:
-            if sys.platform == 'win32':
-                result = subprocess.run(
-                    ["powershell", "-Command", "Get-Command qwen-code -ErrorAction SilentlyContinue"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-            else:
-                result = subprocess.run(
-                    ["which", "qwen-code"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return shutil.which("qwen-code") is not None
+
+    def _build_messages(self, prompt: str, max_words: int) -> list:
+        """Chat messages: system prompt, conversation history, then the prompt."""
+        system_prompt = self.rock_personality.get_system_prompt(self.user_nickname)
+
+        # Build messages with history for context
+        messages = [{"role": "system", "content": system_prompt}]
+
+        # Add conversation history
+        for msg in self.chat_history:
+            messages.append(msg)
+
+        # Add current prompt
+        user_message = f"{prompt}\n\n(Responde en máximo {max_words} palabras)"
+        messages.append({"role": "user", "content": user_message})
+        return messages
+
+    def _call_ollama(
+        self,
+        prompt: str,
+        max_words: int = 20,
+        add_to_history: bool = True,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Optional[str]:
+        """
+        Call the local Ollama model, streaming and stopping at max_words.
+
+        Args:
+            prompt: The prompt to send
+            max_words: Maximum words in response
+            add_to_history: Whether to add this exchange to history
+            cancelled: Polled while streaming; True drops the request
+
+        Returns:
+            The model's response or None if failed
+        """
+        if self.ollama is None:
+            return None
+
+        result = self.ollama.chat(
+            self._build_messages(prompt, max_words),
+            max_words=max_words,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            cancelled=cancelled,
+        )
+        if result:
+            if add_to_history:
+                self._add_to_history("user", prompt)
+                self._add_to_history("assistant", result)
+            if self.logger:
+                self.logger.log_debug(f"Ollama response (history={len(self.chat_history)}): {result}")
+        return result
 
     def _call_openai(self, prompt: str, max_words: int = 20, add_to_history: bool = True) -> Optional[str]:
         """
@@ -183,18 +252,7 @@ class QwenContextGenerator:
             return None
 
         try:
-            system_prompt = self.rock_personality.get_system_prompt(self.user_nickname)
-
-            # Build messages with history for context
-            messages = [{"role": "system", "content": system_prompt}]
-
-            # Add conversation history
-            for msg in self.chat_history:
-                messages.append(msg)
-
-            # Add current prompt
-            user_message = f"{prompt}\n\n(Responde en máximo {max_words} palabras)"
-            messages.append({"role": "user", "content": user_message})
+            messages = self._build_messages(prompt, max_words)
 
             response = self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
@@ -222,7 +280,10 @@ class QwenContextGenerator:
 
     def _call_qwen(self, prompt: str, max_words: int = 20) -> Optional[str]:
         """
-        Call qwen-code CLI as fallback.
+        Call qwen-code as fallback.
+
+        Asks the daemon's warm worker pool first; only when the daemon
+        isn't serving workers does this start a one-shot CLI process.
 
         Args:
             prompt: The prompt to send to qwen
@@ -234,14 +295,21 @@ class QwenContextGenerator:
         if not self.qwen_available:
             return None
 
-        try:
-            system_context = self.rock_personality.get_system_prompt(self.user_nickname)
-            full_prompt = (
-                f"{system_context}\n\n"
-                f"Tarea: {prompt}\n\n"
-                f"Responde en maximo {max_words} palabras."
-            )
+        system_context = self.rock_personality.get_system_prompt(self.user_nickname)
+        full_prompt = (
+            f"{system_context}\n\n"
+            f"Tarea: {prompt}\n\n"
+            f"Responde en maximo {max_words} palabras."
+        )
 
+        from voice_handler.ai.qwen_worker import ask_worker_service
+        response = ask_worker_service(full_prompt, timeout=10)
+        if response:
+            if self.logger:
+                self.logger.log_debug(f"Qwen worker response: {response}")
+            return self._limit_words(response, max_words)
+
+        try:
             if sys.platform == 'win32':
                 escaped_prompt = full_prompt.replace("'", "''")
                 result = subprocess.run(
@@ -262,7 +330,7 @@ class QwenContextGenerator:
                 response = result.stdout.strip()
                 if self.logger:
                     self.logger.log_debug(f"Qwen response: {response}")
-                return response
+                return self._limit_words(response, max_words)
             return None
 
         except subprocess.TimeoutExpired:
@@ -274,33 +342,93 @@ class QwenContextGenerator:
                 self.logger.log_error("Error calling qwen-code", exception=e)
             return None
 
-    def _call_llm(self, prompt: str, max_words: int = 20) -> Optional[str]:
+    @staticmethod
+    def _limit_words(response: str, max_words: int) -> str:
+        """HARD LIMIT: enforce max_words regardless of what the CLI returned."""
+        words = response.split()
+        if len(words) > max_words:
+            return ' '.join(words[:max_words]) + '...'
+        return response
+
+    def _candidates(self, prompt: str, max_words: int) -> list:
+        """Available providers in preference order, as race candidates."""
+        candidates = []
+        if self.ollama is not None:
+            candidates.append(Candidate(
+                "ollama",
+                lambda cancelled: self._call_ollama(prompt, max_words, add_to_history=False, cancelled=cancelled.is_set),
+            ))
+        if self.openai_available:
+            candidates.append(Candidate(
+                "openai",
+                lambda cancelled: self._call_openai(prompt, max_words, add_to_history=False),
+            ))
+        if self.qwen_available:
+            candidates.append(Candidate("qwen", lambda cancelled: self._call_qwen(prompt, max_words)))
+        return candidates
+
+    async def acall_llm(self, prompt: str, max_words: int = 20, message_type: str = "default") -> Optional[str]:
+        """
+        Race the available providers against the message type's latency budget.
+
+        The preferred provider starts first; the next one is hedged in
+        once it passes its usual latency. The first answer wins.
+
+        Args:
+            prompt: The prompt to send
+            max_words: Maximum words in response
+            message_type: Budget key (greeting, tool, completion, ...)
+
+        Returns:
+            LLM response or None if nothing arrived within the budget
+        """
+        result = await self.racer.run(self._candidates(prompt, max_words), message_type)
+        if result is None:
+            return None
+        if result.provider != "qwen":
+            self._add_to_history("user", prompt)
+            self._add_to_history("assistant", result.text)
+        tracing.mark("llm_done")
+        return result.text
+
+    def _call_llm(self, prompt: str, max_words: int = 20, message_type: str = "default") -> Optional[str]:
         """
         Call LLM with OpenAI as primary and Qwen as fallback.
 
+        With a local Ollama model configured, it is tried first. With
+        llm_hedging enabled the providers are raced (see acall_llm);
+        otherwise each is tried in turn until one answers.
+
         Args:
             prompt: The prompt to send
             max_words: Maximum words in response
+            message_type: Latency budget key for hedged generation
 
         Returns:
             LLM response or None if all providers failed
         """
-        # Try OpenAI first (fast!)
+        if self.racer is not None:
+            return asyncio.run(self.acall_llm(prompt, max_words, message_type))
+
+        # Local model first when configured (offline, no API round-trip)
+        response = self._call_ollama(prompt, max_words)
+        if response:
+            tracing.mark("llm_done")
+            return response
+
+        # Then OpenAI (fast!)
         response = self._call_openai(prompt, max_words)
         if response:
+            tracing.mark("llm_done")
             return response
 
         # Fallback to Qwen
         if self.logger:
             self.logger.log_debug("OpenAI unavailable, trying Qwen fallback...")
         response = self._call_qwen(prompt, max_words)
-        
-        # HARD LIMIT: Enforce max_words regardless of LLM response
         if response:
-            words = response.split()
-            if len(words) > max_words:
-                response = ' '.join(words[:max_words]) + '...'
-        
+            tracing.mark("llm_done")
+
         return response
 
     def generate_greeting(self, hour: Optional[int] = None) -> str:
@@ -325,7 +453,7 @@ class QwenContextGenerator:
 
         prompt = f"Saludo profesional {time_context} a {self.user_nickname}."
 
-        response = self._call_llm(prompt, max_words=15)
+        response = self._call_llm(prompt, max_words=15, message_type="greeting")
         if response:
             return response
         # Fallback: usar saludo pre-definido de RockPersonality
@@ -368,7 +496,7 @@ class QwenContextGenerator:
             }
 
         prompt = prompts.get(source, prompts["startup"])
-        response = self._call_llm(prompt, max_words=15)
+        response = self._call_llm(prompt, max_words=15, message_type="greeting")
 
         if response:
             return response
@@ -395,7 +523,7 @@ class QwenContextGenerator:
             project_name
         )
 
-        response = self._call_llm(prompt, max_words=20)
+        response = self._call_llm(prompt, max_words=20, message_type="acknowledgment")
         if response:
             return response
         # Fallback: usar frase de acknowledgment pre-definida
@@ -435,7 +563,7 @@ class QwenContextGenerator:
             else:
                 prompt = f"{metaphor}."
 
-        response = self._call_llm(prompt, max_words=15)
+        response = self._call_llm(prompt, max_words=15, message_type="tool")
         return response or f"{metaphor.capitalize()}..."
 
     def generate_completion(
@@ -477,7 +605,7 @@ class QwenContextGenerator:
 
         prompt = f"{context} Resume brevemente lo realizado para {self.user_nickname} con contexto técnico específico."
 
-        response = self._call_llm(prompt, max_words=35)
+        response = self._call_llm(prompt, max_words=35, message_type="completion")
         if response:
             return response
         # Fallback: usar frase de completion pre-definida
@@ -525,7 +653,7 @@ class QwenContextGenerator:
                 f"Notifica profesionalmente que hay una aprobación pendiente."
             )
 
-        response = self._call_llm(prompt, max_words=35)
+        response = self._call_llm(prompt, max_words=35, message_type="approval")
         if response:
             return response
         # Fallback: usar frase de approval pre-definida
@@ -559,7 +687,7 @@ class QwenContextGenerator:
                 f"Informalo a {self.user_nickname} sin alarma."
             )
 
-        response = self._call_llm(prompt, max_words=20)
+        response = self._call_llm(prompt, max_words=20, message_type="error")
         if response:
             return response
         # Fallback: usar frase de error pre-definida
@@ -588,7 +716,7 @@ class QwenContextGenerator:
             f"con personalidad rockera: '{original_message[:150]}'"
         )
 
-        response = self._call_llm(prompt, max_words=20)
+        response = self._call_llm(prompt, max_words=20, message_type="enrich")
         return response or original_message
 
 
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Qwen Worker Pool - The Session Musicians on Retainer.
+
+Calling qwen-code once per message is like flying in a session player
+for every song: Node boots, the CLI loads, and only then does anyone
+play a note. The daemon keeps a few qwen-code processes running in
+stream-json mode instead, health-checks them, restarts the ones that
+crash (or have answered enough prompts to carry a long context), and
+hands each request to an idle worker.
+
+Hook processes reach the pool through a small local socket service;
+when the daemon isn't running they fall back to the one-shot CLI.
+"""
+
+import json
+import os
+import queue
+import shlex
+import shutil
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# qwen-code's streaming JSON mode: one user message per stdin line,
+# events on stdout ending with a "result" event per turn
+DEFAULT_WORKER_COMMAND = "qwen-code --input-format stream-json --output-format stream-json"
+
+
+def resolve_command(command: str) -> Optional[List[str]]:
+    """
+    Split a worker command line and resolve its executable on PATH.
+
+    Resolving here lets Windows run qwen-code's .cmd shim directly,
+    without a PowerShell wrapper (the prompt travels on stdin, not argv).
+
+    Returns:
+        Argument list, or None if the executable isn't installed
+    """
+    args = shlex.split(command, posix=sys.platform != "win32")
+    if not args:
+        return None
+    executable = shutil.which(args[0])
+    if executable is None:
+        return None
+    return [executable] + args[1:]
+
+
+class QwenWorker:
+    """One long-lived qwen-code process speaking stream-json."""
+
+    def __init__(self, command: List[str], max_requests: int = 20, logger=None):
+        """
+        Initialize the worker (the process starts with start()).
+
+        Args:
+            command: Resolved command line
+            max_requests: Prompts answered before the worker is recycled
+                (each process is one conversation, so context keeps growing)
+            logger: Logger instance
+        """
+        self.command = command
+        self.max_requests = max_requests
+        self.logger = logger
+        self.requests = 0
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.requests >= self.max_requests
+
+    def start(self):
+        """Spawn the process and its stdout reader."""
+        self._lines = queue.Queue()
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        threading.Thread(target=self._pump, args=(self._process, self._lines), name="VoiceQwenWorker", daemon=True).start()
+
+    @staticmethod
+    def _pump(process: subprocess.Popen, lines: "queue.Queue[Optional[str]]"):
+        for raw in process.stdout:
+            lines.put(raw.decode("utf-8", "replace").strip())
+        lines.put(None)
+
+    def alive(self) -> bool:
+        """True if the process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def ask(self, prompt: str, timeout: float) -> Optional[str]:
+        """
+        Send one prompt and wait for its result event.
+
+        Args:
+            prompt: Full prompt text
+            timeout: Seconds to wait for the result
+
+        Returns:
+            Result text, or None if qwen-code reported an error
+
+        Raises:
+            TimeoutError: No result in time (the worker should be replaced)
+            ConnectionError: The process exited
+        """
+        self.requests += 1
+        request = {"type": "user", "message": {"role": "user", "content": prompt}}
+        try:
+            self._process.stdin.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            self._process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise ConnectionError(f"qwen-code worker stdin closed: {e}")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"qwen-code worker gave no result in {timeout}s")
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise ConnectionError("qwen-code worker exited")
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Banner or log output
+            if isinstance(event, dict) and event.get("type") == "result":
+                if event.get("is_error"):
+                    return None
+                return (event.get("result") or "").strip() or None
+
+    def stop(self):
+        """End the process (EOF first, then kill)."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=1.0)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            process.kill()
+
+
+class QwenWorkerPool:
+    """
+    A fixed number of warm qwen-code workers.
+
+    Features:
+    - Workers start with the pool, so no request pays Node startup
+    - Concurrent requests are spread over idle workers (and queue when all are busy)
+    - A supervisor thread restarts crashed idle workers
+    - Workers that crash, time out or reach max_requests are replaced
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        command: Optional[List[str]] = None,
+        timeout: float = 10.0,
+        max_requests: int = 20,
+        health_interval: float = 10.0,
+        logger=None,
+        metrics=None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of workers
+            command: Resolved worker command (default: DEFAULT_WORKER_COMMAND)
+            timeout: Default seconds to wait for one answer
+            max_requests: Prompts per worker before it is recycled
+            health_interval: Seconds between supervisor health checks
+            logger: Logger instance
+            metrics: Optional DaemonMetrics registry
+        """
+        self.size = size
+        self.command = command or resolve_command(DEFAULT_WORKER_COMMAND)
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self.health_interval = health_interval
+        self.logger = logger
+        self.metrics = metrics
+
+        self.restarts = 0
+        self.served = 0
+        self._idle: "queue.Queue[QwenWorker]" = queue.Queue()
+        self._stop = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+
+    def available(self) -> bool:
+        """True if the worker executable exists."""
+        return bool(self.command)
+
+    def _spawn(self) -> QwenWorker:
+        worker = QwenWorker(self.command, max_requests=self.max_requests, logger=self.logger)
+        try:
+            worker.start()
+        except OSError as e:
+            if self.logger:
+                self.logger.log_warning(f"Could not start qwen-code worker: {e}")
+        return worker
+
+    def _replace(self, worker: QwenWorker, reason: str) -> QwenWorker:
+        worker.stop()
+        self.restarts += 1
+        if self.metrics:
+            self.metrics.inc("qwen_worker_restarts")
+        if self.logger:
+            self.logger.log_info(f"Restarting qwen-code worker ({reason})")
+        return self._spawn()
+
+    def start(self):
+        """Start the workers and the health-check supervisor."""
+        if not self.available():
+            return
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        self._supervisor = threading.Thread(target=self._supervise, name="VoiceQwenSupervisor", daemon=True)
+        self._supervisor.start()
+        if self.logger:
+            self.logger.log_info(f"qwen-code worker pool started ({self.size} workers)")
+
+    def _supervise(self):
+        while not self._stop.wait(self.health_interval):
+            self.check()
+
+    def check(self):
+        """Restart idle workers whose process has died."""
+        checked = []
+        while True:
+            try:
+                checked.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for worker in checked:
+            if not worker.alive() and not self._stop.is_set():
+                worker = self._replace(worker, "health check: process exited")
+            self._idle.put(worker)
+
+    def ask(self, prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Answer a prompt on the next idle worker.
+
+        Args:
+            prompt: Full prompt text
+            timeout: Seconds for the whole request, including waiting for a worker
+
+        Returns:
+            Response text, or None on failure or timeout
+        """
+        if not self.available() or self._stop.is_set():
+            return None
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            if self.logger:
+                self.logger.log_warning("All qwen-code workers busy, giving up")
+            return None
+
+        try:
+            if not worker.alive():
+                worker = self._replace(worker, "process exited")
+            elif worker.exhausted:
+                worker = self._replace(worker, f"served {worker.requests} prompts")
+            answer = worker.ask(prompt, max(0.1, deadline - time.monotonic()))
+            self.served += 1
+            return answer
+        except (TimeoutError, ConnectionError) as e:
+            if self.logger:
+                self.logger.log_warning(f"qwen-code worker failed: {e}")
+            worker = self._replace(worker, str(e))
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def snapshot(self) -> dict:
+        """Pool state for status and debugging."""
+        return {"size": self.size, "idle": self._idle.qsize(), "served": self.served, "restarts": self.restarts}
+
+    def stop(self):
+        """Stop the supervisor and every idle worker."""
+        self._stop.set()
+        if self._supervisor:
+            self._supervisor.join(timeout=self.health_interval + 1.0)
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+
+# ==================== Local service for hook processes ====================
+
+class _ServiceHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line: {"prompt", "timeout"} -> {"text"}."""
+
+    def handle(self):
+        for raw in self.rfile:
+            try:
+                request = json.loads(raw)
+                text = self.server.pool.ask(request["prompt"], request.get("timeout"))
+                reply = {"text": text}
+            except Exception as e:
+                reply = {"text": None, "error": str(e)}
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixService(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixService = None
+
+
+class _TCPService(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _address_file() -> Path:
+    from voice_handler.utils.paths import get_paths
+    return get_paths().qwen_worker_address
+
+
+class QwenWorkerService:
+    """
+    Serves a QwenWorkerPool to hook processes.
+
+    Listens on a Unix socket (owner-only permissions) where available,
+    otherwise on an ephemeral 127.0.0.1 port. The address is written to
+    paths.qwen_worker_address for clients.
+    """
+
+    def __init__(self, pool: QwenWorkerPool, address_file: Optional[Path] = None, logger=None):
+        """
+        Initialize the service.
+
+        Args:
+            pool: Pool that answers the requests
+            address_file: Where to publish the address (default: paths.qwen_worker_address)
+            logger: Logger instance
+        """
+        self.pool = pool
+        self.address_file = Path(address_file) if address_file else _address_file()
+        self.logger = logger
+        self._server: Optional[socketserver.BaseServer] = None
+        self._socket_path: Optional[Path] = None
+
+    def start(self):
+        """Bind, publish the address and serve in a background thread."""
+        if _UnixService is not None and sys.platform != "win32":
+            self._socket_path = self.address_file.with_suffix(".sock")
+            try:
+                self._socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._server = _UnixService(str(self._socket_path), _ServiceHandler)
+            os.chmod(self._socket_path, 0o600)
+            address = f"unix:{self._socket_path}"
+        else:
+            self._server = _TCPService(("127.0.0.1", 0), _ServiceHandler)
+            address = f"tcp:127.0.0.1:{self._server.server_address[1]}"
+        self._server.pool = self.pool
+
+        temp_path = self.address_file.with_suffix(".tmp")
+        temp_path.write_text(address)
+        os.replace(temp_path, self.address_file)
+
+        threading.Thread(target=self._server.serve_forever, name="VoiceQwenService", daemon=True).start()
+        if self.logger:
+            self.logger.log_info(f"qwen-code worker service listening on {address}")
+
+    def stop(self):
+        """Stop serving and remove the published address."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for path in (self.address_file, self._socket_path):
+            if path is not None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def ask_worker_service(prompt: str, timeout: float = 10.0, address_file: Optional[Path] = None) -> Optional[str]:
+    """
+    Ask the daemon's qwen-code workers (client side, used by hooks).
+
+    Args:
+        prompt: Full prompt text
+        timeout: Seconds to wait for the answer
+        address_file: Published service address (default: paths.qwen_worker_address)
+
+    Returns:
+        Response text, or None if the service is not running or failed
+    """
+    try:
+        address = Path(address_file or _address_file()).read_text().strip()
+    except OSError:
+        return None
+
+    try:
+        if address.startswith("unix:"):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            target = address[len("unix:"):]
+        elif address.startswith("tcp:"):
+            host, port = address[len("tcp:"):].rsplit(":", 1)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            target = (host, int(port))
+        else:
+            return None
+        with sock:
+            # The pool enforces the timeout; allow a little for the round trip
+            sock.settimeout(timeout + 1.0)
+            sock.connect(target)
+            request = {"prompt": prompt, "timeout": timeout}
+            sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            reply = sock.makefile("rb").readline()
+        return json.loads(reply).get("text") if reply else None
+    except (OSError, ValueError):
+        return None
+
+
+def create_qwen_worker_pool(timeout: float = 10.0, logger=None, metrics=None) -> Optional[QwenWorkerPool]:
+    """
+    QwenWorkerPool configured from LLMConfig (QWEN_WORKERS, QWEN_WORKER_COMMAND, ...).
+
+    Args:
+        timeout: Default seconds to wait for one answer
+        logger: Logger instance
+        metrics: Optional DaemonMetrics registry
+
+    Returns:
+        The pool, or None if workers are disabled or qwen-code isn't installed
+    """
+    from voice_handler.config import get_config
+
+    llm = get_config().llm
+    if llm.qwen_workers <= 0:
+        return None
+    command = resolve_command(llm.qwen_worker_command)
+    if command is None:
+        return None
+    return QwenWorkerPool(
+        size=llm.qwen_workers,
+        command=command,
+        timeout=timeout,
+        max_requests=llm.qwen_worker_max_requests,
+        logger=logger,
+        metrics=metrics,
+    )
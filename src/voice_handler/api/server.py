@@ -8,17 +8,22 @@ Provides REST API and WebSocket endpoints for the SPA control panel.
 
 import os
 import json
+import asyncio
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from pydantic import BaseModel
 
 from voice_handler.queue.daemon import VoiceDaemon
 from voice_handler.queue.broker import get_broker
+from voice_handler.utils.events import EventStore
+from voice_handler.utils.event_stream import DEFAULT_CLIENT_BUFFER, EventStream, EventStreamRelay
 from voice_handler.utils.logger import get_logger
+from voice_handler.utils.metrics import render_prometheus
+from voice_handler.utils.tracing import TraceRing, render_waterfall
 
 
 # Initialize FastAPI app
@@ -39,8 +44,14 @@ app.add_middleware(
 
 # Initialize components
 logger = get_logger()
+logger.set_mode("async")  # Long-running: never hold records until exit
 daemon = VoiceDaemon(logger=logger)
 broker = get_broker(logger=logger)
+# Read side of the daemon's event store (WAL: reads never block its writes)
+event_store = EventStore()
+# Mirror of the daemon's live event stream, fanned out to /ws/logs clients
+event_stream = EventStream()
+event_relay = EventStreamRelay(event_stream, logger=logger)
 
 # Get project paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -60,6 +71,16 @@ class DaemonStatusResponse(BaseModel):
 class QueueStatusResponse(BaseModel):
     size: int
     pending_messages: int
+    in_flight: int = 0
+    by_type: Dict[str, int] = {}
+    by_session: Dict[str, int] = {}
+
+
+class QueueMessagesResponse(BaseModel):
+    total: int
+    limit: int
+    offset: int
+    messages: List[Dict[str, Any]]
 
 
 class ConfigUpdateRequest(BaseModel):
@@ -108,6 +129,29 @@ async def get_daemon_status():
     )
 
 
+@app.get("/api/daemon/metrics")
+async def get_daemon_metrics():
+    """Get worker counters, latency histograms and cache stats as JSON."""
+    status = daemon.get_status()
+    return {
+        "running": status["running"],
+        "uptime_seconds": status.get("uptime_seconds", 0),
+        "counters": status.get("counters", {}),
+        "histograms": status.get("histograms", {}),
+        "caches": status.get("caches", {}),
+        "updated_at": status.get("updated_at"),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Worker metrics in Prometheus text exposition format."""
+    return PlainTextResponse(
+        render_prometheus(daemon.get_status()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.post("/api/daemon/start")
 async def start_daemon():
     """Start the voice daemon."""
@@ -137,23 +181,132 @@ async def restart_daemon():
 
 @app.get("/api/queue/status", response_model=QueueStatusResponse)
 async def get_queue_status():
-    """Get current queue status."""
-    size = broker.size()
-    return QueueStatusResponse(size=size, pending_messages=size)
+    """Get current queue status with per-type and per-session breakdown."""
+    summary = broker.breakdown()
+    return QueueStatusResponse(
+        size=summary["pending"],
+        pending_messages=summary["pending"],
+        in_flight=summary["in_flight"],
+        by_type=summary["by_type"],
+        by_session=summary["by_session"],
+    )
+
+
+@app.get("/api/queue/messages", response_model=QueueMessagesResponse)
+async def list_queue_messages(
+    limit: int = 20,
+    offset: int = 0,
+    session_id: Optional[str] = None,
+    message_type: Optional[str] = None,
+):
+    """List pending messages (paginated) without removing them from the queue."""
+    if limit < 1 or limit > 500 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-500 and offset >= 0")
+    return QueueMessagesResponse(
+        total=broker.size(session_id=session_id, message_type=message_type),
+        limit=limit,
+        offset=offset,
+        messages=broker.peek(
+            limit=limit,
+            offset=offset,
+            session_id=session_id,
+            message_type=message_type,
+        ),
+    )
 
 
 @app.post("/api/queue/clear")
-async def clear_queue():
-    """Clear all pending messages in the queue."""
-    size_before = broker.size()
-    broker.clear()
+async def clear_queue(session_id: Optional[str] = None, message_type: Optional[str] = None):
+    """Clear pending messages, optionally only for one session or message type."""
+    cleared = broker.clear(session_id=session_id, message_type=message_type)
     return {
         "status": "cleared",
-        "messages_cleared": size_before,
-        "message": f"Cleared {size_before} pending messages"
+        "messages_cleared": cleared,
+        "message": f"Cleared {cleared} pending messages"
     }
 
 
+@app.get("/api/traces")
+async def list_traces(limit: int = 50):
+    """List recent hook-to-audio latency traces, newest first."""
+    if not 1 <= limit <= 1024:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1024")
+    traces = TraceRing().read(limit=limit)
+    return {"traces": [trace.summary() for trace in traces]}
+
+
+@app.get("/api/traces/{trace_id}")
+async def get_trace(trace_id: str, format: str = "json"):
+    """Show one trace as a waterfall (JSON rows, or text bars with format=text)."""
+    trace = TraceRing().find(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace {trace_id} not found")
+    if format == "text":
+        return PlainTextResponse(render_waterfall(trace))
+    return {**trace.summary(), "waterfall": trace.waterfall()}
+
+
+@app.get("/api/events")
+async def list_events(
+    session_id: Optional[str] = None,
+    hook: Optional[str] = None,
+    tool: Optional[str] = None,
+    message_id: Optional[str] = None,
+    stage: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    min_latency_ms: Optional[float] = None,
+    limit: int = 100,
+    offset: int = 0,
+):
+    """Query structured pipeline events, newest first (since/until: epoch, 15m/2h/7d or ISO)."""
+    if not 1 <= limit <= 5000 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-5000 and offset >= 0")
+    try:
+        found = event_store.query(
+            since=since,
+            until=until,
+            min_latency_ms=min_latency_ms,
+            limit=limit,
+            offset=offset,
+            session_id=session_id,
+            hook=hook,
+            tool=tool,
+            message_id=message_id,
+            stage=stage,
+            status=status,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"count": len(found), "limit": limit, "offset": offset, "events": found}
+
+
+@app.get("/api/events/summary")
+async def summarize_events(
+    session_id: Optional[str] = None,
+    hook: Optional[str] = None,
+    tool: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+):
+    """Event counts with average and worst latency per stage."""
+    try:
+        stages = event_store.summary(since=since, until=until, session_id=session_id, hook=hook, tool=tool)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"stages": stages}
+
+
+@app.get("/api/events/{message_id}")
+async def get_message_events(message_id: str):
+    """One message's events from hook to outcome, in time order."""
+    timeline = event_store.timeline(message_id)
+    if not timeline:
+        raise HTTPException(status_code=404, detail=f"No events for message {message_id}")
+    return {"message_id": message_id, "events": timeline}
+
+
 @app.get("/api/config")
 async def get_config():
     """Get current configuration (validated)."""
@@ -289,29 +442,62 @@ async def test_tts(request: TTSTestRequest):
         raise HTTPException(status_code=500, detail=f"Failed to queue TTS: {str(e)}")
 
 
-# WebSocket for real-time log streaming
-active_websockets = []
-
+# WebSocket for real-time log and event streaming
 @app.websocket("/ws/logs")
-async def websocket_logs(websocket: WebSocket):
-    """WebSocket endpoint for streaming logs in real-time."""
+async def websocket_logs(websocket: WebSocket, since: Optional[int] = None, types: Optional[str] = None):
+    """
+    Stream the daemon's pipeline events, log records and metrics ticks.
+
+    Each message carries a "seq"; reconnect with ?since=<last seq> to get
+    what was missed (a "gap" message says if some of it is gone). A client
+    that falls behind loses its oldest messages and gets a "dropped"
+    notice. ?types=event,log limits the message types sent. Send "ping"
+    to get a "pong".
+    """
     await websocket.accept()
-    active_websockets.append(websocket)
+    event_relay.start()
+    wanted = set(types.split(",")) if types else None
+    loop = asyncio.get_running_loop()
+    ready = asyncio.Event()
+    subscription = event_stream.subscribe(
+        since=since,
+        capacity=DEFAULT_CLIENT_BUFFER,
+        on_ready=lambda: loop.call_soon_threadsafe(ready.set),
+    )
+
+    async def send_events():
+        while True:
+            await ready.wait()
+            ready.clear()
+            for event in subscription.drain():
+                if wanted is None or event.get("type") not in ("event", "log", "metrics") or event["type"] in wanted:
+                    await websocket.send_json(event)
+
+    async def answer_pings():
+        while True:
+            if await websocket.receive_text() == "ping":
+                await websocket.send_json({"type": "pong", "seq": event_stream.seq})
 
     try:
-        # Send initial connection message
         await websocket.send_json({
             "type": "connection",
-            "message": "Connected to log stream"
+            "message": "Connected to log stream",
+            "stream": event_stream.stream_id,
+            "seq": event_stream.seq,
+            "daemon_connected": event_relay.connected,
         })
-
-        # Keep connection alive
-        while True:
-            data = await websocket.receive_text()
-            # Echo back for ping/pong
-            await websocket.send_text(f"Echo: {data}")
+        tasks = [asyncio.create_task(send_events()), asyncio.create_task(answer_pings())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # Surface the disconnect (or error) that ended the stream
+        finally:
+            for task in tasks:
+                task.cancel()
     except WebSocketDisconnect:
-        active_websockets.remove(websocket)
+        pass
+    finally:
+        subscription.close()
 
 
 # Mount static files (after building the React app)
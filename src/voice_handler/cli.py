@@ -10,6 +10,7 @@ voice handler requests to the right place.
 import argparse
 import sys
 import json
+import time
 from typing import Optional, Tuple, Dict, Any
 
 # Configure UTF-8 encoding for Windows compatibility
@@ -19,6 +20,7 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 from voice_handler.utils.logger import get_logger
+from voice_handler.utils import tracing
 from voice_handler.core.handler import get_handler
 
 
@@ -62,6 +64,8 @@ def main():
 
     The main stage door - all requests come through here!
     """
+    imports_done = time.time()
+
     parser = argparse.ArgumentParser(
         description="Claude Code Voice Handler - Natural TTS for hook events 🎸",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -122,6 +126,13 @@ Hooks:
 
     args = parser.parse_args()
 
+    # Start the latency trace that follows this hook's message to the speaker
+    trace = tracing.start_trace(
+        label=args.hook or "message",
+        process_start=tracing.process_start_time(),
+    )
+    trace.mark("imports_done", imports_done)
+
     # Initialize logger and handler
     logger = get_logger()
 
@@ -147,8 +158,8 @@ Hooks:
         logger.log_info("Using SYNC mode (from --sync flag)")
     else:
         # Read from config (which loads .env file correctly)
-        from voice_handler.config import VoiceHandlerConfig
-        config_obj = VoiceHandlerConfig()
+        from voice_handler.config import get_config
+        config_obj = get_config()
         use_async = config_obj.runtime.use_async_queue
         logger.log_info(f"Using {'ASYNC' if use_async else 'SYNC'} mode (from config: USE_ASYNC_QUEUE={use_async})")
 
@@ -156,6 +167,7 @@ Hooks:
 
     # Read stdin data
     stdin_data, stdin_text = read_stdin_data()
+    tracing.mark("stdin_parsed")
 
     # Log the hook event
     logger.log_hook_event(
@@ -169,17 +181,32 @@ Hooks:
 
     # Determine tool name and session ID
     tool_name = args.tool
+    session_id = None
     if stdin_data and isinstance(stdin_data, dict):
         tool_name = stdin_data.get('tool_name') or tool_name
         session_id = stdin_data.get('session_id')
         if session_id:
             handler.current_session_id = session_id
             logger.log_debug(f"Session ID captured: {session_id[:8]}...")
+    trace.tool = tool_name
+
+    def record_hook(status: str):
+        # One structured event per hook; the daemon stores it (see utils/events.py)
+        logger.log_event(
+            "hook",
+            session_id=session_id,
+            hook=args.hook,
+            tool=tool_name,
+            message_id=trace.trace_id,
+            status=status,
+            latency_ms=round((time.time() - min(trace.spans.values())) * 1000, 2),
+        )
 
     # Check if this hook should trigger voice announcements
     if not handler.should_announce(args.hook, tool_name):
         print(f"   ⚠️  Hook '{args.hook}' does not trigger voice (logged only)")
         logger.log_info(f"Hook {args.hook} logged only (no voice announcement)")
+        record_hook("logged_only")
         sys.exit(0)
 
     # Update context for voice-enabled hooks
@@ -206,11 +233,13 @@ Hooks:
     elif args.hook == "PreToolUse":
         message = handler.process_pre_tool_use(stdin_data, tool_name)
         if not message:
+            record_hook("silent")
             sys.exit(0)
 
     elif args.hook == "PostToolUse":
         message = handler.process_post_tool_use(stdin_data)
         if not message:
+            record_hook("silent")
             sys.exit(0)
 
     elif args.hook == "Stop":
@@ -228,8 +257,11 @@ Hooks:
         if args.hook == "Stop":
             message = "Listo"
         elif args.hook in ["PostToolUse", "PreToolUse"]:
+            record_hook("silent")
             sys.exit(0)
 
+    tracing.mark("processor_done")
+
     # Speak the message if we have one
     if message:
         logger.log_message_flow("Speaking", message)
@@ -238,6 +270,16 @@ Hooks:
         print(f"   ✓ Queued: {msg_preview}")
         handler.speak(message, voice=args.voice)
         print(f"   🎵 Message sent to TTS daemon")
+        record_hook("queued" if handler.use_async else "spoken")
+
+        # In async mode the daemon finishes and records the trace
+        if not handler.use_async:
+            try:
+                tracing.TraceRing().record(trace)
+            except Exception as e:
+                logger.log_debug(f"Could not record trace: {e}")
+    else:
+        record_hook("silent")
 
 
 if __name__ == "__main__":
@@ -10,26 +10,35 @@ import os
 import threading
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from dataclasses import dataclass, field
 
-# Load .env file if python-dotenv is available
-try:
-    from dotenv import load_dotenv
-
-    # Find .env file (check multiple locations)
-    env_locations = [
-        Path(__file__).parent.parent.parent / ".env",  # voice_notifications/.env
-        Path.home() / ".claude" / "hooks" / "voice_notifications" / ".env",
-        Path.cwd() / ".env",
-    ]
-
-    for env_path in env_locations:
-        if env_path.exists():
-            load_dotenv(env_path, override=True)
-            break
-except ImportError:
-    pass  # python-dotenv not installed, use environment variables only
+from voice_handler.config_snapshot import apply_env, config_candidates, get_snapshot, get_voice_settings
+
+if TYPE_CHECKING:
+    from voice_handler.config_schema import VoiceConfig
+
+__all__ = [
+    "UserConfig",
+    "LLMConfig",
+    "TTSConfig",
+    "PersonalityConfig",
+    "RuntimeConfig",
+    "VoiceHandlerConfig",
+    "get_config",
+    "reload_config",
+    "get_user_nickname",
+    "get_llm_provider",
+    "is_debug_mode",
+    "is_voice_enabled",
+    "load_config_json",
+    "get_voice_config",
+    "reload_voice_config",
+    "get_voice_settings",  # Re-exported from config_snapshot: the schema-free fast path
+]
+
+# .env values are exported at the end of this module, from the config
+# snapshot (see config_snapshot.py) instead of re-parsing .env every hook.
 
 
 @dataclass
@@ -47,9 +56,22 @@ class LLMConfig:
     # Ollama settings
     ollama_model: str = field(default_factory=lambda: os.getenv("OLLAMA_MODEL", "qwen2.5:0.5b"))
     ollama_host: str = field(default_factory=lambda: os.getenv("OLLAMA_HOST", "http://localhost:11434"))
+    ollama_keep_alive: str = field(default_factory=lambda: os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
+    ollama_ping_interval: float = field(
+        default_factory=lambda: float(os.getenv("OLLAMA_PING_INTERVAL", "240"))
+    )
 
     # Qwen settings
     qwen_max_tokens: int = field(default_factory=lambda: int(os.getenv("QWEN_MAX_TOKENS", "50")))
+    qwen_workers: int = field(default_factory=lambda: int(os.getenv("QWEN_WORKERS", "2")))
+    qwen_worker_command: str = field(
+        default_factory=lambda: os.getenv(
+            "QWEN_WORKER_COMMAND", "qwen-code --input-format stream-json --output-format stream-json"
+        )
+    )
+    qwen_worker_max_requests: int = field(
+        default_factory=lambda: int(os.getenv("QWEN_WORKER_MAX_REQUESTS", "20"))
+    )
 
 
 @dataclass
@@ -78,6 +100,24 @@ class RuntimeConfig:
     debug_mode: bool = field(
         default_factory=lambda: os.getenv("DEBUG_MODE", "false").lower() == "true"
     )
+    hook_log_mode: str = field(
+        default_factory=lambda: os.getenv("LOG_MODE_HOOKS", "buffered").lower()
+    )
+    daemon_log_mode: str = field(
+        default_factory=lambda: os.getenv("LOG_MODE_DAEMON", "async").lower()
+    )
+    log_max_mb: int = field(
+        default_factory=lambda: int(os.getenv("LOG_MAX_MB", "10"))
+    )
+    log_max_age_hours: float = field(
+        default_factory=lambda: float(os.getenv("LOG_MAX_AGE_HOURS", "24"))
+    )
+    log_backups: int = field(
+        default_factory=lambda: int(os.getenv("LOG_BACKUPS", "5"))
+    )
+    event_retention_days: float = field(
+        default_factory=lambda: float(os.getenv("EVENT_RETENTION_DAYS", "7"))
+    )
     min_speech_delay: float = field(
         default_factory=lambda: float(os.getenv("MIN_SPEECH_DELAY", "1.0"))
     )
@@ -160,10 +200,7 @@ def is_voice_enabled() -> bool:
 # CONFIG.JSON VALIDATION (Pydantic)
 # ============================================================================
 
-from voice_handler.config_schema import VoiceConfig
-from pydantic import ValidationError
-
-_voice_config_singleton: Optional[VoiceConfig] = None
+_voice_config_singleton: Optional["VoiceConfig"] = None
 _voice_config_lock = threading.Lock()
 
 
@@ -171,7 +208,7 @@ def load_config_json(
     config_path: Optional[Path] = None,
     fail_on_invalid: bool = True,
     logger=None
-) -> VoiceConfig:
+) -> "VoiceConfig":
     """
     Load and validate config.json with Pydantic.
 
@@ -187,13 +224,12 @@ def load_config_json(
         ValidationError: If fail_on_invalid=True and config is invalid
         Exception: If fail_on_invalid=True and file cannot be read
     """
+    from voice_handler.config_schema import VoiceConfig
+    from pydantic import ValidationError
+
     # Auto-detect config path
     if config_path is None:
-        possible_paths = [
-            Path(__file__).parent.parent.parent / "config.json",  # voice_notifications/config.json
-            Path.home() / ".claude" / "hooks" / "voice_notifications" / "config.json",
-        ]
-        for path in possible_paths:
+        for path in config_candidates():
             if path.exists():
                 config_path = path
                 break
@@ -242,12 +278,16 @@ def load_config_json(
         return VoiceConfig()
 
 
-def get_voice_config(reload: bool = False) -> VoiceConfig:
+def get_voice_config(reload: bool = False) -> "VoiceConfig":
     """
     Get singleton VoiceConfig instance.
 
+    Built from the config snapshot, so config.json is only read and
+    validated again after it changes. Hooks that just need the values
+    should use get_voice_settings(), which skips the schema entirely.
+
     Args:
-        reload: Force reload from disk
+        reload: Re-check config.json on disk
 
     Returns:
         Cached or freshly loaded VoiceConfig
@@ -257,11 +297,18 @@ def get_voice_config(reload: bool = False) -> VoiceConfig:
     if _voice_config_singleton is None or reload:
         with _voice_config_lock:
             if _voice_config_singleton is None or reload:
-                _voice_config_singleton = load_config_json(fail_on_invalid=False)
+                from voice_handler.config_schema import VoiceConfig
+                snapshot = get_snapshot(refresh=reload)
+                _voice_config_singleton = VoiceConfig.model_validate(snapshot["voice_config"])
 
     return _voice_config_singleton
 
 
-def reload_voice_config() -> VoiceConfig:
+def reload_voice_config() -> "VoiceConfig":
     """Force reload of config.json (useful after API updates)."""
     return get_voice_config(reload=True)
+
+
+# Export .env values last: a snapshot rebuild validates config.json with
+# load_config_json above.
+apply_env(get_snapshot())
@@ -15,6 +15,16 @@ class QueueSettings(BaseModel):
     max_retries: int = Field(default=3, ge=1, le=10, description="Maximum retry attempts for failed messages")
     retry_backoff_base: float = Field(default=0.5, ge=0.1, le=5.0, description="Base delay for exponential backoff (seconds)")
     consumer_poll_timeout: float = Field(default=1.0, ge=0.1, le=10.0, description="Consumer polling timeout (seconds)")
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = Field(default="NORMAL", description="SQLite synchronous pragma for the WAL queue database")
+    group_commit: bool = Field(default=False, description="Coalesce concurrent daemon-side enqueues into shared transactions")
+    group_commit_window_ms: float = Field(default=5.0, ge=0.0, le=100.0, description="Time to collect writes before a group commit (milliseconds)")
+    group_commit_max_batch: int = Field(default=64, ge=1, le=1000, description="Maximum messages per group commit")
+    status_flush_interval: float = Field(default=5.0, ge=0.5, le=300.0, description="Seconds between daemon metrics/status file writes")
+    config_reload_interval: float = Field(default=2.0, ge=0.0, le=300.0, description="Seconds between daemon checks of config.json/.env for changes to apply live (0 disables)")
+    prefetch_depth: int = Field(default=2, ge=0, le=20, description="Pending messages the daemon prepares (compresses) while another is spoken")
+    queue_backend: Literal["persist", "sqlite"] = Field(default="persist", description="Queue storage engine shared by hooks and daemon (persist-queue or stdlib sqlite3; the in-process memory backend can't be shared, so it is not offered)")
+    runtime: Literal["async", "thread"] = Field(default="async", description="Daemon core: asyncio reader/renderer with a playback thread, or the single consumer thread")
+    render_ahead: int = Field(default=2, ge=0, le=10, description="Messages the async runtime synthesizes while another one plays")
 
 
 class MessageLimits(BaseModel):
@@ -31,6 +41,7 @@ class TimingConfig(BaseModel):
     min_speech_delay: float = Field(default=1.0, ge=0.0, le=60.0, description="Minimum delay between speech outputs (seconds)")
     min_tool_announcement_interval: float = Field(default=3.0, ge=0.0, le=60.0, description="Minimum interval between tool announcements (seconds)")
     session_expiry_hours: int = Field(default=4, ge=1, le=72, description="Session expiry time (hours)")
+    session_touch_interval: float = Field(default=60.0, ge=0.0, le=3600.0, description="Seconds a session's last-used time may drift before it is written to disk (0: every hook)")
 
 
 class TTSSettings(BaseModel):
@@ -39,6 +50,77 @@ class TTSSettings(BaseModel):
     max_tokens_llm: int = Field(default=100, ge=1, le=2048, description="Maximum tokens for LLM compression")
     llm_temperature: float = Field(default=0.8, ge=0.0, le=2.0, description="LLM temperature for message generation")
     llm_timeout: int = Field(default=5, ge=1, le=60, description="LLM request timeout (seconds)")
+    compression_budget_ms: int = Field(default=1200, ge=50, le=30000, description="Longest speech waits for LLM compression before speaking the original text (milliseconds)")
+    compression_cache_size: int = Field(default=256, ge=0, le=10000, description="Compressed texts cached by input hash")
+    audio_cache: bool = Field(default=True, description="Cache rendered speech on disk, keyed by engine, voice, settings and text")
+    audio_cache_mb: int = Field(default=50, ge=1, le=10000, description="Audio cache size limit (megabytes)")
+    system_engine: Literal["persistent", "subprocess"] = Field(default="persistent", description="Keep the system TTS engine running between messages, or start one per message")
+    system_render_wav: bool = Field(default=False, description="Render system TTS to WAV and play it through the shared (cached) playback pipeline")
+    system_language: str = Field(default="es", description="Language for speech-dispatcher/espeak system voices")
+    speech_language: Literal["es", "en"] = Field(default="es", description="Language file names, units and acronyms are read in (speech_lexicon.json)")
+    chunked_synthesis: bool = Field(default=True, description="Split long messages at sentence boundaries and synthesize chunks concurrently")
+    chunk_min_chars: int = Field(default=160, ge=20, le=5000, description="Messages shorter than this are synthesized whole")
+    chunk_first_chars: int = Field(default=80, ge=10, le=1000, description="Target size of the first chunk (sets time to first audio)")
+    chunk_max_chars: int = Field(default=250, ge=20, le=4000, description="Maximum size of later chunks")
+    chunk_workers: int = Field(default=3, ge=1, le=8, description="Concurrent chunk synthesis requests")
+
+
+class ProviderHealthSettings(BaseModel):
+    """TTS provider health tracking, circuit breaker and adaptive selection."""
+    enabled: bool = Field(default=True, description="Track provider health and reorder the chain per message")
+    window: int = Field(default=20, ge=1, le=1000, description="Recent outcomes kept per provider for the error rate")
+    failure_threshold: int = Field(default=3, ge=1, le=100, description="Consecutive failures that open the circuit breaker")
+    error_rate_threshold: float = Field(default=0.5, gt=0.0, le=1.0, description="Rolling error rate that opens the circuit breaker")
+    min_samples: int = Field(default=5, ge=1, le=1000, description="Outcomes needed before the error rate can open the breaker")
+    cooldown_seconds: float = Field(default=30.0, ge=1.0, le=3600.0, description="Seconds a tripped provider is skipped before a probe")
+    ewma_alpha: float = Field(default=0.3, gt=0.0, le=1.0, description="Weight of the newest sample in the latency EWMA")
+    urgent_priority: int = Field(default=8, ge=1, le=10, description="Messages at or above this priority get urgent_deadline_ms")
+    urgent_deadline_ms: int = Field(default=2500, ge=100, le=60000, description="Time to first audio urgent messages should meet (milliseconds)")
+
+
+class PreemptionSettings(BaseModel):
+    """Interrupting low-priority speech when an urgent message arrives."""
+    enabled: bool = Field(default=True, description="Let urgent messages interrupt the message being spoken")
+    min_priority: int = Field(default=9, ge=1, le=10, description="Messages at or above this priority (and above the current one) interrupt speech")
+    mode: Literal["fade", "cut", "skip"] = Field(default="fade", description="Fade out, cut, or finish the current clip and skip the rest of the message")
+    fade_ms: int = Field(default=250, ge=0, le=5000, description="Fade-out length in fade mode (milliseconds)")
+    poll_interval_ms: int = Field(default=100, ge=10, le=5000, description="How often the queue is checked for urgent messages while speaking (milliseconds)")
+    requeue_interrupted: bool = Field(default=False, description="Put interrupted messages back in the queue (once) instead of dropping them")
+
+
+class MixingSettings(BaseModel):
+    """Sharing the speaker between concurrent sessions (queue/mixer.py)."""
+    enabled: bool = Field(default=True, description="Take turns across sessions and merge a large backlog into digests")
+    digest_threshold: int = Field(default=6, ge=0, le=1000, description="Pending messages at which turns become digests (0: never merge)")
+    max_sessions: int = Field(default=4, ge=1, le=20, description="Sessions merged into one digest")
+    max_per_session: int = Field(default=5, ge=1, le=50, description="Messages of one session merged into its digest clause")
+    max_clause_words: int = Field(default=14, ge=3, le=100, description="Words of a session's latest message kept in its clause")
+    urgent_priority: int = Field(default=8, ge=1, le=10, description="Messages at or above this priority are never merged or delayed")
+    session_weights: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Round-robin weight per project name (default 1.0): a project with weight 2 gets twice the turns",
+    )
+
+
+class LLMHedgingSettings(BaseModel):
+    """Deadline-driven message generation racing LLM providers."""
+    enabled: bool = Field(default=True, description="Race providers against a per-message latency budget instead of trying them one after another")
+    default_budget_ms: int = Field(default=3000, ge=100, le=60000, description="Latency budget for message types without their own (milliseconds)")
+    budgets_ms: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "greeting": 3000,
+            "acknowledgment": 2000,
+            "tool": 1500,
+            "completion": 4000,
+            "approval": 3000,
+            "error": 2000,
+            "enrich": 2000,
+        },
+        description="Latency budget per message type; past it the canned phrase is used (milliseconds)",
+    )
+    hedge_quantile: float = Field(default=0.9, gt=0.0, lt=1.0, description="Start the next provider once the running one exceeds this latency quantile")
+    latency_window: int = Field(default=50, ge=5, le=1000, description="Recent latencies kept per provider")
+    min_samples: int = Field(default=5, ge=1, le=1000, description="Samples needed before the quantile is trusted (until then: half the budget)")
 
 
 class HistoryConfig(BaseModel):
@@ -62,6 +144,9 @@ class VoiceSettings(BaseModel):
     )
     fallback_voice: str = Field(default="Ralph", description="System TTS fallback voice (macOS/Linux)")
     fallback_speech_rate: int = Field(default=180, ge=50, le=400, description="System TTS speech rate (words per minute)")
+    session_identity: bool = Field(default=True, description="Vary speed and delivery style per session, not just the voice")
+    session_earcons: bool = Field(default=True, description="Play a short per-session earcon before each announcement")
+    earcon_volume: float = Field(default=0.3, ge=0.0, le=1.0, description="Earcon peak volume (0-1)")
     personality: str = Field(default="friendly_professional", description="Personality mode selection")
     user_nickname: str = Field(default="Bernard", min_length=1, description="User nickname for personalized messages")
 
@@ -79,6 +164,10 @@ class VoiceConfig(BaseModel):
     message_limits: MessageLimits = Field(default_factory=MessageLimits, description="Message truncation limits")
     timing: TimingConfig = Field(default_factory=TimingConfig, description="Timing and rate limiting")
     tts_settings: TTSSettings = Field(default_factory=TTSSettings, description="TTS provider settings")
+    provider_health: ProviderHealthSettings = Field(default_factory=ProviderHealthSettings, description="TTS provider health and circuit breaker")
+    preemption: PreemptionSettings = Field(default_factory=PreemptionSettings, description="Urgent messages interrupting playback")
+    mixing: MixingSettings = Field(default_factory=MixingSettings, description="Fair turns and digests across concurrent sessions")
+    llm_hedging: LLMHedgingSettings = Field(default_factory=LLMHedgingSettings, description="Deadline-driven LLM provider racing")
     history: HistoryConfig = Field(default_factory=HistoryConfig, description="LLM history settings")
     voice_settings: VoiceSettings = Field(default_factory=VoiceSettings, description="Voice and personality settings")
 
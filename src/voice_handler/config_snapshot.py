@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Config Snapshot - The Setlist Taped to the Stage.
+
+Every hook is its own process, and each used to start the show by
+finding and parsing .env, reading config.json and running it through
+pydantic. None of that changes between songs, so the result is written
+once as a marshal snapshot: the .env values and the validated config as
+plain dicts, keyed by the stat (mtime, size, inode) of the files it came
+from and a fingerprint of the schema that validated them. A hook that
+finds a snapshot with a matching key loads it in microseconds and never
+imports the schema; editing either file, or upgrading to a changed
+schema, changes the key and the next hook rebuilds it.
+
+Because it carries API keys, the snapshot is written owner-only in the
+user's private state directory, one file per .env in use, so hooks run
+from projects with different .env files don't overwrite each other.
+
+This module stays free of pydantic and python-dotenv imports until a
+rebuild actually needs them.
+"""
+
+import marshal
+import os
+import sys
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bumped whenever the snapshot layout changes, so old files are rebuilt
+SNAPSHOT_FORMAT = 1
+
+
+def _schema_fingerprint() -> int:
+    """
+    Checksum of config_schema.py, so an upgrade that changes the schema
+    (new sections, fields or defaults) rebuilds snapshots made by the
+    old code. Reading the source keeps pydantic out of the fast path.
+    """
+    try:
+        return zlib.crc32((Path(__file__).parent / "config_schema.py").read_bytes())
+    except OSError:
+        return 0
+
+
+SCHEMA_FINGERPRINT = _schema_fingerprint()
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent  # voice_notifications/
+_HOOKS_DIR = Path.home() / ".claude" / "hooks" / "voice_notifications"
+
+_snapshot: Optional[Dict[str, Any]] = None
+_snapshot_lock = threading.Lock()
+
+
+def env_candidates() -> List[Path]:
+    """.env locations, in the order they are tried (the first that exists wins)."""
+    return [_PROJECT_ROOT / ".env", _HOOKS_DIR / ".env", Path.cwd() / ".env"]
+
+
+def config_candidates() -> List[Path]:
+    """config.json locations, in the order they are tried."""
+    return [_PROJECT_ROOT / "config.json", _HOOKS_DIR / "config.json"]
+
+
+def _resolve(candidates: List[Path]) -> Tuple[Optional[Path], tuple]:
+    """
+    Find the first existing candidate and fingerprint the lookup.
+
+    The fingerprint covers every candidate up to and including the one
+    found: creating a file earlier in the list changes which one is used.
+
+    Returns:
+        Tuple of (path found or None, fingerprint)
+    """
+    fingerprint = []
+    for path in candidates:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            fingerprint.append((str(path), None, None, None))
+            continue
+        fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return path, tuple(fingerprint)
+    return None, tuple(fingerprint)
+
+
+def source_key() -> tuple:
+    """Fingerprint of the .env and config.json files the snapshot is built from."""
+    _, env_key = _resolve(env_candidates())
+    _, config_key = _resolve(config_candidates())
+    return (SNAPSHOT_FORMAT, SCHEMA_FINGERPRINT, sys.version_info[:2], env_key, config_key)
+
+
+def snapshot_path(base: Path) -> Path:
+    """
+    Snapshot file for the .env in use.
+
+    Args:
+        base: Snapshot file name to derive from (paths.config_snapshot)
+
+    Returns:
+        base with a checksum of the resolved .env path added to its name
+    """
+    env_path, _ = _resolve(env_candidates())
+    source = str(env_path.resolve()) if env_path is not None else ""
+    return base.with_name(f"{base.stem}.{zlib.crc32(source.encode('utf-8')):08x}{base.suffix}")
+
+
+def build_snapshot(logger=None) -> Dict[str, Any]:
+    """
+    Parse .env and validate config.json (the slow path).
+
+    An invalid or unreadable config.json is recorded as the schema
+    defaults with valid=False, as load_config_json(fail_on_invalid=False)
+    would return; the error is reported once, not on every hook.
+
+    Args:
+        logger: Optional logger for validation errors
+
+    Returns:
+        Snapshot dict: key, env, config_path, voice_config, valid
+    """
+    key = source_key()
+    env_path, _ = _resolve(env_candidates())
+    config_path, _ = _resolve(config_candidates())
+
+    env: Dict[str, str] = {}
+    if env_path is not None:
+        try:
+            from dotenv import dotenv_values
+            env = {name: value for name, value in dotenv_values(env_path).items() if value is not None}
+        except ImportError:
+            pass  # python-dotenv not installed, use environment variables only
+
+    from voice_handler.config import load_config_json
+    from voice_handler.config_schema import VoiceConfig
+
+    valid = True
+    if config_path is None:
+        voice_config = VoiceConfig()
+    else:
+        try:
+            voice_config = load_config_json(config_path, fail_on_invalid=True, logger=logger)
+        except Exception:
+            valid = False
+            voice_config = VoiceConfig()
+            if logger:
+                logger.log_warning("Using default config due to validation errors")
+
+    return {
+        "key": key,
+        "env": env,
+        "config_path": str(config_path) if config_path else None,
+        "voice_config": voice_config.model_dump(),
+        "valid": valid,
+    }
+
+
+def read_snapshot(path: Path, key: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a snapshot file if it was built from the current sources.
+
+    Args:
+        path: Snapshot file
+        key: Expected source key (computed if None)
+
+    Returns:
+        Snapshot dict, or None if missing, unreadable or stale
+    """
+    try:
+        data = marshal.loads(Path(path).read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    if data.get("key") != (key if key is not None else source_key()):
+        return None
+    return data
+
+
+def write_snapshot(path: Path, snapshot: Dict[str, Any]):
+    """
+    Write a snapshot atomically, so hooks never read a partial file.
+
+    The file is created owner-only (it carries the .env values, API keys
+    included), in a directory only the user can open.
+
+    Args:
+        path: Destination file
+        snapshot: Snapshot dict (builtins only)
+
+    Raises:
+        OSError: If the file can't be written or the directory isn't private
+    """
+    from voice_handler.utils.paths import ensure_private_dir
+
+    path = Path(path)
+    ensure_private_dir(path.parent)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps(snapshot))
+        os.replace(tmp_name, path)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def get_snapshot(refresh: bool = False, path: Optional[Path] = None, logger=None) -> Dict[str, Any]:
+    """
+    Get the config snapshot, rebuilding it only when the sources changed.
+
+    The snapshot is cached for the life of the process; use refresh=True
+    to check the sources again (or force a rebuild after a config write).
+
+    Args:
+        refresh: Re-check the source files (and rebuild if they changed)
+        path: Snapshot file (default: paths.config_snapshot)
+        logger: Optional logger for rebuild messages
+
+    Returns:
+        Snapshot dict: key, env, config_path, voice_config, valid
+    """
+    global _snapshot
+
+    if _snapshot is not None and not refresh:
+        return _snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None and not refresh:
+            return _snapshot
+
+        if path is None:
+            from voice_handler.utils.paths import get_paths
+            path = snapshot_path(get_paths().config_snapshot)
+
+        snapshot = read_snapshot(path)
+        if snapshot is None:
+            snapshot = build_snapshot(logger=logger)
+            try:
+                write_snapshot(path, snapshot)
+            except OSError as e:
+                if logger:
+                    logger.log_warning(f"Could not write config snapshot: {e}")
+            else:
+                if logger:
+                    logger.log_debug(f"Config snapshot rebuilt at {path}")
+
+        _snapshot = snapshot
+        return _snapshot
+
+
+def apply_env(snapshot: Dict[str, Any], previous: Optional[Dict[str, str]] = None):
+    """
+    Export the snapshot's .env values (they override the environment, as load_dotenv(override=True)).
+
+    Args:
+        snapshot: Snapshot dict
+        previous: .env values exported before (a reload): names no longer
+            in .env are removed from the environment, unless something
+            else has changed them since
+    """
+    env = snapshot["env"]
+    for name in set(previous or ()) - set(env):
+        if os.environ.get(name) == previous[name]:
+            del os.environ[name]
+    os.environ.update(env)
+
+
+def get_voice_settings(refresh: bool = False) -> Dict[str, Any]:
+    """
+    Validated config.json as a dict (the shape of VoiceConfig.model_dump()).
+
+    Each call returns a fresh copy, so callers may modify it.
+
+    Args:
+        refresh: Re-check config.json before answering
+
+    Returns:
+        Nested settings dict
+    """
+    return marshal.loads(marshal.dumps(get_snapshot(refresh=refresh)["voice_config"]))
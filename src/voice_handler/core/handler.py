@@ -109,15 +109,14 @@ class VoiceNotificationHandler:
         self.logger.log_info("VoiceNotificationHandler ready - Let's rock!")
 
     def _load_config(self) -> dict:
-        """Load voice configuration from config.json with Pydantic validation."""
-        from voice_handler.config import get_voice_config
-        from voice_handler.config_schema import VoiceConfig
+        """Load voice configuration from the pre-validated config snapshot."""
+        from voice_handler.config import get_voice_settings
 
         try:
-            config = get_voice_config()
-            return config.model_dump()  # Convert to dict for backward compat
+            return get_voice_settings()  # Already a dict, validated when the snapshot was built
         except Exception as e:
             self.logger.log_error("Config validation failed, using defaults", exception=e)
+            from voice_handler.config_schema import VoiceConfig
             return VoiceConfig().model_dump()
 
     @property
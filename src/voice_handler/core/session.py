@@ -6,29 +6,324 @@ Like assigning different voices to different characters in an epic concept album
 this module gives each Claude Code session a unique voice identity.
 """
 
+import heapq
 import json
 import os
-import sys
+import tempfile
 import time
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple
+
+from voice_handler.tts.identity import FEMALE_VOICES, MALE_VOICES, IdentitySpace, VoiceIdentity
+
+
+class SessionRegistry:
+    """
+    Session records with an expiry index and debounced, compact persistence.
+
+    Every hook is a fresh process that looks up one session, so nothing
+    here scans or rewrites all sessions per call:
+
+    - A min-heap of (last_used, session_id) finds expired and least
+      recently used sessions from the top. Entries superseded by a newer
+      last_used are skipped when they surface, and the heap is rebuilt
+      once it is mostly stale
+    - Identity use counts answer "which voices are taken" without a scan
+    - last_used is only written when it moved by more than
+      touch_interval; new sessions, project changes and expiries are
+      written right away
+    - On disk: one compact JSON document, {"v": 2, "sessions": {id:
+      [voice, created_at, last_used, project_name, speed, variant,
+      earcon]}}, written atomically.
+      Records another process added since the file was read are merged
+      in before writing. The legacy indented format is still read
+    - A long-lived reader (the daemon) picks up other processes' writes
+      with one stat() per lookup
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, path, expiry_seconds: float, touch_interval: float = 60.0, logger=None):
+        """
+        Initialize the registry and load it from disk.
+
+        Args:
+            path: Session storage file
+            expiry_seconds: Idle time after which a session is dropped
+            touch_interval: Seconds last_used may drift before it is written
+            logger: Optional logger instance
+        """
+        self.path = Path(path)
+        self.expiry_seconds = expiry_seconds
+        self.touch_interval = touch_interval
+        self.logger = logger
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._identities: Counter = Counter()  # (voice, speed, variant, earcon) -> sessions
+        self._saved_last_used: Dict[str, float] = {}
+        self._dirty: set = set()
+        self._removed: set = set()
+        self._file_stamp: Optional[Tuple[int, int, int]] = None
+        self.refresh(force=True)
+
+    # ---------------- disk ----------------
+
+    def _stamp(self) -> Optional[Tuple[int, int, int]]:
+        """File identity: every atomic write replaces the inode."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Sessions on disk (compact or legacy format); empty if missing or corrupt."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        raw = data.get("sessions", {})
+        if data.get("v") != self.FORMAT_VERSION:
+            return {sid: dict(record) for sid, record in raw.items() if isinstance(record, dict) and "voice" in record}
+        sessions = {}
+        for sid, row in raw.items():
+            if not isinstance(row, list) or len(row) not in (4, 7):
+                continue
+            record = {"voice": row[0], "created_at": row[1], "last_used": row[2], "project_name": row[3]}
+            if len(row) == 7:
+                record.update(speed=row[4], variant=row[5], earcon=row[6])
+            sessions[sid] = record
+        return sessions
+
+    @staticmethod
+    def _traits(record: Dict[str, Any]) -> tuple:
+        return (record["voice"], record.get("speed", 1.0), record.get("variant", "neutral"), record.get("earcon"))
+
+    @classmethod
+    def identity(cls, record: Dict[str, Any]) -> VoiceIdentity:
+        """Identity stored in a session record (voice only for records from before identities)."""
+        return VoiceIdentity(*cls._traits(record))
+
+    def _index(self, sessions: Dict[str, Dict[str, Any]]):
+        """Replace the in-memory sessions and rebuild the heap and identity counts."""
+        self.sessions = sessions
+        self._heap = [(record.get("last_used", 0), sid) for sid, record in sessions.items()]
+        heapq.heapify(self._heap)
+        self._identities = Counter(self._traits(record) for record in sessions.values())
+        self._saved_last_used = {sid: record.get("last_used", 0) for sid, record in sessions.items()}
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reload from disk if another process wrote the file.
+
+        Args:
+            force: Reload even if the file looks unchanged
+
+        Returns:
+            True if the sessions were reloaded
+        """
+        stamp = self._stamp()
+        if not force and stamp == self._file_stamp:
+            return False
+        self._file_stamp = stamp
+        self._index(self._read())
+        self._dirty.clear()
+        self._removed.clear()
+        self.expire()
+        return True
+
+    def save(self):
+        """Write the sessions atomically (merging records other processes added meanwhile)."""
+        if self._stamp() != self._file_stamp:
+            merged = self._read()
+            for sid in self._removed:
+                merged.pop(sid, None)
+            for sid in self._dirty:
+                if sid in self.sessions:
+                    merged[sid] = self.sessions[sid]
+            self._index(merged)
+
+        document = {
+            "v": self.FORMAT_VERSION,
+            "sessions": {
+                sid: [r["voice"], r.get("created_at", 0), r.get("last_used", 0), r.get("project_name", "Unknown"),
+                      r.get("speed", 1.0), r.get("variant", "neutral"), r.get("earcon")]
+                for sid, r in self.sessions.items()
+            },
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(self.path.parent), prefix=f".{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(document, f, separators=(",", ":"))
+                os.replace(tmp_name, self.path)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            if self.logger:
+                self.logger.log_error("Failed to save session mappings", exception=e)
+            return
+
+        self._file_stamp = self._stamp()
+        self._saved_last_used = {sid: r.get("last_used", 0) for sid, r in self.sessions.items()}
+        self._dirty.clear()
+        self._removed.clear()
+
+    # ---------------- index ----------------
+
+    def _top(self) -> Optional[Tuple[float, str]]:
+        """Heap entry of the least recently used session (stale entries dropped)."""
+        heap = self._heap
+        while heap:
+            last_used, sid = heap[0]
+            record = self.sessions.get(sid)
+            if record is not None and record.get("last_used", 0) == last_used:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _drop(self, session_id: str):
+        record = self.sessions.pop(session_id, None)
+        if record is None:
+            return
+        traits = self._traits(record)
+        self._identities[traits] -= 1
+        if self._identities[traits] <= 0:
+            del self._identities[traits]
+        self._saved_last_used.pop(session_id, None)
+        self._dirty.discard(session_id)
+        self._removed.add(session_id)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Drop sessions idle longer than expiry_seconds (and write if any were).
+
+        Returns:
+            Number of sessions dropped
+        """
+        cutoff = (now if now is not None else time.time()) - self.expiry_seconds
+        expired = 0
+        while True:
+            top = self._top()
+            if top is None or top[0] >= cutoff:
+                break
+            heapq.heappop(self._heap)
+            self._drop(top[1])
+            expired += 1
+        if expired:
+            self.save()
+            if self.logger:
+                self.logger.log_debug(f"Cleaned up {expired} expired sessions")
+        return expired
+
+    def least_recent(self) -> Optional[str]:
+        """Session ID that was used longest ago."""
+        top = self._top()
+        return top[1] if top else None
+
+    def voices_in_use(self) -> set:
+        """Voices assigned to live sessions."""
+        return {traits[0] for traits in self._identities}
+
+    def identities_in_use(self) -> List[VoiceIdentity]:
+        """Distinct identities of live sessions."""
+        return [VoiceIdentity(*traits) for traits in self._identities]
+
+    # ---------------- records ----------------
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Record of a session, or None."""
+        return self.sessions.get(session_id)
+
+    def add(self, session_id: str, identity: VoiceIdentity, project_name: Optional[str] = None):
+        """Register a new session with its identity (written right away)."""
+        now = time.time()
+        if session_id in self.sessions:
+            self._drop(session_id)
+        self.sessions[session_id] = {
+            "voice": identity.voice,
+            "created_at": now,
+            "last_used": now,
+            "project_name": project_name or "Unknown",
+            "speed": identity.speed,
+            "variant": identity.variant,
+            "earcon": identity.earcon,
+        }
+        heapq.heappush(self._heap, (now, session_id))
+        self._identities[self._traits(self.sessions[session_id])] += 1
+        self._removed.discard(session_id)
+        self._dirty.add(session_id)
+        self.save()
+
+    def touch(self, session_id: str, project_name: Optional[str] = None) -> bool:
+        """
+        Mark a session as used now.
+
+        Args:
+            session_id: Existing session
+            project_name: New project name (written right away if it changed)
+
+        Returns:
+            True if the change was written to disk
+        """
+        record = self.sessions.get(session_id)
+        if record is None:
+            return False
+        now = time.time()
+        record["last_used"] = now
+        heapq.heappush(self._heap, (now, session_id))
+        if len(self._heap) > 2 * len(self.sessions) + 16:
+            self._heap = [(r.get("last_used", 0), sid) for sid, r in self.sessions.items()]
+            heapq.heapify(self._heap)
+        self._dirty.add(session_id)
+
+        renamed = bool(project_name) and record.get("project_name") != project_name
+        if renamed:
+            record["project_name"] = project_name
+        if renamed or now - self._saved_last_used.get(session_id, 0) > self.touch_interval:
+            self.save()
+            return True
+        return False
+
+    def remove(self, session_id: str) -> bool:
+        """Forget a session (written right away). Returns True if it existed."""
+        if session_id not in self.sessions:
+            return False
+        self._drop(session_id)
+        self.save()
+        return True
+
+    def clear(self):
+        """Forget every session."""
+        self._removed.update(self.sessions)
+        self._index({})
+        self.save()
 
 
 class SessionVoiceManager:
     """
     Manages unique voice assignments per Claude Code session.
 
-    Each session gets a unique OpenAI TTS voice so users can audibly
-    distinguish between multiple Claude Code instances running in parallel.
+    Each session gets a distinct identity - OpenAI TTS voice, speed,
+    delivery style and earcon (see tts/identity.py) - so users can audibly
+    distinguish between many Claude Code instances running in parallel.
 
     Think of it like having different vocalists for each track on the album!
     """
 
     # Available OpenAI TTS voices - our band of vocalists
     # Organized by gender for alternating assignment
-    FEMALE_VOICES: List[str] = ["nova", "shimmer", "alloy"]  # alloy is neutral but leans feminine
-    MALE_VOICES: List[str] = ["echo", "fable", "onyx"]
+    FEMALE_VOICES: List[str] = list(FEMALE_VOICES)
+    MALE_VOICES: List[str] = list(MALE_VOICES)
     VOICES: List[str] = ["nova", "alloy", "echo", "fable", "onyx", "shimmer"]  # kept for compatibility
 
     def __init__(self, storage_path: Optional[str] = None, logger=None, config: Optional[Dict] = None):
@@ -44,121 +339,102 @@ class SessionVoiceManager:
 
         # Load validated config to get session expiry time
         if config is None:
-            from voice_handler.config import get_voice_config
-            voice_config = get_voice_config()
-            config = voice_config.model_dump()
+            from voice_handler.config import get_voice_settings
+            config = get_voice_settings()
 
         # Get session expiry from validated config (hours → seconds)
-        session_expiry_hours = config["timing"]["session_expiry_hours"]
-        self.SESSION_EXPIRY_SECONDS = session_expiry_hours * 60 * 60
+        timing = config["timing"]
+        session_expiry_hours = timing["session_expiry_hours"]
 
         if storage_path is None:
             from voice_handler.utils.paths import get_paths
             storage_path = get_paths().session_storage
 
         self.storage_path = Path(storage_path)
-        self.sessions: Dict[str, Dict[str, Any]] = self._load_sessions()
+        self.registry = SessionRegistry(
+            self.storage_path,
+            expiry_seconds=session_expiry_hours * 60 * 60,
+            touch_interval=timing.get("session_touch_interval", 60.0),
+            logger=logger,
+        )
+
+        self.configure_identities(config)
 
         if self.logger:
             self.logger.log_debug(
                 f"SessionVoiceManager initialized with {len(self.sessions)} sessions"
             )
 
-    def _load_sessions(self) -> Dict[str, Dict[str, Any]]:
-        """Load existing session mappings from storage."""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    return data.get('sessions', {})
-            except (json.JSONDecodeError, IOError):
-                pass
-        return {}
-
-    def _save_sessions(self):
-        """Save session mappings to storage."""
-        try:
-            with open(self.storage_path, 'w') as f:
-                json.dump({
-                    'sessions': self.sessions,
-                    'updated_at': datetime.now().isoformat()
-                }, f, indent=2)
-        except IOError as e:
-            if self.logger:
-                self.logger.log_error("Failed to save session mappings", exception=e)
-
-    def _cleanup_expired_sessions(self):
-        """Remove expired sessions to free up voices - clearing the old guest list."""
-        current_time = time.time()
-        expired_sessions = []
+    @property
+    def sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Live session records, keyed by session ID."""
+        return self.registry.sessions
 
-        for session_id, data in self.sessions.items():
-            last_used = data.get('last_used', 0)
-            if current_time - last_used > self.SESSION_EXPIRY_SECONDS:
-                expired_sessions.append(session_id)
-
-        if expired_sessions:
-            for session_id in expired_sessions:
-                del self.sessions[session_id]
-            self._save_sessions()
+    @property
+    def session_expiry_seconds(self) -> float:
+        """Idle time after which a session is forgotten (seconds)."""
+        return self.registry.expiry_seconds
 
-            if self.logger:
-                self.logger.log_debug(
-                    f"Cleaned up {len(expired_sessions)} expired sessions"
-                )
+    @session_expiry_seconds.setter
+    def session_expiry_seconds(self, seconds: float):
+        self.registry.expiry_seconds = seconds
 
-    def _get_used_voices(self) -> List[str]:
-        """Get list of voices currently in use by active sessions."""
-        self._cleanup_expired_sessions()
-        return [data['voice'] for data in self.sessions.values()]
+    # Former attribute name, kept for existing callers
+    SESSION_EXPIRY_SECONDS = session_expiry_seconds
 
-    def _get_next_available_voice(self, preferred_voice: Optional[str] = None) -> str:
+    def _get_next_identity(self, preferred_voice: Optional[str] = None) -> VoiceIdentity:
         """
-        Get the next available voice that's not in use.
+        Get the identity that sounds least like every active session.
 
-        Alternates between feminine and masculine voices for variety.
-        Like building a diverse lineup for the concert!
+        Expired sessions are dropped first, so their identities are free again.
 
         Args:
-            preferred_voice: User's preferred voice from config
+            preferred_voice: User's preferred voice from config (used if no session has it)
 
         Returns:
-            Voice name to use
+            Identity for a new session
         """
-        used_voices = self._get_used_voices()
-
-        # If preferred voice is available, use it
-        if preferred_voice and preferred_voice not in used_voices:
-            return preferred_voice
-
-        # Determine what gender to use next (alternate based on session count)
-        session_count = len(self.sessions)
-        use_female = session_count % 2 == 0  # Even sessions = female, odd = male
-
-        # Get available voices of the preferred gender
-        if use_female:
-            primary_voices = [v for v in self.FEMALE_VOICES if v not in used_voices]
-            fallback_voices = [v for v in self.MALE_VOICES if v not in used_voices]
-        else:
-            primary_voices = [v for v in self.MALE_VOICES if v not in used_voices]
-            fallback_voices = [v for v in self.FEMALE_VOICES if v not in used_voices]
-
-        # Try primary gender first, then fallback
-        if primary_voices:
-            return primary_voices[0]
-        elif fallback_voices:
-            return fallback_voices[0]
-
-        # All voices in use - find least recently used session's voice
-        if self.sessions:
-            oldest_session = min(
-                self.sessions.items(),
-                key=lambda x: x[1].get('last_used', 0)
-            )
-            return oldest_session[1]['voice']
+        self.registry.expire()
+        return self.identity_space.assign(self.registry.identities_in_use(), preferred_voice)
+
+    def configure_identities(self, config: Dict):
+        """
+        Build the identity space new sessions are assigned from.
 
-        # Default fallback
-        return preferred_voice or self.FEMALE_VOICES[0]
+        Existing sessions keep their identities.
+
+        Args:
+            config: Validated config dict (voice_settings and tts_settings are used)
+        """
+        from voice_handler.tts.earcons import MOTIFS
+
+        voice_settings = config.get("voice_settings", {})
+        earcons = voice_settings.get("session_earcons", True)
+        self._identity_settings = (voice_settings.get("session_identity", True), len(MOTIFS) if earcons else 0)
+        self._identity_space: Optional[IdentitySpace] = None
+        self._earcon_volume = voice_settings.get("earcon_volume", 0.3)
+        self._tts_settings = config.get("tts_settings", {})
+        self._earcons = None
+
+    @property
+    def identity_space(self) -> IdentitySpace:
+        """Identities new sessions are assigned from (built on first assignment)."""
+        if self._identity_space is None:
+            vary_delivery, earcons = self._identity_settings
+            self._identity_space = IdentitySpace(vary_delivery=vary_delivery, earcons=earcons)
+        return self._identity_space
+
+    def earcon_bank(self):
+        """Rendered earcons, shared through the audio cache (created on first use)."""
+        if self._earcons is None:
+            from voice_handler.tts.audio_cache import AudioCache
+            from voice_handler.tts.earcons import EarconBank
+
+            cache = None
+            if self._tts_settings.get("audio_cache", True):
+                cache = AudioCache(max_bytes=self._tts_settings.get("audio_cache_mb", 50) * 1024 * 1024)
+            self._earcons = EarconBank(cache, volume=self._earcon_volume)
+        return self._earcons
 
     def get_voice_for_session(
         self,
@@ -179,42 +455,73 @@ class SessionVoiceManager:
         """
         if not session_id:
             return preferred_voice or self.VOICES[0]
+        return self.get_identity_for_session(session_id, preferred_voice, project_name).voice
 
-        # Check if session already has a voice
-        if session_id in self.sessions:
-            # Update last used time
-            self.sessions[session_id]['last_used'] = time.time()
+    def get_identity_for_session(
+        self,
+        session_id: str,
+        preferred_voice: Optional[str] = None,
+        project_name: Optional[str] = None
+    ) -> VoiceIdentity:
+        """
+        Get the assigned identity for a session, creating assignment if needed.
+
+        A new session's earcon is rendered into the audio cache right away,
+        so the daemon only has to play it.
+
+        Args:
+            session_id: Claude Code session identifier
+            preferred_voice: User's preferred voice from config
+            project_name: Project name extracted from cwd (for prefix)
 
-            # Update project name if provided and different
-            if project_name and self.sessions[session_id].get('project_name') != project_name:
-                self.sessions[session_id]['project_name'] = project_name
+        Returns:
+            Identity for this session
+        """
+        # Pick up sessions other hooks assigned since we last looked
+        self.registry.refresh()
 
-            self._save_sessions()
+        # Check if session already has a voice
+        record = self.registry.get(session_id)
+        if record is not None:
+            # Update last used time (written only once it drifts past the touch interval)
+            self.registry.touch(session_id, project_name)
 
-            voice = self.sessions[session_id]['voice']
+            identity = self.registry.identity(record)
             if self.logger:
                 self.logger.log_debug(
-                    f"Session {session_id[:8]}... using existing voice: {voice}"
+                    f"Session {session_id[:8]}... using existing voice: {identity.describe()}"
                 )
-            return voice
+            return identity
 
-        # Assign new voice to this session
-        voice = self._get_next_available_voice(preferred_voice)
-        self.sessions[session_id] = {
-            'voice': voice,
-            'created_at': time.time(),
-            'last_used': time.time(),
-            'project_name': project_name or 'Unknown'
-        }
-        self._save_sessions()
+        # Assign new identity to this session
+        identity = self._get_next_identity(preferred_voice)
+        self.registry.add(session_id, identity, project_name)
+        if identity.earcon is not None:
+            self.earcon_bank().prerender(identity.earcon)
 
         if self.logger:
             project_info = f" for project '{project_name}'" if project_name else ""
             self.logger.log_info(
-                f"Session {session_id[:8]}... assigned NEW voice: {voice}{project_info}"
+                f"Session {session_id[:8]}... assigned NEW voice: {identity.describe()}{project_info}"
             )
 
-        return voice
+        return identity
+
+    def get_session_identity(self, session_id: str) -> Optional[VoiceIdentity]:
+        """
+        Get a session's identity without assigning or touching it.
+
+        Args:
+            session_id: Claude Code session identifier
+
+        Returns:
+            The session's identity, or None if session not found
+        """
+        if not session_id:
+            return None
+        self.registry.refresh()
+        record = self.registry.get(session_id)
+        return self.registry.identity(record) if record is not None else None
 
     def get_session_prefix(self, session_id: str) -> Optional[str]:
         """
@@ -226,8 +533,12 @@ class SessionVoiceManager:
         Returns:
             Message prefix string, or None if session not found
         """
-        if session_id and session_id in self.sessions:
-            project_name = self.sessions[session_id].get('project_name')
+        if not session_id:
+            return None
+        self.registry.refresh()
+        record = self.registry.get(session_id)
+        if record is not None:
+            project_name = record.get('project_name')
             if project_name and project_name != 'Unknown':
                 return f"[{project_name}]"
         return None
@@ -239,12 +550,14 @@ class SessionVoiceManager:
         Returns:
             Session info for debugging/display
         """
-        self._cleanup_expired_sessions()
+        self.registry.refresh()
+        self.registry.expire()
 
         info = {}
         for session_id, data in self.sessions.items():
             info[session_id[:8] + '...'] = {
                 'voice': data['voice'],
+                'identity': self.registry.identity(data).describe(),
                 'age_minutes': int((time.time() - data.get('created_at', 0)) / 60)
             }
         return info
@@ -256,17 +569,13 @@ class SessionVoiceManager:
         Args:
             session_id: Session to clear
         """
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-            self._save_sessions()
-
+        if self.registry.remove(session_id):
             if self.logger:
                 self.logger.log_debug(f"Cleared session {session_id[:8]}...")
 
     def clear_all_sessions(self):
         """Clear all session mappings - new tour, all voices available!"""
-        self.sessions = {}
-        self._save_sessions()
+        self.registry.clear()
 
         if self.logger:
             self.logger.log_info("Cleared all session voice mappings")
@@ -0,0 +1,51 @@
+"""
+Broker storage backends - interchangeable engines behind MessageBroker.
+"""
+
+from pathlib import Path
+from typing import Dict, Type
+
+from voice_handler.queue.backends.base import BrokerBackend
+from voice_handler.queue.backends.memory import AsyncioMemoryBackend
+from voice_handler.queue.backends.persist import PERSIST_QUEUE_AVAILABLE, PersistQueueBackend
+from voice_handler.queue.backends.sqlite import SQLiteWALBackend
+
+BACKENDS: Dict[str, Type[BrokerBackend]] = {
+    "persist": PersistQueueBackend,
+    "sqlite": SQLiteWALBackend,
+    "memory": AsyncioMemoryBackend,
+}
+
+
+def create_backend(name: str, queue_path: Path, synchronous: str = "NORMAL") -> BrokerBackend:
+    """
+    Create a broker backend by name.
+
+    Args:
+        name: Backend name ("persist", "sqlite" or "memory")
+        queue_path: Queue directory (ignored by the memory backend)
+        synchronous: SQLite synchronous pragma for disk backends
+
+    Returns:
+        BrokerBackend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the backend's dependency is missing
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown queue backend '{name}', expected one of {sorted(BACKENDS)}")
+    if name == "memory":
+        return AsyncioMemoryBackend()
+    return BACKENDS[name](queue_path, synchronous=synchronous)
+
+
+__all__ = [
+    "BrokerBackend",
+    "PersistQueueBackend",
+    "SQLiteWALBackend",
+    "AsyncioMemoryBackend",
+    "BACKENDS",
+    "PERSIST_QUEUE_AVAILABLE",
+    "create_backend",
+]
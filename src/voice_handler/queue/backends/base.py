@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Broker Backend Interface - The Stage Plot.
+
+Like the stage plot every venue must honor no matter who built the stage,
+this interface defines what a queue backend must provide so MessageBroker
+can swap storage engines without the hooks or the worker noticing.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def message_type_value(message_type: Any) -> Optional[str]:
+    """Normalize a MessageType (or its string value) for filtering."""
+    if message_type is None:
+        return None
+    return getattr(message_type, "value", message_type)
+
+
+class BrokerBackend(ABC):
+    """
+    Abstract base class for message broker storage engines.
+
+    Items are plain message dicts (VoiceMessage.to_dict()). A successful
+    get() claims an item and returns a receipt; the claim is released by
+    ack() (done) or nack() (deliver again, with updated item data).
+
+    Implementers must provide:
+    1. put_many() / get() / ack() / nack() - the delivery contract
+    2. count() / peek() / breakdown() / purge() - introspection
+    3. backend_name / durable - identifiers for logging and callers
+    """
+
+    @property
+    @abstractmethod
+    def backend_name(self) -> str:
+        """Return the name of this backend for logging."""
+        pass
+
+    @property
+    def durable(self) -> bool:
+        """Whether queued items survive a process restart."""
+        return True
+
+    @abstractmethod
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Append items to the queue atomically, in order.
+
+        Args:
+            items: Serialized message dicts
+
+        Raises:
+            Exception: If the items could not be stored
+        """
+        pass
+
+    @abstractmethod
+    def get(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+        Claim the next pending item, waiting up to timeout seconds.
+
+        Args:
+            timeout: Seconds to wait for an item
+
+        Returns:
+            (receipt, item) tuple, or None if nothing arrived in time
+        """
+        pass
+
+    def claim(self, item_id: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+        Claim one specific pending item, out of delivery order.
+
+        Lets the consumer jump an urgent message (found with peek()) ahead
+        of the queue. Backends that can't do this return None.
+
+        Args:
+            item_id: The item's queue "id" as reported by peek()
+
+        Returns:
+            (receipt, item) tuple, or None if the item is no longer pending
+        """
+        return None
+
+    @abstractmethod
+    def ack(self, receipt: Any) -> None:
+        """
+        Mark a claimed item as done.
+
+        Args:
+            receipt: Receipt returned by get()
+        """
+        pass
+
+    @abstractmethod
+    def nack(self, receipt: Any, item: Dict[str, Any]) -> None:
+        """
+        Release a claimed item for redelivery.
+
+        Args:
+            receipt: Receipt returned by get()
+            item: Item data to store (carries updated retry metadata)
+        """
+        pass
+
+    @abstractmethod
+    def count(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        """Count pending (unclaimed) items, optionally filtered."""
+        pass
+
+    @abstractmethod
+    def peek(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        message_type: Any = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List pending items in delivery order without claiming them.
+
+        Returns:
+            Item dicts, each with its queue "id" and "enqueued_at"
+        """
+        pass
+
+    @abstractmethod
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        Summarize the queue.
+
+        Returns:
+            Dict with "pending", "in_flight", "by_type" and "by_session"
+        """
+        pass
+
+    @abstractmethod
+    def purge(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        """
+        Remove pending items, optionally filtered.
+
+        Returns:
+            Number of items removed
+        """
+        pass
+
+    def close(self) -> None:
+        """Release connections and wake any blocked readers."""
+        pass
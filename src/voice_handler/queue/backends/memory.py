@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+In-Process Asyncio Backend - The Monitor Mix.
+
+Messages never leave the process: an asyncio.PriorityQueue of message ids
+ordered like the SQLite backends. Nothing is durable, so it only fits
+callers that produce and consume in the same process (tests, embedded
+use, benchmarks against the disk-backed engines).
+
+It is deliberately not a queue_settings.queue_backend choice: hooks and
+the daemon are separate processes, so a daemon on the memory backend
+would never see a hook's message. Pass backend="memory" to MessageBroker
+directly instead.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from voice_handler.queue.backends.base import BrokerBackend, message_type_value
+
+
+class AsyncioMemoryBackend(BrokerBackend):
+    """
+    asyncio.PriorityQueue-backed storage.
+
+    Features:
+    - Thread-safe sync API, plus get_async() for coroutines on the loop
+    - Runs its own event loop thread unless a loop is supplied
+    - nack() keeps the original delivery position, like SQLiteAckQueue
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            loop: Running event loop to attach to (default: start a private one)
+        """
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._in_flight: Dict[int, Tuple[Dict[str, Any], float]] = {}
+
+        self._owns_loop = loop is None
+        self._thread: Optional[threading.Thread] = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=loop.run_forever,
+                name="VoiceMemoryQueue",
+                daemon=True,
+            )
+            self._thread.start()
+        self.loop = loop
+        self._queue: asyncio.PriorityQueue = asyncio.run_coroutine_threadsafe(
+            self._make_queue(), loop
+        ).result()
+
+    @staticmethod
+    async def _make_queue() -> asyncio.PriorityQueue:
+        """Create the queue on the loop it will be used from."""
+        return asyncio.PriorityQueue()
+
+    @property
+    def backend_name(self) -> str:
+        return "memory"
+
+    @property
+    def durable(self) -> bool:
+        return False
+
+    def _matches(self, item: Dict[str, Any], session_id: Optional[str], message_type: Any) -> bool:
+        """Check an item against optional session/type filters."""
+        if session_id is not None and item.get("session_id") != session_id:
+            return False
+        if message_type is not None and item.get("message_type") != message_type_value(message_type):
+            return False
+        return True
+
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            ids = []
+            for item in items:
+                msg_id = next(self._ids)
+                self._pending[msg_id] = (dict(item), now)
+                ids.append(msg_id)
+        for msg_id in ids:
+            self.loop.call_soon_threadsafe(self._queue.put_nowait, msg_id)
+
+    def _take(self, msg_id: int) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Move an id from pending to in-flight (None if it was purged)."""
+        with self._lock:
+            entry = self._pending.pop(msg_id, None)
+            if entry is None:
+                return None
+            self._in_flight[msg_id] = entry
+            return msg_id, dict(entry[0])
+
+    async def get_async(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        """
+        Claim the next item from a coroutine running on this backend's loop.
+
+        Args:
+            timeout: Seconds to wait for an item
+
+        Returns:
+            (receipt, item) tuple, or None if nothing arrived in time
+        """
+        deadline = self.loop.time() + max(timeout, 0.0)
+        while True:
+            remaining = deadline - self.loop.time()
+            try:
+                if remaining <= 0:
+                    msg_id = self._queue.get_nowait()
+                else:
+                    msg_id = await asyncio.wait_for(self._queue.get(), remaining)
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                return None
+            claimed = self._take(msg_id)
+            if claimed is not None:
+                return claimed
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            # Blocking here would deadlock the loop that serves the queue
+            raise RuntimeError("Use get_async() from the backend's own event loop")
+        future = asyncio.run_coroutine_threadsafe(self.get_async(timeout), self.loop)
+        return future.result()
+
+    def claim(self, item_id: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        # The id stays in the asyncio queue; get_async() skips it once taken
+        return self._take(item_id)
+
+    def ack(self, receipt: Any) -> None:
+        with self._lock:
+            self._in_flight.pop(receipt, None)
+
+    def nack(self, receipt: Any, item: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._in_flight.pop(receipt, None)
+            if entry is None:
+                return
+            self._pending[receipt] = (dict(item), entry[1])
+            # Keep delivery order by id, like the SQLite backends
+            self._pending = OrderedDict(sorted(self._pending.items()))
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, receipt)
+
+    def count(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        with self._lock:
+            if session_id is None and message_type is None:
+                return len(self._pending)
+            return sum(
+                1 for item, _ in self._pending.values()
+                if self._matches(item, session_id, message_type)
+            )
+
+    def peek(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        message_type: Any = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            matched = [
+                (msg_id, item, enqueued_at)
+                for msg_id, (item, enqueued_at) in self._pending.items()
+                if self._matches(item, session_id, message_type)
+            ]
+        messages = []
+        for msg_id, item, enqueued_at in matched[offset:offset + limit]:
+            entry = dict(item)
+            entry["id"] = msg_id
+            entry["enqueued_at"] = enqueued_at
+            messages.append(entry)
+        return messages
+
+    def breakdown(self) -> Dict[str, Any]:
+        by_type: Dict[str, int] = {}
+        by_session: Dict[str, int] = {}
+        with self._lock:
+            for item, _ in self._pending.values():
+                type_key = item.get("message_type") or "unknown"
+                session_key = item.get("session_id") or "none"
+                by_type[type_key] = by_type.get(type_key, 0) + 1
+                by_session[session_key] = by_session.get(session_key, 0) + 1
+            in_flight = len(self._in_flight)
+        return {
+            "pending": sum(by_type.values()),
+            "in_flight": in_flight,
+            "by_type": by_type,
+            "by_session": by_session,
+        }
+
+    def purge(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        # Ids left in the asyncio queue are skipped by _take()
+        with self._lock:
+            doomed = [
+                msg_id for msg_id, (item, _) in self._pending.items()
+                if self._matches(item, session_id, message_type)
+            ]
+            for msg_id in doomed:
+                del self._pending[msg_id]
+        return len(doomed)
+
+    def close(self) -> None:
+        if self._owns_loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            if self._thread is not None:
+                self._thread.join(timeout=2.0)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Persist-Queue Backend - The House PA.
+
+The original SQLite storage built on persist-queue's SQLiteAckQueue,
+with WAL pragmas and indexed metadata columns added alongside the
+pickled payload.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from voice_handler.queue.backends.base import BrokerBackend, message_type_value
+
+# Import persist-queue for SQLite-backed queue
+try:
+    from persistqueue import SQLiteAckQueue
+    from persistqueue.exceptions import Empty
+    from persistqueue.sqlackqueue import AckStatus
+    PERSIST_QUEUE_AVAILABLE = True
+except ImportError:
+    PERSIST_QUEUE_AVAILABLE = False
+
+
+# Indexed metadata columns added alongside persist-queue's pickled payload
+INDEX_COLUMNS = {
+    "message_type": "TEXT",
+    "session_id": "TEXT",
+    "priority": "INTEGER",
+}
+
+
+class PersistQueueBackend(BrokerBackend):
+    """
+    SQLiteAckQueue-backed storage (the default).
+
+    Features:
+    - Survives process crashes and restarts
+    - WAL journal with a configurable synchronous pragma
+    - Indexed message_type/session_id/priority columns for introspection
+    """
+
+    def __init__(self, queue_path: Path, synchronous: str = "NORMAL"):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            queue_path: Directory holding persist-queue's data.db
+            synchronous: SQLite synchronous pragma (OFF, NORMAL, FULL)
+
+        Raises:
+            ImportError: If persist-queue is not installed
+        """
+        if not PERSIST_QUEUE_AVAILABLE:
+            raise ImportError("persist-queue is not installed")
+
+        self.synchronous = synchronous
+        self.queue = SQLiteAckQueue(
+            str(queue_path),
+            multithreading=True,
+            auto_commit=True,
+        )
+        self._apply_pragmas()
+        self._ensure_index_columns()
+
+    @property
+    def backend_name(self) -> str:
+        return "persist"
+
+    def _apply_pragmas(self):
+        """Put both queue connections in WAL mode with the configured synchronous level."""
+        connections = {id(conn): conn for conn in (self.queue._getter, self.queue._putter)}
+        for conn in connections.values():
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute(f"PRAGMA synchronous={self.synchronous};")
+
+    def _ensure_index_columns(self):
+        """
+        Add indexed metadata columns to the persist-queue table (idempotent).
+
+        Pending rows written before the columns existed are backfilled
+        from their payload so filters and breakdowns see them too.
+        """
+        queue = self.queue
+        table = queue._table_name
+        index_prefix = table.strip("`")
+
+        with queue.tran_lock:
+            with queue._putter as conn:
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                added = [name for name in INDEX_COLUMNS if name not in existing]
+                for name in added:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {INDEX_COLUMNS[name]}")
+
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{index_prefix}_status_type "
+                    f"ON {table} (status, message_type)"
+                )
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{index_prefix}_status_session "
+                    f"ON {table} (status, session_id)"
+                )
+
+                if added:
+                    legacy = conn.execute(
+                        f"SELECT _id, data FROM {table} "
+                        f"WHERE status < ? AND message_type IS NULL",
+                        (AckStatus.unack,),
+                    ).fetchall()
+                    for rowid, data in legacy:
+                        item = queue._serializer.loads(data)
+                        conn.execute(
+                            f"UPDATE {table} SET message_type = ?, session_id = ?, priority = ? "
+                            f"WHERE _id = ?",
+                            (item.get("message_type"), item.get("session_id"),
+                             item.get("priority", 5), rowid),
+                        )
+
+    def _pending_filter(self, session_id: Optional[str], message_type: Any) -> tuple:
+        """Build the WHERE clause selecting pending (not yet claimed) rows."""
+        clauses = ["status < ?"]
+        params: List[Any] = [AckStatus.unack]
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if message_type is not None:
+            clauses.append("message_type = ?")
+            params.append(message_type_value(message_type))
+        return " AND ".join(clauses), params
+
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        Insert items in a single SQLite transaction.
+
+        Writes the same row as SQLiteAckQueue.put() plus the indexed
+        metadata columns, with one commit for the whole batch.
+        """
+        queue = self.queue
+        now = time.time()
+        rows = [
+            (
+                queue._serializer.dumps(item),
+                now,
+                item.get("message_type"),
+                item.get("session_id"),
+                item.get("priority", 5),
+            )
+            for item in items
+        ]
+        sql = (
+            f"INSERT INTO {queue._table_name} "
+            f"(data, timestamp, status, message_type, session_id, priority) "
+            f"VALUES (?, ?, {AckStatus.inited}, ?, ?, ?)"
+        )
+        with queue.tran_lock:
+            with queue._putter as conn:
+                conn.executemany(sql, rows)
+        queue.total += len(rows)
+        queue.put_event.set()
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        try:
+            raw = self.queue.get(timeout=timeout, raw=True)
+        except Empty:
+            return None
+        if not raw:
+            return None
+        return raw["pqid"], raw["data"]
+
+    def claim(self, item_id: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        # persist-queue's get(id=...) doesn't check the row is still pending
+        pending = self.queue._getter.execute(
+            f"SELECT 1 FROM {self.queue._table_name} WHERE _id = ? AND status < ?",
+            (item_id, AckStatus.unack),
+        ).fetchone()
+        if pending is None:
+            return None
+        try:
+            raw = self.queue.get(block=False, id=item_id, raw=True)
+        except Empty:
+            return None
+        if not raw:
+            return None
+        return raw["pqid"], raw["data"]
+
+    def ack(self, receipt: Any) -> None:
+        self.queue.ack(id=receipt)
+
+    def nack(self, receipt: Any, item: Dict[str, Any]) -> None:
+        # Persist updated retry metadata before releasing the row
+        self.queue.update(item, id=receipt)
+        self.queue.nack(id=receipt)
+
+    def count(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        where, params = self._pending_filter(session_id, message_type)
+        row = self.queue._getter.execute(
+            f"SELECT COUNT(*) FROM {self.queue._table_name} WHERE {where}", params
+        ).fetchone()
+        return row[0] if row else 0
+
+    def peek(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        message_type: Any = None,
+    ) -> List[Dict[str, Any]]:
+        where, params = self._pending_filter(session_id, message_type)
+        rows = self.queue._getter.execute(
+            f"SELECT _id, data, timestamp FROM {self.queue._table_name} "
+            f"WHERE {where} ORDER BY _id ASC LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+
+        messages = []
+        for rowid, data, enqueued_at in rows:
+            item = dict(self.queue._serializer.loads(data))
+            item["id"] = rowid
+            item["enqueued_at"] = enqueued_at
+            messages.append(item)
+        return messages
+
+    def breakdown(self) -> Dict[str, Any]:
+        table = self.queue._table_name
+        conn = self.queue._getter
+        by_type = conn.execute(
+            f"SELECT message_type, COUNT(*) FROM {table} WHERE status < ? GROUP BY message_type",
+            (AckStatus.unack,),
+        ).fetchall()
+        by_session = conn.execute(
+            f"SELECT session_id, COUNT(*) FROM {table} WHERE status < ? GROUP BY session_id",
+            (AckStatus.unack,),
+        ).fetchall()
+        in_flight = conn.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE status = ?",
+            (AckStatus.unack,),
+        ).fetchone()
+
+        by_type_counts = {(t or "unknown"): n for t, n in by_type}
+        return {
+            "pending": sum(by_type_counts.values()),
+            "in_flight": in_flight[0] if in_flight else 0,
+            "by_type": by_type_counts,
+            "by_session": {(sid or "none"): n for sid, n in by_session},
+        }
+
+    def purge(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        queue = self.queue
+        where, params = self._pending_filter(session_id, message_type)
+        with queue.tran_lock:
+            with queue._putter as conn:
+                removed = conn.execute(
+                    f"DELETE FROM {queue._table_name} WHERE {where}", params
+                ).rowcount
+                if session_id is None and message_type is None:
+                    # Clearing everything also drops acked history
+                    conn.execute(
+                        f"DELETE FROM {queue._table_name} WHERE status IN (?, ?)",
+                        (AckStatus.acked, AckStatus.ack_failed),
+                    )
+        queue.total = queue._count()
+        return removed
+
+    def close(self) -> None:
+        try:
+            self.queue.close()
+        except Exception:
+            pass
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+SQLite WAL Backend - The Bare Wiring.
+
+A dependency-free queue on the standard library's sqlite3: JSON payloads,
+WAL journal, indexed status/type/session columns, and claim leases so a
+crashed consumer's in-flight messages are delivered again.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from voice_handler.queue.backends.base import BrokerBackend, message_type_value
+
+# Row states
+STATUS_PENDING = 0
+STATUS_CLAIMED = 1
+
+DB_FILENAME = "voice_queue.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    message_type TEXT,
+    session_id TEXT,
+    priority INTEGER,
+    enqueued_at REAL NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_status_id ON messages (status, id);
+CREATE INDEX IF NOT EXISTS idx_messages_status_type ON messages (status, message_type);
+CREATE INDEX IF NOT EXISTS idx_messages_status_session ON messages (status, session_id);
+"""
+
+
+class SQLiteWALBackend(BrokerBackend):
+    """
+    Standard-library SQLite queue.
+
+    Features:
+    - No third-party dependency (fallback when persist-queue is missing)
+    - Claims are atomic under BEGIN IMMEDIATE, safe across processes
+    - Claims older than reclaim_after seconds are returned to pending
+    - Acked rows are deleted, so the table only holds live messages
+    """
+
+    def __init__(
+        self,
+        queue_path: Path,
+        synchronous: str = "NORMAL",
+        reclaim_after: float = 300.0,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Open (or create) the queue database.
+
+        Args:
+            queue_path: Directory holding the database file
+            synchronous: SQLite synchronous pragma (OFF, NORMAL, FULL)
+            reclaim_after: Seconds before an unacked claim is redelivered
+            poll_interval: Seconds between polls while waiting in get()
+        """
+        self.queue_path = Path(queue_path)
+        self.queue_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.queue_path / DB_FILENAME
+        self.synchronous = synchronous
+        self.reclaim_after = reclaim_after
+        self.poll_interval = poll_interval
+
+        self._lock = threading.RLock()
+        self._put_event = threading.Event()
+        self._closed = False
+
+        # isolation_level=None: explicit BEGIN/COMMIT only
+        self.conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=10.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute(f"PRAGMA synchronous={synchronous};")
+        with self._lock:
+            self.conn.executescript(SCHEMA)
+
+    @property
+    def backend_name(self) -> str:
+        return "sqlite"
+
+    def _pending_filter(self, session_id: Optional[str], message_type: Any) -> tuple:
+        """Build the WHERE clause selecting pending rows."""
+        clauses = ["status = ?"]
+        params: List[Any] = [STATUS_PENDING]
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if message_type is not None:
+            clauses.append("message_type = ?")
+            params.append(message_type_value(message_type))
+        return " AND ".join(clauses), params
+
+    def put_many(self, items: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        rows = [
+            (
+                json.dumps(item),
+                item.get("message_type"),
+                item.get("session_id"),
+                item.get("priority", 5),
+                now,
+            )
+            for item in items
+        ]
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    "INSERT INTO messages (payload, message_type, session_id, priority, enqueued_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        self._put_event.set()
+
+    def _claim(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Atomically claim the oldest pending row (reclaiming stale leases first)."""
+        now = time.time()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    "UPDATE messages SET status = ?, claimed_at = NULL "
+                    "WHERE status = ? AND claimed_at < ?",
+                    (STATUS_PENDING, STATUS_CLAIMED, now - self.reclaim_after),
+                )
+                row = self.conn.execute(
+                    "SELECT id, payload FROM messages WHERE status = ? ORDER BY id LIMIT 1",
+                    (STATUS_PENDING,),
+                ).fetchone()
+                if row is not None:
+                    self.conn.execute(
+                        "UPDATE messages SET status = ?, claimed_at = ? WHERE id = ?",
+                        (STATUS_CLAIMED, now, row[0]),
+                    )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def get(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while not self._closed:
+            self._put_event.clear()
+            claimed = self._claim()
+            if claimed is not None:
+                return claimed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            # Local puts wake us immediately; other processes are seen on the next poll
+            self._put_event.wait(min(self.poll_interval, remaining))
+        return None
+
+    def claim(self, item_id: Any) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        with self._lock:
+            claimed = self.conn.execute(
+                "UPDATE messages SET status = ?, claimed_at = ? WHERE id = ? AND status = ?",
+                (STATUS_CLAIMED, time.time(), item_id, STATUS_PENDING),
+            ).rowcount
+            if not claimed:
+                return None
+            row = self.conn.execute("SELECT payload FROM messages WHERE id = ?", (item_id,)).fetchone()
+        return item_id, json.loads(row[0])
+
+    def ack(self, receipt: Any) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM messages WHERE id = ?", (receipt,))
+
+    def nack(self, receipt: Any, item: Dict[str, Any]) -> None:
+        with self._lock:
+            self.conn.execute(
+                "UPDATE messages SET status = ?, claimed_at = NULL, payload = ? WHERE id = ?",
+                (STATUS_PENDING, json.dumps(item), receipt),
+            )
+        self._put_event.set()
+
+    def count(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        where, params = self._pending_filter(session_id, message_type)
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT COUNT(*) FROM messages WHERE {where}", params
+            ).fetchone()
+        return row[0] if row else 0
+
+    def peek(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        message_type: Any = None,
+    ) -> List[Dict[str, Any]]:
+        where, params = self._pending_filter(session_id, message_type)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, payload, enqueued_at FROM messages "
+                f"WHERE {where} ORDER BY id ASC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+
+        messages = []
+        for rowid, payload, enqueued_at in rows:
+            item = json.loads(payload)
+            item["id"] = rowid
+            item["enqueued_at"] = enqueued_at
+            messages.append(item)
+        return messages
+
+    def breakdown(self) -> Dict[str, Any]:
+        with self._lock:
+            by_type = self.conn.execute(
+                "SELECT message_type, COUNT(*) FROM messages WHERE status = ? GROUP BY message_type",
+                (STATUS_PENDING,),
+            ).fetchall()
+            by_session = self.conn.execute(
+                "SELECT session_id, COUNT(*) FROM messages WHERE status = ? GROUP BY session_id",
+                (STATUS_PENDING,),
+            ).fetchall()
+            in_flight = self.conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE status = ?",
+                (STATUS_CLAIMED,),
+            ).fetchone()
+
+        by_type_counts = {(t or "unknown"): n for t, n in by_type}
+        return {
+            "pending": sum(by_type_counts.values()),
+            "in_flight": in_flight[0] if in_flight else 0,
+            "by_type": by_type_counts,
+            "by_session": {(sid or "none"): n for sid, n in by_session},
+        }
+
+    def purge(self, session_id: Optional[str] = None, message_type: Any = None) -> int:
+        where, params = self._pending_filter(session_id, message_type)
+        with self._lock:
+            return self.conn.execute(f"DELETE FROM messages WHERE {where}", params).rowcount
+
+    def close(self) -> None:
+        self._closed = True
+        self._put_event.set()
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
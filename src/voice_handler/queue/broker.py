@@ -6,8 +6,15 @@ Like the production manager coordinating roadies, this broker
 manages the flow of voice messages between Claude hooks and
 the TTS worker.
 
-Uses persist-queue with SQLite for reliable, crash-resistant
-message passing that survives process restarts.
+Storage is pluggable (see voice_handler.queue.backends): persist-queue
+with SQLite by default, a dependency-free sqlite3 WAL engine, or an
+in-process asyncio queue. The disk engines run in WAL mode with a
+tunable synchronous pragma, and long-lived producers can group-commit
+bursts of enqueues into one transaction.
+
+Message type, session and priority are stored in indexed columns next
+to the payload, so inspecting or purging the queue is a single SQL
+statement instead of draining it.
 """
 
 import os
@@ -16,16 +23,11 @@ import json
 import time
 import threading
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Optional, Any, Dict
+from dataclasses import dataclass, asdict, field
+from typing import Optional, Any, Dict, Iterable, List, Callable
 from enum import Enum
 
-# Import persist-queue for SQLite-backed queue
-try:
-    from persistqueue import SQLiteAckQueue
-    PERSIST_QUEUE_AVAILABLE = True
-except ImportError:
-    PERSIST_QUEUE_AVAILABLE = False
+from voice_handler.queue.backends.base import BrokerBackend
 
 
 class MessageType(Enum):
@@ -97,29 +99,188 @@ class VoiceMessage:
         )
 
 
+# Allowed values for the SQLite synchronous pragma (WAL mode)
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL")
+
+# Storage engines MessageBroker can be configured with by name. "memory" is
+# in-process only (tests, benchmarks), so config.json offers just the first two
+BACKEND_NAMES = ("persist", "sqlite", "memory")
+
+# Metadata the consumer sets when it settles a message (copied to a digest's parts on nack)
+SETTLE_METADATA = ("retry_count", "last_retry_time", "interrupted")
+
+
+@dataclass
+class _PendingWrite:
+    """An enqueue waiting for the next group commit."""
+    item: Dict[str, Any]
+    done: threading.Event = field(default_factory=threading.Event)
+    ok: bool = False
+
+
+class GroupCommitWriter:
+    """
+    Coalesces concurrent enqueues into shared transactions - the roadie
+    who waits a beat so he can carry three amps in one trip.
+
+    Callers block until their batch is committed, so durability is the
+    same as a single put; only the number of fsyncs goes down.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], None],
+        window: float = 0.005,
+        max_batch: int = 64,
+        logger=None,
+    ):
+        """
+        Initialize the writer and start its flush thread.
+
+        Args:
+            write_batch: Function that persists a list of items in one transaction
+            window: Seconds to wait for more writes after the first one arrives
+            max_batch: Flush immediately once this many writes are pending
+            logger: Optional logger instance
+        """
+        self.write_batch = write_batch
+        self.window = window
+        self.max_batch = max_batch
+        self.logger = logger
+
+        self.batches_committed = 0
+        self.messages_committed = 0
+
+        self._cond = threading.Condition()
+        self._pending: List[_PendingWrite] = []
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="VoiceGroupCommit",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def submit(self, item: Dict[str, Any], timeout: float = 5.0) -> bool:
+        """
+        Queue an item for the next group commit and wait for it.
+
+        On timeout an item still waiting for its batch is withdrawn (it
+        will never be written); one already being written is waited for,
+        so False always means "not in the queue" and a retry can't
+        duplicate the message.
+
+        Args:
+            item: Serialized message dict
+            timeout: Maximum seconds to wait before withdrawing the item
+
+        Returns:
+            bool: True if the item was committed
+        """
+        pending = _PendingWrite(item=item)
+        with self._cond:
+            if self._closed:
+                return False
+            self._pending.append(pending)
+            self._cond.notify()
+
+        if not pending.done.wait(timeout):
+            with self._cond:
+                if pending in self._pending:
+                    self._pending.remove(pending)
+                    return False
+            pending.done.wait()  # Taken into a batch: its outcome decides
+        return pending.ok
+
+    def _flush_loop(self):
+        """Collect pending writes for one window, then commit them together."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return  # Closed and drained
+
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending[:self.max_batch]
+                self._pending = self._pending[self.max_batch:]
+
+            ok = True
+            try:
+                self.write_batch([p.item for p in batch])
+                self.batches_committed += 1
+                self.messages_committed += len(batch)
+            except Exception as e:
+                ok = False
+                if self.logger:
+                    self.logger.log_error("Group commit failed", exception=e)
+
+            for pending in batch:
+                pending.ok = ok
+                pending.done.set()
+
+    def close(self, timeout: float = 2.0):
+        """Flush whatever is pending and stop the flush thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout)
+
+
 class MessageBroker:
     """
     The message broker - like the production desk at a concert.
 
-    Manages a persistent SQLite queue that:
-    - Survives process crashes and restarts
+    Fronts a pluggable storage backend that:
+    - Survives process crashes and restarts (disk backends)
     - Supports acknowledgment-based processing
     - Allows retry of failed messages
     - Handles multiple producers (hooks) and one consumer (TTS worker)
+    - Batches bursts with enqueue_many() or optional group commit
     """
 
     DEFAULT_QUEUE_PATH = None  # Set based on OS
 
-    def __init__(self, queue_path: Optional[str] = None, logger=None):
+    def __init__(
+        self,
+        queue_path: Optional[str] = None,
+        logger=None,
+        synchronous: str = "NORMAL",
+        group_commit: bool = False,
+        group_commit_window: float = 0.005,
+        group_commit_max_batch: int = 64,
+        backend: Any = "persist",
+    ):
         """
         Initialize the message broker.
 
         Args:
-            queue_path: Path to the SQLite queue database
+            queue_path: Path to the queue directory
             logger: Optional logger instance
+            synchronous: SQLite synchronous pragma (OFF, NORMAL, FULL)
+            group_commit: Coalesce concurrent enqueue() calls into shared transactions
+            group_commit_window: Seconds to collect writes before committing
+            group_commit_max_batch: Maximum writes per group commit
+            backend: Backend name ("persist", "sqlite", "memory") or a BrokerBackend
         """
         self.logger = logger
 
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Invalid synchronous mode '{synchronous}', expected one of {SYNCHRONOUS_MODES}"
+            )
+        self.synchronous = synchronous
+
+        if not isinstance(backend, BrokerBackend) and backend not in BACKEND_NAMES:
+            raise ValueError(f"Invalid queue backend '{backend}', expected one of {BACKEND_NAMES}")
+
         # Get queue path from centralized paths module
         if queue_path is None:
             from voice_handler.utils.paths import get_paths
@@ -128,23 +289,52 @@ class MessageBroker:
         self.queue_path = Path(queue_path)
         self.queue_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize the queue
-        self.queue = None
-        if PERSIST_QUEUE_AVAILABLE:
-            try:
-                self.queue = SQLiteAckQueue(
-                    str(self.queue_path),
-                    multithreading=True,
-                    auto_commit=True,
-                )
-                if self.logger:
-                    self.logger.log_info(f"Message broker initialized at {self.queue_path}")
-            except Exception as e:
-                if self.logger:
-                    self.logger.log_error("Failed to initialize queue", exception=e)
+        # Initialize the storage backend
+        self.backend: Optional[BrokerBackend] = None
+        if isinstance(backend, BrokerBackend):
+            self.backend = backend
         else:
+            self.backend = self._open_backend(backend)
+        if self.backend is not None and self.logger:
+            self.logger.log_info(
+                f"Message broker initialized at {self.queue_path} ({self.backend.backend_name})"
+            )
+
+        # Optional group commit for long-lived, multi-threaded producers
+        self._group_writer: Optional[GroupCommitWriter] = None
+        if group_commit and self.backend is not None:
+            self._group_writer = GroupCommitWriter(
+                write_batch=self.backend.put_many,
+                window=group_commit_window,
+                max_batch=group_commit_max_batch,
+                logger=self.logger,
+            )
+
+    def _open_backend(self, name: str) -> Optional[BrokerBackend]:
+        """
+        Open a backend by name.
+
+        If persist-queue is missing, falls back to the standard-library
+        SQLite backend rather than dropping messages.
+        """
+        from voice_handler.queue.backends import PERSIST_QUEUE_AVAILABLE, create_backend
+
+        if name == "persist" and not PERSIST_QUEUE_AVAILABLE:
             if self.logger:
-                self.logger.log_warning("persist-queue not available, using in-memory fallback")
+                self.logger.log_warning("persist-queue not available, using sqlite backend")
+            name = "sqlite"
+
+        try:
+            return create_backend(name, self.queue_path, synchronous=self.synchronous)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error(f"Failed to initialize {name} queue backend", exception=e)
+            return None
+
+    @property
+    def backend_name(self) -> Optional[str]:
+        """Name of the active storage backend (None if unavailable)."""
+        return self.backend.backend_name if self.backend is not None else None
 
     def enqueue(self, message: VoiceMessage) -> bool:
         """
@@ -156,13 +346,19 @@ class MessageBroker:
         Returns:
             bool: True if successful
         """
-        if self.queue is None:
+        if self.backend is None:
             if self.logger:
                 self.logger.log_warning("Queue not available, message dropped")
             return False
 
         try:
-            self.queue.put(message.to_dict())
+            if self._group_writer is not None:
+                if not self._group_writer.submit(message.to_dict()):
+                    if self.logger:
+                        self.logger.log_warning("Group commit did not complete, message dropped")
+                    return False
+            else:
+                self.backend.put_many([message.to_dict()])
             if self.logger:
                 self.logger.log_debug(f"Enqueued message: {message.message_type.value}")
             return True
@@ -171,6 +367,35 @@ class MessageBroker:
                 self.logger.log_error("Failed to enqueue message", exception=e)
             return False
 
+    def enqueue_many(self, messages: Iterable[VoiceMessage]) -> int:
+        """
+        Add several messages to the queue in one transaction.
+
+        Args:
+            messages: The VoiceMessages to enqueue, in order
+
+        Returns:
+            int: Number of messages enqueued (0 on failure)
+        """
+        messages = list(messages)
+        if not messages:
+            return 0
+
+        if self.backend is None:
+            if self.logger:
+                self.logger.log_warning(f"Queue not available, {len(messages)} messages dropped")
+            return 0
+
+        try:
+            self.backend.put_many([message.to_dict() for message in messages])
+            if self.logger:
+                self.logger.log_debug(f"Enqueued batch of {len(messages)} messages")
+            return len(messages)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Failed to enqueue message batch", exception=e)
+            return 0
+
     def dequeue(self, timeout: float = 1.0) -> Optional[VoiceMessage]:
         """
         Get the next message from the queue.
@@ -181,37 +406,60 @@ class MessageBroker:
         Returns:
             VoiceMessage or None if queue is empty
         """
-        if self.queue is None:
+        if self.backend is None:
             return None
 
         try:
-            # Non-blocking get with timeout
-            raw_item = self.queue.get(timeout=timeout)
-            if raw_item:
-                message = VoiceMessage.from_dict(raw_item)
-                # Store raw item for ack/nack - SQLiteAckQueue needs the original
-                message._raw_item = raw_item
+            claimed = self.backend.get(timeout)
+            if claimed:
+                receipt, item = claimed
+                message = VoiceMessage.from_dict(item)
+                # Keep the backend receipt for ack/nack
+                message._receipt = receipt
                 return message
             return None
         except Exception:
             # Queue is empty or timeout
             return None
 
+    def claim(self, item_id: Any) -> Optional[VoiceMessage]:
+        """
+        Claim a specific pending message ahead of delivery order.
+
+        Args:
+            item_id: Queue "id" of a message returned by peek()
+
+        Returns:
+            VoiceMessage, or None if it was already taken (or unsupported)
+        """
+        if self.backend is None:
+            return None
+        try:
+            claimed = self.backend.claim(item_id)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug(f"Could not claim message {item_id}: {e}")
+            return None
+        if not claimed:
+            return None
+        receipt, item = claimed
+        message = VoiceMessage.from_dict(item)
+        message._receipt = receipt
+        return message
+
     def ack(self, message: VoiceMessage):
         """
         Acknowledge successful processing of a message.
 
         Args:
-            message: The message that was processed
+            message: The message that was processed (a digest acks its parts)
         """
-        if self.queue is not None:
+        for part in getattr(message, '_parts', ()):
+            self.ack(part)
+        receipt = getattr(message, '_receipt', None)
+        if self.backend is not None and receipt is not None:
             try:
-                # Use the raw item from dequeue for proper ack
-                raw_item = getattr(message, '_raw_item', None)
-                if raw_item:
-                    self.queue.ack(raw_item)
-                else:
-                    self.queue.ack(message.to_dict())
+                self.backend.ack(receipt)
             except Exception:
                 pass  # Already acked or not in queue
 
@@ -220,40 +468,120 @@ class MessageBroker:
         Negative acknowledge - mark for retry.
 
         Args:
-            message: The message to retry
+            message: The message to retry (a digest puts its parts back)
         """
-        if self.queue is not None:
+        for part in getattr(message, '_parts', ()):
+            # Parts carry the digest's retry and interruption state, so backoff,
+            # max_retries and requeue-once still apply to each of them
+            for key in SETTLE_METADATA:
+                if key in message.metadata:
+                    part.metadata[key] = message.metadata[key]
+            self.nack(part)
+        receipt = getattr(message, '_receipt', None)
+        if self.backend is not None and receipt is not None:
             try:
-                # Use the raw item from dequeue for proper nack
-                raw_item = getattr(message, '_raw_item', None)
-                if raw_item:
-                    # CRITICAL: Update raw item with current metadata
-                    raw_item['metadata'] = message.metadata
-                    self.queue.nack(raw_item)
-                else:
-                    self.queue.nack(message.to_dict())
+                # Store current metadata so retry counts survive redelivery
+                self.backend.nack(receipt, message.to_dict())
             except Exception:
                 pass
 
-    def size(self) -> int:
-        """Get the current queue size."""
-        if self.queue is not None:
-            try:
-                return self.queue.size
-            except Exception:
-                return 0
-        return 0
+    def size(
+        self,
+        session_id: Optional[str] = None,
+        message_type: Optional[Any] = None,
+    ) -> int:
+        """
+        Count pending messages with an indexed query.
 
-    def clear(self):
-        """Clear all messages from the queue."""
-        if self.queue is not None:
-            try:
-                while self.queue.size > 0:
-                    item = self.queue.get(timeout=0.1)
-                    if item:
-                        self.queue.ack(item)
-            except Exception:
-                pass
+        Unlike persist-queue's in-process counter, this is accurate
+        across processes (hooks, daemon, control panel).
+
+        Args:
+            session_id: Only count messages from this session
+            message_type: Only count messages of this MessageType (or value)
+
+        Returns:
+            int: Number of pending messages
+        """
+        if self.backend is None:
+            return 0
+        try:
+            return self.backend.count(session_id, message_type)
+        except Exception:
+            return 0
+
+    def peek(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        session_id: Optional[str] = None,
+        message_type: Optional[Any] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List pending messages in delivery order without claiming them.
+
+        Args:
+            limit: Maximum messages to return
+            offset: Number of pending messages to skip (for pagination)
+            session_id: Only list messages from this session
+            message_type: Only list messages of this MessageType (or value)
+
+        Returns:
+            List of message dicts, each with its queue "id" and "enqueued_at"
+        """
+        if self.backend is None:
+            return []
+        try:
+            return self.backend.peek(limit, offset, session_id, message_type)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Failed to peek queue", exception=e)
+            return []
+
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        Summarize the queue by message type and session from indexed columns.
+
+        Returns:
+            Dict with pending/in-flight totals and per-type/per-session counts
+        """
+        summary: Dict[str, Any] = {"pending": 0, "in_flight": 0, "by_type": {}, "by_session": {}}
+        if self.backend is None:
+            return summary
+        try:
+            return self.backend.breakdown()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Failed to summarize queue", exception=e)
+            return summary
+
+    def clear(
+        self,
+        session_id: Optional[str] = None,
+        message_type: Optional[Any] = None,
+    ) -> int:
+        """
+        Purge pending messages in a single statement.
+
+        Messages already claimed by the consumer are left alone so the
+        current utterance can still be acked. Acked history is dropped
+        too when clearing everything.
+
+        Args:
+            session_id: Only purge messages from this session
+            message_type: Only purge messages of this MessageType (or value)
+
+        Returns:
+            int: Number of pending messages removed
+        """
+        if self.backend is None:
+            return 0
+        try:
+            return self.backend.purge(session_id, message_type)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Failed to clear queue", exception=e)
+            return 0
 
     def send_shutdown(self):
         """Send a shutdown signal to the consumer."""
@@ -264,14 +592,39 @@ class MessageBroker:
         )
         self.enqueue(shutdown_msg)
 
+    def close(self):
+        """Flush any pending group commit and close the backend."""
+        if self._group_writer is not None:
+            self._group_writer.close()
+            self._group_writer = None
+        if self.backend is not None:
+            try:
+                self.backend.close()
+            except Exception:
+                pass
 
 # Singleton broker instance
 _broker_instance: Optional[MessageBroker] = None
 _broker_lock = threading.Lock()
 
 
+def _configured_queue_settings() -> tuple:
+    """Read (backend, synchronous) from config.json, falling back to defaults."""
+    try:
+        from voice_handler.config import get_voice_settings
+        settings = get_voice_settings()["queue_settings"]
+        return settings["queue_backend"], settings["sqlite_synchronous"]
+    except Exception:
+        return "persist", "NORMAL"
+
+
 def get_broker(logger=None) -> MessageBroker:
-    """Get or create the message broker singleton (thread-safe)."""
+    """
+    Get or create the message broker singleton (thread-safe).
+
+    Hooks and the daemon are separate processes, so both open the
+    backend named in queue_settings.queue_backend.
+    """
     global _broker_instance
     # First check (fast path - no lock)
     if _broker_instance is None:
@@ -279,5 +632,17 @@ def get_broker(logger=None) -> MessageBroker:
         with _broker_lock:
             # Double-check after acquiring lock
             if _broker_instance is None:
-                _broker_instance = MessageBroker(logger=logger)
+                backend, synchronous = _configured_queue_settings()
+                _broker_instance = MessageBroker(
+                    logger=logger,
+                    synchronous=synchronous,
+                    backend=backend,
+                )
     return _broker_instance
+
+
+def set_broker(broker: Optional[MessageBroker]):
+    """Install a preconfigured broker as the singleton (e.g. the daemon's)."""
+    global _broker_instance
+    with _broker_lock:
+        _broker_instance = broker
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Config Reload - Changing the Setlist Mid-Show.
+
+The worker daemon used to play the whole night with the config it
+started with: a PUT /api/config only reloaded the API process, and
+restarting the daemon cuts off the message being spoken. Now a
+ConfigWatcher polls the config snapshot's source key (a few stat()
+calls, see config_snapshot.py). When config.json or .env changes it
+rebuilds and validates the snapshot and hands the new settings to the
+daemon's listeners, which swap them into the TTS provider chain, the
+consumer's timing and the LLM keep-alive without stopping. Queued
+messages stay in the broker throughout. Variables removed from .env are
+removed from the daemon's environment too.
+
+An edit that fails validation is rejected and the running config stays
+in place. Settings only read when the daemon starts (queue backend,
+SQLite pragmas, the runtime, LLM workers) are reported as needing a
+restart.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from voice_handler import config_snapshot
+
+# Settings only read at daemon start: a change is logged as needing a restart
+RESTART_REQUIRED = (
+    "queue_settings.queue_backend",
+    "queue_settings.sqlite_synchronous",
+    "queue_settings.group_commit",
+    "queue_settings.group_commit_window_ms",
+    "queue_settings.group_commit_max_batch",
+    "queue_settings.runtime",
+    "queue_settings.render_ahead",
+    "env.LLM_PROVIDER",
+    "env.OLLAMA_HOST",
+    "env.OLLAMA_MODEL",
+    "env.QWEN_WORKERS",
+    "env.QWEN_WORKER_COMMAND",
+    "env.QWEN_WORKER_MAX_REQUESTS",
+    "env.LOG_MODE_DAEMON",
+    "env.LOG_MAX_MB",
+    "env.LOG_MAX_AGE_HOURS",
+    "env.LOG_BACKUPS",
+    "env.EVENT_RETENTION_DAYS",
+)
+
+
+def changed_settings(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """
+    Names of the settings that differ between two configs.
+
+    Args:
+        old: Previous settings (VoiceConfig.model_dump() shape)
+        new: New settings
+
+    Returns:
+        Sorted names: "section.field" inside sections, or the top-level
+        name for lists
+    """
+    changed = []
+    for section in sorted(set(old) | set(new)):
+        before, after = old.get(section), new.get(section)
+        if before == after:
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            for name in sorted(set(before) | set(after)):
+                if before.get(name) != after.get(name):
+                    changed.append(f"{section}.{name}")
+        else:
+            changed.append(section)
+    return changed
+
+
+class ConfigWatcher:
+    """
+    Background thread that applies config.json/.env changes to a running daemon.
+
+    Listeners are called with (settings, changed) on the watcher thread,
+    where settings is the new validated config and changed the names
+    from changed_settings() (.env variables as "env.NAME").
+    """
+
+    def __init__(self, settings: Dict[str, Any], interval: float = 2.0, logger=None, metrics=None):
+        """
+        Initialize the watcher.
+
+        Args:
+            settings: Config the daemon is running with (VoiceConfig.model_dump())
+            interval: Seconds between checks (0: never check)
+            logger: Optional logger instance
+            metrics: Optional DaemonMetrics registry (reload counters and latency)
+        """
+        self.settings = settings
+        self.interval = interval
+        self.logger = logger
+        self.metrics = metrics
+        self.reloads = 0
+        self.failures = 0
+        self._listeners: List[Callable[[Dict[str, Any], List[str]], None]] = []
+        self._key = config_snapshot.source_key()
+        self._env = dict(config_snapshot.get_snapshot()["env"])
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[Dict[str, Any], List[str]], None]):
+        """Register a callback that swaps new settings into a component."""
+        self._listeners.append(listener)
+
+    def check(self) -> bool:
+        """
+        Apply the config if its source files changed since the last check.
+
+        Returns:
+            True if new settings were applied
+        """
+        key = config_snapshot.source_key()
+        if key == self._key:
+            return False
+        self._key = key
+
+        started = time.perf_counter()
+        snapshot = config_snapshot.get_snapshot(refresh=True, logger=self.logger)
+        if not snapshot["valid"]:
+            self._failed(f"{snapshot['config_path']} failed validation, keeping the running config")
+            return False
+
+        settings = snapshot["voice_config"]
+        env = snapshot["env"]
+        changed = changed_settings(self.settings, settings)
+        changed += [f"env.{name}" for name in sorted(set(self._env) | set(env)) if self._env.get(name) != env.get(name)]
+        if not changed:
+            return False  # Touched or rewritten with the same values
+
+        from voice_handler.config import reload_config, reload_voice_config
+
+        config_snapshot.apply_env(snapshot, previous=self._env)
+        reload_config()
+        reload_voice_config()
+
+        errors = 0
+        for listener in self._listeners:
+            try:
+                listener(settings, changed)
+            except Exception as e:
+                errors += 1
+                if self.logger:
+                    self.logger.log_error("Failed to apply reloaded config", exception=e)
+
+        self.settings = settings
+        self._env = dict(env)
+        elapsed = time.perf_counter() - started
+        if errors:
+            self._failed(f"{errors} component(s) kept their previous settings")
+        else:
+            self.reloads += 1
+            if self.metrics:
+                self.metrics.inc("config_reloads")
+        if self.metrics:
+            self.metrics.observe("config_reload_seconds", elapsed)
+
+        if self.logger:
+            self.logger.log_info(f"Config reloaded in {elapsed * 1000:.1f}ms - new setlist: {', '.join(changed)}")
+            restart = [name for name in changed if name in RESTART_REQUIRED]
+            if restart:
+                self.logger.log_warning(f"Restart the daemon to apply: {', '.join(restart)}")
+
+        interval = settings["queue_settings"]["config_reload_interval"]
+        if interval <= 0:
+            self._stop.set()
+        else:
+            self.interval = interval
+        return True
+
+    def _failed(self, reason: str):
+        self.failures += 1
+        if self.metrics:
+            self.metrics.inc("config_reload_failures")
+        if self.logger:
+            self.logger.log_error(f"Config reload failed: {reason}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self._failed(str(e))
+
+    def start(self):
+        """Start checking in a background thread (no-op with interval 0)."""
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="VoiceConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
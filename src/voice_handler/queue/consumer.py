@@ -8,11 +8,23 @@ and sends them to the TTS provider.
 
 Runs as a daemon thread, continuously processing
 messages without blocking the main application.
+
+With a playback controller attached, a watcher thread lets urgent
+messages (approvals, errors) cut in: the message being spoken is faded
+out, cut or has its remaining chunks skipped, and the urgent one is
+claimed out of queue order and spoken next.
+
+With an event store attached, every dequeue, speech start and outcome
+(spoken, retry, interrupted, dropped) is recorded as a structured event.
+
+With a SessionMixer attached (see mixer.py), messages are taken from
+the queue in fair turns across sessions, and a large backlog is spoken
+as digests.
 """
 
 import time
 import threading
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 from queue import PriorityQueue
 
 from voice_handler.queue.broker import (
@@ -21,6 +33,10 @@ from voice_handler.queue.broker import (
     MessageType,
     get_broker,
 )
+from voice_handler.utils import tracing
+
+# Pending messages scanned for an urgent one while speaking
+PREEMPT_SCAN_LIMIT = 50
 
 
 class QueueConsumer:
@@ -33,6 +49,7 @@ class QueueConsumer:
     - Automatic retry on failure
     - Graceful shutdown handling
     - Rate limiting to prevent speech overlap
+    - Preemption of low-priority speech by urgent messages
     """
 
     def __init__(
@@ -43,6 +60,17 @@ class QueueConsumer:
         min_speech_delay: float = 1.0,
         max_retries: int = 3,
         retry_backoff_base: float = 0.5,
+        metrics=None,
+        trace_ring=None,
+        prepare_callback: Optional[Callable[[str, str, Optional[str]], None]] = None,
+        prefetch_depth: int = 2,
+        playback_controller=None,
+        preempt_priority: Optional[int] = None,
+        preempt_mode: str = "fade",
+        preempt_poll_interval: float = 0.1,
+        requeue_interrupted: bool = False,
+        event_store=None,
+        mixer=None,
     ):
         """
         Initialize the consumer.
@@ -54,42 +82,245 @@ class QueueConsumer:
             min_speech_delay: Minimum delay between speeches
             max_retries: Maximum number of retry attempts
             retry_backoff_base: Base delay for exponential backoff
+            metrics: Optional DaemonMetrics registry
+            trace_ring: Optional TraceRing where finished traces are recorded
+            prepare_callback: Non-blocking (text, voice, session_id) hook that
+                lets TTS prepare a message (e.g. compress it) ahead of speech
+            prefetch_depth: Pending messages prepared while one is spoken
+            playback_controller: PlaybackController used to interrupt speech
+                (reset before each message, interrupted by the watcher)
+            preempt_priority: Pending messages at or above this priority (and
+                above the current one's) interrupt speech; None disables it
+            preempt_mode: How to interrupt: "fade", "cut" or "skip"
+            preempt_poll_interval: Seconds between queue checks while speaking
+            requeue_interrupted: Put interrupted messages back in the queue
+                (once) instead of dropping them
+            event_store: Optional EventStore where stage events are recorded
+            mixer: Optional SessionMixer that picks the next message across sessions
         """
         self.logger = logger
+        self.metrics = metrics
+        self.trace_ring = trace_ring
+        self.event_store = event_store
+        self.mixer = mixer
         self.broker = broker or get_broker(logger=logger)
         self.speak_callback = speak_callback
+        self.prepare_callback = prepare_callback
+        self.prefetch_depth = prefetch_depth
         self.min_speech_delay = min_speech_delay
         self.max_retries = max_retries
         self.retry_backoff_base = retry_backoff_base
+        self.playback_controller = playback_controller
+        self.preempt_priority = preempt_priority
+        self.preempt_mode = preempt_mode
+        self.preempt_poll_interval = preempt_poll_interval
+        self.requeue_interrupted = requeue_interrupted
 
         # Thread control
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._last_speech_time = 0.0
+        # Message being spoken (lets the speak callback read priority/deadline)
+        self.current_message: Optional[VoiceMessage] = None
+
+        # Preemption: queue id of the urgent message that interrupted the current one
+        # (or the message itself, if the async runtime had already read it ahead)
+        self._speaking_lock = threading.Lock()
+        self._preempted_by = None
+        self._watcher: Optional[threading.Thread] = None
+        # Messages dequeued but not yet playing (set by the async runtime)
+        self.read_ahead: Optional[Callable[[], List[VoiceMessage]]] = None
 
         # Priority queue for ordering messages
         self._priority_queue = PriorityQueue()
 
+    # Settings configure() may change on a running consumer (constructor argument names)
+    RELOADABLE = (
+        "min_speech_delay",
+        "max_retries",
+        "retry_backoff_base",
+        "prefetch_depth",
+        "preempt_priority",
+        "preempt_mode",
+        "preempt_poll_interval",
+        "requeue_interrupted",
+    )
+
+    def configure(self, **settings):
+        """
+        Change timing, retry and preemption settings while the consumer runs.
+
+        Each setting is read once per message, so the next message uses the
+        new values; queued messages and the one being spoken are untouched.
+        Enabling preemption starts the watcher.
+
+        Args:
+            **settings: Any of RELOADABLE
+
+        Raises:
+            ValueError: For a setting that can't be changed while running
+        """
+        unknown = set(settings) - set(self.RELOADABLE)
+        if unknown:
+            raise ValueError(f"Consumer settings not reloadable: {', '.join(sorted(unknown))}")
+        for name, value in settings.items():
+            setattr(self, name, value)
+        if self._running:
+            self.start_watcher()
+
     def set_speak_callback(self, callback: Callable[[str, str], None]):
         """Set the TTS callback function."""
         self.speak_callback = callback
 
-    def _process_message(self, message: VoiceMessage) -> tuple:
+    def set_prepare_callback(self, callback: Callable[[str, str, Optional[str]], None]):
+        """Set the TTS prepare (prefetch) callback."""
+        self.prepare_callback = callback
+
+    def next_message(self, timeout: float = 1.0) -> Optional[VoiceMessage]:
+        """
+        Get the next message to speak: from the mixer if set, else in queue order.
+
+        Args:
+            timeout: How long to wait for a message
+
+        Returns:
+            VoiceMessage or None if the queue is empty
+        """
+        mixer = self.mixer  # read once: a reload may swap it
+        if mixer is not None:
+            try:
+                return mixer.next(timeout)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_warning(f"Mixer failed, taking the queue in order: {e}")
+        return self.broker.dequeue(timeout=timeout)
+
+    def set_playback_controller(self, controller):
+        """Set the PlaybackController used for preemption."""
+        self.playback_controller = controller
+
+    def _find_urgent(self, current: VoiceMessage) -> Optional[dict]:
+        """
+        First pending message urgent enough to interrupt the current one.
+
+        Looks at the broker, then at the messages the async runtime has
+        already read ahead (returned as {"message": ..., "priority", "text"}).
+        """
+        preempt_priority = self.preempt_priority
+        if preempt_priority is None:
+            return None  # Disabled by a config reload while the watcher runs
+        threshold = max(preempt_priority, current.priority + 1)
+        for item in self.broker.peek(limit=PREEMPT_SCAN_LIMIT):
+            if item.get("message_type") == MessageType.SHUTDOWN.value:
+                continue
+            if item.get("priority", 5) >= threshold:
+                return item
+        read_ahead = self.read_ahead
+        for message in read_ahead() if read_ahead is not None else ():
+            if message.message_type != MessageType.SHUTDOWN and message.priority >= threshold:
+                return {"message": message, "priority": message.priority, "text": message.text}
+        return None
+
+    def _watch_for_urgent(self):
+        """Watcher loop: interrupt the current message when an urgent one is queued."""
+        while self._running:
+            time.sleep(self.preempt_poll_interval)
+            current = self.current_message
+            if current is None or self._preempted_by is not None:
+                continue
+            try:
+                urgent = self._find_urgent(current)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_debug(f"Preemption check failed: {e}")
+                continue
+            if urgent is None:
+                continue
+            with self._speaking_lock:
+                # The message may have finished while we were looking
+                if self.current_message is not current or self._preempted_by is not None:
+                    continue
+                self._preempted_by = urgent["message"] if "message" in urgent else urgent["id"]
+                self.playback_controller.interrupt(self.preempt_mode)
+            if self.metrics:
+                self.metrics.inc("messages_interrupted")
+            if self.logger:
+                self.logger.log_info(
+                    f"Interrupting priority {current.priority} speech ({self.preempt_mode}) "
+                    f"for priority {urgent.get('priority')}: {urgent.get('text', '')[:50]}..."
+                )
+
+    def _claim_preempting(self) -> Optional[VoiceMessage]:
+        """
+        Claim the urgent message that interrupted the last one, if any.
+
+        A message the async runtime had read ahead is returned as is (it
+        is already claimed); the runtime takes it out of its playlist.
+        """
+        item, self._preempted_by = self._preempted_by, None
+        if item is None:
+            return None
+        message = item if isinstance(item, VoiceMessage) else self.broker.claim(item)
+        if message is not None:
+            # Urgent speech goes out as soon as it is synthesized
+            self._last_speech_time = 0.0
+        return message
+
+    def _handle_interrupted(self, message: VoiceMessage, trace: Optional[tracing.Trace]):
+        """Drop an interrupted message, or put it back in the queue once."""
+        if self.requeue_interrupted and not message.metadata.get("interrupted"):
+            message.metadata["interrupted"] = True
+            self._record_event(message, trace, "interrupted", status="requeued")
+            self._finish_trace(message, trace, done=False)
+            self.broker.nack(message)
+            if self.logger:
+                self.logger.log_info(f"Requeued interrupted message: {message.text[:50]}...")
+        else:
+            self.broker.ack(message)
+            self._record_event(message, trace, "interrupted", status="dropped")
+            self._finish_trace(message, trace, done=True)
+
+    def _prepare_ahead(self, message: VoiceMessage):
+        """
+        Let TTS start preparing this message and the next pending ones.
+
+        Runs before the speech-spacing delay, so compression overlaps with
+        the pause and with playback of the current message.
+        """
+        if not self.prepare_callback:
+            return
+        upcoming = [(message.text, message.voice, message.session_id)]
+        if self.prefetch_depth > 0:
+            for item in self.broker.peek(limit=self.prefetch_depth):
+                if item.get("message_type") != MessageType.SHUTDOWN.value and item.get("text"):
+                    upcoming.append((item["text"], item.get("voice"), item.get("session_id")))
+        for text, voice, session_id in upcoming:
+            try:
+                self.prepare_callback(text, voice, session_id)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_debug(f"Prepare callback failed: {e}")
+
+    def _process_message(self, message: VoiceMessage, speak: Optional[Callable] = None) -> tuple:
         """
         Process a single message.
 
         Args:
             message: The message to process
+            speak: Speak function for this message (default: speak_callback)
 
         Returns:
             tuple[bool, str]: (success, reason)
         """
-        if not self.speak_callback:
+        speak = speak or self.speak_callback
+        if not speak:
             if self.logger:
                 self.logger.log_warning("No speak callback set, skipping message")
             return False, "no_callback"
 
         try:
+            self._prepare_ahead(message)
+
             # Enforce minimum delay between speeches
             now = time.time()
             time_since_last = now - self._last_speech_time
@@ -98,9 +329,23 @@ class QueueConsumer:
 
             # Call the TTS provider with session_id for per-session prefix
             session_id = getattr(message, 'session_id', None)
-            self.speak_callback(message.text, message.voice, session_id)
+            if self.metrics:
+                self.metrics.begin_utterance()
+            with self._speaking_lock:
+                if self.playback_controller is not None:
+                    self.playback_controller.reset()
+                self.current_message = message
+            self._record_event(message, tracing.current_trace(), "speaking")
+            try:
+                speak(message.text, message.voice, session_id)
+            finally:
+                with self._speaking_lock:
+                    self.current_message = None
             self._last_speech_time = time.time()
 
+            if self._preempted_by is not None:
+                return False, "interrupted"
+
             if self.logger:
                 self.logger.log_debug(f"Spoke: {message.text[:50]}...")
 
@@ -111,6 +356,63 @@ class QueueConsumer:
                 self.logger.log_error("Error processing message", exception=e)
             return False, "exception"
 
+    def _finish_trace(self, message: VoiceMessage, trace: Optional[tracing.Trace], done: bool):
+        """Record a finished trace, or carry its spans forward for a retry."""
+        tracing.activate(None)
+        if trace is None:
+            return
+        if not done:
+            message.metadata[tracing.METADATA_KEY] = trace.to_metadata()
+            return
+        if self.trace_ring is not None:
+            try:
+                self.trace_ring.record(trace)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_debug(f"Could not record trace: {e}")
+
+    def _record_event(
+        self,
+        message: VoiceMessage,
+        trace: Optional[tracing.Trace],
+        stage: str,
+        status: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+    ):
+        """
+        Record a stage event for a message (no-op without an event store).
+
+        Args:
+            message: The message
+            trace: Its trace (gives hook, tool and message id), if any
+            stage: Event stage
+            status: Outcome detail
+            latency_ms: Stage latency (default: since the hook started)
+        """
+        if self.event_store is None:
+            return
+        if latency_ms is None:
+            start = min(trace.spans.values()) if trace is not None and trace.spans else message.timestamp
+            latency_ms = (time.time() - start) * 1000
+        try:
+            self.event_store.record(
+                stage,
+                session_id=message.session_id,
+                hook=trace.label if trace is not None else None,
+                tool=trace.tool if trace is not None else None,
+                message_id=trace.trace_id if trace is not None else None,
+                status=status,
+                latency_ms=round(latency_ms, 2),
+                detail={
+                    "text": message.text[:80],
+                    "priority": message.priority,
+                    "retry_count": message.metadata.get("retry_count", 0),
+                },
+            )
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug(f"Could not record event: {e}")
+
     def _calculate_backoff_delay(self, retry_count: int) -> float:
         """Calculate exponential backoff delay."""
         if retry_count == 0:
@@ -161,6 +463,68 @@ class QueueConsumer:
 
         return elapsed < effective_backoff
 
+    def _begin(self, message: VoiceMessage) -> Optional[tracing.Trace]:
+        """
+        Start handling a dequeued message: resume its trace, record queue wait.
+
+        Returns:
+            The message's trace (not activated - the caller activates it on
+            the thread that speaks), or None
+        """
+        trace = tracing.Trace.from_metadata(message.metadata)
+        if trace is not None:
+            trace.mark("dequeued")
+        queued_since = message.metadata.get('last_retry_time') or message.timestamp
+        queue_wait = max(0.0, time.time() - queued_since)
+        if self.metrics and message.metadata.get('retry_count', 0) == 0:
+            self.metrics.observe("queue_wait_seconds", queue_wait)
+        self._record_event(message, trace, "dequeued", latency_ms=queue_wait * 1000)
+        return trace
+
+    def _settle(self, message: VoiceMessage, trace: Optional[tracing.Trace], success: bool, reason: str):
+        """Ack, retry or drop a processed message."""
+        retry_count = message.metadata.get('retry_count', 0)
+
+        if reason == "interrupted":
+            self._handle_interrupted(message, trace)
+        elif success:
+            # Success - acknowledge and remove from queue
+            self.broker.ack(message)
+            self._record_event(message, trace, "spoken", status="ok")
+            self._finish_trace(message, trace, done=True)
+            if self.metrics:
+                self.metrics.inc("messages_processed")
+        else:
+            # Failure - determine if should retry
+            if self.metrics:
+                self.metrics.inc("messages_failed")
+            if self._should_retry(message, reason):
+                # Update retry metadata
+                message.metadata['retry_count'] = retry_count + 1
+                message.metadata['last_retry_time'] = time.time()
+                self._record_event(message, trace, "retry", status=reason)
+                self._finish_trace(message, trace, done=False)
+
+                # Nack to put back in queue for retry
+                self.broker.nack(message)
+
+                if self.logger:
+                    self.logger.log_warning(
+                        f"Message failed (retry #{retry_count + 1}/{self.max_retries}): {message.text[:50]}..."
+                    )
+            else:
+                # Don't retry - ack to remove from queue
+                self.broker.ack(message)
+                self._record_event(message, trace, "dropped", status=reason)
+                self._finish_trace(message, trace, done=True)
+                if self.metrics:
+                    self.metrics.inc("messages_expired")
+
+                if self.logger:
+                    self.logger.log_error(
+                        f"Message dropped (reason: {reason}): {message.text[:50]}..."
+                    )
+
     def _consumer_loop(self):
         """Main consumer loop - runs in daemon thread."""
         if self.logger:
@@ -168,8 +532,9 @@ class QueueConsumer:
 
         while self._running:
             try:
-                # Try to get a message from the broker (longer timeout = less CPU)
-                message = self.broker.dequeue(timeout=1.0)
+                # An urgent message that interrupted the last one jumps the queue;
+                # otherwise get one from the broker (longer timeout = less CPU)
+                message = self._claim_preempting() or self.next_message(timeout=1.0)
 
                 if message:
                     # Check for shutdown signal
@@ -186,37 +551,14 @@ class QueueConsumer:
                         # Don't spin - wait for next dequeue cycle
                         continue
 
-                    # Get retry count for logging
-                    retry_count = message.metadata.get('retry_count', 0)
+                    # Resume the hook's trace on this thread so TTS stages land in it
+                    trace = self._begin(message)
+                    if trace is not None:
+                        tracing.activate(trace)
 
                     # Process the message
                     success, reason = self._process_message(message)
-
-                    if success:
-                        # Success - acknowledge and remove from queue
-                        self.broker.ack(message)
-                    else:
-                        # Failure - determine if should retry
-                        if self._should_retry(message, reason):
-                            # Update retry metadata
-                            message.metadata['retry_count'] = retry_count + 1
-                            message.metadata['last_retry_time'] = time.time()
-
-                            # Nack to put back in queue for retry
-                            self.broker.nack(message)
-
-                            if self.logger:
-                                self.logger.log_warning(
-                                    f"Message failed (retry #{retry_count + 1}/{self.max_retries}): {message.text[:50]}..."
-                                )
-                        else:
-                            # Don't retry - ack to remove from queue
-                            self.broker.ack(message)
-
-                            if self.logger:
-                                self.logger.log_error(
-                                    f"Message dropped (reason: {reason}): {message.text[:50]}..."
-                                )
+                    self._settle(message, trace, success, reason)
 
             except Exception as e:
                 if self.logger:
@@ -240,10 +582,24 @@ class QueueConsumer:
             daemon=True,  # Dies when main process exits
         )
         self._thread.start()
+        self.start_watcher()
 
         if self.logger:
             self.logger.log_info("Consumer thread started")
 
+    def start_watcher(self):
+        """Start the preemption watcher (if a controller and threshold are set)."""
+        if self.playback_controller is None or self.preempt_priority is None:
+            return
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher = threading.Thread(
+            target=self._watch_for_urgent,
+            name="VoicePreemptWatcher",
+            daemon=True,
+        )
+        self._watcher.start()
+
     def stop(self, wait: bool = True, timeout: float = 5.0):
         """
         Stop the consumer.
@@ -512,6 +512,58 @@ class VoiceDaemon:
             return False
 
 
+def consumer_settings(config: dict) -> dict:
+    """
+    QueueConsumer timing, retry and preemption settings from the validated config.
+
+    Used for the consumer's constructor and for QueueConsumer.configure()
+    when the config is reloaded (the keys are QueueConsumer.RELOADABLE).
+
+    Args:
+        config: Validated voice configuration (VoiceConfig.model_dump())
+
+    Returns:
+        Consumer keyword arguments
+    """
+    queue_settings = config["queue_settings"]
+    preemption = config["preemption"]
+    return {
+        "min_speech_delay": config["timing"]["min_speech_delay"],
+        "max_retries": queue_settings["max_retries"],
+        "retry_backoff_base": queue_settings["retry_backoff_base"],
+        "prefetch_depth": queue_settings["prefetch_depth"],
+        "preempt_priority": preemption["min_priority"] if preemption["enabled"] else None,
+        "preempt_mode": preemption["mode"],
+        "preempt_poll_interval": preemption["poll_interval_ms"] / 1000.0,
+        "requeue_interrupted": preemption["requeue_interrupted"],
+    }
+
+
+def mixer_settings(config: dict) -> dict:
+    """
+    SessionMixer settings from the validated config.
+
+    Used for the mixer's constructor and for SessionMixer.configure()
+    when the config is reloaded (the keys are SessionMixer.RELOADABLE).
+
+    Args:
+        config: Validated voice configuration (VoiceConfig.model_dump())
+
+    Returns:
+        Mixer keyword arguments
+    """
+    mixing = config["mixing"]
+    return {
+        "digest_threshold": mixing["digest_threshold"],
+        "max_sessions": mixing["max_sessions"],
+        "max_per_session": mixing["max_per_session"],
+        "max_clause_words": mixing["max_clause_words"],
+        "urgent_priority": mixing["urgent_priority"],
+        "session_weights": dict(mixing["session_weights"]),
+        "language": config["tts_settings"]["speech_language"],
+    }
+
+
 def run_worker():
     """
     Run the daemon worker process.
@@ -525,16 +577,64 @@ def run_worker():
     if env_path.exists():
         load_dotenv(env_path, override=True)
 
+    import asyncio
     from voice_handler.queue.consumer import QueueConsumer
-    from voice_handler.queue.broker import get_broker
+    from voice_handler.queue.mixer import SessionMixer
+    from voice_handler.queue.broker import MessageBroker, set_broker
+    from voice_handler.queue.config_reload import ConfigWatcher
+    from voice_handler.queue.runtime import AsyncDaemonRuntime
     from voice_handler.tts.provider import TTSProvider
+    from voice_handler.tts.playback import get_playback_controller
     from voice_handler.utils.logger import VoiceLogger
+    from voice_handler.utils.log_sink import LogSinkServer
+    from voice_handler.utils.events import EventStore
+    from voice_handler.utils.event_stream import EventStream, EventStreamServer
+    from voice_handler.utils.metrics import MetricsFlusher, get_metrics
+    from voice_handler.utils.tracing import TraceRing
+    from voice_handler.utils.paths import get_paths
     from voice_handler.core.session import get_session_voice_manager
+    from voice_handler.config import get_config
 
     # Initialize components
-    logger = VoiceLogger()
+    runtime_config = get_config().runtime
+    logger = VoiceLogger(
+        mode=runtime_config.daemon_log_mode,
+        writer=True,
+        max_size_mb=runtime_config.log_max_mb,
+        max_age_hours=runtime_config.log_max_age_hours,
+        backup_count=runtime_config.log_backups,
+    )
     logger.log_info("Voice daemon worker starting...")
 
+    # Structured events: the worker's own stages, and hook events arriving through the log sink
+    event_store = None
+    try:
+        event_store = EventStore(retention_days=runtime_config.event_retention_days)
+        event_store.prune()
+        logger.event_store = event_store
+    except Exception as e:
+        logger.log_warning(f"Event store unavailable, events will not be recorded: {e}")
+
+    # Live feed for the control panel: stored events, log records and metrics ticks
+    event_stream = EventStream()
+    event_stream_server = EventStreamServer(event_stream, logger=logger)
+    try:
+        event_stream_server.start()
+        if event_store:
+            event_store.set_listener(event_stream.publish_events)
+        logger.set_tap(event_stream.publish)
+    except OSError as e:
+        event_stream_server = None
+        logger.log_warning(f"Event stream unavailable, the control panel will not update live: {e}")
+
+    # The worker is the only process that writes the log; hooks send their records here
+    log_sink = LogSinkServer(logger.log_file, logger.handle_record, logger=logger)
+    try:
+        log_sink.start()
+    except OSError as e:
+        log_sink = None
+        logger.log_warning(f"Log sink unavailable, hooks will append directly: {e}")
+
     # NOTE: We do NOT write PID file here anymore because:
     # - In normal mode, the parent daemon.start() writes the PID
     # - In DEV mode, the --dev-background process owns the PID file
@@ -550,25 +650,130 @@ def run_worker():
     except Exception as e:
         logger.log_error("FATAL: Invalid config.json - daemon cannot start", exception=e)
         print(f"ERROR: Config validation failed: {e}", file=sys.stderr)
+        if log_sink:
+            log_sink.stop()
+        if event_stream_server:
+            event_stream_server.stop()
+        logger.close()
+        if event_store:
+            event_store.close()
         sys.exit(1)  # Fail hard - do not start with invalid config
 
     # Initialize session voice manager for per-session prefixes
     session_voice_manager = get_session_voice_manager(logger=logger)
 
+    # Live counters/histograms, flushed to the status file read by get_status()
+    queue_settings = voice_config.queue_settings
+    metrics = get_metrics()
+    flusher = MetricsFlusher(
+        metrics,
+        get_paths().daemon_status,
+        interval=queue_settings.status_flush_interval,
+        logger=logger,
+        listener=lambda snapshot: event_stream.publish({"type": "metrics", **snapshot}),
+    )
+
     # Initialize TTS provider with validated config and session manager
-    tts = TTSProvider(config=config, logger=logger, session_voice_manager=session_voice_manager)
+    tts = TTSProvider(
+        config=config,
+        logger=logger,
+        session_voice_manager=session_voice_manager,
+        metrics=metrics,
+    )
 
-    # Get queue settings from validated config (type-safe access)
-    max_retries = voice_config.queue_settings.max_retries
-    retry_backoff_base = voice_config.queue_settings.retry_backoff_base
+    # Daemon-side broker: WAL pragmas and optional group commit for in-process producers
+    broker = MessageBroker(
+        logger=logger,
+        synchronous=queue_settings.sqlite_synchronous,
+        group_commit=queue_settings.group_commit,
+        group_commit_window=queue_settings.group_commit_window_ms / 1000.0,
+        group_commit_max_batch=queue_settings.group_commit_max_batch,
+        backend=queue_settings.queue_backend,
+    )
+    set_broker(broker)
+
+    # Urgent messages (approvals, errors) interrupt whatever is playing
+    playback_controller = get_playback_controller()
+    playback_controller.fade_ms = voice_config.preemption.fade_ms
+
+    # Concurrent sessions take turns; a large backlog is spoken as digests
+    def create_mixer(settings: dict):
+        return SessionMixer(
+            broker,
+            **mixer_settings(settings),
+            session_label=session_voice_manager.get_session_prefix,
+            logger=logger,
+            metrics=metrics,
+        )
 
-    # Create consumer with TTS callback and retry config
+    # Create consumer with TTS callback, timing, retry and preemption config
     consumer = QueueConsumer(
+        broker=broker,
+        logger=logger,
+        metrics=metrics,
+        trace_ring=TraceRing(),
+        playback_controller=playback_controller,
+        event_store=event_store,
+        mixer=create_mixer(config) if config["mixing"]["enabled"] else None,
+        **consumer_settings(config),
+    )
+
+    def speak(text, voice, session_id):
+        # Priority and optional deadline let the TTS router pick a fast enough provider
+        message = consumer.current_message
+        priority = message.priority if message else 5
+        deadline = message.metadata.get("deadline") if message else None
+        tts.speak(text, voice, session_id, priority=priority, deadline=deadline)
+
+    consumer.set_speak_callback(speak)
+    # Generation stage: compress upcoming messages while the current one plays
+    consumer.set_prepare_callback(lambda text, voice, session_id: tts.prefetch(text, voice, session_id))
+
+    # Keep the local LLM loaded so hooks never wait for a cold model
+    keep_alive = None
+    llm_config = get_config().llm
+    if llm_config.provider == "ollama":
+        from voice_handler.ai.ollama import HTTPX_AVAILABLE, OllamaKeepAlive, create_ollama_client
+        if HTTPX_AVAILABLE:
+            keep_alive = OllamaKeepAlive(
+                create_ollama_client(logger=logger),
+                interval=llm_config.ollama_ping_interval,
+                logger=logger,
+            )
+
+    # Warm qwen-code workers, served to hook processes over a local socket
+    qwen_service = None
+    if llm_config.provider == "qwen":
+        from voice_handler.ai.qwen_worker import QwenWorkerService, create_qwen_worker_pool
+        qwen_pool = create_qwen_worker_pool(logger=logger, metrics=metrics)
+        if qwen_pool:
+            qwen_service = QwenWorkerService(qwen_pool, logger=logger)
+
+    # Apply config.json/.env edits live; queued messages and the one playing are kept
+    def apply_config(settings: dict, changed: list):
+        tts.apply_config(settings, env_changed=[name[len("env."):] for name in changed if name.startswith("env.")])
+        consumer.configure(**consumer_settings(settings))
+        if not settings["mixing"]["enabled"]:
+            consumer.mixer = None
+        elif consumer.mixer is None:
+            consumer.mixer = create_mixer(settings)
+        else:
+            consumer.mixer.configure(**mixer_settings(settings))
+        playback_controller.fade_ms = settings["preemption"]["fade_ms"]
+        flusher.interval = settings["queue_settings"]["status_flush_interval"]
+        session_voice_manager.session_expiry_seconds = settings["timing"]["session_expiry_hours"] * 60 * 60
+        session_voice_manager.registry.touch_interval = settings["timing"]["session_touch_interval"]
+        session_voice_manager.configure_identities(settings)
+        if keep_alive:
+            keep_alive.interval = get_config().llm.ollama_ping_interval
+
+    config_watcher = ConfigWatcher(
+        config,
+        interval=queue_settings.config_reload_interval,
         logger=logger,
-        max_retries=max_retries,
-        retry_backoff_base=retry_backoff_base,
+        metrics=metrics,
     )
-    consumer.set_speak_callback(lambda text, voice, session_id: tts.speak(text, voice, session_id))
+    config_watcher.add_listener(apply_config)
 
     # Set up signal handlers
     def handle_signal(signum, frame):
@@ -580,17 +785,55 @@ def run_worker():
 
     # Start processing
     logger.log_info("Voice daemon worker ready - the show begins!")
+    flusher.start()
+    config_watcher.start()
+    if keep_alive:
+        keep_alive.start()
+    if qwen_service:
+        qwen_service.pool.start()
+        try:
+            qwen_service.start()
+        except OSError as e:
+            logger.log_warning(f"qwen-code worker service unavailable: {e}")
 
     try:
         # Run consumer in main thread (blocking)
         consumer._running = True
-        consumer._consumer_loop()
+        consumer.start_watcher()
+        if queue_settings.runtime == "async":
+            # Render upcoming messages on an event loop while a playback thread speaks
+            runtime = AsyncDaemonRuntime(
+                consumer,
+                tts,
+                render_ahead=queue_settings.render_ahead,
+                logger=logger,
+                metrics=metrics,
+            )
+            asyncio.run(runtime.run())
+        else:
+            consumer._consumer_loop()
     except KeyboardInterrupt:
         logger.log_info("Keyboard interrupt received")
     finally:
         # NOTE: PID cleanup is handled by parent process in stop()
         # Worker process should NOT remove PID file it didn't create
+        config_watcher.stop()
+        flusher.stop()
+        if keep_alive:
+            keep_alive.stop()
+            keep_alive.client.close()
+        if qwen_service:
+            qwen_service.stop()
+            qwen_service.pool.stop()
+        broker.close()
         logger.log_info("Voice daemon worker stopped - B.O.!")
+        if log_sink:
+            log_sink.stop()
+        if event_stream_server:
+            event_stream_server.stop()
+        logger.close()
+        if event_store:
+            event_store.close()
 
 
 def run_with_auto_reload(background=False):
@@ -645,6 +888,43 @@ def run_with_auto_reload(background=False):
         reloader.start()
 
 
+def show_events(args):
+    """Print recorded events matching the --events filters."""
+    from voice_handler.utils.events import EventStore, format_event
+
+    store = EventStore()
+    filters = {
+        "session_id": args.session,
+        "stage": args.stage,
+        "hook": args.hook,
+        "tool": args.tool,
+        "message_id": args.message_id,
+    }
+    try:
+        if args.summary:
+            for stage, row in sorted(store.summary(since=args.since, until=args.until, **filters).items()):
+                print(f"{stage:<11} count={row['count']:<6} avg={row['avg_ms']}ms max={row['max_ms']}ms")
+            return
+        found = store.query(
+            since=args.since,
+            until=args.until,
+            min_latency_ms=args.min_latency,
+            limit=args.limit,
+            oldest_first=bool(args.message_id),
+            **filters,
+        )
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        store.close()
+
+    for event in found:
+        print(json.dumps(event, ensure_ascii=False) if args.json else format_event(event))
+    if not found and not args.json:
+        print("No matching events")
+
+
 def main():
     """CLI entry point for the daemon."""
     import argparse
@@ -655,9 +935,24 @@ def main():
     parser.add_argument('--stop', action='store_true', help='Stop the daemon')
     parser.add_argument('--restart', action='store_true', help='Restart the daemon')
     parser.add_argument('--status', action='store_true', help='Show daemon status')
+    parser.add_argument('--metrics', action='store_true', help='Print worker metrics in Prometheus text format')
+    parser.add_argument('--events', action='store_true', help='List recorded pipeline events (newest first)')
     parser.add_argument('--dev', action='store_true', help='Start with auto-reload (development mode)')
     parser.add_argument('--dev-background', action='store_true', help='Start with auto-reload in background (internal use)')
 
+    events = parser.add_argument_group('event filters (with --events)')
+    events.add_argument('--session', help='Session ID')
+    events.add_argument('--stage', help='Stage (hook, dequeued, spoken, retry, interrupted, dropped)')
+    events.add_argument('--hook', help='Hook name')
+    events.add_argument('--tool', help='Tool name')
+    events.add_argument('--message-id', help='Message (trace) ID: show its whole timeline')
+    events.add_argument('--since', help='Start time: epoch seconds, 15m/2h/7d ago, or ISO date/time')
+    events.add_argument('--until', help='End time (same formats as --since)')
+    events.add_argument('--min-latency', type=float, help='Only events at least this slow (ms)')
+    events.add_argument('--limit', type=int, default=50, help='Maximum events shown (default: 50)')
+    events.add_argument('--summary', action='store_true', help='Counts and latencies per stage instead of events')
+    events.add_argument('--json', action='store_true', help='Print events as JSON lines')
+
     args = parser.parse_args()
 
     daemon = VoiceDaemon()
@@ -690,6 +985,13 @@ def main():
         status = daemon.get_status()
         print(f"Running: {status['running']}")
         print(f"PID: {status['pid']}")
+        print(f"Uptime: {status['uptime_seconds']}s")
+        print(f"Messages processed: {status['messages_processed']}")
+    elif args.metrics:
+        from voice_handler.utils.metrics import render_prometheus
+        print(render_prometheus(daemon.get_status()), end="")
+    elif args.events:
+        show_events(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Session Mixer - The Front-of-House Desk.
+
+With several Claude Code sessions talking at once, the consumer used to
+play every announcement of every session one after another, so the
+queue (and the wait for anything new) grew with the number of sessions.
+The mixer sits between the broker and the consumer and decides what is
+spoken next:
+
+- Urgent messages (approvals, errors) are taken first, untouched
+- A message put back after an interruption replays next, on its own
+  (it is never merged again, so it can only be interrupted twice)
+- While the backlog is small, sessions take turns by smooth weighted
+  round-robin, so one chatty session can't starve the others
+- Past digest_threshold pending messages, the next turn becomes a
+  digest: the round-robin picks up to max_sessions sessions, each
+  session's oldest messages collapse into one clause, and the clauses
+  are spoken as one message, e.g. "[api] 3 updates, latest: tests
+  passed; [web] build finished"
+
+Speech time per window is then bounded by max_sessions clauses however
+many sessions are queued. A digest is acked (or retried) as its parts.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from voice_handler.queue.broker import MessageBroker, MessageType, VoiceMessage
+
+# Pending messages scanned for urgent ones and session-less lanes
+MIXER_SCAN_LIMIT = 50
+
+# Lane of messages without a session (breakdown()'s key for them)
+NO_SESSION = "none"
+
+DIGEST_PHRASES = {
+    "es": "{count} avisos, el último: {latest}",
+    "en": "{count} updates, latest: {latest}",
+}
+
+
+class SessionMixer:
+    """
+    Picks the next message across sessions: urgent first, then fair turns or digests.
+    """
+
+    # Settings configure() may change on a running mixer (constructor argument names)
+    RELOADABLE = (
+        "digest_threshold",
+        "max_sessions",
+        "max_per_session",
+        "max_clause_words",
+        "urgent_priority",
+        "session_weights",
+        "language",
+    )
+
+    def __init__(
+        self,
+        broker: MessageBroker,
+        digest_threshold: int = 6,
+        max_sessions: int = 4,
+        max_per_session: int = 5,
+        max_clause_words: int = 14,
+        urgent_priority: int = 8,
+        session_weights: Optional[Dict[str, float]] = None,
+        language: str = "es",
+        session_label: Optional[Callable[[str], Optional[str]]] = None,
+        logger=None,
+        metrics=None,
+    ):
+        """
+        Initialize the mixer.
+
+        Args:
+            broker: MessageBroker the consumer reads from
+            digest_threshold: Pending messages at which turns become digests (0: never)
+            max_sessions: Sessions merged into one digest
+            max_per_session: Messages of one session merged into its clause
+            max_clause_words: Words of a session's latest message kept in its clause
+            urgent_priority: Messages at or above this priority are never merged or delayed
+            session_weights: Round-robin weight per project name (default 1.0)
+            language: Language of the digest phrasing ("es" or "en")
+            session_label: session_id -> spoken label (e.g. "[api]"), or None
+            logger: Optional logger instance
+            metrics: Optional DaemonMetrics registry (digest counters)
+        """
+        self.broker = broker
+        self.digest_threshold = digest_threshold
+        self.max_sessions = max_sessions
+        self.max_per_session = max_per_session
+        self.max_clause_words = max_clause_words
+        self.urgent_priority = urgent_priority
+        self.session_weights = session_weights or {}
+        self.language = language
+        self.session_label = session_label
+        self.logger = logger
+        self.metrics = metrics
+        # Smooth weighted round-robin credit per session
+        self._credit: Dict[str, float] = {}
+
+    def configure(self, **settings):
+        """
+        Change mixing settings while the daemon runs (the next turn uses them).
+
+        Args:
+            **settings: Any of RELOADABLE
+
+        Raises:
+            ValueError: For a setting that can't be changed while running
+        """
+        unknown = set(settings) - set(self.RELOADABLE)
+        if unknown:
+            raise ValueError(f"Mixer settings not reloadable: {', '.join(sorted(unknown))}")
+        for name, value in settings.items():
+            setattr(self, name, value)
+
+    def next(self, timeout: float = 1.0) -> Optional[VoiceMessage]:
+        """
+        Get the next message (or digest) to speak.
+
+        Args:
+            timeout: How long to wait when the queue is empty
+
+        Returns:
+            VoiceMessage, or None if the queue is empty
+        """
+        lanes = {sid: n for sid, n in self.broker.breakdown().get("by_session", {}).items() if n > 0}
+        total = sum(lanes.values())
+        merging = 0 < self.digest_threshold <= total
+        if len(lanes) < 2 and not merging:
+            return self.broker.dequeue(timeout)  # Nothing to share or merge: queue order
+
+        # Sessions with nothing queued start from scratch next time
+        self._credit = {sid: credit for sid, credit in self._credit.items() if sid in lanes}
+
+        scan = self.broker.peek(limit=MIXER_SCAN_LIMIT)
+        for item in scan:
+            if self._urgent(item) or self._interrupted(item):
+                message = self.broker.claim(item["id"])
+                if message is not None:
+                    return message
+
+        # Sessions owed the same number of turns go in queue order
+        oldest = {}
+        for item in scan:
+            oldest.setdefault(item.get("session_id") or NO_SESSION, len(oldest))
+        lanes = {sid: lanes[sid] for sid in sorted(lanes, key=lambda sid: oldest.get(sid, len(scan)))}
+
+        if merging:
+            message = self._digest(lanes, scan)
+        else:
+            message = self._turn(lanes, scan)
+        return message or self.broker.dequeue(timeout)
+
+    def _urgent(self, item: Dict[str, Any]) -> bool:
+        """Whether a pending message bypasses mixing (urgent, or the shutdown signal)."""
+        return (
+            item.get("message_type") == MessageType.SHUTDOWN.value
+            or item.get("priority", 5) >= self.urgent_priority
+        )
+
+    @staticmethod
+    def _interrupted(item: Dict[str, Any]) -> bool:
+        """Whether a pending message was put back after an interruption."""
+        return bool((item.get("metadata") or {}).get("interrupted"))
+
+    def _weight(self, session_id: str) -> float:
+        label = self._label(session_id)
+        return max(0.01, float(self.session_weights.get(label.strip("[]"), 1.0))) if label else 1.0
+
+    def _label(self, session_id: str) -> str:
+        if self.session_label is None or session_id == NO_SESSION:
+            return ""
+        try:
+            return self.session_label(session_id) or ""
+        except Exception:
+            return ""
+
+    def _pick(self, lanes: List[str]) -> str:
+        """
+        Smooth weighted round-robin: the session owed the most turns goes next.
+
+        Every candidate earns its weight and the pick pays back the total,
+        so over time each session gets turns in proportion to its weight,
+        spread out rather than in bursts.
+        """
+        weights = {sid: self._weight(sid) for sid in lanes}
+        for sid, weight in weights.items():
+            self._credit[sid] = self._credit.get(sid, 0.0) + weight
+        chosen = max(lanes, key=lambda sid: self._credit[sid])
+        self._credit[chosen] -= sum(weights.values())
+        return chosen
+
+    def _lane(self, session_id: str, scan: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Oldest pending, non-urgent messages of one session."""
+        if session_id == NO_SESSION:
+            items = [item for item in scan if not item.get("session_id")]
+        else:
+            items = self.broker.peek(limit=limit + MIXER_SCAN_LIMIT // 5, session_id=session_id)
+        return [item for item in items if not self._urgent(item) and not self._interrupted(item)][:limit]
+
+    def _turn(self, lanes: Dict[str, int], scan: List[Dict[str, Any]]) -> Optional[VoiceMessage]:
+        """The oldest message of the session whose turn it is."""
+        for item in self._lane(self._pick(list(lanes)), scan, 1):
+            return self.broker.claim(item["id"])
+        return None
+
+    def _digest(self, lanes: Dict[str, int], scan: List[Dict[str, Any]]) -> Optional[VoiceMessage]:
+        """Merge the backlog of up to max_sessions sessions into one message."""
+        remaining = list(lanes)
+        clauses: List[str] = []
+        parts: List[VoiceMessage] = []
+        while remaining and len(clauses) < max(1, self.max_sessions):
+            session_id = self._pick(remaining)
+            remaining.remove(session_id)
+            claimed = [
+                message for message in (self.broker.claim(item["id"])
+                                        for item in self._lane(session_id, scan, max(1, self.max_per_session)))
+                if message is not None
+            ]
+            if claimed:
+                clauses.append(self._clause(session_id, claimed))
+                parts.extend(claimed)
+
+        if len(parts) <= 1:
+            return parts[0] if parts else None
+
+        digest = VoiceMessage(
+            message_type=MessageType.SPEAK,
+            text="; ".join(clauses),
+            voice=parts[0].voice,
+            priority=max(part.priority for part in parts),
+            timestamp=min(part.timestamp for part in parts),
+            metadata={
+                "digest": len(parts),
+                "retry_count": max(part.metadata.get("retry_count", 0) for part in parts),
+                "last_retry_time": max((part.metadata.get("last_retry_time") or 0 for part in parts), default=0) or None,
+            },
+        )
+        digest._receipt = None
+        digest._parts = parts
+        if self.metrics:
+            self.metrics.inc("digests_spoken")
+            self.metrics.inc("messages_merged", len(parts))
+        if self.logger:
+            self.logger.log_info(f"Mixed {len(parts)} messages from {len(clauses)} sessions into one digest")
+        return digest
+
+    def _clause(self, session_id: str, messages: List[VoiceMessage]) -> str:
+        """One session's messages as a short clause: its latest message, and how many there were."""
+        words = messages[-1].text.split()
+        latest = " ".join(words[:self.max_clause_words])
+        if len(words) > self.max_clause_words:
+            latest += "..."
+        if len(messages) > 1:
+            phrase = DIGEST_PHRASES.get(self.language, DIGEST_PHRASES["en"])
+            latest = phrase.format(count=len(messages), latest=latest)
+        label = self._label(session_id)
+        return f"{label} {latest}" if label else latest
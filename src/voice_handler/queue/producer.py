@@ -19,6 +19,7 @@ from voice_handler.queue.broker import (
     MessageType,
     get_broker,
 )
+from voice_handler.utils import tracing
 
 
 class QueueProducer:
@@ -68,13 +69,19 @@ class QueueProducer:
         Returns:
             bool: True if queued successfully
         """
+        metadata = dict(metadata or {})
+        trace = tracing.current_trace()
+        if trace is not None:
+            trace.mark("enqueued")
+            metadata[tracing.METADATA_KEY] = trace.to_metadata()
+
         message = VoiceMessage(
             message_type=message_type,
             text=text,
             voice=voice,
             session_id=session_id,
             priority=priority,
-            metadata=metadata or {},
+            metadata=metadata,
         )
 
         success = self.broker.enqueue(message)
@@ -158,9 +165,9 @@ class QueueProducer:
             bool: True if queue was cleared successfully
         """
         try:
-            self.broker.clear()
-            if self.logger:
-                self.logger.log_info("Voice queue cleared")
+            removed = self.broker.clear()
+            if self.logger and removed:
+                self.logger.log_info(f"Voice queue cleared ({removed} messages)")
             return True
         except Exception as e:
             if self.logger:
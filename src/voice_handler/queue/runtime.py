@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Async Daemon Runtime - The Stage Manager's Headset.
+
+The threaded consumer does one thing at a time: dequeue, synthesize,
+play, then look at the next message. Here an asyncio loop reads the
+queue and synthesizes upcoming messages (AsyncOpenAI, asyncio
+subprocesses) while a dedicated playback thread speaks the current one,
+so the next song is already tuned up when this one ends.
+
+The playback thread takes messages in queue order and reuses the
+QueueConsumer's logic for speech spacing, retries, traces and
+preemption; a message that couldn't be rendered ahead is spoken through
+the normal speak callback, provider fallback and all. The consumer's
+preemption watcher also sees the messages read ahead, so an urgent one
+that was dequeued while another plays still interrupts it and is
+played next, out of order.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from collections import deque
+from typing import Deque, List, Optional
+
+from voice_handler.queue.broker import MessageType, VoiceMessage
+from voice_handler.queue.consumer import QueueConsumer
+from voice_handler.utils import tracing
+
+# Longest the playback thread waits for a message's pre-rendered audio (seconds)
+RENDER_WAIT_TIMEOUT = 30.0
+
+
+class AsyncDaemonRuntime:
+    """
+    asyncio daemon core: async reader and renderer, one playback thread.
+
+    - The reader dequeues (in a worker thread, so the loop stays free)
+      and starts rendering each message as soon as it is dequeued
+    - At most render_ahead messages wait rendered (or rendering) behind
+      the one being played
+    - The playback thread speaks messages in order and settles them
+      (ack / retry / drop) through the consumer
+    """
+
+    def __init__(self, consumer: QueueConsumer, tts, render_ahead: int = 2, logger=None, metrics=None):
+        """
+        Initialize the runtime.
+
+        Args:
+            consumer: Configured QueueConsumer (speak callback, preemption, retries)
+            tts: TTSProvider with arender()/play_rendered()
+            render_ahead: Messages rendered ahead of the one playing
+            logger: Logger instance
+            metrics: Optional DaemonMetrics registry
+        """
+        self.consumer = consumer
+        self.tts = tts
+        self.render_ahead = render_ahead
+        self.logger = logger
+        self.metrics = metrics
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        # (message, trace, rendering) read ahead; None ends playback
+        self._playlist: Deque[Optional[tuple]] = deque()
+        self._playlist_ready = threading.Condition()
+        consumer.read_ahead = self.read_ahead
+
+    def read_ahead(self) -> List[VoiceMessage]:
+        """Messages dequeued and waiting to be played (for the preemption watcher)."""
+        with self._playlist_ready:
+            return [item[0] for item in self._playlist if item is not None]
+
+    def _put(self, item: Optional[tuple]):
+        with self._playlist_ready:
+            self._playlist.append(item)
+            self._playlist_ready.notify()
+
+    def _take(self) -> Optional[tuple]:
+        with self._playlist_ready:
+            while not self._playlist:
+                self._playlist_ready.wait()
+            return self._playlist.popleft()
+
+    def _take_message(self, message: VoiceMessage) -> Optional[tuple]:
+        """Take a read-ahead message out of turn (it interrupted the one playing)."""
+        with self._playlist_ready:
+            for item in self._playlist:
+                if item is not None and item[0] is message:
+                    self._playlist.remove(item)
+                    return item
+        return None
+
+    async def run(self):
+        """Process messages until the consumer is stopped or a shutdown message arrives."""
+        self._loop = asyncio.get_running_loop()
+        # The message being played plus those rendered ahead of it
+        self._slots = asyncio.Semaphore(self.render_ahead + 1)
+        player = threading.Thread(target=self._playback_loop, name="VoicePlayback", daemon=True)
+        player.start()
+        if self.logger:
+            self.logger.log_info(f"Async runtime started (render ahead: {self.render_ahead}) - ready to rock!")
+
+        try:
+            await self._read()
+        finally:
+            self._put(None)
+            await asyncio.to_thread(player.join)
+            if self.logger:
+                self.logger.log_info("Async runtime ended - show's over!")
+
+    async def _read(self):
+        """Reader: dequeue messages and start rendering them."""
+        consumer = self.consumer
+        while consumer._running:
+            await self._slots.acquire()
+            handed_over = False
+            try:
+                message = await asyncio.to_thread(consumer.next_message, 1.0)
+                if message is None:
+                    continue
+
+                if message.message_type == MessageType.SHUTDOWN:
+                    if self.logger:
+                        self.logger.log_info("Shutdown signal received - B.O.!")
+                    consumer.broker.ack(message)
+                    return
+
+                if consumer._should_apply_backoff(message):
+                    # Too soon to retry, put back in queue
+                    consumer.broker.nack(message)
+                    continue
+
+                trace = consumer._begin(message)
+                rendering = asyncio.run_coroutine_threadsafe(self._render(message, trace), self._loop)
+                self._put((message, trace, rendering))
+                handed_over = True
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error("Error in async reader", exception=e)
+                await asyncio.sleep(0.5)  # Avoid tight loop on errors
+            finally:
+                if not handed_over:
+                    self._slots.release()
+
+    async def _render(self, message: VoiceMessage, trace: Optional[tracing.Trace]):
+        """Synthesize a message ahead of playback (None: speak it normally)."""
+        try:
+            rendered = await self.tts.arender(
+                message.text,
+                message.voice,
+                message.session_id,
+                priority=message.priority,
+                deadline=message.metadata.get("deadline"),
+            )
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug(f"Pre-render failed: {e}")
+            return None
+        if rendered is not None:
+            if trace is not None:
+                trace.mark("synthesis_done")
+            if self.metrics:
+                self.metrics.inc("messages_prerendered")
+        return rendered
+
+    def _playback_loop(self):
+        """Playback thread: speak messages in queue order."""
+        while True:
+            item = self._take()
+            if item is None:
+                break
+            message, trace, rendering = item
+            try:
+                if not self.consumer._running:
+                    # Stopping: leave messages read ahead for the next daemon
+                    rendering.cancel()
+                    self.consumer.broker.nack(message)
+                    continue
+                self._play(message, trace, rendering)
+                # An urgent message that interrupted this one goes next
+                urgent = self.consumer._claim_preempting()
+                while urgent is not None:
+                    held = self._take_message(urgent)
+                    if held is None:
+                        self._play(urgent, self.consumer._begin(urgent), None)
+                    else:
+                        try:
+                            self._play(*held)  # Read ahead: already begun and rendering
+                        finally:
+                            self._loop.call_soon_threadsafe(self._slots.release)
+                    urgent = self.consumer._claim_preempting()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_error("Error in playback thread", exception=e)
+            finally:
+                self._loop.call_soon_threadsafe(self._slots.release)
+
+    def _play(self, message: VoiceMessage, trace: Optional[tracing.Trace], rendering: Optional[concurrent.futures.Future]):
+        """Speak one message (pre-rendered if possible) and settle it."""
+        if trace is not None:
+            tracing.activate(trace)
+
+        def speak(text, voice, session_id):
+            rendered = None
+            if rendering is not None:
+                try:
+                    rendered = rendering.result(timeout=RENDER_WAIT_TIMEOUT)
+                except Exception:
+                    rendering.cancel()
+            if rendered is None or not self.tts.play_rendered(rendered):
+                self.consumer.speak_callback(text, voice, session_id)
+
+        success, reason = self.consumer._process_message(message, speak=speak)
+        self.consumer._settle(message, trace, success, reason)
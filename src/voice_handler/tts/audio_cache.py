@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Audio Cache - The Sample Library.
+
+Like the sampler loaded with the band's signature stabs, this cache
+keeps rendered speech as WAV files keyed by a hash of everything that
+shapes the audio (engine, voice, settings, text). Repeated phrases
+play back without another synthesis round-trip, whichever engine
+rendered them.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Cache name reported to DaemonMetrics
+CACHE_NAME = "audio"
+
+
+class AudioCache:
+    """
+    Size-bounded on-disk cache of rendered audio.
+
+    Files are written atomically, so hooks and the daemon can share the
+    directory. When the total size passes max_bytes the least recently
+    used files (by mtime; hits touch the file) are removed.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 50 * 1024 * 1024, metrics=None):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: paths.audio_cache)
+            max_bytes: Total size kept on disk
+            metrics: Optional DaemonMetrics registry
+        """
+        if directory is None:
+            from voice_handler.utils.paths import get_paths
+            directory = get_paths().audio_cache
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.metrics = metrics
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Cache key for everything that determines the audio."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.wav"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for a key, or None."""
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            audio = None
+        if self.metrics:
+            if audio is None:
+                self.metrics.cache_miss(CACHE_NAME)
+            else:
+                self.metrics.cache_hit(CACHE_NAME)
+        return audio
+
+    def contains(self, key: str) -> bool:
+        """Whether audio is cached for a key (without counting a hit or miss)."""
+        return self._path(key).exists()
+
+    def put(self, key: str, audio: bytes):
+        """Store audio under a key (atomic write), then enforce the size limit."""
+        if not audio:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(audio)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            try:
+                entries = [(p.stat(), p) for p in self.directory.glob("*.wav")]
+            except OSError:
+                return
+            total = sum(stat.st_size for stat, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime):
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= stat.st_size
+                if total <= self.max_bytes:
+                    break
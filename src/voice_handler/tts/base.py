@@ -18,6 +18,12 @@ class TTSProviderInterface(ABC):
     1. speak() - Generate and play audio
     2. available() - Check if provider is ready to use
     3. provider_name - Identifier for logging
+
+    Optionally, prefetch() lets a provider start preparing a message
+    (e.g. compressing it) before it is spoken, arender() lets the
+    async daemon runtime synthesize a message while another one plays,
+    and close() releases what a provider holds when a config reload
+    replaces it.
     """
 
     @abstractmethod
@@ -54,3 +60,41 @@ class TTSProviderInterface(ABC):
             Provider name (e.g., "OpenAI", "System")
         """
         pass
+
+    def prefetch(self, message: str):
+        """
+        Start preparing a message that will be spoken soon.
+
+        Called by the daemon for upcoming queue messages while another
+        one is playing. Must not block; the default does nothing.
+
+        Args:
+            message: Speech-formatted text, exactly as speak() will receive it
+        """
+        pass
+
+    async def arender(self, message: str, voice: Optional[str] = None) -> Optional[bytes]:
+        """
+        Synthesize a message to audio without playing it.
+
+        Called on the daemon's event loop for upcoming messages; the
+        audio is played later by the playback thread. The default (None)
+        means this message is spoken with speak() instead.
+
+        Args:
+            message: Speech-formatted text, exactly as speak() would receive it
+            voice: Optional voice selection (provider-specific)
+
+        Returns:
+            WAV (or other soundfile-readable) audio bytes, or None
+        """
+        return None
+
+    def close(self):
+        """
+        Release engines, pools or connections held by the provider.
+
+        Called when a config reload replaces the provider chain, once no
+        message is using this provider any more. The default does nothing.
+        """
+        pass
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Speech Chunker - The Setlist Splitter.
+
+Like a band that starts the first song while the crew is still tuning
+the rest of the set, long messages are split at sentence boundaries and
+synthesized concurrently. Chunks play strictly in order as soon as each
+is ready, so the listener waits only for the first sentence.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, List, Optional
+
+from voice_handler.utils.transcript import SENTENCE_PATTERN
+
+# Where to break a sentence that is too long to be one chunk
+_CLAUSE_PATTERN = re.compile(r'(?<=[,;:])\s+')
+
+# How often a pending chunk checks for cancellation (seconds)
+CANCEL_POLL_INTERVAL = 0.05
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an overlong sentence at clause boundaries, then at words."""
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces: List[str] = []
+    current = ""
+    for part in _CLAUSE_PATTERN.split(sentence):
+        for word in (part.split() if len(part) > max_chars else [part]):
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, first_chunk_chars: int = 80, max_chunk_chars: int = 250) -> List[str]:
+    """
+    Split text into speakable chunks at sentence boundaries.
+
+    The first chunk is kept short so audio starts quickly; later chunks
+    pack several sentences to avoid many tiny synthesis requests.
+
+    Args:
+        text: Message to split
+        first_chunk_chars: Target size of the first chunk
+        max_chunk_chars: Maximum size of every other chunk
+
+    Returns:
+        Chunks in speaking order (a single chunk for short text)
+    """
+    sentences = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        sentence = sentence.strip()
+        if sentence:
+            sentences.extend(_split_long(sentence, max_chunk_chars))
+
+    chunks: List[str] = []
+    current = ""
+    for sentence in sentences:
+        limit = max_chunk_chars if chunks else first_chunk_chars
+        if current and len(current) + 1 + len(sentence) > limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def synthesize_in_order(
+    chunks: List[str],
+    synthesize: Callable[[str], Optional[bytes]],
+    play: Callable[[int, bytes], None],
+    max_workers: int = 3,
+    on_failure: Optional[Callable[[int, str], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> int:
+    """
+    Synthesize chunks concurrently and play them in order.
+
+    Playback of chunk N starts as soon as it is synthesized and chunk
+    N-1 has finished playing. A chunk that fails to synthesize is skipped.
+
+    Args:
+        chunks: Text chunks in speaking order
+        synthesize: Returns audio bytes for a chunk (None on failure)
+        play: Plays one chunk's audio (index, audio), blocking until done
+        max_workers: Concurrent synthesis requests
+        on_failure: Called with (index, chunk) for chunks that produced no audio
+        cancelled: Polled while waiting; once it returns True the remaining
+            chunks are dropped (e.g. playback was interrupted)
+
+    Returns:
+        Number of chunks played
+    """
+    played = 0
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="VoiceChunk")
+    try:
+        futures = [executor.submit(synthesize, chunk) for chunk in chunks]
+        for index, future in enumerate(futures):
+            if cancelled:
+                while not future.done() and not cancelled():
+                    wait([future], timeout=CANCEL_POLL_INTERVAL)
+                if cancelled():
+                    break
+            try:
+                audio = future.result()
+            except Exception:
+                audio = None
+            if not audio:
+                if on_failure:
+                    on_failure(index, chunks[index])
+                continue
+            play(index, audio)
+            played += 1
+    finally:
+        # Don't start synthesis for chunks nobody will hear (e.g. playback raised)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return played
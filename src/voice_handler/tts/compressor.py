@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Speech Compressor - The Setlist Editor.
+
+Like the editor who trims a ten-minute jam into a radio cut before the
+show, this module shortens long technical messages for basic TTS. It
+runs ahead of playback: the daemon asks it to prepare upcoming messages
+while the current one is still speaking, results are cached by input
+hash, and speech never waits longer than a fixed budget - on timeout
+the original text goes to TTS unchanged.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Optional
+
+
+COMPRESSION_PROMPT = """Eres un asistente que hace respuestas técnicas largas más concisas para salida de voz.
+Tu tarea es reformular el siguiente texto para que sea más corto y conversacional,
+preservando toda la información clave. Enfócate solo en los detalles más importantes.
+Sé breve pero claro, ya que esto será hablado en voz alta.
+
+IMPORTANTE - MANEJO DE BLOQUES DE CÓDIGO:
+- No incluyas bloques de código completos en tu respuesta
+- En su lugar, menciona brevemente "Creé código para X" o "Aquí hay un script que hace Y"
+- Para bloques grandes de código, solo di algo como "Escribí una función Python que maneja autenticación de usuarios"
+- NO intentes leer la sintaxis del código
+- Solo describe qué hace el código en máximo 1 oración
+
+CRÍTICO - IDIOMA:
+- SIEMPRE responde en ESPAÑOL
+- Mantén el mismo idioma del texto original
+- NO traduzcas a inglés
+
+Texto original:
+{text}
+
+Devuelve solo el texto comprimido en ESPAÑOL, sin explicación ni introducción."""
+
+# Cache name reported to DaemonMetrics
+CACHE_NAME = "compression"
+
+
+class SpeechCompressor:
+    """
+    Cached, time-budgeted LLM compression of speech text.
+
+    Requests run on a small thread pool so a timed-out call keeps going
+    and still fills the cache for a retry; identical texts share one
+    in-flight request.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_chars: int = 300,
+        min_chars: int = 50,
+        budget: float = 1.2,
+        request_timeout: float = 5.0,
+        max_tokens: int = 100,
+        cache_size: int = 256,
+        workers: int = 2,
+        logger=None,
+        metrics=None,
+    ):
+        """
+        Initialize the compressor.
+
+        Args:
+            client: OpenAI client used for gpt-4o-mini
+            max_chars: Texts at or under this length are spoken as-is
+            min_chars: Texts under this length are never compressed
+            budget: Seconds speech may wait for a compression result
+            request_timeout: Hard timeout of the background LLM request (seconds)
+            max_tokens: Completion token limit
+            cache_size: Compressed texts kept (LRU)
+            workers: Concurrent compression requests
+            logger: Logger instance
+            metrics: Optional DaemonMetrics registry
+        """
+        self.client = client
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self.budget = budget
+        self.request_timeout = request_timeout
+        self.max_tokens = max_tokens
+        self.cache_size = cache_size
+        self.workers = workers
+        self.logger = logger
+        self.metrics = metrics
+
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def needs_compression(self, text: str) -> bool:
+        """True if the text is long enough to be worth an LLM round-trip."""
+        return len(text) >= self.min_chars and len(text) > self.max_chars
+
+    def _cached(self, key: str) -> Optional[str]:
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+            return compressed
+
+    def _submit(self, key: str, text: str) -> Future:
+        """Start (or join) the background request for a text."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="VoiceCompress"
+                    )
+                future = self._executor.submit(self._run, key, text)
+                self._inflight[key] = future
+            return future
+
+    def _run(self, key: str, text: str) -> str:
+        try:
+            compressed = self._call_llm(text)
+            with self._lock:
+                self._cache[key] = compressed
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return compressed
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Error compressing text", exception=e)
+            return text
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _call_llm(self, text: str) -> str:
+        llm_start = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": COMPRESSION_PROMPT.format(text=text)}],
+            temperature=0.1,
+            max_tokens=self.max_tokens,
+            timeout=self.request_timeout,
+        )
+        if self.metrics:
+            self.metrics.observe("llm_latency_seconds", time.perf_counter() - llm_start)
+
+        compressed = (response.choices[0].message.content or "").strip()
+        if not compressed:
+            raise ValueError("empty compression result")
+
+        if self.logger:
+            self.logger.log_debug(f"Compressed text from {len(text)} to {len(compressed)} chars")
+        return compressed
+
+    def prefetch(self, text: str):
+        """Start compressing a text that will be spoken soon (non-blocking)."""
+        if not self.needs_compression(text):
+            return
+        key = self._key(text)
+        if self._cached(key) is None:
+            self._submit(key, text)
+
+    def compress(self, text: str) -> str:
+        """
+        Compressed text for speech, waiting at most the latency budget.
+
+        Args:
+            text: Original text
+
+        Returns:
+            Compressed text, or the original when it is short, the LLM
+            fails, or the budget runs out
+        """
+        if not self.needs_compression(text):
+            if self.logger:
+                self.logger.log_debug(f"Skipping compression for short message ({len(text)} chars)")
+            return text
+
+        key = self._key(text)
+        compressed = self._cached(key)
+        if compressed is not None:
+            if self.metrics:
+                self.metrics.cache_hit(CACHE_NAME)
+            return compressed
+        if self.metrics:
+            self.metrics.cache_miss(CACHE_NAME)
+
+        try:
+            return self._submit(key, text).result(timeout=self.budget)
+        except FutureTimeout:
+            if self.metrics:
+                self.metrics.inc("compression_timeouts")
+            if self.logger:
+                self.logger.log_warning(
+                    f"Compression exceeded {self.budget:.1f}s budget, speaking original text"
+                )
+            return text
+
+    def close(self):
+        """Stop the worker pool without waiting for running requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
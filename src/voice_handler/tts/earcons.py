@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Earcons - The Walk-On Riffs.
+
+Every session can get its own three-note riff, played right before its
+announcements so a listener knows who is talking before the first word.
+The riffs are sine tones from a pentatonic scale with distinct contours,
+rendered once to WAV and kept in the AudioCache (and in memory in the
+daemon), so playing one costs no synthesis at speak time.
+"""
+
+import io
+import math
+import struct
+import threading
+import wave
+from typing import Dict, List, Optional, Tuple
+
+from voice_handler.tts.audio_cache import AudioCache
+
+# Bumped whenever the rendering changes, so cached riffs are re-rendered
+EARCON_FORMAT = 1
+
+SAMPLE_RATE = 24000
+NOTE_MS = 70
+GAP_MS = 15
+
+# Riffs as note frequencies (Hz), A minor pentatonic
+MOTIFS: Tuple[Tuple[float, ...], ...] = (
+    (440.0, 523.3, 659.3),  # up
+    (659.3, 523.3, 440.0),  # down
+    (440.0, 659.3, 440.0),  # up and back
+    (659.3, 440.0, 659.3),  # down and back
+    (523.3, 523.3, 784.0),  # repeat, then leap
+    (784.0, 587.3, 587.3),  # fall, then repeat
+    (392.0, 587.3, 880.0),  # wide climb
+    (880.0, 659.3, 392.0),  # wide drop
+)
+
+
+def render_earcon(index: int, volume: float = 0.3, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """
+    Render one riff as 16-bit mono WAV.
+
+    Args:
+        index: Motif number (wraps around MOTIFS)
+        volume: Peak amplitude (0-1)
+        sample_rate: Samples per second
+
+    Returns:
+        WAV bytes
+    """
+    note_samples = int(sample_rate * NOTE_MS / 1000)
+    gap = b"\0\0" * int(sample_rate * GAP_MS / 1000)
+    ramp = max(1, int(sample_rate * 0.005))  # 5ms attack/release, no clicks
+    peak = volume * 32767
+
+    frames: List[bytes] = []
+    for frequency in MOTIFS[index % len(MOTIFS)]:
+        step = 2 * math.pi * frequency / sample_rate
+        samples = []
+        for i in range(note_samples):
+            envelope = min(1.0, i / ramp, (note_samples - 1 - i) / ramp)
+            samples.append(int(peak * envelope * math.sin(step * i)))
+        frames.append(struct.pack(f"<{note_samples}h", *samples))
+        frames.append(gap)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"".join(frames))
+    return buffer.getvalue()
+
+
+class EarconBank:
+    """
+    Rendered riffs: in memory first, then the AudioCache, then rendered.
+
+    Hooks call prerender() when a session is assigned its earcon; the
+    daemon's get() then finds it on disk (once) and in memory after that.
+    """
+
+    def __init__(self, cache: Optional[AudioCache] = None, volume: float = 0.3):
+        """
+        Initialize the bank.
+
+        Args:
+            cache: Shared audio cache (None: keep riffs in memory only)
+            volume: Peak amplitude (0-1)
+        """
+        self.cache = cache
+        self.volume = volume
+        self._rendered: Dict[int, bytes] = {}
+        self._lock = threading.Lock()
+
+    def key(self, index: int) -> str:
+        """AudioCache key of a riff."""
+        return AudioCache.key("earcon", EARCON_FORMAT, index % len(MOTIFS), self.volume, SAMPLE_RATE)
+
+    def prerender(self, index: int):
+        """Make sure a riff is in the audio cache (no-op if it already is)."""
+        if self.cache is not None and not self.cache.contains(self.key(index)):
+            self.cache.put(self.key(index), render_earcon(index, self.volume))
+
+    def get(self, index: int) -> bytes:
+        """WAV bytes of a riff."""
+        audio = self._rendered.get(index)
+        if audio is not None:
+            return audio
+        with self._lock:
+            audio = self._rendered.get(index)
+            if audio is None:
+                audio = self.cache.get(self.key(index)) if self.cache is not None else None
+                if audio is None:
+                    audio = render_earcon(index, self.volume)
+                    if self.cache is not None:
+                        self.cache.put(self.key(index), audio)
+                self._rendered[index] = audio
+        return audio
@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+System TTS Engines - The House Band.
+
+Spawning a speech engine per message is like hiring a new band for every
+song: espeak re-initializes, and Windows starts PowerShell and loads the
+System.Speech assembly each time. These engines stay up between
+messages:
+
+- speech-dispatcher: one SSIP connection over its Unix socket, waiting
+  for the END event of each message
+- espeak / espeak-ng: one process reading lines from stdin
+- Windows: one PowerShell host with SAPI loaded, fed commands on stdin
+- macOS: `say` (cheap to start; kept for rendering to WAV)
+
+Every engine can also render to WAV where the platform allows, so system
+speech can use the audio cache and the shared playback pipeline. The
+async daemon runtime renders through arender(), which runs espeak and
+say as asyncio subprocesses.
+"""
+
+import asyncio
+import atexit
+import base64
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# espeak's default rate (words per minute); other engines' scales are mapped from it
+DEFAULT_RATE_WPM = 175
+
+
+class SystemEngine(ABC):
+    """A long-lived platform speech engine."""
+
+    name = "engine"
+
+    def available(self) -> bool:
+        """True if the engine is installed/reachable."""
+        return True
+
+    @abstractmethod
+    def speak(self, text: str, voice: Optional[str] = None) -> bool:
+        """
+        Speak text, blocking until it has been spoken.
+
+        Args:
+            text: Speech-formatted text
+            voice: Engine-specific voice (may be ignored)
+
+        Returns:
+            True if the engine spoke the text
+        """
+
+    def render(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        """
+        Render text to WAV bytes instead of speaking it.
+
+        Returns:
+            WAV data, or None if this engine can't render
+        """
+        return None
+
+    async def arender(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        """Async render(); the default runs render() in a worker thread."""
+        return await asyncio.to_thread(self.render, text, voice)
+
+    def stop(self):
+        """Cut off speech in progress (called from another thread; best effort)."""
+
+    def close(self):
+        """Stop the engine process/connection."""
+
+
+# ==================== speech-dispatcher ====================
+
+def speechd_socket_path() -> Path:
+    """speech-dispatcher's Unix socket (SPEECHD_ADDRESS or the per-user default)."""
+    address = os.environ.get("SPEECHD_ADDRESS", "")
+    if address.startswith("unix_socket:"):
+        return Path(address.split(":", 1)[1])
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}"
+    return Path(runtime_dir) / "speech-dispatcher" / "speechd.sock"
+
+
+class SpeechDispatcherEngine(SystemEngine):
+    """
+    speech-dispatcher client speaking SSIP over one persistent socket.
+
+    Each message is sent with SPEAK and the call blocks until the
+    server's END (or CANCEL) notification for that message arrives.
+    """
+
+    name = "speech-dispatcher"
+
+    def __init__(
+        self,
+        socket_path: Optional[Path] = None,
+        language: str = "es",
+        rate_wpm: int = DEFAULT_RATE_WPM,
+        timeout: float = 120.0,
+        logger=None,
+    ):
+        """
+        Initialize the client (connects lazily).
+
+        Args:
+            socket_path: SSIP socket (default: speechd_socket_path())
+            language: Language code for the synthesis voice
+            rate_wpm: Speech rate in words per minute
+            timeout: Longest wait for one message to finish (seconds)
+            logger: Logger instance
+        """
+        self.socket_path = Path(socket_path) if socket_path else speechd_socket_path()
+        self.language = language
+        # SSIP rate is -100..100 around the engine default
+        self.rate = max(-100, min(100, int((rate_wpm - DEFAULT_RATE_WPM) * 100 / DEFAULT_RATE_WPM)))
+        self.timeout = timeout
+        self.logger = logger
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return self.socket_path.exists()
+
+    def _send(self, data: str):
+        self._sock.sendall(data.encode("utf-8"))
+
+    def _reply(self) -> Tuple[int, List[str]]:
+        """Read one (possibly multi-line) SSIP reply: 'NNN-...' lines end with 'NNN ...'."""
+        lines = []
+        while True:
+            raw = self._reader.readline()
+            if not raw:
+                raise ConnectionError("speech-dispatcher closed the connection")
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(line[4:])
+            if len(line) >= 4 and line[3] == " ":
+                return int(line[:3]), lines
+
+    def _command(self, command: str, expect: int) -> List[str]:
+        self._send(command + "\r\n")
+        code, lines = self._reply()
+        if code != expect:
+            raise RuntimeError(f"SSIP '{command}' failed: {code} {lines[-1] if lines else ''}")
+        return lines
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(str(self.socket_path))
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        self._command("SET self CLIENT_NAME user:voice_handler:main", 208)
+        self._command("SET self NOTIFICATION end on", 218)
+        self._command("SET self NOTIFICATION cancel on", 218)
+        self._command(f"SET self LANGUAGE {self.language}", 201)
+        self._command(f"SET self RATE {self.rate}", 203)
+
+    def speak(self, text: str, voice: Optional[str] = None) -> bool:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._connect()
+                self._command("SPEAK", 230)
+                # Data lines starting with '.' are escaped by doubling it
+                body = "\r\n".join(
+                    "." + line if line.startswith(".") else line
+                    for line in text.splitlines() or [""]
+                )
+                self._send(body + "\r\n.\r\n")
+                code, lines = self._reply()
+                if code != 225:
+                    raise RuntimeError(f"SSIP message rejected: {code}")
+                message_id = lines[0]
+
+                # Wait for this message's END/CANCEL event ("702-<msg>", "702-<client>", "702 END")
+                while True:
+                    code, lines = self._reply()
+                    if code in (702, 703) and lines and lines[0] == message_id:
+                        return code == 702
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_warning(f"speech-dispatcher failed: {e}")
+                self.close()
+                return False
+
+    def stop(self):
+        # speak() holds the lock while it waits; the CANCEL event ends that wait
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.sendall(b"CANCEL self\r\n")
+            except OSError:
+                pass
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._send("QUIT\r\n")
+            except OSError:
+                pass
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+
+# ==================== espeak ====================
+
+class EspeakEngine(SystemEngine):
+    """
+    One espeak (or espeak-ng) process speaking each stdin line.
+
+    espeak gives no completion signal on stdin, so speak() waits for the
+    estimated length of the utterance at the configured rate - enough to
+    keep messages from overlapping. Use speech-dispatcher or render-to-WAV
+    when exact timing matters.
+    """
+
+    name = "espeak"
+
+    def __init__(
+        self,
+        binary: Optional[str] = None,
+        language: str = "es",
+        rate_wpm: int = DEFAULT_RATE_WPM,
+        logger=None,
+    ):
+        """
+        Initialize the engine (the process starts on first use).
+
+        Args:
+            binary: espeak executable (default: espeak-ng, then espeak on PATH)
+            language: espeak voice/language
+            rate_wpm: Speech rate in words per minute
+            logger: Logger instance
+        """
+        self.binary = binary or shutil.which("espeak-ng") or shutil.which("espeak")
+        self.language = language
+        self.rate_wpm = rate_wpm
+        self.logger = logger
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def available(self) -> bool:
+        return bool(self.binary)
+
+    def _base_command(self) -> List[str]:
+        return [self.binary, "-v", self.language, "-s", str(self.rate_wpm)]
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                self._base_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        return self._process
+
+    def estimated_duration(self, text: str) -> float:
+        """Seconds espeak needs to say the text at the configured rate."""
+        return len(text.split()) * 60.0 / max(1, self.rate_wpm) + 0.2
+
+    def speak(self, text: str, voice: Optional[str] = None) -> bool:
+        line = " ".join(text.split())
+        if not line:
+            return True
+        with self._lock:
+            self._stopped.clear()
+            try:
+                process = self._ensure_process()
+                process.stdin.write((line + "\n").encode("utf-8"))
+                process.stdin.flush()
+            except (OSError, ValueError) as e:
+                if self.logger:
+                    self.logger.log_warning(f"espeak engine failed: {e}")
+                self.close()
+                return False
+            return not self._stopped.wait(self.estimated_duration(line))
+
+    def render(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        result = subprocess.run(
+            self._base_command() + ["--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=60,
+        )
+        if result.returncode != 0 or not result.stdout:
+            return None
+        return result.stdout
+
+    async def arender(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        process = await asyncio.create_subprocess_exec(
+            *self._base_command(), "--stdout", "--stdin",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(text.encode("utf-8")), timeout=60)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return None
+        if process.returncode != 0 or not stdout:
+            return None
+        return stdout
+
+    def stop(self):
+        # espeak can't be told to hush over stdin: kill it, the next message restarts it
+        process = self._process
+        if process is not None:
+            process.kill()
+        self._stopped.set()
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+            except (OSError, ValueError):
+                pass
+            try:
+                process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+
+
+# ==================== Windows SAPI ====================
+
+# Host loop: one command per stdin line, base64 fields, one reply line per command
+_SAPI_HOST = r"""
+Add-Type -AssemblyName System.Speech
+$s = New-Object System.Speech.Synthesis.SpeechSynthesizer
+$s.Rate = {rate}
+$utf8 = [Text.Encoding]::UTF8
+[Console]::Out.WriteLine('READY'); [Console]::Out.Flush()
+while (($line = [Console]::In.ReadLine()) -ne $null) {{
+  try {{
+    $parts = $line.Split(' ')
+    $text = $utf8.GetString([Convert]::FromBase64String($parts[1]))
+    if ($parts[0] -eq 'WAV') {{
+      $s.SetOutputToWaveFile($utf8.GetString([Convert]::FromBase64String($parts[2])))
+      try {{ $s.Speak($text) }} finally {{ $s.SetOutputToDefaultAudioDevice() }}
+    }} else {{
+      $s.Speak($text)
+    }}
+    [Console]::Out.WriteLine('OK')
+  }} catch {{
+    [Console]::Out.WriteLine('ERR ' + $_.Exception.Message)
+  }}
+  [Console]::Out.Flush()
+}}
+"""
+
+
+def _b64(value: str) -> str:
+    return base64.b64encode(value.encode("utf-8")).decode("ascii")
+
+
+class PowerShellSAPIEngine(SystemEngine):
+    """
+    A PowerShell host with System.Speech loaded once.
+
+    Text travels base64-encoded, so quotes and shell metacharacters in a
+    message can't break (or inject into) the command.
+    """
+
+    name = "sapi"
+
+    def __init__(self, rate_wpm: int = DEFAULT_RATE_WPM, timeout: float = 120.0, logger=None, command=None):
+        """
+        Initialize the engine (the host starts on first use).
+
+        Args:
+            rate_wpm: Speech rate in words per minute
+            timeout: Longest wait for one command (seconds)
+            logger: Logger instance
+            command: Host command override (default: powershell)
+        """
+        # SAPI rate is -10..10 around its default
+        self.rate = max(-10, min(10, round((rate_wpm - DEFAULT_RATE_WPM) / 20)))
+        self.timeout = timeout
+        self.logger = logger
+        self.command = command
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return bool(self.command or shutil.which("powershell") or shutil.which("pwsh"))
+
+    def _host_command(self) -> List[str]:
+        if self.command:
+            return list(self.command)
+        script = _SAPI_HOST.format(rate=self.rate)
+        encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+        executable = shutil.which("powershell") or shutil.which("pwsh") or "powershell"
+        return [executable, "-NoProfile", "-NoLogo", "-NonInteractive", "-EncodedCommand", encoded]
+
+    def _pump(self, process: subprocess.Popen):
+        for raw in process.stdout:
+            self._lines.put(raw.decode("utf-8", "replace").strip())
+        self._lines.put(None)
+
+    def _read_line(self) -> str:
+        line = self._lines.get(timeout=self.timeout)
+        if line is None:
+            raise ConnectionError("SAPI host exited")
+        return line
+
+    def _ensure_process(self):
+        if self._process is not None and self._process.poll() is None:
+            return
+        self._lines = queue.Queue()
+        self._process = subprocess.Popen(
+            self._host_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        threading.Thread(target=self._pump, args=(self._process,), name="VoiceSAPIHost", daemon=True).start()
+        if self._read_line() != "READY":
+            raise RuntimeError("SAPI host failed to start")
+
+    def _run(self, *fields: str) -> bool:
+        with self._lock:
+            try:
+                self._ensure_process()
+                self._process.stdin.write((" ".join(fields) + "\n").encode("ascii"))
+                self._process.stdin.flush()
+                reply = self._read_line()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_warning(f"SAPI host failed: {e}")
+                self.close()
+                return False
+            if reply != "OK" and self.logger:
+                self.logger.log_warning(f"SAPI host: {reply}")
+            return reply == "OK"
+
+    def speak(self, text: str, voice: Optional[str] = None) -> bool:
+        return self._run("SPEAK", _b64(text))
+
+    def stop(self):
+        # SAPI's Speak() blocks the host loop: end the host, the next message restarts it
+        process = self._process
+        if process is not None:
+            process.terminate()
+
+    def render(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "speech.wav"
+            if not self._run("WAV", _b64(text), _b64(str(path))):
+                return None
+            try:
+                return path.read_bytes()
+            except OSError:
+                return None
+
+    def close(self):
+        process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()  # EOF ends the host loop
+                process.wait(timeout=2.0)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                process.terminate()
+
+
+# ==================== macOS ====================
+
+class SayEngine(SystemEngine):
+    """macOS `say`, with text on stdin and optional render to WAV."""
+
+    name = "say"
+
+    def __init__(self, rate_wpm: Optional[int] = None, logger=None):
+        self.rate_wpm = rate_wpm
+        self.logger = logger
+        self._process: Optional[subprocess.Popen] = None
+
+    def available(self) -> bool:
+        return bool(shutil.which("say"))
+
+    def _base_command(self, voice: Optional[str]) -> List[str]:
+        cmd = ["say"]
+        if voice:
+            cmd.extend(["-v", voice])
+        if self.rate_wpm:
+            cmd.extend(["-r", str(self.rate_wpm)])
+        return cmd
+
+    def speak(self, text: str, voice: Optional[str] = None) -> bool:
+        self._process = subprocess.Popen(self._base_command(voice) + ["-f", "-"], stdin=subprocess.PIPE)
+        try:
+            self._process.communicate(text.encode("utf-8"))
+            return self._process.returncode == 0
+        finally:
+            self._process = None
+
+    def stop(self):
+        process = self._process
+        if process is not None:
+            process.terminate()
+
+    def render(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "speech.wav"
+            result = subprocess.run(
+                self._base_command(voice) + ["-o", str(path), "--data-format=LEI16@22050", "-f", "-"],
+                input=text.encode("utf-8"),
+                capture_output=True,
+            )
+            if result.returncode != 0 or not path.exists():
+                return None
+            return path.read_bytes()
+
+    async def arender(self, text: str, voice: Optional[str] = None) -> Optional[bytes]:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "speech.wav"
+            process = await asyncio.create_subprocess_exec(
+                *self._base_command(voice), "-o", str(path), "--data-format=LEI16@22050", "-f", "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await process.communicate(text.encode("utf-8"))
+            if process.returncode != 0 or not path.exists():
+                return None
+            return path.read_bytes()
+
+
+# ==================== Factory ====================
+
+def create_engine(system: str, language: str = "es", rate_wpm: int = DEFAULT_RATE_WPM, logger=None) -> Optional[SystemEngine]:
+    """
+    Best persistent engine for a platform.
+
+    Args:
+        system: platform.system() value
+        language: Language code for engines that take one
+        rate_wpm: Speech rate in words per minute
+        logger: Logger instance
+
+    Returns:
+        An engine (closed automatically at exit), or None if none is installed
+    """
+    candidates: List[SystemEngine] = []
+    if system == "Linux":
+        candidates = [
+            SpeechDispatcherEngine(language=language, rate_wpm=rate_wpm, logger=logger),
+            EspeakEngine(language=language, rate_wpm=rate_wpm, logger=logger),
+        ]
+    elif system == "Windows":
+        candidates = [PowerShellSAPIEngine(rate_wpm=rate_wpm, logger=logger)]
+    elif system == "Darwin":
+        candidates = [SayEngine(rate_wpm=rate_wpm, logger=logger)]
+
+    for engine in candidates:
+        if engine.available():
+            atexit.register(engine.close)
+            if logger:
+                logger.log_info(f"System TTS engine: {engine.name} (persistent)")
+            return engine
+    return None
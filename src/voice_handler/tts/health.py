@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Provider Health - The Stage Manager's Clipboard.
+
+Like the stage manager who knows which mic has been cutting out all
+night and swaps it before the next song, this module tracks every TTS
+provider's recent error rate and latency, trips a circuit breaker on
+providers that keep failing, and orders the provider chain per message:
+quality first, unless the message is urgent and a better-sounding
+provider has been too slow to make its deadline.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Circuit breaker states
+CLOSED = "closed"         # Healthy: traffic flows
+OPEN = "open"             # Tripped: skipped until the cool-down ends
+HALF_OPEN = "half_open"   # Cool-down over: next message is a probe
+
+
+# ==================== Attempt timing ====================
+
+# Per-thread timing of the provider attempt in progress, so providers can
+# report when audio actually started (synthesis latency, not playback)
+_attempt = threading.local()
+
+
+def begin_attempt():
+    """Start timing a provider attempt on this thread."""
+    _attempt.start = time.perf_counter()
+    _attempt.audio_at = None
+
+
+def audio_started():
+    """Called by providers when audio starts; first call per attempt wins."""
+    if getattr(_attempt, "start", None) is not None and _attempt.audio_at is None:
+        _attempt.audio_at = time.perf_counter()
+
+
+def attempt_latency() -> float:
+    """Seconds until audio started, or the whole attempt if it never did."""
+    start = getattr(_attempt, "start", None)
+    if start is None:
+        return 0.0
+    end = _attempt.audio_at if _attempt.audio_at is not None else time.perf_counter()
+    return end - start
+
+
+# ==================== Health ====================
+
+class ProviderHealth:
+    """
+    Rolling health of one provider with a circuit breaker.
+
+    The breaker opens after failure_threshold consecutive failures, or
+    when the error rate over the window reaches error_rate_threshold
+    (with at least min_samples outcomes). After cooldown seconds it turns
+    half-open and the next attempt decides: success closes it, failure
+    re-opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        failure_threshold: int = 3,
+        error_rate_threshold: float = 0.5,
+        min_samples: int = 5,
+        cooldown: float = 30.0,
+        ewma_alpha: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize provider health.
+
+        Args:
+            name: Provider name
+            window: Outcomes kept for the rolling error rate
+            failure_threshold: Consecutive failures that open the breaker
+            error_rate_threshold: Rolling error rate that opens the breaker
+            min_samples: Outcomes needed before the error rate counts
+            cooldown: Seconds an open breaker skips the provider
+            ewma_alpha: Weight of the newest latency sample
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window)
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.consecutive_failures = 0
+        self.latency_ewma: Optional[float] = None
+        self.trips = 0
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failures in the rolling window."""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def allow(self) -> bool:
+        """True if the provider may be tried now (closed, or cool-down over)."""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+            return self.state != OPEN
+
+    def record(self, success: bool, latency: float) -> bool:
+        """
+        Record the outcome of one attempt.
+
+        Args:
+            success: Whether the provider spoke the message
+            latency: Seconds until audio started (or until it gave up)
+
+        Returns:
+            True if this outcome tripped the breaker open
+        """
+        with self._lock:
+            self._outcomes.append(success)
+            if success:
+                self.consecutive_failures = 0
+                # Expected time to audio only learns from attempts that produced audio
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma += self.ewma_alpha * (latency - self.latency_ewma)
+                if self.state != CLOSED:
+                    # Recovered: forget the failures that opened the breaker
+                    self.state = CLOSED
+                    self.opened_at = None
+                    self._outcomes.clear()
+                    self._outcomes.append(True)
+                return False
+
+            self.consecutive_failures += 1
+            should_open = (
+                self.state == HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+                or (len(self._outcomes) >= self.min_samples and self.error_rate >= self.error_rate_threshold)
+            )
+            if should_open and self.state != OPEN:
+                self.state = OPEN
+                self.opened_at = self.clock()
+                self.trips += 1
+                return True
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable view for status and debugging."""
+        with self._lock:
+            return {
+                "state": self.state,
+                "error_rate": round(self.error_rate, 4),
+                "samples": len(self._outcomes),
+                "consecutive_failures": self.consecutive_failures,
+                "latency_ewma_ms": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+                "trips": self.trips,
+            }
+
+
+# ==================== Routing ====================
+
+class ProviderRouter:
+    """
+    Orders the provider chain per message using health and urgency.
+
+    - Providers with an open breaker are skipped (unless every provider
+      is open, then the configured chain is tried as a last resort).
+    - Without a deadline the configured order wins (best quality first).
+    - With a deadline - explicit, or implied by an urgent priority - the
+      first provider whose latency EWMA fits the remaining time goes
+      first; if none fits, the fastest goes first.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[dict] = None,
+        logger=None,
+        metrics=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            settings: provider_health config section
+            logger: Logger instance
+            metrics: Optional DaemonMetrics registry
+            clock: Monotonic time source (injectable for tests)
+        """
+        settings = settings or {}
+        self.logger = logger
+        self.metrics = metrics
+        self.clock = clock
+        self.urgent_priority = settings.get("urgent_priority", 8)
+        self.urgent_deadline = settings.get("urgent_deadline_ms", 2500) / 1000.0
+        self._health_settings = {
+            "window": settings.get("window", 20),
+            "failure_threshold": settings.get("failure_threshold", 3),
+            "error_rate_threshold": settings.get("error_rate_threshold", 0.5),
+            "min_samples": settings.get("min_samples", 5),
+            "cooldown": settings.get("cooldown_seconds", 30.0),
+            "ewma_alpha": settings.get("ewma_alpha", 0.3),
+        }
+        self._health: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+
+    def health(self, name: str) -> ProviderHealth:
+        """Health record for a provider (created on first use)."""
+        with self._lock:
+            health = self._health.get(name)
+            if health is None:
+                health = self._health[name] = ProviderHealth(name, clock=self.clock, **self._health_settings)
+            return health
+
+    def budget(self, priority: int = 5, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds left until audio should start, if the message has a deadline.
+
+        Args:
+            priority: Message priority (1-10)
+            deadline: Absolute epoch time audio should start by
+
+        Returns:
+            Remaining seconds, or None when there is no time pressure
+        """
+        if deadline is not None:
+            return deadline - time.time()
+        if priority >= self.urgent_priority:
+            return self.urgent_deadline
+        return None
+
+    def order(self, providers: List, priority: int = 5, deadline: Optional[float] = None) -> List:
+        """
+        Providers to try for one message, best first.
+
+        Args:
+            providers: Configured chain (quality order)
+            priority: Message priority (1-10)
+            deadline: Absolute epoch time audio should start by
+
+        Returns:
+            Available providers in the order to try them
+        """
+        candidates = [p for p in providers if p.available()]
+        allowed = [p for p in candidates if self.health(p.provider_name).allow()]
+        if not allowed:
+            if candidates and self.logger:
+                self.logger.log_warning("Every TTS provider is cooling down, trying the full chain")
+            return candidates
+
+        budget = self.budget(priority, deadline)
+        if budget is None:
+            return allowed
+
+        def expected(provider) -> Optional[float]:
+            return self.health(provider.provider_name).latency_ewma
+
+        fitting = [p for p in allowed if expected(p) is None or expected(p) <= budget]
+        if fitting:
+            return fitting + [p for p in allowed if p not in fitting]
+        return sorted(allowed, key=lambda p: expected(p) or 0.0)
+
+    def record(self, provider, success: bool, latency: float):
+        """Record an attempt and report breaker trips."""
+        name = provider.provider_name
+        if self.health(name).record(success, latency):
+            if self.metrics:
+                self.metrics.inc("provider_breaker_trips")
+            if self.logger:
+                self.logger.log_warning(f"TTS provider {name} tripped its circuit breaker, cooling down")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Health of every provider seen so far."""
+        with self._lock:
+            records = list(self._health.values())
+        return {health.name: health.snapshot() for health in records}
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Voice Identity - The Stage Persona.
+
+Six OpenAI voices run out fast when many Claude Code sessions talk at
+once: the seventh used to get the least recently used session's voice
+and sound exactly like it. A session is now identified by a combination
+of traits:
+
+- voice: one of the six OpenAI voices
+- speed: a speaking-rate multiplier (tts-1 speed; a pace hint for steerable TTS)
+- variant: a delivery style for steerable TTS (neutral, warm, bright)
+- earcon: a short motif played before each announcement (see earcons.py)
+
+IdentitySpace hands out the combination that differs most from every
+active session, weighting the traits by how easily they are heard
+(a different voice counts more than a different earcon).
+
+While a message is spoken, TTSProvider makes its identity the current
+one (speaking_as) and the providers read it with current_identity().
+"""
+
+import contextvars
+from contextlib import contextmanager
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+FEMALE_VOICES = ("nova", "shimmer", "alloy")  # alloy is neutral but leans feminine
+MALE_VOICES = ("echo", "fable", "onyx")
+
+# Speed tiers, in the order they are handed out
+SPEEDS = (1.0, 0.9, 1.12)
+
+# Steerable TTS delivery styles, in the order they are handed out
+VARIANTS = {
+    "neutral": "",
+    "warm": "Use a warm, low-pitched, relaxed delivery.",
+    "bright": "Use a bright, higher-pitched, energetic delivery.",
+}
+
+# How much a difference in each trait counts (roughly: how easy it is to hear)
+VOICE_WEIGHT = 4.0
+GENDER_WEIGHT = 1.0
+SPEED_WEIGHT = 2.0  # per tier step
+VARIANT_WEIGHT = 1.5
+EARCON_WEIGHT = 1.0
+
+_current: contextvars.ContextVar = contextvars.ContextVar("voice_identity", default=None)
+
+
+@dataclass(frozen=True)
+class VoiceIdentity:
+    """How one session sounds."""
+    voice: str
+    speed: float = 1.0
+    variant: str = "neutral"
+    earcon: Optional[int] = None
+
+    @property
+    def style(self) -> str:
+        """Delivery instruction for steerable TTS ("" for neutral)."""
+        return VARIANTS.get(self.variant, "")
+
+    @property
+    def pace(self) -> str:
+        """Pace instruction for steerable TTS ("" at normal speed)."""
+        if self.speed > 1.0:
+            return "Speak slightly faster than usual."
+        if self.speed < 1.0:
+            return "Speak slightly slower than usual."
+        return ""
+
+    def describe(self) -> str:
+        """Short label for logs, e.g. "echo x0.9 warm #3"."""
+        label = self.voice
+        if self.speed != 1.0:
+            label += f" x{self.speed:g}"
+        if self.variant != "neutral":
+            label += f" {self.variant}"
+        if self.earcon is not None:
+            label += f" #{self.earcon}"
+        return label
+
+
+def _gender(voice: str) -> Optional[str]:
+    if voice in FEMALE_VOICES:
+        return "female"
+    if voice in MALE_VOICES:
+        return "male"
+    return None
+
+
+def distance(a: VoiceIdentity, b: VoiceIdentity) -> float:
+    """
+    How different two identities sound.
+
+    Args:
+        a: First identity
+        b: Second identity
+
+    Returns:
+        Weighted sum of the traits that differ (0 for the same identity)
+    """
+    d = 0.0
+    if a.voice != b.voice:
+        d += VOICE_WEIGHT
+        if _gender(a.voice) != _gender(b.voice):
+            d += GENDER_WEIGHT
+    if a.speed != b.speed:
+        tiers = sorted(SPEEDS)
+        if a.speed in tiers and b.speed in tiers:
+            d += SPEED_WEIGHT * abs(tiers.index(a.speed) - tiers.index(b.speed))
+        else:
+            d += SPEED_WEIGHT
+    if a.variant != b.variant:
+        d += VARIANT_WEIGHT
+    if a.earcon != b.earcon:
+        d += EARCON_WEIGHT
+    return d
+
+
+class IdentitySpace:
+    """
+    Every identity sessions can be given, and the rule for picking one.
+
+    assign() returns the candidate whose nearest active identity is
+    farthest away (ties: the larger total distance, then the earlier
+    candidate). Candidates are ordered voice first, alternating
+    feminine and masculine voices, so the first sessions mostly differ
+    by voice, as before.
+    """
+
+    def __init__(self, vary_delivery: bool = True, earcons: int = 0):
+        """
+        Initialize the space.
+
+        Args:
+            vary_delivery: Vary speed and delivery style, not just the voice
+            earcons: Number of earcon motifs to hand out (0: no earcons)
+        """
+        speeds = SPEEDS if vary_delivery else (1.0,)
+        variants = tuple(VARIANTS) if vary_delivery else ("neutral",)
+        earcon_ids = tuple(range(earcons)) if earcons else (None,)
+        voices = [v for pair in zip(FEMALE_VOICES, MALE_VOICES) for v in pair]
+        self.candidates: List[VoiceIdentity] = [
+            VoiceIdentity(voice, speed, variant, earcon)
+            for voice in voices
+            for earcon in earcon_ids
+            for speed in speeds
+            for variant in variants
+        ]
+
+        self._base: Dict[tuple, float] = {}
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _base_distance(self, a: tuple, b: tuple) -> float:
+        """distance() between (voice, speed, variant) traits, ignoring the earcon (memoized)."""
+        key = (a, b)
+        d = self._base.get(key)
+        if d is None:
+            d = self._base[key] = distance(VoiceIdentity(*a), VoiceIdentity(*b))
+        return d
+
+    def assign(self, active: Iterable[VoiceIdentity], preferred_voice: Optional[str] = None) -> VoiceIdentity:
+        """
+        Pick the identity that sounds least like the active sessions.
+
+        Args:
+            active: Identities of the sessions still alive
+            preferred_voice: Voice to use if no active session has it
+
+        Returns:
+            The chosen identity
+        """
+        counts = Counter(active)
+        candidates: Sequence[VoiceIdentity] = self.candidates
+        if preferred_voice and all(identity.voice != preferred_voice for identity in counts):
+            candidates = [c for c in self.candidates if c.voice == preferred_voice] or self.candidates
+        if not counts:
+            return candidates[0]
+
+        # Sessions grouped by everything but the earcon: at most 54 groups,
+        # however many sessions there are
+        groups: Dict[tuple, Counter] = {}
+        for identity, count in counts.items():
+            groups.setdefault((identity.voice, identity.speed, identity.variant), Counter())[identity.earcon] += count
+
+        best, best_score = candidates[0], (-1.0, -1.0)
+        for candidate in candidates:
+            if candidate in counts:
+                continue
+            traits = (candidate.voice, candidate.speed, candidate.variant)
+            nearest, total = float("inf"), 0.0
+            for group, earcons in groups.items():
+                base = self._base_distance(traits, group)
+                sessions = sum(earcons.values())
+                same_earcon = earcons.get(candidate.earcon, 0)
+                nearest = min(nearest, base if same_earcon else base + EARCON_WEIGHT)
+                total += base * sessions + EARCON_WEIGHT * (sessions - same_earcon)
+            if (nearest, total) > best_score:
+                best, best_score = candidate, (nearest, total)
+        if best_score[0] < 0:
+            # Every identity is taken: share the one used by the fewest sessions
+            best = min(candidates, key=lambda c: counts[c])
+        return best
+
+
+@contextmanager
+def speaking_as(identity: Optional[VoiceIdentity]) -> Iterator[None]:
+    """Make identity the current one for the message spoken inside the block."""
+    token = _current.set(identity)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_identity() -> Optional[VoiceIdentity]:
+    """Identity of the message being spoken (None outside speaking_as)."""
+    return _current.get()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Speech Normalizer - The Lyric Sheet.
+
+Before the singer goes on, someone writes out how every awkward word is
+sung: "provider.py" becomes "archivo python provider", "200ms" becomes
+"200 milisegundos", "getUserName" becomes "get user name". The readings
+live in speech_lexicon.json (Spanish and English); they are compiled
+once into a single regular expression, so a message is normalized in
+one pass instead of a chain of str.replace() calls that mangled
+".json" via ".js" and turned every "-" into a space.
+"""
+
+import json
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+LEXICON_PATH = Path(__file__).with_name("speech_lexicon.json")
+DEFAULT_LANGUAGE = "es"
+
+# Word breaks inside identifiers: separators and camelCase humps
+_SPLIT_WORDS = re.compile(r"[\W_]+|(?<=[a-z\d])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Regex alternation for a set of words, factored as a trie.
+
+    Shared prefixes are matched once ("js|json|jsonl" becomes
+    "js(?:on(?:l)?)?"), so a miss costs one failed character test
+    instead of one per word.
+
+    Args:
+        words: Literal words
+
+    Returns:
+        Regex source (no surrounding group)
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        optional = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+def load_lexicon(path: Optional[Path] = None) -> dict:
+    """Read the speech lexicon (default: the packaged speech_lexicon.json)."""
+    with open(path or LEXICON_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class SpeechNormalizer:
+    """
+    Rewrites technical text into something a TTS engine reads naturally.
+
+    One compiled pattern, tried left to right at each position:
+    - URLs: "un enlace a github" / "a link to github"
+    - Paths: only the last component is read ("src/tts/provider.py")
+    - File names: known extensions, longest match with a word boundary
+    - Versions and dotted numbers: "v1.2.3" -> "versión 1 punto 2 punto 3"
+    - Numbers: units ("200ms", "50%"), ranges ("10-20"), negatives, "#12"
+    - Identifiers: snake_case, kebab-case, camelCase and PascalCase split into words
+    - Pronunciations: acronyms and tool names (API, npm, JSON...)
+    - A lone dash becomes a pause; list bullets are dropped
+
+    Dates (2024-01-31) and ordinary words are left alone. Output is
+    stable: normalizing it again changes nothing.
+    """
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE, lexicon: Optional[dict] = None, cache_size: int = 512):
+        """
+        Compile the lexicon for one language.
+
+        Args:
+            language: "es" or "en" (unknown languages read as Spanish)
+            lexicon: Lexicon data (default: speech_lexicon.json)
+            cache_size: Normalized messages remembered (hook phrases repeat a lot)
+        """
+        lexicon = lexicon if lexicon is not None else load_lexicon()
+        self.language = language if language in ("es", "en") else DEFAULT_LANGUAGE
+
+        def pick(entries: dict) -> dict:
+            return {key: value[self.language] for key, value in entries.items() if self.language in value}
+
+        self.phrases = pick(lexicon.get("phrases", {}))
+        self.extensions = {ext.lower(): kind for ext, kind in pick(lexicon.get("extensions", {})).items()}
+        self.words = {word.lower(): reading for word, reading in pick(lexicon.get("words", {})).items()}
+        self.units = pick(lexicon.get("units", {}))
+
+        spaced_units = [unit for unit in self.units if len(unit) > 1 and unit != "%"]
+        tight_units = [unit for unit in self.units if len(unit) == 1 and unit != "%"]
+        unit_alternatives = []
+        if spaced_units:
+            unit_alternatives.append(r"\s?(?P<unit>" + _trie_pattern(spaced_units) + r")\b")
+        if "%" in self.units:
+            unit_alternatives.append(r"\s?(?P<percent>%)")
+        if tight_units:
+            unit_alternatives.append(r"(?P<tight>" + _trie_pattern(tight_units) + r")\b")
+
+        rules = [
+            r"(?P<url>\bhttps?://[^\s<>\"')\]]+)",
+            r"(?P<date>\b\d{4}-\d{2}-\d{2}\b)",
+            r"(?P<path>(?<![\w.@/\\-])(?:[A-Za-z]:|~|\.{1,2})?[/\\]?(?:[\w.@-]+[/\\])+[\w.@-]*)",
+        ]
+        if self.extensions:
+            rules.append(
+                r"(?P<file>(?<![\w.@-])(?P<stem>[\w-]+(?:\.[\w-]+)*?)\.(?P<ext>(?i:"
+                + _trie_pattern(self.extensions)
+                + r"))(?![\w-]|\.\w))"
+            )
+        rules += [
+            r"(?P<version>\b[vV](?P<vnumber>\d+(?:\.\d+)*)\b|\b(?P<dotted>\d+(?:\.\d+){2,})\b)",
+            r"(?P<issue>(?<![\w&])#(?P<inumber>\d+)\b)",
+            r"(?P<range>(?<![\w.-])(?P<rstart>\d+)-(?=\d)(?!\d+-\d))",
+            r"(?P<minus>(?<![\w.)-])-(?=\d))",
+        ]
+        if unit_alternatives:
+            rules.append(
+                r"(?P<measure>(?<![\w.])(?P<mvalue>\d+(?:[.,]\d+)?)(?:" + "|".join(unit_alternatives) + r"))"
+            )
+        rules += [
+            r"(?P<bullet>^[ \t]*[-*•][ \t]+)",
+            r"(?P<ident>(?<![\w-])_*[^\W_]+(?:(?:_+|-)[^\W_]+)+_*(?![\w-])"
+            r"|(?<!\w)_+[^\W_]+_*(?!\w)"
+            r"|\b[a-z][a-z\d]*[A-Z]\w*|\b[A-Z][a-z\d]+[A-Z]\w*|\b[A-Z]+[A-Z][a-z]{2,}\w*)",
+        ]
+        if self.words:
+            rules.append(r"(?P<word>\b(?i:" + _trie_pattern(self.words) + r")\b)")
+
+        # Every rule but the pause starts a token: one lookbehind rejects
+        # positions inside words before any alternative is tried
+        self._pattern = re.compile(
+            r"(?P<pause>[ \t]+[-–—]{1,2}(?=\s))|(?<!\w)(?:" + "|".join(rules) + ")",
+            re.MULTILINE,
+        )
+        self._handlers = {
+            "url": self._url,
+            "date": self._keep,
+            "path": self._path,
+            "file": self._file,
+            "version": self._version,
+            "issue": self._issue,
+            "range": self._range,
+            "minus": self._minus,
+            "measure": self._measure,
+            "bullet": self._drop,
+            "pause": self._pause,
+            "ident": self._ident,
+            "word": self._word,
+        }
+        self._cached = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def normalize(self, message: str) -> str:
+        """
+        Normalize a message for speech.
+
+        Args:
+            message: Technical message text
+
+        Returns:
+            Speech-formatted message
+        """
+        return self._cached(message)
+
+    def _normalize(self, message: str) -> str:
+        return self._pattern.sub(self._replace, message)
+
+    def _replace(self, match: "re.Match") -> str:
+        return self._handlers[match.lastgroup](match)
+
+    # Readings
+
+    def speak_words(self, text: str) -> str:
+        """Read an identifier-like string word by word, with pronunciations."""
+        spoken = []
+        for part in _SPLIT_WORDS.split(text):
+            if not part:
+                continue
+            lower = part.lower()
+            if lower in self.words:
+                spoken.append(self.words[lower])
+            else:
+                spoken.append(part if part.isupper() and len(part) > 1 else lower)
+        return " ".join(spoken)
+
+    def _phrase(self, phrase: str, **values) -> str:
+        return self.phrases[phrase].format(**values)
+
+    def _point(self, number: str) -> str:
+        return f" {self.phrases['point']} ".join(number.split("."))
+
+    # Handlers (one per named rule)
+
+    def _keep(self, match: "re.Match") -> str:
+        return match.group()
+
+    def _drop(self, match: "re.Match") -> str:
+        return ""
+
+    def _pause(self, match: "re.Match") -> str:
+        return ","
+
+    def _url(self, match: "re.Match") -> str:
+        url = match.group()
+        trailing = len(url) - len(url.rstrip(".,;:!?"))
+        host = url[:len(url) - trailing].split("://", 1)[1].split("/", 1)[0].split(":", 1)[0]
+        labels = [label for label in host.split(".") if label]
+        # The site name alone: "api.openai.com" is read "openai"
+        site = labels[-2] if len(labels) > 1 else (labels[0] if labels else "")
+        spoken = self._phrase("link", host=self.speak_words(site))
+        return spoken + url[len(url) - trailing:] if trailing else spoken
+
+    def _path(self, match: "re.Match") -> str:
+        text = match.group()
+        body = text.rstrip(".")
+        trailing = text[len(body):]
+        components = re.split(r"[/\\]", body)
+        name = next((c for c in reversed(components) if c), "")
+        is_path = any(c.isalpha() for c in body) and (
+            body[:1] in "/\\~."
+            or re.match(r"[A-Za-z]:", body) is not None
+            or len(components) > 2
+            or self._file_match(name) is not None
+        )
+        if not is_path:
+            # "y/o", "read/write": ordinary words joined by a slash
+            return "/".join(self._pattern.sub(self._replace, c) for c in components) + trailing
+        if not name:
+            return trailing
+        if body.endswith(("/", "\\")):
+            return self._phrase("folder", name=self.speak_words(name)) + trailing
+        return self._pattern.sub(self._replace, name) + trailing
+
+    def _file_match(self, name: str) -> Optional["re.Match"]:
+        if not self.extensions:
+            return None
+        match = self._pattern.fullmatch(name)
+        return match if match is not None and match.lastgroup == "file" else None
+
+    def _file(self, match: "re.Match") -> str:
+        kind = self.extensions[match.group("ext").lower()]
+        return self._phrase("file", kind=kind, name=self.speak_words(match.group("stem")))
+
+    def _version(self, match: "re.Match") -> str:
+        if match.group("vnumber") is not None:
+            number = self._point(match.group("vnumber"))
+            before = match.string[max(0, match.start() - 9):match.start()].rstrip().lower()
+            if before.endswith(("versión", "version")):
+                return number  # "la versión v1.2" is not read "versión versión 1 punto 2"
+            return self._phrase("version", number=number)
+        return self._point(match.group("dotted"))
+
+    def _issue(self, match: "re.Match") -> str:
+        return self._phrase("issue", number=match.group("inumber"))
+
+    def _range(self, match: "re.Match") -> str:
+        # Only the start and the dash: the end is read by the following rules ("10-20ms")
+        return f"{match.group('rstart')} {self.phrases['range']} "
+
+    def _minus(self, match: "re.Match") -> str:
+        return f"{self.phrases['minus']} "
+
+    def _measure(self, match: "re.Match") -> str:
+        value = match.group("mvalue")
+        unit = match.group("unit") or match.group("tight") or match.group("percent")
+        singular, plural = self.units[unit]
+        return f"{value} {singular if value == '1' else plural}"
+
+    def _ident(self, match: "re.Match") -> str:
+        text = match.group()
+        return self.words.get(text.lower()) or self.speak_words(text)
+
+    def _word(self, match: "re.Match") -> str:
+        return self.words[match.group().lower()]
+
+
+_normalizers: Dict[str, SpeechNormalizer] = {}
+_normalizers_lock = threading.Lock()
+
+
+def get_speech_normalizer(language: str = DEFAULT_LANGUAGE) -> SpeechNormalizer:
+    """Get or create the process-wide normalizer for a language (thread-safe)."""
+    normalizer = _normalizers.get(language)
+    if normalizer is None:
+        with _normalizers_lock:
+            normalizer = _normalizers.get(language)
+            if normalizer is None:
+                normalizer = _normalizers[language] = SpeechNormalizer(language)
+    return normalizer
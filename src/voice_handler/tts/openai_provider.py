@@ -6,21 +6,24 @@ Premium audio quality from OpenAI's text-to-speech API with optional
 accent steering using GPT-4o-mini-audio-preview.
 """
 
+import asyncio
 import os
+import time
 import base64
-import platform
-import subprocess
-import tempfile
-from pathlib import Path
-from typing import Optional
+from functools import partial
+from typing import List, Optional
 
 from voice_handler.tts.base import TTSProviderInterface
-
-# Optional imports for OpenAI TTS
+from voice_handler.tts.chunker import split_into_chunks, synthesize_in_order
+from voice_handler.tts.audio_cache import AudioCache
+from voice_handler.tts.compressor import SpeechCompressor
+from voice_handler.tts.identity import VoiceIdentity, current_identity
+from voice_handler.tts.playback import get_playback_controller, play_audio
+from voice_handler.utils import tracing
+
+# Optional imports for OpenAI TTS (audio output is tts/playback.py's concern)
 try:
-    from openai import OpenAI
-    import sounddevice as sd
-    import soundfile as sf
+    from openai import AsyncOpenAI, OpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
@@ -31,14 +34,24 @@ class OpenAITTSProvider(TTSProviderInterface):
     OpenAI TTS provider with support for both basic TTS and steerable TTS.
 
     Steerable TTS uses gpt-4o-mini-audio-preview for accent control.
-    Basic TTS uses tts-1 with speed control and GPT-4o-mini compression.
+    Basic TTS uses tts-1 with speed control and GPT-4o-mini compression
+    (prepared ahead of playback by SpeechCompressor).
+
+    The current session identity (see tts/identity.py) scales the tts-1
+    speed and adds its delivery style and pace to the steerable prompt.
+
+    arender() synthesizes with AsyncOpenAI for the async daemon runtime.
     """
 
     def __init__(
         self,
         config: Optional[dict] = None,
         logger=None,
-        use_steerable: bool = True
+        use_steerable: bool = True,
+        metrics=None,
+        basic_fallback: bool = True,
+        client=None,
+        async_client=None,
     ):
         """
         Initialize OpenAI TTS provider.
@@ -47,11 +60,19 @@ class OpenAITTSProvider(TTSProviderInterface):
             config: Voice configuration
             logger: Logger instance
             use_steerable: Whether to use steerable TTS with accent
+            metrics: Optional DaemonMetrics registry
+            basic_fallback: Fall back to basic TTS inside speak() when
+                steerable fails (False when basic is its own chain entry)
+            client: Existing OpenAI client to share (one connection pool)
+            async_client: Existing AsyncOpenAI client (default: created on first arender)
         """
         self.config = config or {}
         self.logger = logger
+        self.metrics = metrics
         self.use_steerable = use_steerable
-        self.client: Optional[OpenAI] = None
+        self.basic_fallback = basic_fallback
+        self.client: Optional[OpenAI] = client
+        self.async_client = async_client
 
         # Load config values
         message_limits = self.config.get("message_limits", {})
@@ -60,11 +81,35 @@ class OpenAITTSProvider(TTSProviderInterface):
 
         tts_settings = self.config.get("tts_settings", {})
         self.openai_speed = tts_settings.get("openai_speed", 0.95)
+        self.chunked_synthesis = tts_settings.get("chunked_synthesis", True)
+        self.chunk_min_chars = tts_settings.get("chunk_min_chars", 160)
+        self.chunk_first_chars = tts_settings.get("chunk_first_chars", 80)
+        self.chunk_max_chars = tts_settings.get("chunk_max_chars", 250)
+        self.chunk_workers = tts_settings.get("chunk_workers", 3)
+        self.compressor: Optional[SpeechCompressor] = None
+        self.audio_cache: Optional[AudioCache] = None
+        if tts_settings.get("audio_cache", True):
+            self.audio_cache = AudioCache(
+                max_bytes=tts_settings.get("audio_cache_mb", 50) * 1024 * 1024,
+                metrics=self.metrics,
+            )
 
         # Initialize OpenAI client if API key available
-        if OPENAI_AVAILABLE and os.environ.get("OPENAI_API_KEY"):
+        if OPENAI_AVAILABLE and (self.client is not None or os.environ.get("OPENAI_API_KEY")):
             try:
-                self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+                if self.client is None:
+                    self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+                self.compressor = SpeechCompressor(
+                    self.client,
+                    max_chars=message_limits.get("max_chars", 300),
+                    min_chars=self.min_chars_for_compression,
+                    budget=tts_settings.get("compression_budget_ms", 1200) / 1000.0,
+                    request_timeout=tts_settings.get("llm_timeout", 5),
+                    max_tokens=tts_settings.get("max_tokens_llm", 100),
+                    cache_size=tts_settings.get("compression_cache_size", 256),
+                    logger=self.logger,
+                    metrics=self.metrics,
+                )
                 if self.logger:
                     self.logger.log_info("OpenAI TTS provider initialized")
             except Exception as e:
@@ -74,7 +119,7 @@ class OpenAITTSProvider(TTSProviderInterface):
 
     @property
     def provider_name(self) -> str:
-        return "OpenAI"
+        return "OpenAI-Steerable" if self.use_steerable else "OpenAI"
 
     def available(self) -> bool:
         """Check if OpenAI client is available."""
@@ -106,12 +151,68 @@ class OpenAITTSProvider(TTSProviderInterface):
         if self.use_steerable:
             if self._speak_steerable(message, voice):
                 return True
+            if not self.basic_fallback:
+                return False
             if self.logger:
                 self.logger.log_debug("Steerable TTS failed, trying basic TTS")
 
         # Fallback to basic TTS
         return self._speak_basic(message, voice)
 
+    def _default_voice(self) -> str:
+        return self.config.get("voice_settings", {}).get("openai_voice", "nova")
+
+    def _speech_chunks(self, text: str) -> List[str]:
+        """Sentence chunks for incremental synthesis ([text] when chunking doesn't apply)."""
+        if not self.chunked_synthesis or len(text) < self.chunk_min_chars:
+            return [text]
+        return split_into_chunks(text, self.chunk_first_chars, self.chunk_max_chars) or [text]
+
+    def _speak_chunks(self, chunks: List[str], voice: str, synthesize, event_name: str, text: str) -> bool:
+        """
+        Synthesize chunks concurrently and play them in order.
+
+        Args:
+            chunks: Sentence chunks in speaking order
+            voice: OpenAI voice selection
+            synthesize: Bound synthesis method (chunk, voice) -> audio bytes
+            event_name: Provider name for the TTS event log
+            text: Full text, for the TTS event log
+
+        Returns:
+            True if at least one chunk was played
+        """
+        if self.logger:
+            self.logger.log_debug(f"Speaking {len(chunks)} chunks with {self.chunk_workers} workers")
+
+        playback_start = time.perf_counter()
+
+        def play(index: int, audio_bytes: bytes):
+            tracing.mark("synthesis_done")
+            self._play_audio(audio_bytes, finish=False)
+
+        def failed(index: int, chunk: str):
+            if self.logger:
+                self.logger.log_warning(f"Chunk {index + 1}/{len(chunks)} failed to synthesize, skipping")
+
+        played = synthesize_in_order(
+            chunks,
+            lambda chunk: synthesize(chunk, voice),
+            play,
+            max_workers=self.chunk_workers,
+            on_failure=failed,
+            cancelled=lambda: get_playback_controller().interrupted is not None,
+        )
+        if not played:
+            return False
+
+        tracing.mark("playback_end")
+        if self.metrics:
+            self.metrics.observe("playback_duration_seconds", time.perf_counter() - playback_start)
+        if self.logger:
+            self.logger.log_tts_event(event_name, True, voice=voice, text=text)
+        return True
+
     def _speak_steerable(self, message: str, voice: Optional[str] = None) -> bool:
         """
         Generate speech using gpt-4o-mini-audio-preview with accent steering.
@@ -123,56 +224,114 @@ class OpenAITTSProvider(TTSProviderInterface):
         Returns:
             True if successful, False otherwise
         """
+        voice = voice or self._default_voice()
+        # Read on this thread: chunk workers don't see the speaking context
+        synthesize = partial(self._synthesize_steerable, identity=current_identity())
+
+        chunks = self._speech_chunks(message)
+        if len(chunks) > 1:
+            return self._speak_chunks(chunks, voice, synthesize, "OpenAI-Steerable", message)
+
         try:
-            # Get accent config
-            voice_settings = self.config.get("voice_settings", {})
-            accent = voice_settings.get("accent", "mexicano")
-            voice = voice or voice_settings.get("openai_voice", "nova")
+            audio_bytes = synthesize(message, voice)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_warning(f"Steerable TTS failed: {e}")
+            return False
+        tracing.mark("synthesis_done")
 
-            # System prompt for accent - VERBATIM reading
-            accent_prompt = f"""Your only task is to read the user's text EXACTLY as written with a {accent} accent.
+        # Play audio with cleanup
+        self._play_audio(audio_bytes)
 
-CRITICAL INSTRUCTIONS:
-- Read ONLY the exact text provided, word-for-word, character-for-character
-- Apply {accent} accent and intonation to your speech
-- Do NOT interpret, paraphrase, summarize, or change any words
-- Do NOT add commentary, explanations, or your own words
-- Do NOT answer questions in the text - just read them aloud
-- Do NOT correct grammar or spelling - read it exactly as written
-- Preserve all punctuation, capitalization, and formatting in your speech rhythm
+        if self.logger:
+            self.logger.log_tts_event("OpenAI-Steerable", True, voice=voice, text=message)
 
-You are a voice reader, not a conversational assistant. Read the text verbatim with {accent} pronunciation."""
+        return True
 
-            if self.logger:
-                self.logger.log_debug(f"Using gpt-4o-mini-audio-preview with {accent} accent, voice: {voice}")
+    def _synthesize_steerable(self, message: str, voice: str, identity: Optional[VoiceIdentity] = None) -> bytes:
+        """
+        Synthesize one text with gpt-4o-mini-audio-preview accent steering.
+
+        Args:
+            message: Text to read verbatim
+            voice: OpenAI voice selection
+            identity: Session identity (delivery style and pace)
+
+        Returns:
+            WAV audio bytes
 
+        Raises:
+            Exception: On any API error
+        """
+        accent = self._accent()
+        delivery = self._delivery(identity)
+        if self.logger:
+            self.logger.log_debug(f"Using gpt-4o-mini-audio-preview with {accent} accent, voice: {voice}")
+
+        def synthesize() -> bytes:
             # Use chat completions with audio modality
+            synthesis_start = time.perf_counter()
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini-audio-preview",
                 modalities=["text", "audio"],
                 audio={"voice": voice, "format": "wav"},
-                messages=[
-                    {"role": "system", "content": accent_prompt},
-                    {"role": "user", "content": message}
-                ]
+                messages=self._steerable_messages(message, accent, delivery),
             )
 
             # Extract audio data
             audio_data = response.choices[0].message.audio.data
             audio_bytes = base64.b64decode(audio_data)
+            if self.metrics:
+                self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+            return audio_bytes
+
+        return self._cached(self._steerable_key(accent, voice, delivery, message), synthesize)
+
+    def _accent(self) -> str:
+        return self.config.get("voice_settings", {}).get("accent", "mexicano")
+
+    @staticmethod
+    def _delivery(identity: Optional[VoiceIdentity]) -> str:
+        """Extra steerable instructions for a session identity ("" for none)."""
+        if identity is None:
+            return ""
+        return " ".join(part for part in (identity.style, identity.pace) if part)
+
+    @staticmethod
+    def _steerable_key(accent: str, voice: str, delivery: str, message: str) -> tuple:
+        """Cache key parts (unchanged for the default delivery, so existing entries still hit)."""
+        if delivery:
+            return ("gpt-4o-mini-audio-preview", accent, voice, delivery, message)
+        return ("gpt-4o-mini-audio-preview", accent, voice, message)
+
+    def _speed(self, identity: Optional[VoiceIdentity]) -> float:
+        """tts-1 speed for a session identity (configured speed × identity multiplier)."""
+        if identity is None or identity.speed == 1.0:
+            return self.openai_speed
+        return round(max(0.25, min(4.0, self.openai_speed * identity.speed)), 3)
+
+    @staticmethod
+    def _steerable_messages(message: str, accent: str, delivery: str = "") -> list:
+        """Chat messages asking gpt-4o-mini-audio-preview to read the text verbatim."""
+        # System prompt for accent - VERBATIM reading
+        accent_prompt = f"""Your only task is to read the user's text EXACTLY as written with a {accent} accent.
 
-            # Play audio with cleanup
-            self._play_audio(audio_bytes)
-
-            if self.logger:
-                self.logger.log_tts_event("OpenAI-Steerable", True, voice=voice, text=message)
-
-            return True
+CRITICAL INSTRUCTIONS:
+- Read ONLY the exact text provided, word-for-word, character-for-character
+- Apply {accent} accent and intonation to your speech
+- Do NOT interpret, paraphrase, summarize, or change any words
+- Do NOT add commentary, explanations, or your own words
+- Do NOT answer questions in the text - just read them aloud
+- Do NOT correct grammar or spelling - read it exactly as written
+- Preserve all punctuation, capitalization, and formatting in your speech rhythm
 
-        except Exception as e:
-            if self.logger:
-                self.logger.log_warning(f"Steerable TTS failed: {e}")
-            return False
+You are a voice reader, not a conversational assistant. Read the text verbatim with {accent} pronunciation."""
+        if delivery:
+            accent_prompt += f"\n\n{delivery}"
+        return [
+            {"role": "system", "content": accent_prompt},
+            {"role": "user", "content": message}
+        ]
 
     def _speak_basic(self, message: str, voice: Optional[str] = None) -> bool:
         """
@@ -186,30 +345,34 @@ You are a voice reader, not a conversational assistant. Read the text verbatim w
             True if successful, False otherwise
         """
         try:
-            voice_settings = self.config.get("voice_settings", {})
-            voice = voice or voice_settings.get("openai_voice", "nova")
+            voice = voice or self._default_voice()
 
             if self.logger:
                 self.logger.log_info(f"OpenAI TTS Original text: '{message}'")
 
             # Compress the message for better speech
             compressed_message = self._compress_text(message)
+            tracing.mark("compression_done")
 
             if self.logger:
                 if compressed_message != message:
                     self.logger.log_info(f"OpenAI TTS Compressed text: '{compressed_message}'")
                 self.logger.log_debug(f"Using OpenAI TTS with voice: {voice}")
 
+            # Read on this thread: chunk workers don't see the speaking context
+            synthesize = partial(self._synthesize_basic, identity=current_identity())
+
+            chunks = self._speech_chunks(compressed_message)
+            if len(chunks) > 1:
+                if self._speak_chunks(chunks, voice, synthesize, "OpenAI", compressed_message):
+                    return True
+                raise RuntimeError("no chunk could be synthesized")
+
             # Generate speech
-            response = self.client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=compressed_message,
-                speed=self.openai_speed,
-            )
+            audio_bytes = synthesize(compressed_message, voice)
+            tracing.mark("synthesis_done")
 
             # Play audio with cleanup
-            audio_bytes = b''.join(response.iter_bytes())
             self._play_audio(audio_bytes)
 
             if self.logger:
@@ -222,98 +385,164 @@ You are a voice reader, not a conversational assistant. Read the text verbatim w
                 self.logger.log_tts_event("OpenAI", False, voice=voice, error=str(e))
             return False
 
-    def _compress_text(self, text: str) -> str:
+    def _synthesize_basic(self, text: str, voice: str, identity: Optional[VoiceIdentity] = None) -> bytes:
         """
-        Use GPT-4o-mini to compress verbose text for natural speech.
+        Synthesize one text with tts-1.
 
         Args:
-            text: Original text to compress
+            text: Text to speak
+            voice: OpenAI voice selection
+            identity: Session identity (speed multiplier)
 
         Returns:
-            Compressed, speech-optimized text
+            Audio bytes
+
+        Raises:
+            Exception: On any API error
         """
-        # Skip compression for short messages
-        if len(text) < self.min_chars_for_compression:
-            if self.logger:
-                self.logger.log_debug(f"Skipping compression for short message ({len(text)} chars)")
-            return text
+        speed = self._speed(identity)
 
-        try:
-            prompt = f"""Eres un asistente que hace respuestas técnicas largas más concisas para salida de voz.
-Tu tarea es reformular el siguiente texto para que sea más corto y conversacional,
-preservando toda la información clave. Enfócate solo en los detalles más importantes.
-Sé breve pero claro, ya que esto será hablado en voz alta.
+        def synthesize() -> bytes:
+            synthesis_start = time.perf_counter()
+            response = self.client.audio.speech.create(
+                model="tts-1",
+                voice=voice,
+                input=text,
+                speed=speed,
+            )
+            audio_bytes = b''.join(response.iter_bytes())
+            if self.metrics:
+                self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+            return audio_bytes
 
-IMPORTANTE - MANEJO DE BLOQUES DE CÓDIGO:
-- No incluyas bloques de código completos en tu respuesta
-- En su lugar, menciona brevemente "Creé código para X" o "Aquí hay un script que hace Y"
-- Para bloques grandes de código, solo di algo como "Escribí una función Python que maneja autenticación de usuarios"
-- NO intentes leer la sintaxis del código
-- Solo describe qué hace el código en máximo 1 oración
+        return self._cached(("tts-1", voice, speed, text), synthesize)
 
-CRÍTICO - IDIOMA:
-- SIEMPRE responde en ESPAÑOL
-- Mantén el mismo idioma del texto original
-- NO traduzcas a inglés
+    def _get_async_client(self):
+        """AsyncOpenAI client for arender (created on first use, on the daemon's loop)."""
+        if self.async_client is None and os.environ.get("OPENAI_API_KEY"):
+            self.async_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        return self.async_client
 
-Texto original:
-{text}
+    async def arender(self, message: str, voice: Optional[str] = None) -> Optional[bytes]:
+        """
+        Synthesize a message without playing it (AsyncOpenAI).
 
-Devuelve solo el texto comprimido en ESPAÑOL, sin explicación ni introducción."""
+        Messages long enough to be chunked return None: speak() already
+        streams those sentence by sentence.
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1,
-                max_tokens=1024,
+        Args:
+            message: Text to speak
+            voice: OpenAI voice selection
+
+        Returns:
+            Audio bytes, or None to have speak() handle the message
+
+        Raises:
+            Exception: On any API error
+        """
+        if not self.available() or len(message.strip()) < self.min_chars_for_tts:
+            return None
+        client = self._get_async_client()
+        if client is None:
+            return None
+        voice = voice or self._default_voice()
+        identity = current_identity()
+
+        if self.use_steerable:
+            if len(self._speech_chunks(message)) > 1:
+                return None
+            accent = self._accent()
+            delivery = self._delivery(identity)
+
+            async def synthesize_steerable() -> bytes:
+                synthesis_start = time.perf_counter()
+                response = await client.chat.completions.create(
+                    model="gpt-4o-mini-audio-preview",
+                    modalities=["text", "audio"],
+                    audio={"voice": voice, "format": "wav"},
+                    messages=self._steerable_messages(message, accent, delivery),
+                )
+                audio_bytes = base64.b64decode(response.choices[0].message.audio.data)
+                if self.metrics:
+                    self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+                return audio_bytes
+
+            return await self._acached(self._steerable_key(accent, voice, delivery, message), synthesize_steerable)
+
+        # Compression runs on the compressor's own pool (budgeted, cached)
+        text = await asyncio.to_thread(self._compress_text, message)
+        if len(self._speech_chunks(text)) > 1:
+            return None
+        speed = self._speed(identity)
+
+        async def synthesize_basic() -> bytes:
+            synthesis_start = time.perf_counter()
+            response = await client.audio.speech.create(
+                model="tts-1",
+                voice=voice,
+                input=text,
+                speed=speed,
             )
+            audio_bytes = response.content
+            if self.metrics:
+                self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+            return audio_bytes
 
-            compressed = response.choices[0].message.content
+        return await self._acached(("tts-1", voice, speed, text), synthesize_basic)
 
-            if self.logger:
-                self.logger.log_debug(f"Compressed text from {len(text)} to {len(compressed)} chars")
+    def _compress_text(self, text: str) -> str:
+        """
+        Compress verbose text for natural speech (cached, time-budgeted).
 
-            return compressed
+        Args:
+            text: Original text to compress
 
-        except Exception as e:
-            if self.logger:
-                self.logger.log_error("Error compressing text", exception=e)
+        Returns:
+            Compressed, speech-optimized text (the original on skip/timeout/error)
+        """
+        if self.compressor is None:
             return text
+        return self.compressor.compress(text)
 
-    def _play_audio(self, audio_bytes: bytes):
+    def prefetch(self, message: str):
+        """Start compressing a message basic TTS will speak soon."""
+        if self.compressor is not None and not self.use_steerable:
+            self.compressor.prefetch(message)
+
+    def close(self):
+        """Stop the compression pool (the client may be shared with the steerable entry)."""
+        if self.compressor is not None:
+            self.compressor.close()
+
+    def _play_audio(self, audio_bytes: bytes, finish: bool = True):
         """
-        Play audio bytes with guaranteed cleanup.
+        Play audio bytes through the shared playback pipeline.
 
         Args:
             audio_bytes: WAV audio data
+            finish: Record playback end/duration (False for all but the
+                last chunk of a chunked message; the caller records them)
         """
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_filename = Path(temp_dir) / "speech.wav"
-
-            with open(temp_filename, 'wb') as f:
-                f.write(audio_bytes)
-
-            # Play audio - use afplay on macOS for better background compatibility
-            if platform.system() == 'Darwin':
-                # macOS: use native afplay (works in daemon background)
-                if self.logger:
-                    self.logger.log_debug(f"Playing audio with afplay: {temp_filename}")
-                # Run afplay in foreground and wait for completion
-                result = subprocess.run(
-                    ['afplay', str(temp_filename)],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if self.logger:
-                    if result.returncode != 0:
-                        self.logger.log_error(f"afplay failed with code {result.returncode}: {result.stderr}")
-                    else:
-                        self.logger.log_debug("afplay completed successfully")
-            else:
-                # Other platforms: use sounddevice
-                data, samplerate = sf.read(temp_filename)
-                sd.play(data, samplerate)
-                sd.wait()
-            # TemporaryDirectory auto-cleans on exit
+        play_audio(audio_bytes, logger=self.logger, metrics=self.metrics, finish=finish)
+
+    async def _acached(self, key_parts: tuple, synthesize) -> bytes:
+        """Async _cached(): synthesize is a coroutine function."""
+        if self.audio_cache is None:
+            return await synthesize()
+        key = AudioCache.key(*key_parts)
+        audio_bytes = self.audio_cache.get(key)
+        if audio_bytes is None:
+            audio_bytes = await synthesize()
+            self.audio_cache.put(key, audio_bytes)
+        return audio_bytes
+
+    def _cached(self, key_parts: tuple, synthesize) -> bytes:
+        """Audio from the cache, or synthesize and store it."""
+        if self.audio_cache is None:
+            return synthesize()
+        key = AudioCache.key(*key_parts)
+        audio_bytes = self.audio_cache.get(key)
+        if audio_bytes is None:
+            audio_bytes = synthesize()
+            self.audio_cache.put(key, audio_bytes)
+        return audio_bytes
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Audio Playback - The Monitor Wedges.
+
+One playback path for every rendered voice: OpenAI audio, system TTS
+rendered to WAV and cached clips all go through play_audio(), so
+latency metrics, traces and device handling stay identical.
+
+Playback is interruptible: when the daemon has something more urgent to
+say, the PlaybackController fades out or cuts whatever is playing (or
+lets it finish and skips the rest of the message).
+"""
+
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from voice_handler.tts import health
+from voice_handler.utils import tracing
+
+# Optional audio device support
+try:
+    import sounddevice as sd
+    import soundfile as sf
+    PLAYBACK_AVAILABLE = True
+except (ImportError, OSError):
+    sd = None
+    sf = None
+    PLAYBACK_AVAILABLE = False
+
+
+# Interrupt modes
+FADE = "fade"   # Ramp the current audio down over fade_ms, then stop
+CUT = "cut"     # Stop immediately
+SKIP = "skip"   # Let the current clip finish, drop the rest of the message
+INTERRUPT_MODES = (FADE, CUT, SKIP)
+
+
+class PlaybackController:
+    """
+    Interrupt switch for the utterance being spoken.
+
+    The consumer reset()s it before each message; a watcher calls
+    interrupt() when something more urgent arrives. Everything that
+    produces sound checks it: play_audio() stops the device, chunked
+    synthesis stops fetching chunks, live system engines register a
+    stop callback through playing().
+    """
+
+    def __init__(self, fade_ms: int = 250):
+        """
+        Initialize the controller.
+
+        Args:
+            fade_ms: Length of the fade-out in FADE mode (milliseconds)
+        """
+        self.fade_ms = fade_ms
+        self._lock = threading.Lock()
+        self._mode: Optional[str] = None
+        self._stop: Optional[Callable[[], None]] = None
+
+    @property
+    def interrupted(self) -> Optional[str]:
+        """Interrupt mode for the current utterance, or None."""
+        return self._mode
+
+    def reset(self):
+        """Start a new utterance (clears any interrupt)."""
+        with self._lock:
+            self._mode = None
+            self._stop = None
+
+    def interrupt(self, mode: str = FADE) -> bool:
+        """
+        Interrupt the current utterance.
+
+        Args:
+            mode: FADE, CUT or SKIP
+
+        Returns:
+            True if this call interrupted it (False if already interrupted)
+        """
+        if mode not in INTERRUPT_MODES:
+            raise ValueError(f"Invalid interrupt mode '{mode}', expected one of {INTERRUPT_MODES}")
+        with self._lock:
+            if self._mode is not None:
+                return False
+            self._mode = mode
+            stop = self._stop
+        if stop is not None and mode != SKIP:
+            stop()
+        return True
+
+    @contextmanager
+    def playing(self, stop: Callable[[], None]) -> Iterator[None]:
+        """
+        Register how to stop the sound being produced inside the block.
+
+        If the utterance is interrupted (FADE/CUT) while the block runs -
+        or already was - stop() is called.
+        """
+        with self._lock:
+            self._stop = stop
+            mode = self._mode
+        if mode in (FADE, CUT):
+            stop()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._stop is stop:
+                    self._stop = None
+
+
+_controller_instance: Optional[PlaybackController] = None
+_controller_lock = threading.Lock()
+
+
+def get_playback_controller() -> PlaybackController:
+    """Get or create the process-wide playback controller (thread-safe)."""
+    global _controller_instance
+    if _controller_instance is None:
+        with _controller_lock:
+            if _controller_instance is None:
+                _controller_instance = PlaybackController()
+    return _controller_instance
+
+
+def _fade_tail(data, samplerate: int, position: int, fade_ms: int):
+    """Replay a short stretch from where playback stopped, ramping to silence."""
+    import numpy as np
+
+    tail = data[position:position + int(samplerate * fade_ms / 1000)]
+    if len(tail) == 0:
+        return
+    ramp = np.linspace(1.0, 0.0, len(tail))
+    if tail.ndim > 1:
+        ramp = ramp[:, None]
+    sd.play(tail * ramp, samplerate)
+    sd.wait()
+
+
+def play_audio(audio_bytes: bytes, logger=None, metrics=None, finish: bool = True, cue: bool = False):
+    """
+    Play audio bytes with guaranteed cleanup.
+
+    Args:
+        audio_bytes: WAV audio data
+        logger: Logger instance
+        metrics: Optional DaemonMetrics registry
+        finish: Record playback end/duration (False for all but the
+            last chunk of a chunked message; the caller records them)
+        cue: A cue played ahead of the message (an earcon): not counted
+            as the message's audio start or playback
+
+    Returns early (silently) if the utterance was interrupted; see
+    PlaybackController.
+    """
+    controller = get_playback_controller()
+    if controller.interrupted:
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_filename = Path(temp_dir) / "speech.wav"
+
+        with open(temp_filename, 'wb') as f:
+            f.write(audio_bytes)
+
+        if not cue:
+            if metrics:
+                metrics.audio_started()
+            health.audio_started()
+            tracing.mark("playback_start")
+        playback_start = time.perf_counter()
+
+        # Play audio - use afplay on macOS for better background compatibility
+        if platform.system() == 'Darwin':
+            # macOS: use native afplay (works in daemon background)
+            if logger:
+                logger.log_debug(f"Playing audio with afplay: {temp_filename}")
+            # Run afplay in foreground and wait for completion (afplay can't fade: interrupts cut)
+            process = subprocess.Popen(
+                ['afplay', str(temp_filename)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            with controller.playing(process.terminate):
+                try:
+                    _, stderr = process.communicate(timeout=30)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    _, stderr = process.communicate()
+            if logger:
+                if controller.interrupted:
+                    logger.log_debug("afplay interrupted")
+                elif process.returncode != 0:
+                    logger.log_error(f"afplay failed with code {process.returncode}: {stderr}")
+                else:
+                    logger.log_debug("afplay completed successfully")
+        else:
+            # Other platforms: use sounddevice
+            if not PLAYBACK_AVAILABLE:
+                raise RuntimeError("sounddevice/soundfile not installed")
+            data, samplerate = sf.read(temp_filename)
+            stopped_at = []
+
+            def stop():
+                stopped_at.append(time.perf_counter())
+                sd.stop()
+
+            with controller.playing(stop):
+                started = time.perf_counter()
+                if stopped_at:
+                    return  # Interrupted before the first sample
+                sd.play(data, samplerate)
+                sd.wait()
+            if stopped_at and controller.interrupted == FADE:
+                position = int(max(0.0, stopped_at[0] - started) * samplerate)
+                _fade_tail(data, samplerate, position, controller.fade_ms)
+
+        if finish and not cue:
+            tracing.mark("playback_end")
+            if metrics:
+                metrics.observe("playback_duration_seconds", time.perf_counter() - playback_start)
+        # TemporaryDirectory auto-cleans on exit
@@ -6,24 +6,60 @@ Like the sound engineer who ensures every note reaches the audience crystal clea
 this module handles text-to-speech output with automatic provider fallback.
 """
 
-from typing import Optional, List
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, List
 
+from voice_handler.tts import health
 from voice_handler.tts.base import TTSProviderInterface
+from voice_handler.tts.health import ProviderRouter
+from voice_handler.tts.identity import VoiceIdentity, speaking_as
+from voice_handler.tts.normalizer import get_speech_normalizer
+from voice_handler.tts.playback import get_playback_controller, play_audio
 from voice_handler.tts.provider_factory import TTSProviderFactory
 
 
+@dataclass
+class RenderedSpeech:
+    """Audio synthesized ahead of playback by TTSProvider.arender()."""
+    provider: TTSProviderInterface
+    text: str
+    voice: Optional[str]
+    audio: bytes
+    synthesis_seconds: float
+    identity: Optional[VoiceIdentity] = None
+
+
 class TTSProvider:
     """
     Manages text-to-speech output with automatic provider fallback.
 
     Uses Strategy pattern to try providers in order:
-    1. OpenAI TTS (steerable or basic) - if available
-    2. System TTS (macOS/Linux/Windows) - always available
+    1. OpenAI steerable TTS - if enabled and available
+    2. OpenAI basic TTS - if available
+    3. System TTS (macOS/Linux/Windows) - always available
+
+    With provider_health enabled, a ProviderRouter reorders the chain per
+    message: providers with a tripped circuit breaker are skipped, and
+    urgent messages go to a provider fast enough for their deadline.
+
+    apply_config() swaps in a new configuration while the daemon runs
+    (see queue/config_reload.py).
+
+    Messages from a session are spoken with its identity (speed, delivery
+    style; see tts/identity.py), preceded by its earcon.
 
     The sound engineer who makes sure the voice hits every speaker in the arena!
     """
 
-    def __init__(self, config: Optional[dict] = None, logger=None, session_voice_manager=None):
+    # Config sections the provider chain is built from (a change rebuilds it)
+    CHAIN_SECTIONS = ("voice_settings", "tts_settings", "message_limits")
+    # Environment variables the providers read when they are created (same)
+    CHAIN_ENV = ("OPENAI_API_KEY", "SPEECHD_ADDRESS")
+
+    def __init__(self, config: Optional[dict] = None, logger=None, session_voice_manager=None, metrics=None):
         """
         Initialize TTS provider with automatic provider chain.
 
@@ -31,27 +67,118 @@ class TTSProvider:
             config: Voice configuration
             logger: Logger instance
             session_voice_manager: Session voice manager for per-session prefixes
+            metrics: Optional DaemonMetrics registry (latency histograms)
         """
         self.config = config or {}
         self.logger = logger
         self.session_voice_manager = session_voice_manager
+        self.metrics = metrics
+
+        # Messages using the chain right now, and providers a reload replaced under them
+        self._swap_lock = threading.Lock()
+        self._users = 0
+        self._retired: List[TTSProviderInterface] = []
 
         # Load config values
         message_limits = self.config.get("message_limits", {})
         self.min_chars_for_tts = message_limits.get("min_chars_for_tts", 3)
+        self.normalizer = get_speech_normalizer(self.config.get("tts_settings", {}).get("speech_language", "es"))
 
         # Create provider chain using factory
         self.providers: List[TTSProviderInterface] = TTSProviderFactory.create_provider_chain(
             config=self.config,
-            logger=self.logger
+            logger=self.logger,
+            metrics=metrics
         )
 
+        # Per-provider health and circuit breakers
+        health_settings = self.config.get("provider_health", {})
+        self.router: Optional[ProviderRouter] = None
+        if health_settings.get("enabled", True):
+            self.router = ProviderRouter(settings=health_settings, logger=self.logger, metrics=metrics)
+
         if self.logger:
             provider_names = [p.provider_name for p in self.providers]
             self.logger.log_info(
                 f"TTS provider initialized with chain: {' → '.join(provider_names)}"
             )
 
+    def apply_config(self, config: dict, env_changed: Iterable[str] = ()) -> bool:
+        """
+        Swap in a new validated configuration while the daemon keeps running.
+
+        Everything derived from the config is built first and swapped in
+        together under a lock. The provider chain is only rebuilt when one
+        of CHAIN_SECTIONS or CHAIN_ENV changed, and the providers it
+        replaces are closed once no message is using them. Provider health
+        history is kept unless provider_health itself changed.
+
+        Args:
+            config: Validated voice configuration (VoiceConfig.model_dump())
+            env_changed: Names of the environment variables a .env reload changed
+
+        Returns:
+            True if the provider chain was rebuilt
+        """
+        config = config or {}
+        previous = self.config
+        rebuild = any(config.get(section) != previous.get(section) for section in self.CHAIN_SECTIONS)
+        rebuild = rebuild or any(name in self.CHAIN_ENV for name in env_changed)
+
+        providers = self.providers
+        if rebuild:
+            providers = TTSProviderFactory.create_provider_chain(config=config, logger=self.logger, metrics=self.metrics)
+
+        router = self.router
+        health_settings = config.get("provider_health", {})
+        if health_settings != previous.get("provider_health", {}):
+            router = None
+            if health_settings.get("enabled", True):
+                router = ProviderRouter(settings=health_settings, logger=self.logger, metrics=self.metrics)
+
+        normalizer = get_speech_normalizer(config.get("tts_settings", {}).get("speech_language", "es"))
+        min_chars_for_tts = config.get("message_limits", {}).get("min_chars_for_tts", 3)
+
+        with self._swap_lock:
+            if rebuild:
+                self._retired.extend(p for p in self.providers if p not in providers)
+            self.config = config
+            self.providers = providers
+            self.router = router
+            self.normalizer = normalizer
+            self.min_chars_for_tts = min_chars_for_tts
+        self._close_retired()
+
+        if rebuild and self.logger:
+            provider_names = [p.provider_name for p in self.providers]
+            self.logger.log_info(f"TTS provider chain rebuilt: {' → '.join(provider_names)}")
+        return rebuild
+
+    @contextmanager
+    def _in_use(self) -> Iterator[None]:
+        """Mark a message as using the provider chain (retired providers wait for it)."""
+        with self._swap_lock:
+            self._users += 1
+        try:
+            yield
+        finally:
+            with self._swap_lock:
+                self._users -= 1
+            self._close_retired()
+
+    def _close_retired(self):
+        """Close providers replaced by a reload, once no message is using the chain."""
+        with self._swap_lock:
+            if self._users or not self._retired:
+                return
+            retired, self._retired = self._retired, []
+        for provider in retired:
+            try:
+                provider.close()
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_warning(f"Failed to close retired provider {provider.provider_name}: {e}")
+
     def format_message_for_speech(self, message: str) -> str:
         """
         Format technical text for natural speech output.
@@ -62,26 +189,179 @@ class TTSProvider:
         Returns:
             Speech-formatted message
         """
-        # Replace underscores and hyphens
-        message = message.replace('_', ' ').replace('-', ' ')
-        # Replace file extensions
-        message = message.replace('.py', ' python file')
-        message = message.replace('.json', ' JSON file')
-        message = message.replace('.js', ' javascript file')
-        message = message.replace('.md', ' markdown file')
+        return self.normalizer.normalize(message)
+
+    def _identity(self, session_id: Optional[str]) -> Optional[VoiceIdentity]:
+        """Identity of the session a message comes from (None without one)."""
+        if not session_id or not self.session_voice_manager:
+            return None
+        return self.session_voice_manager.get_session_identity(session_id)
+
+    def _play_earcon(self, identity: Optional[VoiceIdentity]):
+        """Play a session's earcon ahead of its message (pre-rendered, no synthesis)."""
+        if identity is None or identity.earcon is None or not self.session_voice_manager:
+            return
+        if not self.config.get("voice_settings", {}).get("session_earcons", True):
+            return
+        try:
+            audio = self.session_voice_manager.earcon_bank().get(identity.earcon)
+            play_audio(audio, logger=self.logger, cue=True)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_debug(f"Earcon playback failed: {e}")
+
+    def _apply_prefix(self, message: str, session_id: Optional[str] = None) -> str:
+        """
+        Prepend the per-session prefix, or the global message prefix.
+
+        Args:
+            message: Speech-formatted message
+            session_id: Session ID for per-session prefix (optional)
+
+        Returns:
+            Message with its prefix
+        """
+        # Apply per-session prefix if available (takes precedence)
+        if session_id and self.session_voice_manager:
+            session_prefix = self.session_voice_manager.get_session_prefix(session_id)
+            if session_prefix:
+                if self.logger:
+                    self.logger.log_debug(f"Applied session prefix: {session_prefix}")
+                return f"{session_prefix} {message}"
+
+        # Apply global message prefix if no session prefix was applied
+        voice_settings = self.config.get("voice_settings", {})
+        message_prefix = voice_settings.get("message_prefix", "")
+        if message_prefix:
+            return f"{message_prefix} {message}"
         return message
 
-    def speak(self, message: str, voice: Optional[str] = None, session_id: Optional[str] = None):
+    def prefetch(self, message: str, voice: Optional[str] = None, session_id: Optional[str] = None):
+        """
+        Let the provider that will speak a message start preparing it.
+
+        Applies the same formatting and prefix as speak(), so whatever the
+        provider prepares (e.g. a compressed text) matches exactly.
+
+        Args:
+            message: Message that will be spoken soon
+            voice: Voice selection (unused, mirrors speak())
+            session_id: Session ID for per-session prefix (optional)
+        """
+        if len(message.strip()) < self.min_chars_for_tts:
+            return
+        prepared = self._apply_prefix(self.format_message_for_speech(message), session_id)
+        route = self._route()
+        if route:
+            route[0].prefetch(prepared)
+
+    async def arender(
+        self,
+        message: str,
+        voice: Optional[str] = None,
+        session_id: Optional[str] = None,
+        priority: int = 5,
+        deadline: Optional[float] = None,
+    ) -> Optional[RenderedSpeech]:
+        """
+        Synthesize a message on the provider that would speak it, without playing it.
+
+        Used by the async daemon runtime to render upcoming messages while
+        another one plays. Only the first provider in the route is asked;
+        if it can't pre-render, the message is later spoken with speak()
+        (and its full fallback chain).
+
+        Args:
+            message: Message that will be spoken
+            voice: Override voice selection
+            session_id: Session ID for per-session prefix (optional)
+            priority: Message priority (1-10, higher = more urgent)
+            deadline: Epoch time audio should start by (optional)
+
+        Returns:
+            RenderedSpeech, or None to speak the message with speak()
+        """
+        if len(message.strip()) < self.min_chars_for_tts:
+            return None
+        prepared = self._apply_prefix(self.format_message_for_speech(message), session_id)
+        route = self._route(priority, deadline)
+        if not route:
+            return None
+
+        provider = route[0]
+        identity = self._identity(session_id)
+        started = time.perf_counter()
+        try:
+            with self._in_use(), speaking_as(identity):
+                audio = await provider.arender(prepared, voice)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_warning(f"Provider {provider.provider_name} failed to pre-render: {e}")
+            router = self.router
+            if router is not None:
+                router.record(provider, False, time.perf_counter() - started)
+            return None
+        if not audio:
+            return None
+        return RenderedSpeech(provider, prepared, voice, audio, time.perf_counter() - started, identity)
+
+    def play_rendered(self, rendered: RenderedSpeech) -> bool:
+        """
+        Play speech rendered by arender() (on the playback thread).
+
+        Args:
+            rendered: Pre-rendered speech
+
+        Returns:
+            True if it was played (or interrupted on purpose)
+        """
+        self._play_earcon(rendered.identity)
+        try:
+            play_audio(rendered.audio, logger=self.logger, metrics=self.metrics)
+            played = True
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Playback of pre-rendered speech failed", exception=e)
+            played = False
+
+        if get_playback_controller().interrupted:
+            return True
+
+        router = self.router
+        if router is not None:
+            router.record(rendered.provider, played, rendered.synthesis_seconds)
+        if played and self.logger:
+            self.logger.log_tts_event(rendered.provider.provider_name, True, voice=rendered.voice, text=rendered.text)
+        return played
+
+    def _route(self, priority: int = 5, deadline: Optional[float] = None) -> List[TTSProviderInterface]:
+        """Providers to try for a message, in order."""
+        router, providers = self.router, self.providers
+        if router is not None:
+            return router.order(providers, priority, deadline)
+        return [p for p in providers if p.available()]
+
+    def speak(
+        self,
+        message: str,
+        voice: Optional[str] = None,
+        session_id: Optional[str] = None,
+        priority: int = 5,
+        deadline: Optional[float] = None,
+    ):
         """
         Main speech output method with automatic provider selection.
 
         Tries providers in order until one succeeds.
-        Priority: OpenAI (steerable → basic) → System TTS
+        Default order: OpenAI steerable → OpenAI basic → System TTS,
+        adjusted per message by provider health (see ProviderRouter).
 
         Args:
             message: Message to speak
             voice: Override voice selection
             session_id: Session ID for per-session prefix (optional)
+            priority: Message priority (1-10, higher = more urgent)
+            deadline: Epoch time audio should start by (optional)
         """
         # Validate message length
         char_count = len(message)
@@ -102,46 +382,46 @@ class TTSProvider:
         # Format message
         message = self.format_message_for_speech(message)
 
-        # Apply per-session prefix if available (takes precedence)
-        prefix_applied = False
-        if session_id and self.session_voice_manager:
-            session_prefix = self.session_voice_manager.get_session_prefix(session_id)
-            if session_prefix:
-                message = f"{session_prefix} {message}"
-                prefix_applied = True
-                if self.logger:
-                    self.logger.log_debug(f"Applied session prefix: {session_prefix}")
-
-        # Apply global message prefix if no session prefix was applied
-        if not prefix_applied:
-            voice_settings = self.config.get("voice_settings", {})
-            message_prefix = voice_settings.get("message_prefix", "")
-            if message_prefix:
-                message = f"{message_prefix} {message}"
+        message = self._apply_prefix(message, session_id)
 
         if self.logger:
             self.logger.log_debug(f"TTS Input (after formatting): '{message}'")
 
-        # Try each provider in the chain until one succeeds
-        for provider in self.providers:
-            if not provider.available():
+        identity = self._identity(session_id)
+        self._play_earcon(identity)
+
+        # Try each provider in the chain until one succeeds (a reload waits for it to finish)
+        with self._in_use(), speaking_as(identity):
+            for provider in self._route(priority, deadline):
                 if self.logger:
-                    self.logger.log_debug(
-                        f"Provider {provider.provider_name} not available, skipping"
-                    )
-                continue
+                    self.logger.log_debug(f"Trying provider: {provider.provider_name}")
 
-            if self.logger:
-                self.logger.log_debug(f"Trying provider: {provider.provider_name}")
+                health.begin_attempt()
+                try:
+                    spoke = provider.speak(message, voice)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.log_error(f"Provider {provider.provider_name} raised", exception=e)
+                    spoke = False
 
-            if provider.speak(message, voice):
-                # Success! No need to try other providers
-                return
+                if get_playback_controller().interrupted:
+                    # Cut short on purpose: not the provider's fault, and no fallback
+                    if self.logger:
+                        self.logger.log_info(f"Speech interrupted on {provider.provider_name}")
+                    return
 
-            if self.logger:
-                self.logger.log_debug(
-                    f"Provider {provider.provider_name} failed, trying next"
-                )
+                router = self.router  # read once: a reload may swap it
+                if router is not None:
+                    router.record(provider, spoke, health.attempt_latency())
+
+                if spoke:
+                    # Success! No need to try other providers
+                    return
+
+                if self.logger:
+                    self.logger.log_debug(
+                        f"Provider {provider.provider_name} failed, trying next"
+                    )
 
         # All providers failed
         if self.logger:
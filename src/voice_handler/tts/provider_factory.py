@@ -27,17 +27,21 @@ class TTSProviderFactory:
     @staticmethod
     def create_provider_chain(
         config: Optional[dict] = None,
-        logger=None
+        logger=None,
+        metrics=None
     ) -> List[TTSProviderInterface]:
         """
         Create a chain of TTS providers with automatic fallback.
 
         The chain is ordered by preference from config, with system TTS
-        as the final fallback (always available).
+        as the final fallback (always available). Steerable and basic
+        OpenAI TTS are separate entries sharing one client, so health
+        tracking can skip either one on its own.
 
         Args:
             config: Voice configuration
             logger: Logger instance
+            metrics: Optional DaemonMetrics registry
 
         Returns:
             List of providers in priority order
@@ -51,13 +55,23 @@ class TTSProviderFactory:
 
         # Add primary provider based on config
         if tts_provider == "openai":
-            openai_provider = OpenAITTSProvider(
+            basic_provider = OpenAITTSProvider(
                 config=config,
                 logger=logger,
-                use_steerable=use_steerable
+                use_steerable=False,
+                metrics=metrics
             )
-            if openai_provider.available():
-                providers.append(openai_provider)
+            if basic_provider.available():
+                if use_steerable:
+                    providers.append(OpenAITTSProvider(
+                        config=config,
+                        logger=logger,
+                        use_steerable=True,
+                        metrics=metrics,
+                        basic_fallback=False,
+                        client=basic_provider.client,
+                    ))
+                providers.append(basic_provider)
                 if logger:
                     logger.log_debug("Added OpenAI TTS to provider chain")
             else:
@@ -65,7 +79,7 @@ class TTSProviderFactory:
                     logger.log_debug("OpenAI TTS not available, skipping")
 
         # Always add system TTS as fallback
-        system_provider = SystemTTSProvider(config=config, logger=logger)
+        system_provider = SystemTTSProvider(config=config, logger=logger, metrics=metrics)
         if system_provider.available():
             providers.append(system_provider)
             if logger:
@@ -81,7 +95,8 @@ class TTSProviderFactory:
     def create_openai_provider(
         config: Optional[dict] = None,
         logger=None,
-        use_steerable: bool = True
+        use_steerable: bool = True,
+        metrics=None
     ) -> OpenAITTSProvider:
         """
         Create an OpenAI TTS provider.
@@ -90,6 +105,7 @@ class TTSProviderFactory:
             config: Voice configuration
             logger: Logger instance
             use_steerable: Whether to use steerable TTS with accent
+            metrics: Optional DaemonMetrics registry
 
         Returns:
             OpenAI TTS provider instance
@@ -97,13 +113,15 @@ class TTSProviderFactory:
         return OpenAITTSProvider(
             config=config,
             logger=logger,
-            use_steerable=use_steerable
+            use_steerable=use_steerable,
+            metrics=metrics
         )
 
     @staticmethod
     def create_system_provider(
         config: Optional[dict] = None,
-        logger=None
+        logger=None,
+        metrics=None
     ) -> SystemTTSProvider:
         """
         Create a system TTS provider.
@@ -111,8 +129,9 @@ class TTSProviderFactory:
         Args:
             config: Voice configuration
             logger: Logger instance
+            metrics: Optional DaemonMetrics registry
 
         Returns:
             System TTS provider instance
         """
-        return SystemTTSProvider(config=config, logger=logger)
+        return SystemTTSProvider(config=config, logger=logger, metrics=metrics)
@@ -4,17 +4,27 @@ System TTS Provider - The Backup PA System.
 
 Uses platform-native text-to-speech engines:
 - macOS: say command
-- Linux: espeak
+- Linux: speech-dispatcher or espeak
 - Windows: SAPI via PowerShell
 
+By default the engine stays running between messages (see engines.py);
+it can also render to WAV so system speech shares the audio cache and
+playback pipeline with OpenAI audio.
+
 Always reliable, always available!
 """
 
 import platform
 import subprocess
-from typing import Optional
+import time
+from typing import Callable, Optional
 
+from voice_handler.tts import health
+from voice_handler.tts.audio_cache import AudioCache
 from voice_handler.tts.base import TTSProviderInterface
+from voice_handler.tts.engines import SystemEngine, create_engine
+from voice_handler.tts.playback import get_playback_controller, play_audio
+from voice_handler.utils import tracing
 
 
 class SystemTTSProvider(TTSProviderInterface):
@@ -27,22 +37,37 @@ class SystemTTSProvider(TTSProviderInterface):
     - Windows: SAPI via PowerShell
     """
 
-    def __init__(self, config: Optional[dict] = None, logger=None):
+    def __init__(self, config: Optional[dict] = None, logger=None, metrics=None):
         """
         Initialize system TTS provider.
 
         Args:
             config: Voice configuration
             logger: Logger instance
+            metrics: Optional DaemonMetrics registry
         """
         self.config = config or {}
         self.logger = logger
+        self.metrics = metrics
         self.system = platform.system()
 
         # Load config values for message formatting
         message_limits = self.config.get("message_limits", {})
         self.min_chars_for_tts = message_limits.get("min_chars_for_tts", 3)
 
+        tts_settings = self.config.get("tts_settings", {})
+        self.engine_mode = tts_settings.get("system_engine", "persistent")
+        self.render_wav = tts_settings.get("system_render_wav", False)
+        self.language = tts_settings.get("system_language", "es")
+        self._engine: Optional[SystemEngine] = None
+        self._engine_checked = False
+        self.audio_cache: Optional[AudioCache] = None
+        if self.render_wav and tts_settings.get("audio_cache", True):
+            self.audio_cache = AudioCache(
+                max_bytes=tts_settings.get("audio_cache_mb", 50) * 1024 * 1024,
+                metrics=self.metrics,
+            )
+
     @property
     def provider_name(self) -> str:
         return f"System ({self.system})"
@@ -56,7 +81,7 @@ class SystemTTSProvider(TTSProviderInterface):
         Generate speech using system TTS.
 
         Args:
-            message: Text to speak
+            message: Text to speak (already speech-formatted by TTSProvider)
             voice: System voice selection (platform-specific)
 
         Returns:
@@ -68,25 +93,139 @@ class SystemTTSProvider(TTSProviderInterface):
                 self.logger.log_debug(f"Skipping very short message: '{message}'")
             return True
 
-        # Format message for speech
-        message = self._format_message(message)
-
         # Get default voice if not specified
         if not voice:
             voice_settings = self.config.get("voice_settings", {})
             voice = voice_settings.get("fallback_voice", "Samantha")
 
-        try:
-            if self.system == "Darwin":  # macOS
-                self._speak_macos(message, voice)
-            elif self.system == "Linux":
-                self._speak_linux(message, voice)
-            elif self.system == "Windows":
-                self._speak_windows(message, voice)
-            else:
+        controller = get_playback_controller()
+        if self.engine_mode == "persistent":
+            engine = self._get_engine()
+            if engine is not None:
+                if self.render_wav and self._speak_rendered(engine, message, voice):
+                    return True
+                if self._speak_live(lambda: self._speak_engine(engine, message, voice), message, voice):
+                    return True
+                if controller.interrupted:
+                    return True  # Stopped on purpose, don't start over in a subprocess
                 if self.logger:
-                    self.logger.log_error(f"Unsupported platform: {self.system}")
+                    self.logger.log_debug(f"{engine.name} engine failed, falling back to a subprocess")
+
+        return self._speak_live(lambda: self._speak_subprocess(message, voice), message, voice)
+
+    def _speak_engine(self, engine: SystemEngine, message: str, voice: str) -> bool:
+        """Speak through the persistent engine, stoppable by the playback controller."""
+        controller = get_playback_controller()
+        if controller.interrupted:
+            return True
+        with controller.playing(engine.stop):
+            return engine.speak(message, voice)
+
+    def _get_engine(self) -> Optional[SystemEngine]:
+        """The persistent engine for this platform (created once)."""
+        if not self._engine_checked:
+            self._engine_checked = True
+            voice_settings = self.config.get("voice_settings", {})
+            self._engine = create_engine(
+                self.system,
+                language=self.language,
+                rate_wpm=voice_settings.get("fallback_speech_rate", 180),
+                logger=self.logger,
+            )
+        return self._engine
+
+    def _speak_rendered(self, engine: SystemEngine, message: str, voice: str) -> bool:
+        """
+        Render to WAV (or take it from the cache) and play it like OpenAI audio.
+
+        Returns:
+            True if audio was played
+        """
+        key = AudioCache.key("system", engine.name, self.language, voice, message)
+        audio_bytes = self.audio_cache.get(key) if self.audio_cache else None
+        if audio_bytes is None:
+            synthesis_start = time.perf_counter()
+            audio_bytes = engine.render(message, voice)
+            if not audio_bytes:
                 return False
+            if self.metrics:
+                self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+            if self.audio_cache:
+                self.audio_cache.put(key, audio_bytes)
+        tracing.mark("synthesis_done")
+
+        try:
+            play_audio(audio_bytes, logger=self.logger, metrics=self.metrics)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("System TTS playback failed", exception=e)
+            return False
+
+        if self.logger:
+            self.logger.log_tts_event("System", True, voice=voice, text=message)
+        return True
+
+    def close(self):
+        """Stop the persistent engine, if one was started."""
+        engine, self._engine = self._engine, None
+        if engine is not None:
+            engine.close()
+
+    async def arender(self, message: str, voice: Optional[str] = None) -> Optional[bytes]:
+        """
+        Render to WAV ahead of playback (render mode with a persistent engine only).
+
+        Returns:
+            WAV bytes, or None to have speak() handle the message
+        """
+        if not self.render_wav or self.engine_mode != "persistent":
+            return None
+        if len(message.strip()) < self.min_chars_for_tts:
+            return None
+        engine = self._get_engine()
+        if engine is None:
+            return None
+
+        voice = voice or self.config.get("voice_settings", {}).get("fallback_voice", "Samantha")
+        key = AudioCache.key("system", engine.name, self.language, voice, message)
+        audio_bytes = self.audio_cache.get(key) if self.audio_cache else None
+        if audio_bytes is None:
+            synthesis_start = time.perf_counter()
+            audio_bytes = await engine.arender(message, voice)
+            if not audio_bytes:
+                return None
+            if self.metrics:
+                self.metrics.observe("tts_synthesis_seconds", time.perf_counter() - synthesis_start)
+            if self.audio_cache:
+                self.audio_cache.put(key, audio_bytes)
+        return audio_bytes
+
+    def _speak_live(self, run: Callable[[], bool], message: str, voice: str) -> bool:
+        """
+        Speak through the engine directly, recording playback timing.
+
+        Args:
+            run: Speaks the message; returns success or raises
+            message: Text being spoken (for the TTS event log)
+            voice: Voice in use (for the TTS event log)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if self.metrics:
+            # System engines synthesize while speaking: audio starts with the process
+            self.metrics.audio_started()
+        health.audio_started()
+        tracing.mark("playback_start")
+        playback_start = time.perf_counter()
+
+        try:
+            if not run():
+                return False
+
+            tracing.mark("playback_end")
+            if self.metrics:
+                self.metrics.observe("playback_duration_seconds", time.perf_counter() - playback_start)
 
             if self.logger:
                 self.logger.log_tts_event("System", True, voice=voice, text=message)
@@ -102,26 +241,27 @@ class SystemTTSProvider(TTSProviderInterface):
                 self.logger.log_error("System TTS failed", exception=e)
             return False
 
-    def _format_message(self, message: str) -> str:
+    def _speak_subprocess(self, message: str, voice: str) -> bool:
         """
-        Format technical text for natural speech output.
-
-        Args:
-            message: Technical message text
+        Speak with a one-off platform command.
 
         Returns:
-            Speech-formatted message
-        """
-        # Replace underscores and hyphens
-        message = message.replace('_', ' ').replace('-', ' ')
-
-        # Replace file extensions
-        message = message.replace('.py', ' python file')
-        message = message.replace('.json', ' JSON file')
-        message = message.replace('.js', ' javascript file')
-        message = message.replace('.md', ' markdown file')
+            True on success, False on unsupported platforms
 
-        return message
+        Raises:
+            subprocess.CalledProcessError: If the command fails
+        """
+        if self.system == "Darwin":  # macOS
+            self._speak_macos(message, voice)
+        elif self.system == "Linux":
+            self._speak_linux(message, voice)
+        elif self.system == "Windows":
+            self._speak_windows(message, voice)
+        else:
+            if self.logger:
+                self.logger.log_error(f"Unsupported platform: {self.system}")
+            return False
+        return True
 
     def _speak_macos(self, message: str, voice: str):
         """
@@ -160,9 +300,11 @@ class SystemTTSProvider(TTSProviderInterface):
             message: Text to speak
             voice: SAPI voice name (ignored for now)
         """
+        # Single-quoted PowerShell string: only ' needs escaping (doubled)
+        quoted = message.replace("'", "''")
         ps_command = (
             f'Add-Type -AssemblyName System.speech; '
             f'$speak = New-Object System.Speech.Synthesis.SpeechSynthesizer; '
-            f'$speak.Speak("{message}")'
+            f"$speak.Speak('{quoted}')"
         )
         subprocess.run(["powershell", "-Command", ps_command], check=True)
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Event Stream - The Monitor Feed.
+
+The sound engineer doesn't walk to the stage to ask how it's going; a
+monitor feed tells them as it happens. The daemon numbers every
+pipeline event (hook enqueues, dequeues, speech start and end, retries
+and drops, log records, metrics ticks) and publishes it on a local
+socket. The control panel's API server subscribes and fans the feed out
+to its websocket clients.
+
+Every subscriber has its own bounded buffer: a slow reader loses its
+oldest events (and is told how many) instead of holding up the daemon
+or the other readers. The last events are kept, so a reader that
+reconnects can resume from the last sequence number it saw.
+"""
+
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from voice_handler.utils.log_sink import _connect
+
+# Events kept for subscribers that resume
+DEFAULT_BACKLOG = 2000
+# Events buffered per subscriber before the oldest are dropped
+DEFAULT_CLIENT_BUFFER = 500
+
+
+class Subscription:
+    """One subscriber's bounded event buffer (drop-oldest when full)."""
+
+    def __init__(self, stream: "EventStream", capacity: int, on_ready: Optional[Callable[[], None]] = None):
+        """
+        Initialize the subscription (use EventStream.subscribe).
+
+        Args:
+            stream: Stream being followed
+            capacity: Events buffered before the oldest are dropped
+            on_ready: Called (from the publishing thread) when events arrive
+        """
+        self.stream = stream
+        self.on_ready = on_ready
+        self.dropped = 0
+        self.closed = False
+        self._events: deque = deque(maxlen=capacity)
+        self._ready = threading.Condition()
+
+    def _push(self, event: Dict[str, Any]):
+        with self._ready:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._ready.notify()
+        if self.on_ready is not None:
+            self.on_ready()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """
+        Take every buffered event without waiting.
+
+        Returns:
+            Events in order, preceded by a {"type": "dropped"} notice if
+            any were lost since the last call
+        """
+        with self._ready:
+            events = list(self._events)
+            self._events.clear()
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            events.insert(0, {"type": "dropped", "count": dropped})
+        return events
+
+    def get(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Wait up to timeout seconds for events, then drain them (empty if none or closed)."""
+        with self._ready:
+            if not self._events and not self.closed:
+                self._ready.wait(timeout)
+        return self.drain()
+
+    def close(self):
+        """Stop receiving events."""
+        self.stream.unsubscribe(self)
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+
+class EventStream:
+    """
+    Sequenced fan-out of events with a replay backlog.
+
+    Events are dicts with a "type" ("event", "log", "metrics"); publish()
+    stamps them with a sequence number and hands them to every
+    subscription. A relay that mirrors another stream keeps the upstream
+    sequence numbers, so clients can resume against either.
+    """
+
+    def __init__(self, backlog: int = DEFAULT_BACKLOG, stream_id: Optional[str] = None):
+        """
+        Initialize the stream.
+
+        Args:
+            backlog: Events kept for resuming subscribers
+            stream_id: Identity of this run of the stream (new sequence numbers
+                start at 1 for each id)
+        """
+        self.stream_id = stream_id or uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._backlog: deque = deque(maxlen=backlog)
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def publish(self, event: Dict[str, Any]) -> int:
+        """
+        Number an event and deliver it to every subscriber (never blocks on them).
+
+        Args:
+            event: Event dict; a "seq" already set (relayed events) is kept
+
+        Returns:
+            The event's sequence number
+        """
+        with self._lock:
+            if event.get("seq") is None:
+                self.seq += 1
+                event = {**event, "seq": self.seq, "ts": event.get("ts") or time.time()}
+            else:
+                self.seq = max(self.seq, event["seq"])
+            self._backlog.append(event)
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._push(event)
+        return event["seq"]
+
+    def publish_events(self, events: Iterable[Dict[str, Any]]):
+        """Publish stored pipeline events (EventStore listener)."""
+        for event in events:
+            self.publish({**event, "type": "event"})
+
+    def subscribe(
+        self,
+        since: Optional[int] = None,
+        capacity: int = DEFAULT_CLIENT_BUFFER,
+        on_ready: Optional[Callable[[], None]] = None,
+    ) -> Subscription:
+        """
+        Follow the stream.
+
+        Args:
+            since: Last sequence number already seen: events after it are
+                replayed from the backlog (None: live events only)
+            capacity: Events buffered before the oldest are dropped
+            on_ready: Called when events arrive (e.g. to wake an event loop)
+
+        Returns:
+            The Subscription (close() it when done)
+        """
+        subscription = Subscription(self, capacity, on_ready)
+        with self._lock:
+            if since is not None:
+                if since > self.seq:
+                    since = 0  # A sequence number from an earlier run: replay everything
+                missed = [event for event in self._backlog if event["seq"] > since]
+                oldest = missed[0]["seq"] if missed else self.seq + 1
+                if oldest > since + 1:
+                    subscription._push({"type": "gap", "from": since + 1, "to": oldest - 1})
+                for event in missed:
+                    subscription._push(event)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription (no-op if already removed)."""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def reset(self, stream_id: str):
+        """
+        Start over under a new identity (the upstream daemon restarted).
+
+        Subscribers are told with a {"type": "reset"} event.
+        """
+        with self._lock:
+            self.stream_id = stream_id
+            self.seq = 0
+            self._backlog.clear()
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription._push({"type": "reset", "stream": stream_id})
+
+    @property
+    def subscribers(self) -> int:
+        """Current number of subscriptions."""
+        with self._lock:
+            return len(self._subscriptions)
+
+
+def _address_file() -> Path:
+    from voice_handler.utils.paths import get_paths
+    return get_paths().event_stream_address
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    """
+    One subscriber connection.
+
+    The client sends one JSON line ({"since": seq, "stream": id}, both
+    optional), gets a {"type": "hello"} line and then one line per event.
+    """
+
+    def handle(self):
+        stream: EventStream = self.server.stream
+        self.connection.settimeout(5.0)
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+        except (OSError, ValueError):
+            return
+        self.connection.settimeout(None)
+
+        since = request.get("since")
+        if since is not None and request.get("stream") not in (None, stream.stream_id):
+            since = 0  # Resuming a previous daemon's stream: replay what this one has
+        subscription = stream.subscribe(since=since, capacity=self.server.client_buffer)
+        try:
+            self._send([{"type": "hello", "stream": stream.stream_id, "seq": stream.seq}])
+            while not subscription.closed and self.server.serving:
+                events = subscription.get(timeout=1.0)
+                if events:
+                    self._send(events)
+        except OSError:
+            pass
+        finally:
+            subscription.close()
+
+    def _send(self, events: List[Dict[str, Any]]):
+        data = "".join(json.dumps(event, ensure_ascii=False, default=str) + "\n" for event in events)
+        self.wfile.write(data.encode("utf-8"))
+        self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixStream(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixStream = None
+
+
+class _TCPStream(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class EventStreamServer:
+    """
+    Publishes an EventStream to other local processes.
+
+    Listens on a Unix socket (owner-only permissions) where available,
+    otherwise on an ephemeral 127.0.0.1 port. The address is written to
+    paths.event_stream_address for subscribers.
+    """
+
+    def __init__(
+        self,
+        stream: EventStream,
+        address_file: Optional[Path] = None,
+        client_buffer: int = DEFAULT_CLIENT_BUFFER,
+        logger=None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            stream: Stream to publish
+            address_file: Where to publish the address (default: paths.event_stream_address)
+            client_buffer: Events buffered per connection before the oldest are dropped
+            logger: Logger instance
+        """
+        self.stream = stream
+        self.address_file = Path(address_file) if address_file else _address_file()
+        self.client_buffer = client_buffer
+        self.logger = logger
+        self._server: Optional[socketserver.BaseServer] = None
+        self._socket_path: Optional[Path] = None
+
+    def start(self):
+        """Bind, publish the address and serve in a background thread."""
+        if _UnixStream is not None and sys.platform != "win32":
+            self._socket_path = self.address_file.with_suffix(".sock")
+            try:
+                self._socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._server = _UnixStream(str(self._socket_path), _StreamHandler)
+            os.chmod(self._socket_path, 0o600)
+            address = f"unix:{self._socket_path}"
+        else:
+            self._server = _TCPStream(("127.0.0.1", 0), _StreamHandler)
+            address = f"tcp:127.0.0.1:{self._server.server_address[1]}"
+        self._server.stream = self.stream
+        self._server.client_buffer = self.client_buffer
+        self._server.serving = True
+
+        temp_path = self.address_file.with_suffix(".tmp")
+        temp_path.write_text(address)
+        os.replace(temp_path, self.address_file)
+
+        threading.Thread(target=self._server.serve_forever, name="VoiceEventStream", daemon=True).start()
+        if self.logger:
+            self.logger.log_info(f"Event stream publishing on {address}")
+
+    def stop(self):
+        """Stop serving, end subscriber connections and remove the published address."""
+        if self._server is not None:
+            self._server.serving = False
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for path in (self.address_file, self._socket_path):
+            if path is not None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+class EventStreamRelay:
+    """
+    Mirrors the daemon's stream into a local EventStream (API server side).
+
+    Reconnects when the daemon goes away, resuming from the last sequence
+    number received; a restarted daemon resets the local stream.
+    """
+
+    def __init__(
+        self,
+        stream: EventStream,
+        address_file: Optional[Path] = None,
+        retry_interval: float = 2.0,
+        logger=None,
+    ):
+        """
+        Initialize the relay (nothing connects until start()).
+
+        Args:
+            stream: Local stream that receives the daemon's events
+            address_file: Published daemon stream address (default: paths.event_stream_address)
+            retry_interval: Seconds between connection attempts
+            logger: Logger instance
+        """
+        self.stream = stream
+        self.address_file = Path(address_file) if address_file else _address_file()
+        self.retry_interval = retry_interval
+        self.logger = logger
+        self.connected = False
+        self._upstream: Optional[str] = None
+        self._stop = threading.Event()
+        self._sock = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start relaying in a background thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="VoiceEventRelay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Disconnect and stop the relay thread."""
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=self.retry_interval + 1.0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._follow()
+            except (OSError, ValueError) as e:
+                if self.logger:
+                    self.logger.log_debug(f"Event stream connection lost: {e}")
+            self.connected = False
+            self._stop.wait(self.retry_interval)
+
+    def _follow(self):
+        """Connect once and relay events until the connection ends."""
+        try:
+            address = self.address_file.read_text().strip()
+        except OSError:
+            return
+        sock = _connect(address, timeout=2.0) if address else None
+        if sock is None:
+            return
+        self._sock = sock
+        try:
+            # First connection: since=0 fetches the daemon's backlog too
+            resume = {"since": self.stream.seq if self._upstream else 0, "stream": self._upstream}
+            sock.sendall((json.dumps(resume) + "\n").encode("utf-8"))
+            sock.settimeout(None)
+            lines = sock.makefile("rb")
+            hello = json.loads(lines.readline() or b"{}")
+            if hello.get("type") != "hello":
+                return
+            if hello["stream"] != self._upstream:
+                self._upstream = hello["stream"]
+                self.stream.reset(hello["stream"])
+            self.connected = True
+            for line in lines:
+                if self._stop.is_set():
+                    break
+                event = json.loads(line)
+                if event.get("seq") is not None:
+                    self.stream.publish(event)
+        finally:
+            self._sock = None
+            sock.close()
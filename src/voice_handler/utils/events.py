@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Event Store - The Tour Logbook.
+
+The journal (claude_voice.log) is prose for humans; answering "why was
+that announcement late?" from it meant grepping multi-MB files for
+lines like "Hook Event - Like a song request! | {...}". The logbook
+keeps the same story as structured rows instead: one event per hook
+and per pipeline stage of each message, with session, hook, tool,
+message id, stage and latency in indexed columns of a SQLite (WAL)
+database, so a query over days of events takes milliseconds.
+
+The daemon is the only writer: hook events reach it through the log
+sink, stage events come from its consumer. Anyone may read.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+# Stages recorded for a message, in pipeline order
+EVENT_STAGES = (
+    "hook",         # A hook finished (status: queued, spoken, logged_only, silent)
+    "dequeued",     # The daemon took the message (latency: time spent queued)
+    "speaking",     # Playback is starting (latency: hook start to speech start)
+    "spoken",       # Playback finished (latency: hook start to end of audio)
+    "retry",        # Speaking failed, the message went back to the queue
+    "interrupted",  # An urgent message cut this one off
+    "dropped",      # Given up on (latency: hook start to giving up)
+)
+
+# Columns callers can filter on with equality
+FILTER_FIELDS = ("session_id", "hook", "tool", "message_id", "stage", "status")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    stage TEXT NOT NULL,
+    session_id TEXT,
+    hook TEXT,
+    tool TEXT,
+    message_id TEXT,
+    status TEXT,
+    latency_ms REAL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_session_ts ON events (session_id, ts);
+CREATE INDEX IF NOT EXISTS idx_events_stage_ts ON events (stage, ts);
+CREATE INDEX IF NOT EXISTS idx_events_hook_ts ON events (hook, ts);
+CREATE INDEX IF NOT EXISTS idx_events_tool_ts ON events (tool, ts);
+CREATE INDEX IF NOT EXISTS idx_events_message ON events (message_id);
+CREATE INDEX IF NOT EXISTS idx_events_stage_latency ON events (stage, latency_ms);
+"""
+
+_COLUMNS = ("id", "ts", "stage", "session_id", "hook", "tool", "message_id", "status", "latency_ms", "detail")
+_INSERT = (
+    "INSERT INTO events (ts, stage, session_id, hook, tool, message_id, status, latency_ms, detail) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Rows written between retention sweeps
+_PRUNE_EVERY = 1000
+
+_RELATIVE_TIME = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(value: Union[str, float, int, None], now: Optional[float] = None) -> Optional[float]:
+    """
+    Read a time filter as epoch seconds.
+
+    Accepts epoch seconds ("1760780000"), a relative age ("90s", "15m",
+    "2h", "7d" - that long ago) or an ISO date/time ("2026-10-18",
+    "2026-10-18T09:30:00").
+
+    Args:
+        value: Time to parse (None passes through)
+        now: Reference for relative ages (default: now)
+
+    Returns:
+        Epoch seconds, or None
+
+    Raises:
+        ValueError: If the value is none of the above
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = value.strip()
+    match = _RELATIVE_TIME.match(text)
+    if match:
+        return (now if now is not None else time.time()) - float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(text).timestamp()
+    except ValueError:
+        raise ValueError(f"Unrecognized time '{value}' (use epoch seconds, 15m/2h/7d or an ISO date)")
+
+
+class EventStore:
+    """
+    Append-only SQLite log of structured pipeline events.
+
+    Features:
+    - Indexed session, hook, tool, message id, stage, time and latency
+    - WAL journal: the daemon writes while the API and CLI read
+    - Events older than retention_days are swept out as new ones arrive
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        retention_days: Optional[float] = 7.0,
+        synchronous: str = "NORMAL",
+    ):
+        """
+        Open (or create) the event database.
+
+        Args:
+            path: Database file (default: paths.event_store)
+            retention_days: Age at which events are deleted (None or 0: keep all)
+            synchronous: SQLite synchronous pragma (OFF, NORMAL, FULL)
+        """
+        if path is None:
+            from voice_handler.utils.paths import get_paths
+            path = get_paths().event_store
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = retention_days
+
+        self._lock = threading.Lock()
+        self._since_prune = 0
+        self._listener: Optional[Callable[[List[Dict[str, Any]]], None]] = None
+        # isolation_level=None: explicit BEGIN/COMMIT only
+        self.conn = sqlite3.connect(
+            str(self.path),
+            timeout=10.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute(f"PRAGMA synchronous={synchronous};")
+        with self._lock:
+            self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _row(event: Dict[str, Any]) -> tuple:
+        detail = event.get("detail")
+        return (
+            event["ts"],
+            event["stage"],
+            event.get("session_id"),
+            event.get("hook"),
+            event.get("tool"),
+            event.get("message_id"),
+            event.get("status"),
+            event.get("latency_ms"),
+            json.dumps(detail, default=str) if detail else None,
+        )
+
+    def set_listener(self, callback: Optional[Callable[[List[Dict[str, Any]]], None]]):
+        """Set a callback that gets each batch of events once stored (e.g. EventStream.publish_events)."""
+        self._listener = callback
+
+    def record(self, stage: str, **fields):
+        """
+        Append one event.
+
+        Args:
+            stage: Stage name (see EVENT_STAGES)
+            **fields: ts, session_id, hook, tool, message_id, status,
+                latency_ms, detail (a JSON-serializable dict)
+        """
+        self.record_many([{**fields, "stage": stage}])
+
+    def record_many(self, events: Iterable[Dict[str, Any]]):
+        """Append several events in one transaction."""
+        events = [event if event.get("ts") else {**event, "ts": time.time()} for event in events]
+        rows = [self._row(event) for event in events]
+        if not rows:
+            return
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(_INSERT, rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._since_prune += len(rows)
+            if self.retention_days and self._since_prune >= _PRUNE_EVERY:
+                self._since_prune = 0
+                self._prune(time.time() - self.retention_days * 86400)
+        if self._listener is not None:
+            self._listener(events)
+
+    def prune(self, older_than: Optional[float] = None) -> int:
+        """
+        Delete old events.
+
+        Args:
+            older_than: Epoch cutoff (default: now minus retention_days)
+
+        Returns:
+            Number of events deleted
+        """
+        if older_than is None:
+            if not self.retention_days:
+                return 0
+            older_than = time.time() - self.retention_days * 86400
+        with self._lock:
+            return self._prune(older_than)
+
+    def _prune(self, older_than: float) -> int:
+        return self.conn.execute("DELETE FROM events WHERE ts < ?", (older_than,)).rowcount
+
+    @staticmethod
+    def _where(filters: Dict[str, Any], since: Optional[float], until: Optional[float],
+               min_latency_ms: Optional[float]) -> tuple:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for name in FILTER_FIELDS:
+            value = filters.get(name)
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        if min_latency_ms is not None:
+            clauses.append("latency_ms >= ?")
+            params.append(min_latency_ms)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(
+        self,
+        since: Union[str, float, None] = None,
+        until: Union[str, float, None] = None,
+        min_latency_ms: Optional[float] = None,
+        limit: int = 100,
+        offset: int = 0,
+        oldest_first: bool = False,
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find events, newest first.
+
+        Args:
+            since: Only events at or after this time (see parse_time)
+            until: Only events before this time (see parse_time)
+            min_latency_ms: Only events at least this slow
+            limit: Maximum events returned
+            offset: Events skipped (for paging)
+            oldest_first: Return events in time order instead
+            **filters: Exact matches on session_id, hook, tool, message_id, stage, status
+
+        Returns:
+            Event dicts (detail decoded)
+
+        Raises:
+            ValueError: On an unknown filter or unparseable time
+        """
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown event filter(s): {', '.join(sorted(unknown))}")
+        where, params = self._where(filters, parse_time(since), parse_time(until), min_latency_ms)
+        order = "ASC" if oldest_first else "DESC"
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM events{where} ORDER BY ts {order}, id {order} LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        events = []
+        for row in rows:
+            event = dict(zip(_COLUMNS, row))
+            event["detail"] = json.loads(event["detail"]) if event["detail"] else None
+            events.append(event)
+        return events
+
+    def timeline(self, message_id: str) -> List[Dict[str, Any]]:
+        """All events of one message (hook to outcome), in time order."""
+        return self.query(message_id=message_id, limit=1000, oldest_first=True)
+
+    def summary(
+        self,
+        since: Union[str, float, None] = None,
+        until: Union[str, float, None] = None,
+        **filters,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Event counts and latencies per stage.
+
+        Args:
+            since: Only events at or after this time (see parse_time)
+            until: Only events before this time (see parse_time)
+            **filters: Same exact-match filters as query()
+
+        Returns:
+            {stage: {count, avg_ms, max_ms}}
+        """
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown event filter(s): {', '.join(sorted(unknown))}")
+        where, params = self._where(filters, parse_time(since), parse_time(until), None)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT stage, COUNT(*), AVG(latency_ms), MAX(latency_ms) FROM events{where} GROUP BY stage",
+                params,
+            ).fetchall()
+        return {
+            stage: {
+                "count": count,
+                "avg_ms": round(avg, 2) if avg is not None else None,
+                "max_ms": round(peak, 2) if peak is not None else None,
+            }
+            for stage, count, avg, peak in rows
+        }
+
+    def count(self) -> int:
+        """Events stored."""
+        with self._lock:
+            row = self.conn.execute("SELECT COUNT(*) FROM events").fetchone()
+        return row[0] if row else 0
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """One-line rendering of an event for the CLI."""
+    when = datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    latency = f"{event['latency_ms']:.0f}ms" if event.get("latency_ms") is not None else "-"
+    session = (event.get("session_id") or "-")[:8]
+    parts = [
+        when,
+        f"{event['stage']:<11}",
+        f"{event.get('status') or '-':<11}",
+        f"{latency:>8}",
+        f"session={session}",
+        f"hook={event.get('hook') or '-'}",
+    ]
+    if event.get("tool"):
+        parts.append(f"tool={event['tool']}")
+    if event.get("message_id"):
+        parts.append(f"msg={event['message_id'][:12]}")
+    return " ".join(parts)
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Log Sink - One Pen for the Tour Journal.
+
+When every hook and the daemon scribble in the same notebook, pages get
+torn out mid-sentence: each process used to stat the log and rename it
+when it grew, racing the others. Now the daemon holds the only pen. It
+writes and rotates the log (numbered, gzip-compressed archives with a
+retention limit), and hook processes hand their records to it over a
+local socket. Without a daemon, records are simply appended to the log.
+
+Nothing here touches the filesystem per record: the writer counts the
+bytes it writes instead of stat()ing the file, and a shipper that found
+no daemon doesn't look again for a while.
+
+Hook records carry prompt and tool text, so the sink's address, socket
+and per-run token live in the user's private state directory, and a
+connection is only read after it presents the token.
+"""
+
+import gzip
+import hmac
+import json
+import logging
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from voice_handler.utils.paths import ensure_private_dir, get_paths
+
+# Record attributes sent from hooks to the daemon (the file format, plus structured events)
+_SHIPPED_FIELDS = ("name", "levelno", "levelname", "funcName", "created", "msecs", "process", "threadName", "event")
+
+
+def sink_address_file(log_file) -> Path:
+    """
+    Where the daemon publishes the sink address and token for a log file.
+
+    The file is in paths.user_state_dir (private to the user), named
+    after the log file and a checksum of its directory.
+    """
+    log_file = Path(log_file).absolute()
+    digest = zlib.crc32(str(log_file.parent).encode("utf-8"))
+    return get_paths().user_state_dir / f"{log_file.name}.{digest:08x}.sink"
+
+
+def read_sink_address(address_file: Path) -> Tuple[str, str]:
+    """
+    Read a published sink address and its token.
+
+    Args:
+        address_file: sink_address_file() of the log
+
+    Returns:
+        Tuple of (address, token), empty strings if nothing trustworthy is published
+    """
+    try:
+        ensure_private_dir(address_file.parent)
+        parts = address_file.read_text().split()
+    except OSError:
+        return "", ""
+    if len(parts) != 2:
+        return "", ""
+    return parts[0], parts[1]
+
+
+class RotatingLogWriter(logging.Handler):
+    """
+    Single-writer log file with size- and age-based rotation.
+
+    - The size is read once when the file is opened, then counted in memory
+    - Rotation happens before a write that would pass max_bytes, or once
+      max_age seconds have passed since the file was opened or rotated
+    - claude_voice.log becomes claude_voice.log.1.gz, older archives shift
+      up one number and anything past backup_count is deleted
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_age: Optional[float] = 24 * 3600.0,
+        backup_count: int = 5,
+        compress: bool = True,
+    ):
+        """
+        Initialize the writer (the file is opened on first write).
+
+        Args:
+            path: Log file path
+            max_bytes: Size that triggers rotation
+            max_age: Seconds before rotation regardless of size (None: never)
+            backup_count: Archives kept (0: the old log is just deleted)
+            compress: gzip archives
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+        self.compress = compress
+        self._stream = None
+        self._size = 0
+        self._rotate_at: Optional[float] = None
+
+    def _open(self):
+        self._stream = open(self.path, "ab")
+        self._size = os.fstat(self._stream.fileno()).st_size
+        self._rotate_at = time.time() + self.max_age if self.max_age else None
+
+    def archive_path(self, index: int) -> Path:
+        """Path of the index-th most recent archive."""
+        return self.path.with_name(f"{self.path.name}.{index}{'.gz' if self.compress else ''}")
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            data = (self.format(record) + "\n").encode("utf-8")
+            with self.lock:
+                if self._stream is None:
+                    self._open()
+                if self._size and (
+                    self._size + len(data) > self.max_bytes
+                    or (self._rotate_at is not None and time.time() >= self._rotate_at)
+                ):
+                    self._rollover()
+                self._stream.write(data)
+                self._stream.flush()
+                self._size += len(data)
+        except Exception:
+            self.handleError(record)
+
+    def rollover(self):
+        """Rotate now."""
+        with self.lock:
+            self._rollover()
+
+    def _rollover(self):
+        previous_size = self._size
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+        if self.backup_count > 0 and self.path.exists():
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.archive_path(index)
+                if source.exists():
+                    os.replace(source, self.archive_path(index + 1))
+            if self.compress:
+                staged = self.path.with_name(self.path.name + ".rotating")
+                os.replace(self.path, staged)
+                with open(staged, "rb") as source, gzip.open(self.archive_path(1), "wb") as target:
+                    shutil.copyfileobj(source, target)
+                staged.unlink()
+            else:
+                os.replace(self.path, self.archive_path(1))
+        else:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+        # Archives left over from a larger backup_count
+        index = self.backup_count + 1
+        while self.archive_path(index).exists():
+            self.archive_path(index).unlink()
+            index += 1
+
+        self._open()
+        note = (f"{time.strftime('%Y-%m-%d %H:%M:%S')} | INFO     | rotate               | "
+                f"Log rotated - new setlist starts! (previous: {previous_size / 1024 / 1024:.2f}MB)\n")
+        data = note.encode("utf-8")
+        self._stream.write(data)
+        self._size += len(data)
+
+    def flush(self):
+        with self.lock:
+            if self._stream is not None:
+                self._stream.flush()
+
+    def close(self):
+        with self.lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+        super().close()
+
+
+def _connect(address: str, timeout: float) -> Optional[socket.socket]:
+    """Connect to a published "unix:<path>" or "tcp:<host>:<port>" address."""
+    if address.startswith("unix:") and hasattr(socket, "AF_UNIX"):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        target = address[len("unix:"):]
+    elif address.startswith("tcp:"):
+        host, port = address[len("tcp:"):].rsplit(":", 1)
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        target = (host, int(port))
+    else:
+        return None
+    try:
+        sock.settimeout(timeout)
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+class LogShipper(logging.Handler):
+    """
+    Sends records to the daemon's LogSinkServer over one kept-open connection.
+
+    Falls back to appending to the log file itself when no daemon is
+    listening; the sink is looked for again after recheck_interval.
+    """
+
+    def __init__(self, log_file, recheck_interval: float = 30.0, timeout: float = 1.0):
+        """
+        Initialize the shipper (no connection is made until the first record).
+
+        Args:
+            log_file: Log file the daemon writes (and the fallback target)
+            recheck_interval: Seconds before a missing sink is looked for again
+            timeout: Connect/send timeout (seconds)
+        """
+        super().__init__()
+        self.address_file = sink_address_file(log_file)
+        self.recheck_interval = recheck_interval
+        self.timeout = timeout
+        self.fallback = logging.FileHandler(log_file, mode="a", encoding="utf-8", delay=True)
+        self._sock: Optional[socket.socket] = None
+        self._down_until = 0.0
+
+    def setFormatter(self, fmt):  # noqa: N802 - overrides logging.Handler.setFormatter
+        """Format shipped and fallback records alike."""
+        super().setFormatter(fmt)
+        self.fallback.setFormatter(fmt)
+
+    def _ship(self, record: logging.LogRecord) -> bool:
+        if self._sock is None:
+            if time.monotonic() < self._down_until:
+                return False
+            address, token = read_sink_address(self.address_file)
+            self._sock = _connect(address, self.timeout) if address else None
+            if self._sock is None:
+                self._down_until = time.monotonic() + self.recheck_interval
+                return False
+            try:
+                self._sock.sendall(token.encode("ascii") + b"\n")
+            except OSError:
+                self._disconnect()
+                self._down_until = time.monotonic() + self.recheck_interval
+                return False
+
+        fields = {name: getattr(record, name, None) for name in _SHIPPED_FIELDS}
+        fields["msg"] = record.getMessage()
+        try:
+            self._sock.sendall((json.dumps(fields, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+            return True
+        except OSError:
+            self._disconnect()
+            self._down_until = time.monotonic() + self.recheck_interval
+            return False
+
+    def _disconnect(self):
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.close()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            with self.lock:
+                shipped = self._ship(record)
+        except Exception:
+            shipped = False
+        if not shipped:
+            self.fallback.emit(record)
+
+    def flush(self):
+        self.fallback.flush()
+
+    def close(self):
+        with self.lock:
+            self._disconnect()
+        self.fallback.close()
+        super().close()
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """The run's token, then newline-delimited JSON records from one hook process."""
+
+    def handle(self):
+        sink = self.server.sink
+        if not hmac.compare_digest(self.rfile.readline().strip(), sink.token.encode("ascii")):
+            sink.connections_rejected += 1
+            return
+        for raw in self.rfile:
+            try:
+                fields = json.loads(raw)
+            except ValueError:
+                continue
+            record = logging.makeLogRecord(fields)
+            sink.records_received += 1
+            sink.target(record)
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixSink(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixSink = None
+
+
+class _TCPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LogSinkServer:
+    """
+    Receives log records from other processes and hands them to the writer.
+
+    Listens on a Unix socket (created owner-only) where available,
+    otherwise on an ephemeral 127.0.0.1 port, and publishes the address
+    and a per-run token in the user's private state directory
+    (sink_address_file). Connections that don't open with the token are
+    closed unread.
+    """
+
+    def __init__(self, log_file, target: Callable[[logging.LogRecord], None], logger=None):
+        """
+        Initialize the sink.
+
+        Args:
+            log_file: Log file the writer writes
+            target: Takes each received record (VoiceLogger.handle_record of the writer)
+            logger: Logger instance (for the sink's own messages)
+        """
+        self.address_file = sink_address_file(log_file)
+        self.target = target
+        self.logger = logger
+        self.records_received = 0
+        self.connections_rejected = 0
+        self.token = secrets.token_hex(16)
+        self._server: Optional[socketserver.BaseServer] = None
+        self._socket_path: Optional[Path] = None
+
+    def start(self):
+        """
+        Bind, publish the address and serve in a background thread.
+
+        Raises:
+            OSError: If the state directory isn't private or binding fails
+        """
+        ensure_private_dir(self.address_file.parent)
+        if _UnixSink is not None and sys.platform != "win32":
+            self._socket_path = self.address_file.with_suffix(".sock")
+            try:
+                self._socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            previous_umask = os.umask(0o177)  # The socket is owner-only from the moment it exists
+            try:
+                self._server = _UnixSink(str(self._socket_path), _SinkHandler)
+            finally:
+                os.umask(previous_umask)
+            address = f"unix:{self._socket_path}"
+        else:
+            self._server = _TCPSink(("127.0.0.1", 0), _SinkHandler)
+            address = f"tcp:127.0.0.1:{self._server.server_address[1]}"
+        self._server.sink = self
+
+        fd, temp_name = tempfile.mkstemp(dir=str(self.address_file.parent), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{address}\n{self.token}\n")
+        os.replace(temp_name, self.address_file)
+
+        threading.Thread(target=self._server.serve_forever, name="VoiceLogSink", daemon=True).start()
+        if self.logger:
+            self.logger.log_info(f"Log sink listening on {address}")
+
+    def stop(self):
+        """Stop serving and remove the published address."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for path in (self.address_file, self._socket_path):
+            if path is not None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
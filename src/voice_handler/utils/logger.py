@@ -4,130 +4,323 @@ Centralized logging system for voice handler - The Tour Journal.
 
 Like a road manager keeping meticulous notes of every show,
 this logger tracks all voice handler events with style.
+
+Writing the journal must never hold up the show, so besides writing
+each line as it happens ("sync") the logger can hand records to a
+background writer thread ("async", the daemon) or keep them in memory
+and write them all once the process exits ("buffered", the hooks).
+Context is only serialized when a record is actually written.
+
+Only one process - the daemon, created with writer=True - writes and
+rotates the log file; the others ship their records to it (see
+log_sink.py). Structured events (log_event) travel the same way and
+end up in the daemon's event store (see events.py).
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+from voice_handler.utils.log_sink import LogShipper, RotatingLogWriter
+
+LOG_MODES = ("sync", "async", "buffered")
+
+
+class _LazyMessage:
+    """Log message whose context is JSON-encoded only when the record is formatted."""
+
+    __slots__ = ("message", "context", "separator")
+
+    def __init__(self, message, context, separator):
+        self.message = message
+        self.context = context
+        self.separator = separator
+
+    def __str__(self):
+        return f"{self.message}{self.separator}{json.dumps(self.context, default=str)}"
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+
+class _TapHandler(logging.Handler):
+    """Hands records to a callback as plain dicts (the daemon's live event stream)."""
+
+    def __init__(self, callback, level):
+        super().__init__(level)
+        self.callback = callback
+
+    def emit(self, record):
+        if getattr(record, "event", None) is not None:
+            return  # Structured events are published by the event store
+        try:
+            self.callback({
+                "type": "log",
+                "ts": record.created,
+                "level": record.levelname,
+                "function": record.funcName,
+                "process": record.process,
+                "message": record.getMessage(),
+            })
+        except Exception:
+            self.handleError(record)
+
+
+class _TeeHandler(logging.Handler):
+    """Passes each record to several handlers, each with its own level."""
+
+    def __init__(self, *handlers):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
 
 class VoiceLogger:
     """
     Centralized logging system for voice handler debugging.
 
     Provides structured logging with levels, timestamps, and context tracking.
-    Logs are written with automatic rotation to prevent disk space issues.
+    The writer (the daemon) rotates the log by size and age into compressed
+    numbered archives; every other process ships its records to the writer.
+
+    Modes:
+    - sync: every record is written before the call returns
+    - async: records go through a queue to a writer thread (QueueListener)
+    - buffered: records are kept in memory and written at exit (or when
+      buffer_capacity fills up, or on an error)
     """
 
-    def __init__(self, log_file=None, debug_mode=True, max_size_mb=10):
+    def __init__(
+        self,
+        log_file=None,
+        debug_mode=None,
+        max_size_mb=10,
+        mode="sync",
+        buffer_capacity=5000,
+        writer=False,
+        max_age_hours=24,
+        backup_count=5,
+    ):
         """
         Initialize the logger with file and console handlers.
 
         Args:
             log_file (str): Path to log file (auto-detected based on OS)
-            debug_mode (bool): Enable debug level logging
-            max_size_mb (int): Maximum log file size in MB before rotation
+            debug_mode (bool): Enable debug level logging (default: DEBUG_MODE)
+            max_size_mb (int): Maximum log file size in MB before rotation (writer only)
+            mode (str): "sync", "async" or "buffered"
+            buffer_capacity (int): Records buffered before an early write (buffered mode)
+            writer (bool): Own the log file: write and rotate it (one process only)
+            max_age_hours (float): Rotate after this long regardless of size (writer only, 0: never)
+            backup_count (int): Compressed archives kept (writer only)
         """
         # Determine log file location based on OS
         if log_file is None:
             from voice_handler.utils.paths import get_paths
             log_file = get_paths().daemon_log
+        if debug_mode is None:
+            from voice_handler.config import is_debug_mode
+            debug_mode = is_debug_mode()
 
         self.log_file = Path(log_file)
         self.debug_mode = debug_mode
         self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.max_age_seconds = max_age_hours * 3600 if max_age_hours else None
+        self.backup_count = backup_count
+        self.buffer_capacity = buffer_capacity
+        self.writer = writer
+        # The writer's EventStore (set by the daemon); None: events are shipped in log records
+        self.event_store = None
 
         # Ensure log directory exists
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Check and rotate log file if needed
-        self._check_and_rotate_log()
-
         # Configure logger
         self.logger = logging.getLogger("VoiceHandler")
         self.logger.setLevel(logging.DEBUG if debug_mode else logging.INFO)
+        # The journal is its own file: handlers on the root logger would
+        # format every record in the caller's thread
+        self.logger.propagate = False
+
+        self.mode = None
+        self._tap = None
+        self._handler = None
+        self._file_handler = None
+        self._listener = None
+        self._closed_at_exit = False
+        self.set_mode(mode)
 
-        # Remove existing handlers to avoid duplicates
-        self.logger.handlers.clear()
+        # Keep track of session
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.log_info(f"=== NEW SESSION: {self.session_id} - The show begins! ===")
+
+    def set_mode(self, mode):
+        """
+        Switch how records reach the log file (pending records are written first).
 
-        # File handler with detailed format
-        file_handler = logging.FileHandler(self.log_file, mode='a', encoding='utf-8')
+        Args:
+            mode (str): "sync", "async" or "buffered"
+        """
+        if mode not in LOG_MODES:
+            raise ValueError(f"Unknown log mode: {mode} (expected one of {', '.join(LOG_MODES)})")
+        if mode == self.mode:
+            return
+        self._shutdown_pipeline()
+
+        # The writer owns the file; everyone else ships to it
+        if self.writer:
+            file_handler = RotatingLogWriter(
+                self.log_file,
+                max_bytes=self.max_size_bytes,
+                max_age=self.max_age_seconds,
+                backup_count=self.backup_count,
+            )
+        else:
+            file_handler = LogShipper(self.log_file)
         file_format = logging.Formatter(
             '%(asctime)s | %(levelname)-8s | %(funcName)-20s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_format)
-        self.logger.addHandler(file_handler)
-
-        # Keep track of session
-        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self._log_count = 0
-        self.log_info(f"=== NEW SESSION: {self.session_id} - The show begins! ===")
-
-    def _check_and_rotate_log(self):
-        """Check log file size and rotate if it exceeds the maximum."""
-        if not self.log_file.exists():
-            return
-
-        try:
-            file_size = self.log_file.stat().st_size
+        if self._tap is not None:
+            file_handler = _TeeHandler(file_handler, self._tap)
+        self._file_handler = file_handler
+
+        if mode == "async":
+            records = queue.SimpleQueue()
+            handler = _DeferredQueueHandler(records)
+            self._listener = logging.handlers.QueueListener(records, file_handler)
+            self._listener.start()
+        elif mode == "buffered":
+            # Errors are written at once: they matter most if the process dies
+            handler = logging.handlers.MemoryHandler(
+                self.buffer_capacity, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+            )
+        else:
+            handler = file_handler
 
-            if file_size > self.max_size_bytes:
-                # Create backup filename
-                backup_file = self.log_file.parent / f"{self.log_file.stem}_backup{self.log_file.suffix}"
+        # Remove existing handlers to avoid duplicates (pending records are written)
+        for existing in list(self.logger.handlers):
+            existing.flush()
+        self.logger.handlers.clear()
+        self.logger.addHandler(handler)
+        self._handler = handler
+        self.mode = mode
 
-                # Remove old backup if it exists
-                if backup_file.exists():
-                    backup_file.unlink()
+        if mode != "sync" and not self._closed_at_exit:
+            atexit.register(self.close)
+            self._closed_at_exit = True
 
-                # Move current log to backup
-                self.log_file.rename(backup_file)
+    def set_tap(self, callback, level=logging.INFO):
+        """
+        Also hand records (this process's and those received from hooks) to a callback.
 
-                # Create new empty log file
-                self.log_file.touch()
+        The callback runs where records are written (the writer thread in
+        async mode) and gets {"type": "log", "ts", "level", "function",
+        "process", "message"} dicts.
 
-                # Log rotation event
-                with open(self.log_file, 'w', encoding='utf-8') as f:
-                    f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | INFO | "
-                           f"Log rotated - new setlist starts! (previous: {file_size / 1024 / 1024:.2f}MB)\n")
-        except Exception:
-            pass  # Don't interrupt service on rotation failure
+        Args:
+            callback: Called with each record as a dict (None removes the tap)
+            level: Lowest level passed on
+        """
+        self._tap = _TapHandler(callback, level) if callback is not None else None
+        mode, self.mode = self.mode, None
+        if mode is not None:
+            self.set_mode(mode)  # Rebuild the pipeline with the tap
+
+    def handle_record(self, record):
+        """Write a record made elsewhere (a hook's, received by the log sink) through this logger's pipeline."""
+        event = getattr(record, "event", None)
+        if event is not None and self.event_store is not None:
+            self._store_event(event)
+        if self._handler is not None:
+            self._handler.handle(record)
+
+    def flush(self):
+        """Write every pending record now."""
+        if self._listener is not None:
+            # The listener drains its queue when stopped
+            self._listener.stop()
+            self._listener.start()
+        if self._handler is not None:
+            self._handler.flush()
+
+    def close(self):
+        """Write pending records and release the log file."""
+        self._shutdown_pipeline()
+        self.mode = None
+
+    def _shutdown_pipeline(self):
+        """Drain and remove this instance's handlers (another instance's stay)."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        handler, self._handler = self._handler, None
+        if handler is not None:
+            self.logger.removeHandler(handler)
+            try:
+                handler.close()  # A MemoryHandler writes its buffer on close
+            except Exception:
+                pass  # Never fail the caller over its log file
+        if self._file_handler is not None:
+            self._file_handler.close()
+            self._file_handler = None
 
     def log_debug(self, message, **context):
         """Log debug level message with optional context."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if context:
-            message = f"{message} | Context: {json.dumps(context, default=str)}"
+            message = _LazyMessage(message, context, " | Context: ")
         self.logger.debug(message)
 
     def log_info(self, message, **context):
         """Log info level message with optional context."""
-        self._log_count += 1
-        if self._log_count % 100 == 0:
-            self._check_and_rotate_log()
-
         if context:
-            message = f"{message} | {json.dumps(context, default=str)}"
+            message = _LazyMessage(message, context, " | ")
         self.logger.info(message)
 
     def log_warning(self, message, **context):
         """Log warning level message with optional context."""
         if context:
-            message = f"{message} | Context: {json.dumps(context, default=str)}"
+            message = _LazyMessage(message, context, " | Context: ")
         self.logger.warning(message)
 
     def log_error(self, message, exception=None, **context):
         """Log error level message with exception details."""
         import traceback
         if exception:
+            # The traceback only exists in this thread, so it is formatted now
             message = f"{message} | Exception: {str(exception)}"
             if self.debug_mode:
                 message += f"\nTraceback:\n{traceback.format_exc()}"
         if context:
-            message = f"{message} | Context: {json.dumps(context, default=str)}"
+            message = _LazyMessage(message, context, " | Context: ")
         self.logger.error(message)
 
     def log_hook_event(self, hook_type, tool=None, stdin_data=None, **kwargs):
@@ -163,6 +356,30 @@ class VoiceLogger:
             log_msg += f" - '{display_msg}'"
         self.log_info(log_msg, **details)
 
+    def log_event(self, stage, **fields):
+        """
+        Record a structured pipeline event (see events.EventStore.record).
+
+        The writer stores it directly; other processes attach it to a log
+        record that the log sink hands to the writer.
+
+        Args:
+            stage (str): Event stage ("hook", "dequeued", "spoken", ...)
+            **fields: session_id, hook, tool, message_id, status, latency_ms, detail
+        """
+        event = {"stage": stage, "ts": time.time(), **fields}
+        if self.event_store is not None:
+            self._store_event(event)
+        else:
+            context = {k: v for k, v in fields.items() if v is not None}
+            self.logger.info(_LazyMessage(f"Event: {stage}", context, " | "), extra={"event": event})
+
+    def _store_event(self, event):
+        try:
+            self.event_store.record(**event)
+        except Exception as e:
+            self.log_debug(f"Could not store event: {e}")
+
     def log_tts_event(self, provider, success, voice=None, error=None, text=None):
         """Log TTS operations."""
         if success:
@@ -176,6 +393,8 @@ class VoiceLogger:
 
     def log_stdin_data(self, data):
         """Log stdin data received from Claude Code."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if isinstance(data, dict):
             self.log_debug("Stdin received - setlist data incoming!", keys=list(data.keys()))
         elif data:
@@ -191,7 +410,13 @@ _logger_lock = threading.Lock()
 
 
 def get_logger() -> VoiceLogger:
-    """Get the global logger instance (thread-safe)."""
+    """
+    Get the global logger instance (thread-safe).
+
+    Mostly used by hook processes, so it starts in the hook log mode
+    (LOG_MODE_HOOKS, buffered by default); long-running processes
+    switch it with set_mode().
+    """
     global _logger_instance
     # First check (fast path - no lock)
     if _logger_instance is None:
@@ -199,7 +424,8 @@ def get_logger() -> VoiceLogger:
         with _logger_lock:
             # Double-check after acquiring lock
             if _logger_instance is None:
-                _logger_instance = VoiceLogger()
+                from voice_handler.config import get_config
+                _logger_instance = VoiceLogger(mode=get_config().runtime.hook_log_mode)
     return _logger_instance
 
 
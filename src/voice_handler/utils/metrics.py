@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Daemon Metrics - The Front-of-House Meters.
+
+Like the VU meters on the mixing desk, this module keeps live counters
+and latency histograms for the voice worker, flushes them to the daemon
+status file with atomic writes, and renders them as JSON or Prometheus
+text for the control panel and scrapers.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Upper bounds (seconds) shared by every latency histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Recent samples kept per histogram for percentile estimates
+RECENT_SAMPLES = 512
+
+# Counters and histograms every snapshot reports, even before the first event
+COUNTERS = (
+    "messages_processed",
+    "messages_failed",
+    "messages_expired",
+    "config_reloads",
+    "config_reload_failures",
+    "digests_spoken",
+    "messages_merged",
+)
+HISTOGRAMS = {
+    "queue_wait_seconds": "Time from enqueue to processing start",
+    "llm_latency_seconds": "LLM request latency (compression, generation)",
+    "tts_synthesis_seconds": "TTS synthesis latency",
+    "time_to_first_audio_seconds": "Time from processing start to audio start",
+    "playback_duration_seconds": "Audio playback duration",
+    "config_reload_seconds": "Time to validate and apply a changed config.json/.env in the daemon",
+}
+
+PROMETHEUS_PREFIX = "voice_"
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram with a window of recent samples."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value: float):
+        """Record one sample."""
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Serializable view with percentiles over the recent window."""
+        ordered = sorted(self.recent)
+        cumulative = []
+        running = 0
+        for n in self.bucket_counts:
+            running += n
+            cumulative.append(running)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": round(_percentile(ordered, 50), 6),
+            "p90": round(_percentile(ordered, 90), 6),
+            "p99": round(_percentile(ordered, 99), 6),
+            "max": round(ordered[-1], 6) if ordered else 0.0,
+            "buckets": {str(bound): c for bound, c in zip(self.buckets, cumulative)},
+        }
+
+
+class DaemonMetrics:
+    """
+    Thread-safe registry of worker counters and histograms.
+
+    Recording is a dict update under a lock - cheap enough for the
+    consumer loop. Serialization only happens on flush.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self._histograms: Dict[str, Histogram] = {name: Histogram() for name in HISTOGRAMS}
+        self._caches: Dict[str, Dict[str, int]] = {}
+        self._local = threading.local()
+
+    def inc(self, name: str, amount: int = 1):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float):
+        """Record a latency sample in seconds."""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Time the enclosed block into a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def cache_hit(self, cache: str):
+        """Record a hit on a named cache."""
+        self._cache_event(cache, "hits")
+
+    def cache_miss(self, cache: str):
+        """Record a miss on a named cache."""
+        self._cache_event(cache, "misses")
+
+    def _cache_event(self, cache: str, kind: str):
+        with self._lock:
+            stats = self._caches.setdefault(cache, {"hits": 0, "misses": 0})
+            stats[kind] += 1
+
+    def begin_utterance(self):
+        """Mark processing start for time-to-first-audio on this thread."""
+        self._local.utterance_start = time.perf_counter()
+
+    def audio_started(self):
+        """Record time-to-first-audio once per utterance on this thread."""
+        start = getattr(self._local, "utterance_start", None)
+        if start is not None:
+            self._local.utterance_start = None
+            self.observe("time_to_first_audio_seconds", time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Serializable view of every metric.
+
+        Returns:
+            Dict with uptime, counters, histograms and cache stats; the
+            top-level uptime_seconds/messages_processed keys are what
+            VoiceDaemon.get_status() reports.
+        """
+        now = time.time()
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {name: h.snapshot() for name, h in self._histograms.items()}
+            caches = {}
+            for name, stats in self._caches.items():
+                lookups = stats["hits"] + stats["misses"]
+                caches[name] = {
+                    **stats,
+                    "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                }
+
+        return {
+            "uptime_seconds": int(now - self.started_at),
+            "messages_processed": counters.get("messages_processed", 0),
+            "updated_at": now,
+            "counters": counters,
+            "histograms": histograms,
+            "caches": caches,
+        }
+
+    def write_status(self, path: Path):
+        """Atomically write the snapshot as JSON (write temp file, then rename)."""
+        write_json_atomic(Path(path), self.snapshot())
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]):
+    """
+    Write JSON so readers never see a partial file.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable dict
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_name, path)
+    except Exception:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def render_prometheus(snapshot: Dict[str, Any]) -> str:
+    """
+    Render a metrics snapshot in the Prometheus text exposition format.
+
+    Works from the JSON snapshot so the API server can render the
+    daemon's status file without sharing memory with the worker.
+
+    Args:
+        snapshot: Dict produced by DaemonMetrics.snapshot()
+
+    Returns:
+        Prometheus text (version 0.0.4)
+    """
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}uptime_seconds Seconds since the worker started",
+        f"# TYPE {PROMETHEUS_PREFIX}uptime_seconds gauge",
+        f"{PROMETHEUS_PREFIX}uptime_seconds {snapshot.get('uptime_seconds', 0)}",
+    ]
+
+    for name, value in sorted(snapshot.get("counters", {}).items()):
+        metric = f"{PROMETHEUS_PREFIX}{name}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+
+    for name, hist in sorted(snapshot.get("histograms", {}).items()):
+        metric = f"{PROMETHEUS_PREFIX}{name}"
+        if name in HISTOGRAMS:
+            lines.append(f"# HELP {metric} {HISTOGRAMS[name]}")
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in hist.get("buckets", {}).items():
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+        lines.append(f'{metric}_bucket{{le="+Inf"}} {hist.get("count", 0)}')
+        lines.append(f"{metric}_sum {hist.get('sum', 0.0)}")
+        lines.append(f"{metric}_count {hist.get('count', 0)}")
+
+    caches = snapshot.get("caches", {})
+    if caches:
+        for kind in ("hits", "misses"):
+            metric = f"{PROMETHEUS_PREFIX}cache_{kind}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for cache, stats in sorted(caches.items()):
+                lines.append(f'{metric}{{cache="{cache}"}} {stats.get(kind, 0)}')
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsFlusher:
+    """Background thread that periodically writes the metrics snapshot."""
+
+    def __init__(
+        self,
+        metrics: DaemonMetrics,
+        path: Path,
+        interval: float = 5.0,
+        logger=None,
+        listener: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize the flusher.
+
+        Args:
+            metrics: Registry to snapshot
+            path: Status file to write
+            interval: Seconds between flushes
+            logger: Optional logger instance
+            listener: Optional callback that gets each snapshot written (metrics ticks)
+        """
+        self.metrics = metrics
+        self.path = Path(path)
+        self.interval = interval
+        self.logger = logger
+        self.listener = listener
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def flush(self):
+        """Write the status file now."""
+        try:
+            snapshot = self.metrics.snapshot()
+            write_json_atomic(self.path, snapshot)
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Failed to write daemon status file", exception=e)
+            return
+        if self.listener is not None:
+            try:
+                self.listener(snapshot)
+            except Exception as e:
+                if self.logger:
+                    self.logger.log_debug(f"Metrics listener failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self):
+        """Write an initial snapshot and start flushing in the background."""
+        self.flush()
+        self._thread = threading.Thread(target=self._run, name="VoiceMetricsFlush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1.0)
+        self.flush()
+
+
+# Singleton metrics registry
+_metrics_instance: Optional[DaemonMetrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> DaemonMetrics:
+    """Get or create the metrics registry singleton (thread-safe)."""
+    global _metrics_instance
+    # First check (fast path - no lock)
+    if _metrics_instance is None:
+        # Acquire lock for initialization
+        with _metrics_lock:
+            # Double-check after acquiring lock
+            if _metrics_instance is None:
+                _metrics_instance = DaemonMetrics()
+    return _metrics_instance
@@ -23,6 +23,19 @@ class VoiceHandlerPaths:
             temp = '/tmp'
         return Path(temp)
 
+    @staticmethod
+    def _user_id() -> str:
+        """Current user's id (uid, or the login name where there are no uids)."""
+        if hasattr(os, 'getuid'):
+            return str(os.getuid())
+        import getpass
+        return getpass.getuser()
+
+    @property
+    def user_state_dir(self) -> Path:
+        """Per-user private directory (0700) for state that must not be shared."""
+        return self._get_temp_dir() / f'claude_voice_{self._user_id()}'
+
     @property
     def queue_db(self) -> Path:
         """Queue database path."""
@@ -68,11 +81,72 @@ class VoiceHandlerPaths:
         """Speech lock file path."""
         return self._get_temp_dir() / 'claude_voice_speech.lock'
 
+    @property
+    def trace_ring(self) -> Path:
+        """Latency trace ring-buffer file path."""
+        return self._get_temp_dir() / 'claude_voice_traces.ring'
+
+    @property
+    def event_store(self) -> Path:
+        """Structured pipeline event database (written by the daemon)."""
+        return self._get_temp_dir() / 'claude_voice_events.db'
+
+    @property
+    def event_stream_address(self) -> Path:
+        """Published address of the daemon's live event stream."""
+        return self._get_temp_dir() / 'claude_voice_events.addr'
+
+    @property
+    def config_snapshot(self) -> Path:
+        """
+        Pre-validated config.json/.env snapshot (rebuilt when either changes).
+
+        Holds the .env values, so it lives in the private user_state_dir;
+        config_snapshot.snapshot_path() adds the .env it was built from.
+        """
+        return self.user_state_dir / 'config.snapshot'
+
+    @property
+    def audio_cache(self) -> Path:
+        """Rendered audio cache directory (WAV files keyed by content hash)."""
+        return self._get_temp_dir() / 'claude_voice_audio_cache'
+
     @property
     def last_speech_time(self) -> Path:
         """Last speech timestamp file path."""
         return self._get_temp_dir() / 'claude_voice_last_speech.time'
 
+    @property
+    def llm_latency(self) -> Path:
+        """Recent LLM provider latencies (for hedged generation)."""
+        return self._get_temp_dir() / 'claude_voice_llm_latency.json'
+
+    @property
+    def qwen_worker_address(self) -> Path:
+        """Published address of the daemon's qwen-code worker service."""
+        return self._get_temp_dir() / 'claude_voice_qwen.addr'
+
+
+def ensure_private_dir(path: Path) -> Path:
+    """
+    Create a directory only the current user can use, or check an existing one.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        The path
+
+    Raises:
+        OSError: If the directory belongs to another user or is open to others
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if hasattr(os, 'getuid'):
+        stat = os.stat(path)
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+            raise OSError(f"{path} is not private to this user")
+    return path
+
 
 # Singleton instance
 _paths_instance = None
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Latency Tracing - The Tour Itinerary.
+
+Like the itinerary that logs every leg from hotel to stage, a trace
+follows one voice message from the hook process that created it to the
+moment the audio stops. A trace ID is minted in cli.main, travels inside
+VoiceMessage.metadata, and collects a timestamp per pipeline stage.
+
+Finished traces go to a fixed-size binary ring-buffer file, so recording
+costs one small locked write and the file never grows.
+"""
+
+import os
+import struct
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+if sys.platform != 'win32':
+    import fcntl
+else:
+    fcntl = None  # Not available on Windows
+
+
+# Pipeline stages in the order they normally happen
+STAGES = (
+    "process_start",
+    "imports_done",
+    "stdin_parsed",
+    "processor_done",
+    "llm_done",
+    "enqueued",
+    "dequeued",
+    "compression_done",
+    "synthesis_done",
+    "playback_start",
+    "playback_end",
+)
+
+METADATA_KEY = "trace"
+
+# Ring file layout: header, then fixed-size slots.
+# Slot: trace id (16 bytes), start epoch (double), label (16 bytes),
+# then one float32 millisecond offset per stage (NaN = not reached).
+_MAGIC = b"VTRC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIQ")
+_SLOT = struct.Struct(f"<16sd16s{len(STAGES)}f")
+DEFAULT_CAPACITY = 1024
+
+_NAN = float("nan")
+
+
+def process_start_time() -> float:
+    """
+    Best estimate of when this process started (epoch seconds).
+
+    Uses /proc on Linux so interpreter startup and package imports are
+    included; elsewhere falls back to when this module was imported.
+    The process age is measured against the system uptime (btime in
+    /proc/stat is whole seconds, up to 1s off), so the result is as
+    precise as the clock tick.
+    """
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        started_after_boot = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        now = time.time()
+        try:
+            uptime = time.clock_gettime(time.CLOCK_BOOTTIME)
+        except AttributeError:
+            with open("/proc/uptime", "rb") as f:
+                uptime = float(f.read().split()[0])
+        return now - (uptime - started_after_boot)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return _MODULE_LOADED
+
+
+_MODULE_LOADED = time.time()
+
+
+class Trace:
+    """One message's journey: an ID, a label (the hook), the tool and stage timestamps."""
+
+    def __init__(
+        self,
+        trace_id: Optional[str] = None,
+        label: str = "",
+        spans: Optional[Dict[str, float]] = None,
+        tool: Optional[str] = None,
+    ):
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.label = label or ""
+        self.spans: Dict[str, float] = dict(spans or {})
+        self.tool = tool
+
+    def mark(self, stage: str, timestamp: Optional[float] = None):
+        """
+        Record when a stage finished (first mark wins, so retries keep the original).
+
+        Args:
+            stage: Stage name from STAGES
+            timestamp: Epoch seconds (default: now)
+        """
+        if stage not in self.spans:
+            self.spans[stage] = timestamp if timestamp is not None else time.time()
+
+    def to_metadata(self) -> Dict[str, Any]:
+        """Serializable form stored in VoiceMessage.metadata["trace"]."""
+        data = {"id": self.trace_id, "label": self.label, "spans": dict(self.spans)}
+        if self.tool:
+            data["tool"] = self.tool
+        return data
+
+    @classmethod
+    def from_metadata(cls, metadata: Optional[Dict[str, Any]]) -> Optional["Trace"]:
+        """Rebuild a trace from message metadata (None if the message has none)."""
+        data = (metadata or {}).get(METADATA_KEY)
+        if not data or "id" not in data:
+            return None
+        return cls(trace_id=data["id"], label=data.get("label", ""), spans=data.get("spans"), tool=data.get("tool"))
+
+    def waterfall(self) -> List[Dict[str, Any]]:
+        """
+        Stages in time order with offsets from the first span.
+
+        Returns:
+            Rows with stage, offset_ms (since start) and delta_ms (since previous stage)
+        """
+        if not self.spans:
+            return []
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        ordered = sorted(self.spans.items(), key=lambda kv: (kv[1], order.get(kv[0], len(STAGES))))
+        start = ordered[0][1]
+        rows = []
+        previous = start
+        for stage, ts in ordered:
+            rows.append({
+                "stage": stage,
+                "offset_ms": round((ts - start) * 1000, 2),
+                "delta_ms": round((ts - previous) * 1000, 2),
+            })
+            previous = ts
+        return rows
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact description for listings."""
+        rows = self.waterfall()
+        return {
+            "trace_id": self.trace_id,
+            "label": self.label,
+            "started_at": min(self.spans.values()) if self.spans else None,
+            "total_ms": rows[-1]["offset_ms"] if rows else 0.0,
+            "stages": len(rows),
+        }
+
+
+def render_waterfall(trace: Trace, width: int = 40) -> str:
+    """
+    Render a trace as a text waterfall.
+
+    Args:
+        trace: Trace to render
+        width: Bar width in characters for the full duration
+
+    Returns:
+        Multi-line string, one bar per stage
+    """
+    rows = trace.waterfall()
+    if not rows:
+        return f"{trace.trace_id} (no spans)"
+    total = rows[-1]["offset_ms"] or 1.0
+    lines = [f"trace {trace.trace_id} {trace.label} total={rows[-1]['offset_ms']:.1f}ms"]
+    previous_offset = 0.0
+    for row in rows:
+        begin = int(previous_offset / total * width)
+        end = max(begin + 1, int(row["offset_ms"] / total * width))
+        bar = " " * begin + "█" * (end - begin)
+        lines.append(f"{row['stage']:>17} |{bar:<{width + 1}}| +{row['delta_ms']:.1f}ms")
+        previous_offset = row["offset_ms"]
+    return "\n".join(lines)
+
+
+class TraceRing:
+    """
+    Fixed-capacity ring buffer of finished traces in a binary file.
+
+    Writers from any process take an exclusive lock for the length of one
+    slot write; readers take a shared lock and decode every slot.
+    """
+
+    def __init__(self, path: Optional[Path] = None, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize the ring.
+
+        Args:
+            path: Ring file (default: paths.trace_ring)
+            capacity: Number of slots when creating the file
+        """
+        if path is None:
+            from voice_handler.utils.paths import get_paths
+            path = get_paths().trace_ring
+        self.path = Path(path)
+        self.capacity = capacity
+
+    def _lock(self, f, exclusive: bool):
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def _unlock(self, f):
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_header(self, f) -> Optional[tuple]:
+        f.seek(0)
+        raw = f.read(_HEADER.size)
+        if len(raw) < _HEADER.size:
+            return None
+        magic, version, slot_size, capacity, next_index = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _VERSION or slot_size != _SLOT.size:
+            return None
+        return capacity, next_index
+
+    @staticmethod
+    def _encode(trace: Trace) -> bytes:
+        start = min(trace.spans.values()) if trace.spans else time.time()
+        offsets = [
+            (trace.spans[stage] - start) * 1000.0 if stage in trace.spans else _NAN
+            for stage in STAGES
+        ]
+        try:
+            trace_id = uuid.UUID(hex=trace.trace_id).bytes
+        except ValueError:
+            trace_id = trace.trace_id.encode("ascii", "replace")[:16]
+        label = trace.label.encode("utf-8")[:16]
+        return _SLOT.pack(trace_id, start, label, *offsets)
+
+    @staticmethod
+    def _decode(raw: bytes) -> Optional[Trace]:
+        trace_id, start, label, *offsets = _SLOT.unpack(raw)
+        if not any(trace_id):
+            return None
+        spans = {
+            stage: start + offset / 1000.0
+            for stage, offset in zip(STAGES, offsets)
+            if offset == offset  # skip NaN
+        }
+        return Trace(
+            trace_id=uuid.UUID(bytes=trace_id).hex,
+            label=label.rstrip(b"\0").decode("utf-8", "replace"),
+            spans=spans,
+        )
+
+    def record(self, trace: Trace):
+        """Write a finished trace into the next slot, overwriting the oldest."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        slot = self._encode(trace)
+        fd = os.open(str(self.path), os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            self._lock(f, exclusive=True)
+            try:
+                header = self._read_header(f)
+                if header is None:
+                    capacity, next_index = self.capacity, 0
+                    f.truncate(_HEADER.size + capacity * _SLOT.size)
+                else:
+                    capacity, next_index = header
+                f.seek(_HEADER.size + (next_index % capacity) * _SLOT.size)
+                f.write(slot)
+                f.seek(0)
+                f.write(_HEADER.pack(_MAGIC, _VERSION, _SLOT.size, capacity, next_index + 1))
+            finally:
+                self._unlock(f)
+
+    def read(self, limit: Optional[int] = None) -> List[Trace]:
+        """
+        Read recorded traces, newest first.
+
+        Args:
+            limit: Maximum traces to return
+
+        Returns:
+            List of Trace objects
+        """
+        if not self.path.exists():
+            return []
+        with open(self.path, "rb") as f:
+            self._lock(f, exclusive=False)
+            try:
+                header = self._read_header(f)
+                if header is None:
+                    return []
+                capacity, next_index = header
+                count = min(next_index, capacity)
+                if limit is not None:
+                    count = min(count, limit)
+                traces = []
+                for i in range(count):
+                    index = (next_index - 1 - i) % capacity
+                    f.seek(_HEADER.size + index * _SLOT.size)
+                    trace = self._decode(f.read(_SLOT.size))
+                    if trace is not None:
+                        traces.append(trace)
+                return traces
+            finally:
+                self._unlock(f)
+
+    def find(self, trace_id: str) -> Optional[Trace]:
+        """Look up a recorded trace by ID."""
+        for trace in self.read():
+            if trace.trace_id == trace_id:
+                return trace
+        return None
+
+
+# The trace active on this thread (hook main thread, or the consumer while it speaks)
+_local = threading.local()
+
+
+def start_trace(label: str = "", process_start: Optional[float] = None) -> Trace:
+    """
+    Mint a new trace and make it current on this thread.
+
+    Args:
+        label: Short label (e.g. hook name), max 16 bytes in the ring
+        process_start: Epoch time the process started, recorded as the first span
+
+    Returns:
+        The new Trace
+    """
+    trace = Trace(label=label)
+    if process_start is not None:
+        trace.mark("process_start", process_start)
+    activate(trace)
+    return trace
+
+
+def activate(trace: Optional[Trace]):
+    """Make a trace current on this thread (None to clear)."""
+    _local.trace = trace
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace active on this thread, if any."""
+    return getattr(_local, "trace", None)
+
+
+def mark(stage: str, timestamp: Optional[float] = None):
+    """Mark a stage on the current trace; no-op when nothing is being traced."""
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.mark(stage, timestamp)
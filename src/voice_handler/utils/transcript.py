@@ -14,6 +14,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+# Sentence boundary: terminal punctuation followed by a capitalised word or a newline
+SENTENCE_PATTERN = re.compile(r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*\n')
+
 
 class TranscriptReader:
     """
@@ -191,8 +194,7 @@ class TranscriptReader:
             return self._extract_list_summary(text, max_length)
 
         # Split into sentences
-        sentence_pattern = r'(?<=[.!?])\s+(?=[A-Z])|(?<=[.!?])\s*\n'
-        sentences = re.split(sentence_pattern, text)
+        sentences = SENTENCE_PATTERN.split(text)
         sentences = [s.strip() for s in sentences if s.strip()]
 
         if not sentences:
@@ -115,6 +115,7 @@ def clean_singletons():
     from voice_handler.queue import producer as producer_module
     from voice_handler.queue import consumer as consumer_module
     from voice_handler.ai import qwen as qwen_module
+    from voice_handler.tts import playback as playback_module
 
     yield
 
@@ -126,6 +127,7 @@ def clean_singletons():
     producer_module._producer_instance = None
     consumer_module._consumer_instance = None
     qwen_module._qwen_generator = None
+    playback_module._controller_instance = None
 
 
 # Skip TTS tests if OpenAI not configured
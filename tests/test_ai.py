@@ -5,6 +5,11 @@ These tests verify Cosmic Eddie's rock personality works correctly.
 Like a pre-show interview with the AI roadie!
 """
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
 
@@ -169,3 +174,309 @@ class TestQwenContextGenerator:
         q2 = get_qwen_generator()
 
         assert q1 is q2
+
+
+class _FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Streams the server's reply one word per NDJSON chunk."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests.append((self.path, request))
+
+        if self.path == "/api/generate":
+            body = json.dumps({"model": request["model"], "response": "", "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = self.server.reply.split()
+        try:
+            for index, word in enumerate(words):
+                chunk = {"message": {"role": "assistant", "content": (" " if index else "") + word}, "done": False}
+                self._write_chunk(json.dumps(chunk).encode() + b"\n")
+                self.server.sent += 1
+                time.sleep(self.server.token_delay)
+            self._write_chunk(json.dumps({"message": {"content": ""}, "done": True}).encode() + b"\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client stopped reading early
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+@pytest.fixture
+def fake_ollama():
+    """Local Ollama-compatible server with a configurable streamed reply."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllamaHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.reply = "Listo rockstar, la compilación pasó sin errores y todo quedó en verde."
+    server.token_delay = 0.0
+    server.sent = 0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestOllamaBackend:
+    """Tests for the local Ollama LLM backend."""
+
+    def test_streaming_stops_at_max_words(self, fake_ollama):
+        """The client stops reading once it has max_words complete words."""
+        from voice_handler.ai.ollama import OllamaClient
+
+        fake_ollama.reply = " ".join(f"palabra{i}" for i in range(100))
+        fake_ollama.token_delay = 0.02
+        client = OllamaClient(host=fake_ollama.url, model="test-model", keep_alive="10m")
+
+        started = time.perf_counter()
+        reply = client.chat([{"role": "user", "content": "hola"}], max_words=5, max_tokens=40)
+        elapsed = time.perf_counter() - started
+        client.close()
+
+        assert reply == "palabra0 palabra1 palabra2 palabra3 palabra4"
+        assert elapsed < 1.0  # Not the 2s the full reply would take
+        path, request = fake_ollama.requests[0]
+        assert path == "/api/chat"
+        assert request["stream"] is True
+        assert request["keep_alive"] == "10m"
+        assert request["options"]["num_predict"] == 40
+
+    def test_generator_uses_ollama_offline(self, fake_ollama, mock_config, clean_singletons, monkeypatch):
+        """With LLM_PROVIDER=ollama, messages come from the local model without OpenAI."""
+        from voice_handler import config as config_module
+        from voice_handler.ai.ollama import OllamaKeepAlive
+        from voice_handler.ai.qwen import QwenContextGenerator
+
+        monkeypatch.setenv("LLM_PROVIDER", "ollama")
+        monkeypatch.setenv("OLLAMA_HOST", fake_ollama.url)
+        monkeypatch.setenv("OLLAMA_MODEL", "test-model")
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setattr(config_module, "_config", None)
+
+        generator = QwenContextGenerator(config=mock_config)
+        assert generator.openai_available is False
+        assert generator.generate_error_message() == fake_ollama.reply
+
+        # Keep-alive ping loads the model without generating
+        pinger = OllamaKeepAlive(generator.ollama, interval=60)
+        pinger.start()
+        pinger.stop()
+        assert ("/api/generate", {"model": "test-model", "prompt": "", "stream": False, "keep_alive": "30m"}) in fake_ollama.requests
+
+        generator.ollama.close()
+
+    def test_unreachable_server_fails_fast(self):
+        """A stopped server fails fast and is skipped until the recheck interval."""
+        import socket
+        from voice_handler.ai.ollama import OllamaClient
+
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        client = OllamaClient(host=f"http://127.0.0.1:{port}", recheck_interval=60)
+
+        started = time.perf_counter()
+        assert client.chat([{"role": "user", "content": "hola"}]) is None
+        assert time.perf_counter() - started < 1.0
+        assert client.available() is False
+        client.close()
+
+
+FAKE_QWEN_WORKER = r'''
+import json, os, sys, time
+print(json.dumps({"type": "system", "subtype": "init"}), flush=True)
+for line in sys.stdin:
+    prompt = json.loads(line)["message"]["content"]
+    if prompt == "crash":
+        sys.exit(1)
+    if prompt.startswith("slow"):
+        time.sleep(0.3)
+    print(json.dumps({"type": "assistant", "message": {"content": prompt}}), flush=True)
+    print(json.dumps({"type": "result", "is_error": False, "result": f"{os.getpid()} {prompt}"}), flush=True)
+'''
+
+
+@pytest.fixture
+def fake_qwen_command(temp_dir):
+    """Command line for a stand-in qwen-code speaking stream-json."""
+    import sys
+
+    script = temp_dir / "fake_qwen.py"
+    script.write_text(FAKE_QWEN_WORKER)
+    return [sys.executable, str(script)]
+
+
+class TestQwenWorkerPool:
+    """Tests for the persistent qwen-code worker pool."""
+
+    def test_worker_reused_and_restarted_after_crash(self, fake_qwen_command):
+        """One process answers many prompts; a crashed worker is replaced."""
+        from voice_handler.ai.qwen_worker import QwenWorkerPool
+
+        pool = QwenWorkerPool(size=1, command=fake_qwen_command, timeout=5.0, health_interval=60)
+        pool.start()
+        try:
+            first_pid, first = pool.ask("hola").split(" ", 1)
+            second_pid, second = pool.ask("que tal").split(" ", 1)
+            assert (first, second) == ("hola", "que tal")
+            assert first_pid == second_pid
+
+            assert pool.ask("crash") is None
+            assert pool.restarts == 1
+            new_pid, reply = pool.ask("sigues ahi").split(" ", 1)
+            assert reply == "sigues ahi"
+            assert new_pid != first_pid
+        finally:
+            pool.stop()
+
+    def test_health_check_and_recycling(self, fake_qwen_command):
+        """Dead idle workers are restarted; workers are recycled after max_requests."""
+        from voice_handler.ai.qwen_worker import QwenWorkerPool
+
+        pool = QwenWorkerPool(size=1, command=fake_qwen_command, timeout=5.0, max_requests=2, health_interval=60)
+        pool.start()
+        try:
+            worker = pool._idle.queue[0]
+            worker._process.kill()
+            worker._process.wait()
+            pool.check()
+            assert pool.restarts == 1
+            assert pool._idle.queue[0].alive()
+
+            pids = {pool.ask(f"p{i}").split(" ")[0] for i in range(3)}
+            assert len(pids) == 2  # Third prompt went to a fresh worker
+            assert pool.restarts == 2
+        finally:
+            pool.stop()
+
+    def test_service_multiplexes_concurrent_requests(self, fake_qwen_command, temp_dir):
+        """Concurrent hook requests run in parallel on different workers."""
+        from voice_handler.ai.qwen_worker import QwenWorkerPool, QwenWorkerService, ask_worker_service
+
+        address_file = temp_dir / "qwen.addr"
+        assert ask_worker_service("hola", address_file=address_file) is None  # Daemon not running
+
+        pool = QwenWorkerPool(size=2, command=fake_qwen_command, timeout=5.0, health_interval=60)
+        pool.start()
+        service = QwenWorkerService(pool, address_file=address_file)
+        service.start()
+        try:
+            ask_worker_service("warm", address_file=address_file)
+            replies = []
+
+            def ask(prompt):
+                replies.append(ask_worker_service(prompt, timeout=5.0, address_file=address_file))
+
+            started = time.perf_counter()
+            threads = [threading.Thread(target=ask, args=(f"slow {i}",)) for i in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            assert sorted(reply.split(" ", 1)[1] for reply in replies) == ["slow 0", "slow 1"]
+            assert len({reply.split(" ")[0] for reply in replies}) == 2
+            assert elapsed < 0.55  # Two 0.3s answers side by side, not back to back
+        finally:
+            service.stop()
+            pool.stop()
+        assert not address_file.exists()
+
+
+class TestHedgedGeneration:
+    """Tests for deadline-driven LLM provider racing."""
+
+    def test_hedge_wins_and_loser_is_cancelled(self):
+        """A slow primary gets a hedge at half the budget; the loser is told to stop."""
+        import asyncio
+        from voice_handler.ai.hedging import Candidate, LLMRacer
+
+        primary_cancelled = threading.Event()
+
+        def slow_primary(cancelled):
+            if cancelled.wait(2.0):
+                primary_cancelled.set()
+            return "demasiado tarde"
+
+        racer = LLMRacer(settings={"budgets_ms": {"tool": 600}})
+        started = time.perf_counter()
+        result = asyncio.run(racer.run(
+            [Candidate("openai", slow_primary), Candidate("ollama", lambda cancelled: "a tiempo")],
+            message_type="tool",
+        ))
+        elapsed = time.perf_counter() - started
+
+        assert (result.provider, result.text, result.hedged) == ("ollama", "a tiempo", True)
+        assert 0.25 < elapsed < 0.5  # Hedged at half the 600ms budget
+        assert primary_cancelled.wait(1.0)
+        assert racer.stats.count("ollama") == 1
+
+    def test_failure_hedges_at_once_and_budget_caps_wait(self):
+        """A failed provider starts the next immediately; nothing in budget returns None."""
+        import asyncio
+        from voice_handler.ai.hedging import Candidate, LatencyStats, LLMRacer
+
+        stats = LatencyStats()
+        for _ in range(5):
+            stats.record("openai", 0.05)
+        racer = LLMRacer(settings={"budgets_ms": {"error": 400}}, stats=stats)
+        assert racer.hedge_delay("openai", 0.4) == 0.05  # Learned p90, not half the budget
+
+        started = time.perf_counter()
+        result = asyncio.run(racer.run(
+            [Candidate("ollama", lambda cancelled: None), Candidate("qwen", lambda cancelled: "listo")],
+            message_type="error",
+        ))
+        assert result.provider == "qwen"
+        assert time.perf_counter() - started < 0.15
+
+        started = time.perf_counter()
+        result = asyncio.run(racer.run(
+            [Candidate("ollama", lambda cancelled: cancelled.wait(5.0) and None)],
+            message_type="error",
+        ))
+        assert result is None
+        assert 0.35 < time.perf_counter() - started < 0.6
+
+    def test_generator_uses_canned_phrase_past_budget(self, mock_config, clean_singletons, monkeypatch):
+        """The generator races its providers and falls back to the canned phrase on time."""
+        from voice_handler.ai.hedging import LatencyStats, LLMRacer
+        from voice_handler.ai.qwen import QwenContextGenerator
+
+        generator = QwenContextGenerator(config=mock_config)
+        generator.racer = LLMRacer(settings={"budgets_ms": {"tool": 400}}, stats=LatencyStats())
+        generator.ollama = None
+        generator.openai_available = True
+        generator.qwen_available = True
+        monkeypatch.setattr(generator, "_call_openai", lambda prompt, max_words, add_to_history=True: time.sleep(2.0) or "openai")
+        monkeypatch.setattr(generator, "_call_qwen", lambda prompt, max_words: "Revisando el setlist main.py")
+
+        started = time.perf_counter()
+        assert generator.generate_tool_announcement("Read", file_path="main.py") == "Revisando el setlist main.py"
+        assert time.perf_counter() - started < 0.4
+
+        monkeypatch.setattr(generator, "_call_qwen", lambda prompt, max_words: time.sleep(2.0) or "qwen")
+        started = time.perf_counter()
+        message = generator.generate_tool_announcement("Read", file_path="main.py")
+        assert time.perf_counter() - started < 0.6
+        assert message not in ("openai", "qwen")
@@ -0,0 +1,215 @@
+"""
+Broker Backend Conformance Tests - Same Setlist, Every Venue.
+
+Every storage backend must behave identically behind MessageBroker:
+ordering, ack/nack, retry metadata, filtering and purging.
+"""
+
+import pytest
+
+
+BACKEND_NAMES = ["persist", "sqlite", "memory"]
+
+
+@pytest.fixture(params=BACKEND_NAMES)
+def make_broker(request, temp_dir):
+    """Factory for brokers on each backend, all sharing one queue path."""
+    from voice_handler.queue.broker import MessageBroker
+
+    opened = []
+
+    def _make(**kwargs):
+        broker = MessageBroker(
+            queue_path=str(temp_dir / "conformance_queue"),
+            backend=request.param,
+            **kwargs,
+        )
+        opened.append(broker)
+        return broker
+
+    yield _make
+    for broker in opened:
+        broker.close()
+
+
+def _speak(text, session_id=None, message_type=None):
+    from voice_handler.queue.broker import VoiceMessage, MessageType
+    return VoiceMessage(
+        message_type=message_type or MessageType.SPEAK,
+        text=text,
+        session_id=session_id,
+    )
+
+
+class TestBackendConformance:
+    """Behavior every backend must share."""
+
+    def test_fifo_order(self, make_broker):
+        """Messages come out in enqueue order."""
+        broker = make_broker()
+        broker.enqueue(_speak("one"))
+        assert broker.enqueue_many([_speak("two"), _speak("three")]) == 2
+
+        received = [broker.dequeue(timeout=1.0) for _ in range(3)]
+        assert [m.text for m in received] == ["one", "two", "three"]
+        for message in received:
+            broker.ack(message)
+        assert broker.size() == 0
+
+    def test_dequeue_empty_times_out(self, make_broker):
+        """An empty queue returns None after the timeout."""
+        broker = make_broker()
+        assert broker.dequeue(timeout=0.1) is None
+
+    def test_ack_removes_and_nack_redelivers(self, make_broker):
+        """Acked messages are gone; nacked ones come back with updated metadata."""
+        broker = make_broker()
+        broker.enqueue_many([_speak("retry me"), _speak("later")])
+
+        first = broker.dequeue(timeout=1.0)
+        assert broker.breakdown()["in_flight"] == 1
+        first.metadata["retry_count"] = 2
+        broker.nack(first)
+
+        again = broker.dequeue(timeout=1.0)
+        assert again.text == "retry me"
+        assert again.metadata["retry_count"] == 2
+        broker.ack(again)
+
+        last = broker.dequeue(timeout=1.0)
+        assert last.text == "later"
+        broker.ack(last)
+        assert broker.dequeue(timeout=0.1) is None
+        assert broker.breakdown()["in_flight"] == 0
+
+    def test_filters_peek_and_breakdown(self, make_broker):
+        """size/peek/breakdown agree on filtered pending messages."""
+        from voice_handler.queue.broker import MessageType
+
+        broker = make_broker()
+        broker.enqueue_many([
+            _speak("a1", session_id="a"),
+            _speak("b1", session_id="b"),
+            _speak("a2", session_id="a", message_type=MessageType.ERROR),
+        ])
+
+        assert broker.size() == 3
+        assert broker.size(session_id="a") == 2
+        assert broker.size(message_type=MessageType.ERROR) == 1
+        assert broker.size(session_id="a", message_type="speak") == 1
+
+        page = broker.peek(limit=1, offset=1, session_id="a")
+        assert [m["text"] for m in page] == ["a2"]
+        assert "id" in page[0] and "enqueued_at" in page[0]
+
+        summary = broker.breakdown()
+        assert summary["pending"] == 3
+        assert summary["by_type"] == {"speak": 2, "error": 1}
+        assert summary["by_session"] == {"a": 2, "b": 1}
+
+    def test_clear_filtered(self, make_broker):
+        """clear() removes only matching pending messages and leaves claims alone."""
+        broker = make_broker()
+        broker.enqueue_many([
+            _speak("claimed", session_id="a"),
+            _speak("a2", session_id="a"),
+            _speak("b1", session_id="b"),
+        ])
+        claimed = broker.dequeue(timeout=1.0)
+
+        assert broker.clear(session_id="a") == 1
+        assert [m["text"] for m in broker.peek()] == ["b1"]
+
+        broker.ack(claimed)
+        assert broker.clear() == 1
+        assert broker.size() == 0
+        assert broker.dequeue(timeout=0.1) is None
+
+    def test_group_commit(self, make_broker):
+        """Group commit works on top of any backend."""
+        broker = make_broker(group_commit=True, group_commit_window=0.01)
+        assert all(broker.enqueue(_speak(f"m{i}")) for i in range(5))
+        assert broker.size() == 5
+
+    def test_claim_out_of_order(self, make_broker):
+        """A pending message can be claimed by id; the rest keep their order."""
+        broker = make_broker()
+        broker.enqueue_many([_speak("one"), _speak("two"), _speak("urgent")])
+        urgent_id = broker.peek(limit=3)[2]["id"]
+
+        claimed = broker.claim(urgent_id)
+        assert claimed is not None and claimed.text == "urgent"
+        assert broker.claim(urgent_id) is None
+        broker.ack(claimed)
+
+        received = [broker.dequeue(timeout=1.0) for _ in range(2)]
+        assert [m.text for m in received] == ["one", "two"]
+        assert broker.dequeue(timeout=0.1) is None
+
+    def test_persistence_across_instances(self, make_broker):
+        """Durable backends keep messages for the next broker instance."""
+        first = make_broker()
+        if not first.backend.durable:
+            pytest.skip(f"{first.backend_name} backend is not durable")
+        first.enqueue(_speak("survivor"))
+        first.close()
+
+        second = make_broker()
+        received = second.dequeue(timeout=1.0)
+        assert received is not None
+        assert received.text == "survivor"
+
+
+class TestBackendSelection:
+    """Backend selection and fallback."""
+
+    def test_unknown_backend_rejected(self, temp_dir):
+        """An unknown backend name raises ValueError."""
+        from voice_handler.queue.broker import MessageBroker
+
+        with pytest.raises(ValueError):
+            MessageBroker(queue_path=str(temp_dir / "q"), backend="carrier-pigeon")
+
+    def test_missing_persist_queue_falls_back_to_sqlite(self, temp_dir, monkeypatch):
+        """Without persist-queue the broker still stores messages."""
+        from voice_handler.queue import backends
+        from voice_handler.queue.broker import MessageBroker
+
+        monkeypatch.setattr(backends, "PERSIST_QUEUE_AVAILABLE", False)
+        broker = MessageBroker(queue_path=str(temp_dir / "q"))
+        try:
+            assert broker.backend_name == "sqlite"
+            assert broker.enqueue(_speak("not dropped")) is True
+            assert broker.size() == 1
+        finally:
+            broker.close()
+
+    def test_sqlite_reclaims_stale_claims(self, temp_dir):
+        """Claims abandoned by a crashed consumer are redelivered after the lease."""
+        from voice_handler.queue.backends import SQLiteWALBackend
+
+        backend = SQLiteWALBackend(temp_dir / "q", reclaim_after=0.0)
+        try:
+            backend.put_many([{"message_type": "speak", "text": "orphan"}])
+            receipt, _ = backend.get(timeout=1.0)
+            again = backend.get(timeout=1.0)
+            assert again is not None
+            assert again[0] == receipt
+        finally:
+            backend.close()
+
+    def test_memory_backend_async_get(self):
+        """The asyncio backend serves coroutines on its own loop."""
+        import asyncio
+        from voice_handler.queue.backends import AsyncioMemoryBackend
+
+        backend = AsyncioMemoryBackend()
+        try:
+            backend.put_many([{"message_type": "speak", "text": "async"}])
+            future = asyncio.run_coroutine_threadsafe(backend.get_async(1.0), backend.loop)
+            receipt, item = future.result(timeout=2.0)
+            assert item["text"] == "async"
+            backend.ack(receipt)
+            assert backend.breakdown()["in_flight"] == 0
+        finally:
+            backend.close()
@@ -116,3 +116,108 @@ class TestPersonalityValidation:
             # Personality validation delegated to prompts.py RockPersonality
         finally:
             temp_path.unlink()
+
+
+class TestConfigSnapshot:
+    """Test the pre-validated config snapshot hooks load instead of config.json."""
+
+    def _sources(self, monkeypatch, temp_dir):
+        from voice_handler import config_snapshot
+
+        config_path = temp_dir / "config.json"
+        env_path = temp_dir / ".env"
+        monkeypatch.setattr(config_snapshot, "config_candidates", lambda: [config_path])
+        monkeypatch.setattr(config_snapshot, "env_candidates", lambda: [env_path])
+        monkeypatch.setattr(config_snapshot, "_snapshot", None)
+        return config_snapshot, config_path, env_path
+
+    def test_snapshot_reused_until_sources_change(self, monkeypatch, temp_dir):
+        """Un snapshot vigente se carga sin revalidar; editar config.json lo reconstruye."""
+        config_snapshot, config_path, env_path = self._sources(monkeypatch, temp_dir)
+        snapshot_path = temp_dir / "config.snapshot"
+        config_path.write_text('{"queue_settings": {"max_retries": 5}}')
+        env_path.write_text("USER_NICKNAME=snapshot_star\n")
+
+        first = config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        assert first["valid"] is True
+        assert first["voice_config"]["queue_settings"]["max_retries"] == 5
+        assert first["env"] == {"USER_NICKNAME": "snapshot_star"}
+        assert snapshot_path.exists()
+
+        # A fresh process with unchanged sources never rebuilds
+        build = config_snapshot.build_snapshot
+
+        def no_rebuild(logger=None):
+            raise AssertionError("snapshot rebuilt although sources are unchanged")
+
+        monkeypatch.setattr(config_snapshot, "build_snapshot", no_rebuild)
+        monkeypatch.setattr(config_snapshot, "_snapshot", None)
+        assert config_snapshot.get_snapshot(path=snapshot_path) == first
+        settings = config_snapshot.get_voice_settings()
+        settings["queue_settings"]["max_retries"] = 9  # callers get their own copy
+        assert config_snapshot.get_voice_settings()["queue_settings"]["max_retries"] == 5
+
+        monkeypatch.setattr(config_snapshot, "build_snapshot", build)
+        config_path.write_text('{"queue_settings": {"max_retries": 7}}')
+        rebuilt = config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        assert rebuilt["voice_config"]["queue_settings"]["max_retries"] == 7
+        assert rebuilt["key"] != first["key"]
+
+    def test_invalid_config_and_corrupt_snapshot(self, monkeypatch, temp_dir):
+        """config.json inválido queda como defaults (valid=False); un snapshot corrupto se reconstruye."""
+        config_snapshot, config_path, env_path = self._sources(monkeypatch, temp_dir)
+        snapshot_path = temp_dir / "config.snapshot"
+        config_path.write_text('{"queue_settings": {"max_retries": -999}}')
+        snapshot_path.write_bytes(b"not a marshal snapshot")
+
+        snapshot = config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        assert snapshot["valid"] is False
+        assert snapshot["env"] == {}
+        assert snapshot["voice_config"] == VoiceConfig().model_dump()
+        assert config_snapshot.read_snapshot(snapshot_path) == snapshot
+
+    def test_snapshot_private_and_per_env_file(self, monkeypatch, temp_dir):
+        """El snapshot (con las API keys) es privado del usuario y separado por .env."""
+        import os
+        import stat
+        from voice_handler.utils.paths import VoiceHandlerPaths, get_paths
+
+        config_snapshot, config_path, env_path = self._sources(monkeypatch, temp_dir)
+        monkeypatch.setattr(VoiceHandlerPaths, "_get_temp_dir", staticmethod(lambda: temp_dir))
+        env_path.write_text("OPENAI_API_KEY=sk-secret\n")
+
+        snapshot = config_snapshot.get_snapshot(refresh=True)
+        base = get_paths().config_snapshot
+        path = config_snapshot.snapshot_path(base)
+        assert config_snapshot.read_snapshot(path) == snapshot
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+
+        # Another project's .env gets its own snapshot file
+        other_env = temp_dir / "other" / ".env"
+        other_env.parent.mkdir()
+        other_env.write_text("OPENAI_API_KEY=sk-other\n")
+        monkeypatch.setattr(config_snapshot, "env_candidates", lambda: [other_env])
+        assert config_snapshot.snapshot_path(base) != path
+
+        # A state directory others can open is refused, not written to
+        os.chmod(path.parent, 0o755)
+        with pytest.raises(OSError):
+            config_snapshot.write_snapshot(path, snapshot)
+
+    def test_snapshot_rebuilt_after_schema_change(self, monkeypatch, temp_dir):
+        """Un snapshot hecho con otro esquema (p. ej. antes de una actualización) se reconstruye."""
+        config_snapshot, config_path, env_path = self._sources(monkeypatch, temp_dir)
+        snapshot_path = temp_dir / "config.snapshot"
+        config_path.write_text('{"queue_settings": {"max_retries": 5}}')
+
+        old = config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        # Written by an older release: same sources, fewer sections
+        config_snapshot.write_snapshot(snapshot_path, dict(old, voice_config={"queue_settings": {"max_retries": 5}}))
+        monkeypatch.setattr(config_snapshot, "SCHEMA_FINGERPRINT", config_snapshot.SCHEMA_FINGERPRINT + 1)
+
+        assert config_snapshot.read_snapshot(snapshot_path) is None
+        rebuilt = config_snapshot.get_snapshot(refresh=True, path=snapshot_path)
+        assert rebuilt["key"][1] == config_snapshot.SCHEMA_FINGERPRINT
+        assert "mixing" in rebuilt["voice_config"]
+        assert rebuilt["voice_config"]["queue_settings"]["max_retries"] == 5
@@ -122,6 +122,180 @@ class TestMessageBroker:
         assert msg is not None
         assert msg.message_type == MessageType.SHUTDOWN
 
+    def test_broker_enqueue_many(self, temp_dir):
+        """Batch enqueue should commit all messages and keep FIFO order."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path))
+
+        messages = [
+            VoiceMessage(message_type=MessageType.SPEAK, text=f"Batch {i}")
+            for i in range(5)
+        ]
+
+        assert broker.enqueue_many(messages) == 5
+        assert broker.enqueue_many([]) == 0
+        assert broker.size() == 5
+
+        received = [broker.dequeue(timeout=1.0) for _ in range(5)]
+        assert [m.text for m in received] == [f"Batch {i}" for i in range(5)]
+
+    def test_broker_sqlite_pragmas(self, temp_dir):
+        """Queue database should run in WAL mode with the requested synchronous level."""
+        from voice_handler.queue.broker import MessageBroker
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path), synchronous="normal")
+
+        conn = broker.backend.queue._putter
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+        with pytest.raises(ValueError):
+            MessageBroker(queue_path=str(temp_dir / "other.db"), synchronous="sometimes")
+
+    def test_broker_group_commit(self, temp_dir):
+        """Concurrent enqueues in group-commit mode should share transactions."""
+        import threading
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(
+            queue_path=str(queue_path),
+            group_commit=True,
+            group_commit_window=0.05,
+        )
+
+        results = []
+
+        def produce(i):
+            msg = VoiceMessage(message_type=MessageType.SPEAK, text=f"Concurrent {i}")
+            results.append(broker.enqueue(msg))
+
+        threads = [threading.Thread(target=produce, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        writer = broker._group_writer
+        assert all(results) and len(results) == 8
+        assert writer.messages_committed == 8
+        assert writer.batches_committed < 8
+
+        broker.close()
+
+        # Messages are durable: a fresh broker sees all of them
+        reopened = MessageBroker(queue_path=str(queue_path))
+        assert reopened.size() == 8
+
+    def test_group_commit_timeout_never_duplicates(self):
+        """A timed-out write is either withdrawn (False) or waited for until committed (True)."""
+        import threading
+        from voice_handler.queue.broker import GroupCommitWriter
+
+        writing, release, written = threading.Event(), threading.Event(), []
+
+        def stalled_backend(items):
+            writing.set()
+            release.wait(5.0)
+            written.extend(item["text"] for item in items)
+
+        writer = GroupCommitWriter(stalled_backend, window=0)
+        results = {}
+        first = threading.Thread(target=lambda: results.update(first=writer.submit({"text": "uno"}, timeout=0.05)))
+        first.start()
+        assert writing.wait(5.0)  # "uno" is inside the stalled transaction
+
+        # Still waiting for a batch when it times out: withdrawn, never written
+        assert writer.submit({"text": "dos"}, timeout=0.05) is False
+
+        # Already being written: the caller waits past its timeout for the outcome
+        time.sleep(0.1)
+        assert "first" not in results
+        release.set()
+        first.join(5.0)
+        writer.close()
+        assert results["first"] is True
+        assert written == ["uno"]
+
+    def test_broker_clear_filtered(self, temp_dir):
+        """Clear should purge in one statement, optionally by session or type."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path))
+
+        broker.enqueue_many([
+            VoiceMessage(message_type=MessageType.SPEAK, text="a", session_id="s1"),
+            VoiceMessage(message_type=MessageType.SPEAK, text="b", session_id="s2"),
+            VoiceMessage(message_type=MessageType.APPROVAL, text="c", session_id="s1"),
+            VoiceMessage(message_type=MessageType.COMPLETION, text="d", session_id="s2"),
+        ])
+
+        assert broker.clear(session_id="s1", message_type=MessageType.SPEAK) == 1
+        assert broker.clear(message_type="completion") == 1
+        assert broker.size() == 2
+        assert broker.clear() == 2
+        assert broker.size() == 0
+        assert broker.dequeue(timeout=0.1) is None
+
+    def test_broker_peek_pagination(self, temp_dir):
+        """Peek should page through pending messages without claiming them."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path))
+        broker.enqueue_many([
+            VoiceMessage(message_type=MessageType.SPEAK, text=f"Msg {i}", session_id="s1")
+            for i in range(5)
+        ])
+
+        first_page = broker.peek(limit=2)
+        second_page = broker.peek(limit=2, offset=2)
+
+        assert [m["text"] for m in first_page] == ["Msg 0", "Msg 1"]
+        assert [m["text"] for m in second_page] == ["Msg 2", "Msg 3"]
+        assert first_page[0]["id"] < second_page[0]["id"]
+        assert broker.size() == 5  # Nothing was claimed
+        assert broker.peek(session_id="other") == []
+
+    def test_broker_breakdown(self, temp_dir):
+        """Breakdown should count pending and in-flight messages per type and session."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path))
+        broker.enqueue_many([
+            VoiceMessage(message_type=MessageType.SPEAK, text="a", session_id="s1"),
+            VoiceMessage(message_type=MessageType.SPEAK, text="b", session_id="s2"),
+            VoiceMessage(message_type=MessageType.ERROR, text="c", session_id="s1"),
+        ])
+        claimed = broker.dequeue(timeout=1.0)
+
+        summary = broker.breakdown()
+
+        assert summary["pending"] == 2
+        assert summary["in_flight"] == 1
+        assert summary["by_type"] == {"speak": 1, "error": 1}
+        assert summary["by_session"] == {"s1": 1, "s2": 1}
+
+        broker.ack(claimed)
+        assert broker.breakdown()["in_flight"] == 0
+
+    def test_broker_size_across_instances(self, temp_dir):
+        """Size should reflect writes made through another broker instance."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+
+        queue_path = temp_dir / "test_queue.db"
+        reader = MessageBroker(queue_path=str(queue_path))
+        writer = MessageBroker(queue_path=str(queue_path))
+
+        writer.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="From hook"))
+
+        assert reader.size() == 1
+
 
 class TestQueueProducer:
     """Tests for the queue producer."""
@@ -250,3 +424,429 @@ class TestQueueConsumer:
         # Give it a moment to fully stop
         time.sleep(0.5)
         assert consumer.is_running() is False
+
+    def test_consumer_records_metrics(self, temp_dir, clean_singletons):
+        """Consumer should count processed, failed and expired messages."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.utils.metrics import DaemonMetrics
+
+        queue_path = temp_dir / "test_queue.db"
+        broker = MessageBroker(queue_path=str(queue_path))
+        metrics = DaemonMetrics()
+
+        def flaky_speak(text, voice, session_id=None):
+            if text == "boom":
+                raise RuntimeError("speaker blown")
+            metrics.audio_started()
+
+        consumer = QueueConsumer(
+            broker=broker,
+            min_speech_delay=0,
+            max_retries=1,
+            metrics=metrics,
+        )
+        consumer.set_speak_callback(flaky_speak)
+
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="ok"))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="boom"))
+
+        consumer.start()
+        deadline = time.time() + 5.0
+        while time.time() < deadline and metrics.snapshot()["counters"]["messages_expired"] == 0:
+            time.sleep(0.1)
+        consumer.stop(wait=True)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["messages_processed"] == 1
+        assert snapshot["counters"]["messages_failed"] == 2
+        assert snapshot["counters"]["messages_expired"] == 1
+        assert snapshot["histograms"]["queue_wait_seconds"]["count"] == 2
+        assert snapshot["histograms"]["time_to_first_audio_seconds"]["count"] == 1
+
+    def test_consumer_prepares_upcoming_messages(self, temp_dir, clean_singletons):
+        """Before speaking, the consumer should prepare the current and next messages."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        prepared, spoken = [], []
+
+        consumer = QueueConsumer(
+            broker=broker,
+            min_speech_delay=0,
+            prepare_callback=lambda text, voice, session_id: prepared.append((text, session_id)),
+            prefetch_depth=1,
+        )
+        consumer.set_speak_callback(lambda text, voice, session_id=None: spoken.append(text))
+
+        for text in ("uno", "dos", "tres"):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=text, session_id="s1"))
+
+        message = broker.dequeue(timeout=1.0)
+        assert consumer._process_message(message) == (True, "success")
+        broker.ack(message)
+
+        assert prepared == [("uno", "s1"), ("dos", "s1")]
+        assert spoken == ["uno"]
+
+    def test_urgent_message_preempts_current_speech(self, temp_dir, clean_singletons):
+        """An approval should cut in on long speech, then the interrupted message is requeued once."""
+        import threading
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.tts.playback import PlaybackController
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        controller = PlaybackController()
+        spoken = []
+        approval_spoken = threading.Event()
+        approval_latency = []
+
+        def speak(text, voice, session_id=None):
+            spoken.append(text)
+            if text == "Aprobación requerida":
+                approval_latency.append(time.time() - enqueued_at[0])
+                approval_spoken.set()
+                return
+            # A long clip the first time around, short after that
+            stopped = threading.Event()
+            with controller.playing(stopped.set):
+                stopped.wait(10.0 if len(spoken) == 1 else 0.1)
+
+        consumer = QueueConsumer(
+            broker=broker,
+            min_speech_delay=0,
+            playback_controller=controller,
+            preempt_priority=9,
+            preempt_mode="cut",
+            preempt_poll_interval=0.02,
+            requeue_interrupted=True,
+        )
+        consumer.set_speak_callback(speak)
+
+        broker.enqueue(VoiceMessage(message_type=MessageType.COMPLETION, text="Resumen largo", priority=7))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="Otro mensaje", priority=5))
+        consumer.start()
+        deadline = time.time() + 5.0
+        while not spoken and time.time() < deadline:
+            time.sleep(0.01)
+
+        enqueued_at = [time.time()]
+        broker.enqueue(VoiceMessage(message_type=MessageType.APPROVAL, text="Aprobación requerida", priority=10))
+        assert approval_spoken.wait(5.0)
+        deadline = time.time() + 5.0
+        while len(spoken) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        remaining = broker.size()
+        consumer.stop(wait=True)
+
+        # Jumped ahead of "Otro mensaje"; the interrupted summary replays before it
+        assert spoken == ["Resumen largo", "Aprobación requerida", "Resumen largo", "Otro mensaje"]
+        assert approval_latency[0] < 1.0
+        assert remaining == 0
+
+
+class TestSessionMixer:
+    """Tests for fair turns and digests across concurrent sessions."""
+
+    def test_sessions_take_turns(self, temp_dir):
+        """A session with a backlog should not hold the speaker; urgent messages go first."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.mixer import SessionMixer
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        for i in range(3):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=f"api {i}", session_id="api"))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="web 0", session_id="web"))
+        broker.enqueue(VoiceMessage(message_type=MessageType.ERROR, text="web falló", session_id="web", priority=9))
+
+        mixer = SessionMixer(broker, digest_threshold=0)
+        spoken = []
+        while True:
+            message = mixer.next(timeout=0.1)
+            if message is None:
+                break
+            spoken.append(message.text)
+            broker.ack(message)
+
+        assert spoken[0] == "web falló"
+        assert spoken[1:] == ["api 0", "web 0", "api 1", "api 2"]
+
+        # Weighted: "api" gets two turns for each of "web"'s
+        for i in range(4):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=f"api {i}", session_id="api"))
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=f"web {i}", session_id="web"))
+        mixer.configure(session_weights={"api": 2.0})
+        mixer.session_label = lambda session_id: f"[{session_id}]"
+        turns = []
+        for _ in range(6):
+            message = mixer.next(timeout=0.1)
+            turns.append(message.session_id)
+            broker.ack(message)
+        assert turns.count("api") == 4 and turns.count("web") == 2
+
+    def test_backlog_becomes_digest(self, temp_dir):
+        """Past the threshold, sessions should be merged into one message acked as its parts."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.mixer import SessionMixer
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        for i in range(3):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=f"editando archivo {i}", session_id="api"))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="tests pasaron", session_id="web"))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="build listo", session_id="cli"))
+
+        mixer = SessionMixer(
+            broker, digest_threshold=4, max_sessions=2, language="en",
+            session_label=lambda session_id: f"[{session_id}]",
+        )
+        with pytest.raises(ValueError):
+            mixer.configure(broker=None)
+
+        digest = mixer.next(timeout=0.1)
+        assert digest.text == "[api] 3 updates, latest: editando archivo 2; [web] tests pasaron"
+        assert digest.metadata["digest"] == 4
+        assert broker.size() == 1
+
+        # A failed digest returns every part to the queue for a retry
+        broker.nack(digest)
+        assert broker.size() == 5
+        retried = mixer.next(timeout=0.1)
+        assert "[cli] build listo" in retried.text
+        broker.ack(retried)
+        assert broker.size() == 5 - retried.metadata["digest"]
+
+    def test_interrupted_digest_parts_replay_once(self, temp_dir, clean_singletons):
+        """Parts of an interrupted digest keep the flag: replayed alone, then dropped if cut again."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.queue.mixer import SessionMixer
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        for session_id in ("api", "api", "web"):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=f"{session_id} listo", session_id=session_id))
+        mixer = SessionMixer(broker, digest_threshold=3)
+        consumer = QueueConsumer(broker=broker, min_speech_delay=0, requeue_interrupted=True, mixer=mixer)
+
+        digest = consumer.next_message(timeout=0.1)
+        assert digest.metadata["digest"] == 3
+        consumer._handle_interrupted(digest, None)
+        assert broker.size() == 3
+        assert all(item["metadata"].get("interrupted") for item in broker.peek())
+
+        for remaining in (2, 1, 0):
+            replayed = consumer.next_message(timeout=0.1)
+            assert "digest" not in replayed.metadata
+            assert replayed.metadata["interrupted"] is True
+            consumer._handle_interrupted(replayed, None)  # Cut again: dropped, not requeued
+            assert broker.size() == remaining
+
+
+class TestAsyncRuntime:
+    """Tests for the asyncio daemon runtime."""
+
+    def test_renders_next_message_while_current_plays(self, temp_dir, clean_singletons):
+        """Synthesis of upcoming messages overlaps playback; order and acks are kept."""
+        import asyncio
+        import threading
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.queue.runtime import AsyncDaemonRuntime
+
+        events = []
+
+        class FakeTTS:
+            async def arender(self, text, voice=None, session_id=None, priority=5, deadline=None):
+                events.append(("render", text, time.perf_counter()))
+                await asyncio.sleep(0.3)
+                return None if text == "sin audio" else f"audio:{text}"
+
+            def play_rendered(self, rendered):
+                events.append(("play", rendered, time.perf_counter()))
+                time.sleep(0.3)
+                return True
+
+        spoken_directly = []
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        consumer = QueueConsumer(broker=broker, min_speech_delay=0)
+        consumer.set_speak_callback(lambda text, voice, session_id=None: spoken_directly.append(text))
+        for text in ("uno", "dos", "sin audio", "tres"):
+            broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text=text))
+
+        runtime = AsyncDaemonRuntime(consumer, FakeTTS(), render_ahead=2)
+        consumer._running = True
+        started = time.perf_counter()
+        worker = threading.Thread(target=lambda: asyncio.run(runtime.run()))
+        worker.start()
+
+        deadline = time.time() + 5.0
+        while len([e for e in events if e[0] == "play"]) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        consumer.stop(wait=False)
+        worker.join(timeout=5.0)
+
+        plays = [e[1] for e in events if e[0] == "play"]
+        assert plays == ["audio:uno", "audio:dos", "audio:tres"]
+        assert spoken_directly == ["sin audio"]  # Not pre-rendered: normal speak path
+        render_dos = next(e[2] for e in events if e[:2] == ("render", "dos"))
+        play_uno = next(e[2] for e in events if e[:2] == ("play", "audio:uno"))
+        assert render_dos < play_uno + 0.3  # Rendered while "uno" was playing
+        assert elapsed < 1.6  # Serial would be 3 x (0.3 render + 0.3 play) + 0.3
+        assert not worker.is_alive()
+        assert broker.size() == 0
+
+    def test_urgent_message_read_ahead_preempts_current_speech(self, temp_dir, clean_singletons):
+        """An approval dequeued into the read-ahead should still cut in on long speech."""
+        import asyncio
+        import threading
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.queue.runtime import AsyncDaemonRuntime
+        from voice_handler.tts.playback import PlaybackController
+
+        class FakeTTS:
+            async def arender(self, text, voice=None, session_id=None, priority=5, deadline=None):
+                return None  # Spoken through the speak callback
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        controller = PlaybackController()
+        spoken = []
+        approval_spoken = threading.Event()
+        approval_latency = []
+
+        def speak(text, voice, session_id=None):
+            spoken.append(text)
+            if text == "Aprobación requerida":
+                approval_latency.append(time.time() - enqueued_at[0])
+                approval_spoken.set()
+                return
+            stopped = threading.Event()
+            with controller.playing(stopped.set):
+                stopped.wait(3.0 if len(spoken) == 1 else 0.1)
+
+        consumer = QueueConsumer(
+            broker=broker,
+            min_speech_delay=0,
+            playback_controller=controller,
+            preempt_priority=9,
+            preempt_mode="cut",
+            preempt_poll_interval=0.02,
+            requeue_interrupted=True,
+        )
+        consumer.set_speak_callback(speak)
+        runtime = AsyncDaemonRuntime(consumer, FakeTTS(), render_ahead=2)
+
+        broker.enqueue(VoiceMessage(message_type=MessageType.COMPLETION, text="Resumen largo", priority=7))
+        broker.enqueue(VoiceMessage(message_type=MessageType.SPEAK, text="Otro mensaje", priority=5))
+        consumer._running = True
+        consumer.start_watcher()
+        worker = threading.Thread(target=lambda: asyncio.run(runtime.run()))
+        worker.start()
+        deadline = time.time() + 5.0
+        while not spoken and time.time() < deadline:
+            time.sleep(0.01)
+
+        enqueued_at = [time.time()]
+        broker.enqueue(VoiceMessage(message_type=MessageType.APPROVAL, text="Aprobación requerida", priority=10))
+        assert approval_spoken.wait(5.0)
+        deadline = time.time() + 5.0
+        while len(spoken) < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        consumer.stop(wait=False)
+        worker.join(timeout=5.0)
+
+        # Read ahead behind "Otro mensaje", yet played right after the interruption
+        assert spoken[:2] == ["Resumen largo", "Aprobación requerida"]
+        assert sorted(spoken[2:]) == ["Otro mensaje", "Resumen largo"]
+        assert approval_latency[0] < 1.0
+        assert broker.size() == 0
+
+
+class TestConfigReload:
+    """Tests for applying config.json/.env edits to a running daemon."""
+
+    def test_watcher_applies_valid_edits_and_rejects_invalid(self, temp_dir, monkeypatch):
+        """Valid edits reach listeners with the changed names; invalid ones keep the running config."""
+        import os
+        from voice_handler import config as config_module
+        from voice_handler import config_snapshot
+        from voice_handler.config_schema import VoiceConfig
+        from voice_handler.queue.config_reload import ConfigWatcher
+        from voice_handler.utils.metrics import DaemonMetrics
+        from voice_handler.utils.paths import VoiceHandlerPaths
+
+        config_path = temp_dir / "config.json"
+        env_path = temp_dir / ".env"
+        monkeypatch.setattr(config_snapshot, "config_candidates", lambda: [config_path])
+        monkeypatch.setattr(config_snapshot, "env_candidates", lambda: [env_path])
+        monkeypatch.setattr(VoiceHandlerPaths, "_get_temp_dir", staticmethod(lambda: temp_dir))
+        monkeypatch.setattr(config_snapshot, "_snapshot", None)
+        monkeypatch.setattr(config_module, "_voice_config_singleton", None)
+        monkeypatch.setattr(config_module, "_config", None)
+        monkeypatch.setenv("VOICE_RELOAD_TEST", "before")
+
+        config_path.write_text('{"timing": {"min_speech_delay": 1.0}}')
+        env_path.write_text("VOICE_RELOAD_TEST=before\n")
+        metrics = DaemonMetrics()
+        applied = []
+        watcher = ConfigWatcher(VoiceConfig().model_dump(), metrics=metrics)
+        watcher.add_listener(lambda settings, changed: applied.append((settings, changed)))
+        assert watcher.check() is False  # Nothing changed yet
+
+        config_path.write_text('{"timing": {"min_speech_delay": 0.25}, "queue_settings": {"queue_backend": "sqlite"}}')
+        env_path.write_text("VOICE_RELOAD_TEST=after\n")
+        assert watcher.check() is True
+        settings, changed = applied[-1]
+        assert settings["timing"]["min_speech_delay"] == 0.25
+        assert changed == ["queue_settings.queue_backend", "timing.min_speech_delay", "env.VOICE_RELOAD_TEST"]
+        assert os.environ["VOICE_RELOAD_TEST"] == "after"
+        assert config_module.get_voice_config().timing.min_speech_delay == 0.25
+
+        # A variable deleted from .env is unset, not left at its old value
+        env_path.write_text("# emptied\n")
+        assert watcher.check() is True
+        assert applied[-1][1] == ["env.VOICE_RELOAD_TEST"]
+        assert "VOICE_RELOAD_TEST" not in os.environ
+
+        config_path.write_text('{"timing": {"min_speech_delay": -5}}')
+        assert watcher.check() is False
+        assert len(applied) == 2
+        assert watcher.settings["timing"]["min_speech_delay"] == 0.25
+
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["config_reloads"] == 2
+        assert snapshot["counters"]["config_reload_failures"] == 1
+        assert snapshot["histograms"]["config_reload_seconds"]["count"] == 2
+
+    def test_consumer_takes_new_settings_while_running(self, temp_dir, mock_config, clean_singletons):
+        """configure() changes timing and preemption on a running consumer; startup-only settings are refused."""
+        from voice_handler.queue.broker import MessageBroker
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.queue.daemon import consumer_settings
+        from voice_handler.tts.playback import PlaybackController
+
+        broker = MessageBroker(queue_path=str(temp_dir / "test_queue.db"))
+        consumer = QueueConsumer(broker=broker, playback_controller=PlaybackController(), **consumer_settings(mock_config))
+        assert consumer.preempt_priority == mock_config["preemption"]["min_priority"]
+
+        reloaded = dict(mock_config)
+        reloaded["timing"] = {**mock_config["timing"], "min_speech_delay": 0.0}
+        reloaded["preemption"] = {**mock_config["preemption"], "enabled": False, "mode": "cut"}
+        consumer._running = True
+        consumer.configure(**consumer_settings(reloaded))
+        assert consumer.min_speech_delay == 0.0
+        assert consumer.preempt_priority is None
+        assert consumer.preempt_mode == "cut"
+        assert consumer._watcher is None  # Preemption off: no watcher started
+
+        reloaded["preemption"] = {**reloaded["preemption"], "enabled": True}
+        consumer.configure(**consumer_settings(reloaded))
+        assert consumer._watcher is not None and consumer._watcher.is_alive()
+        consumer._running = False
+        consumer._watcher.join(timeout=2.0)
+
+        with pytest.raises(ValueError):
+            consumer.configure(broker=None)
+        broker.close()
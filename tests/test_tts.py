@@ -0,0 +1,652 @@
+"""
+TTS Tests - Testing the Sound Engineer.
+
+These tests verify speech synthesis and playback orchestration without
+touching the network or an audio device.
+"""
+
+import base64
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from voice_handler.tts import health
+from voice_handler.tts.base import TTSProviderInterface
+
+
+LONG_MESSAGE = (
+    "Terminé de refactorizar el módulo de configuración. "
+    "Ahora todas las opciones se validan con Pydantic y los errores son claros. "
+    "También agregué pruebas para los rangos de velocidad y los proveedores. "
+    "Finalmente actualicé la documentación del README con los nuevos ejemplos."
+)
+
+
+class TestSpeechChunker:
+    """Tests for sentence chunking and in-order concurrent synthesis."""
+
+    def test_split_keeps_text_and_shortens_first_chunk(self):
+        """Chunks cover the whole text; the first is small, none exceed the max."""
+        from voice_handler.tts.chunker import split_into_chunks
+
+        chunks = split_into_chunks(LONG_MESSAGE, first_chunk_chars=60, max_chunk_chars=150)
+
+        assert len(chunks) > 1
+        assert chunks[0] == "Terminé de refactorizar el módulo de configuración."
+        assert all(len(chunk) <= 150 for chunk in chunks)
+        assert " ".join(chunks).split() == LONG_MESSAGE.split()
+
+        # Short text and overlong sentences
+        assert split_into_chunks("Listo.") == ["Listo."]
+        long_sentence = ", ".join(["una parte del texto"] * 20) + "."
+        assert all(len(c) <= 100 for c in split_into_chunks(long_sentence, 50, 100))
+
+    def test_playback_in_order_while_synthesis_overlaps(self):
+        """Later chunks synthesize in parallel; playback order never changes."""
+        from voice_handler.tts.chunker import synthesize_in_order
+
+        chunks = ["uno", "dos", "tres", "cuatro"]
+        delays = {"uno": 0.15, "dos": 0.05, "tres": 0.05, "cuatro": 0.01}
+        played = []
+
+        def synthesize(chunk):
+            time.sleep(delays[chunk])
+            return None if chunk == "tres" else chunk.encode()
+
+        failures = []
+        start = time.perf_counter()
+        count = synthesize_in_order(
+            chunks,
+            synthesize,
+            lambda index, audio: played.append(audio.decode()),
+            max_workers=4,
+            on_failure=lambda index, chunk: failures.append(index),
+        )
+        elapsed = time.perf_counter() - start
+
+        assert played == ["uno", "dos", "cuatro"]
+        assert count == 3
+        assert failures == [2]
+        # Concurrent: total wait is about the slowest chunk, not the sum
+        assert elapsed < sum(delays.values())
+
+    def test_openai_provider_speaks_long_message_in_chunks(self, mock_config):
+        """The steerable provider synthesizes each chunk and plays them in order."""
+        from voice_handler.tts.openai_provider import OPENAI_AVAILABLE, OpenAITTSProvider
+
+        if not OPENAI_AVAILABLE:
+            pytest.skip("openai/sounddevice not installed")
+
+        requests = []
+        lock = threading.Lock()
+
+        def create(**kwargs):
+            text = kwargs["messages"][-1]["content"]
+            with lock:
+                requests.append(text)
+            audio = SimpleNamespace(data=base64.b64encode(text.encode()).decode())
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(audio=audio))])
+
+        mock_config["tts_settings"].update({"chunk_min_chars": 100, "chunk_first_chars": 60, "audio_cache": False})
+        provider = OpenAITTSProvider(config=mock_config, use_steerable=True)
+        provider.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+        played = []
+        provider._play_audio = lambda audio, finish=True: played.append(audio.decode())
+
+        assert provider.speak(LONG_MESSAGE) is True
+        assert len(played) > 1
+        assert sorted(requests) == sorted(played)
+        assert " ".join(played).split() == LONG_MESSAGE.split()
+
+        # Short messages are still one request
+        played.clear()
+        assert provider.speak("Listo, todo bien.") is True
+        assert played == ["Listo, todo bien."]
+
+    def test_openai_arender_uses_async_client_and_cache(self, mock_config, temp_dir):
+        """arender synthesizes without playing; repeats come from the audio cache."""
+        import asyncio
+        from voice_handler.tts.audio_cache import AudioCache
+        from voice_handler.tts.openai_provider import OPENAI_AVAILABLE, OpenAITTSProvider
+
+        if not OPENAI_AVAILABLE:
+            pytest.skip("openai/sounddevice not installed")
+
+        requests = []
+
+        async def create(**kwargs):
+            requests.append(kwargs["messages"][-1]["content"])
+            audio = SimpleNamespace(data=base64.b64encode(b"RIFF-wav").decode())
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(audio=audio))])
+
+        provider = OpenAITTSProvider(
+            config=mock_config,
+            use_steerable=True,
+            client=SimpleNamespace(),
+            async_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        )
+        provider.audio_cache = AudioCache(directory=temp_dir / "cache")
+
+        assert asyncio.run(provider.arender("Listo, todo bien.")) == b"RIFF-wav"
+        assert asyncio.run(provider.arender("Listo, todo bien.")) == b"RIFF-wav"
+        assert requests == ["Listo, todo bien."]
+        # Long messages are left to speak(), which streams them in chunks
+        assert asyncio.run(provider.arender(LONG_MESSAGE)) is None
+
+
+class _FakeCompletions:
+    """chat.completions stand-in that counts calls and can be slow."""
+
+    def __init__(self, delay=0.0, reply="Versión corta."):
+        self.delay = delay
+        self.reply = reply
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestSpeechCompressor:
+    """Tests for cached, time-budgeted compression."""
+
+    def test_skips_short_and_caches_long_text(self):
+        """Short text never reaches the LLM; long text is compressed once."""
+        from voice_handler.tts.compressor import SpeechCompressor
+        from voice_handler.utils.metrics import DaemonMetrics
+
+        completions = _FakeCompletions()
+        metrics = DaemonMetrics()
+        compressor = SpeechCompressor(
+            SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+            max_chars=100,
+            metrics=metrics,
+        )
+
+        short = "Listo, terminé la tarea y todas las pruebas pasan sin problemas."
+        assert compressor.compress(short) == short
+        assert completions.calls == 0
+
+        assert compressor.compress(LONG_MESSAGE) == "Versión corta."
+        assert compressor.compress(LONG_MESSAGE) == "Versión corta."
+        assert completions.calls == 1
+        assert metrics.snapshot()["caches"]["compression"]["hit_rate"] == 0.5
+        compressor.close()
+
+    def test_budget_timeout_speaks_original_then_uses_prefetched_result(self):
+        """A slow LLM never delays speech past the budget; the late result is cached."""
+        from voice_handler.tts.compressor import SpeechCompressor
+        from voice_handler.utils.metrics import DaemonMetrics
+
+        completions = _FakeCompletions(delay=0.3)
+        metrics = DaemonMetrics()
+        compressor = SpeechCompressor(
+            SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+            max_chars=100,
+            budget=0.05,
+            metrics=metrics,
+        )
+
+        start = time.perf_counter()
+        assert compressor.compress(LONG_MESSAGE) == LONG_MESSAGE
+        assert time.perf_counter() - start < 0.25
+        assert metrics.snapshot()["counters"]["compression_timeouts"] == 1
+
+        # Prefetching the same text joins the in-flight request
+        compressor.prefetch(LONG_MESSAGE)
+        time.sleep(0.4)
+        assert compressor.compress(LONG_MESSAGE) == "Versión corta."
+        assert completions.calls == 1
+        compressor.close()
+
+
+class FaultyProvider(TTSProviderInterface):
+    """Fault-injecting fake provider: fails on demand, with fixed latency."""
+
+    def __init__(self, name, fail=False, latency=0.0):
+        self.name = name
+        self.fail = fail
+        self.latency = latency
+        self.calls = 0
+
+    @property
+    def provider_name(self):
+        return self.name
+
+    def available(self):
+        return True
+
+    def speak(self, message, voice=None):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.fail == "raise":
+            raise ConnectionError("injected fault")
+        if self.fail:
+            return False
+        health.audio_started()
+        return True
+
+
+class TestProviderHealth:
+    """Tests for circuit breakers and adaptive provider selection."""
+
+    def _tts(self, mock_config, providers, clock, **settings):
+        from voice_handler.tts.health import ProviderRouter
+        from voice_handler.tts.provider import TTSProvider
+
+        tts = TTSProvider(config=mock_config)
+        tts.providers = providers
+        tts.router = ProviderRouter(settings=settings, clock=clock)
+        return tts
+
+    def test_breaker_skips_failing_provider_until_cooldown(self, mock_config):
+        """A provider that keeps failing is skipped, then probed after the cool-down."""
+        now = [1000.0]
+        steerable = FaultyProvider("steerable", fail="raise")
+        system = FaultyProvider("system")
+        tts = self._tts(mock_config, [steerable, system], lambda: now[0],
+                        failure_threshold=3, cooldown_seconds=30)
+
+        for _ in range(5):
+            tts.speak("Mensaje de prueba para el breaker")
+        assert steerable.calls == 3  # tripped after three failures
+        assert system.calls == 5
+        assert tts.router.snapshot()["steerable"]["state"] == "open"
+
+        # Cool-down over: one probe; success closes the breaker
+        now[0] += 31
+        steerable.fail = False
+        tts.speak("Mensaje de prueba para el breaker")
+        assert steerable.calls == 4
+        assert system.calls == 5
+        assert tts.router.snapshot()["steerable"]["state"] == "closed"
+
+    def test_urgent_messages_prefer_provider_that_meets_deadline(self, mock_config):
+        """Slow high-quality providers keep normal traffic but lose urgent messages."""
+        steerable = FaultyProvider("steerable", latency=0.15)
+        basic = FaultyProvider("basic", latency=0.01)
+        tts = self._tts(mock_config, [steerable, basic], time.monotonic,
+                        urgent_priority=8, urgent_deadline_ms=100)
+
+        # Learn latencies (basic only gets traffic when steerable fails)
+        tts.speak("Primer mensaje normal")
+        steerable.fail = True
+        tts.speak("Segundo mensaje normal")
+        steerable.fail = False
+        assert tts.router.health("steerable").latency_ewma > 0.1
+        assert tts.router.health("basic").latency_ewma < 0.1
+
+        steerable.calls = basic.calls = 0
+        tts.speak("Mensaje normal", priority=5)
+        assert (steerable.calls, basic.calls) == (1, 0)
+
+        tts.speak("¡Error urgente!", priority=9)
+        assert (steerable.calls, basic.calls) == (1, 1)
+
+        # An explicit deadline far away keeps the best-quality provider
+        tts.speak("Aviso con tiempo", priority=9, deadline=time.time() + 10)
+        assert (steerable.calls, basic.calls) == (2, 1)
+
+
+    def test_reload_swaps_chain_and_closes_retired_after_use(self, mock_config):
+        """apply_config rebuilds the chain; replaced providers close once no message uses them."""
+        closed = []
+
+        class ClosingProvider(FaultyProvider):
+            def close(self):
+                closed.append(self.name)
+
+        old = ClosingProvider("old")
+        tts = self._tts(mock_config, [old], time.monotonic)
+        router = tts.router
+
+        assert tts.apply_config(dict(mock_config)) is False  # nothing changed
+        assert tts.apply_config(dict(mock_config), env_changed=["USER_NICKNAME"]) is False
+        assert tts.providers == [old]
+
+        reloaded = dict(mock_config)
+        reloaded["tts_settings"] = {**mock_config["tts_settings"], "speech_language": "en"}
+        reloaded["message_limits"] = {**mock_config["message_limits"], "min_chars_for_tts": 10}
+        with tts._in_use():  # a message is being spoken on the old chain
+            assert tts.apply_config(reloaded) is True
+            assert old not in tts.providers
+            assert closed == []
+        assert closed == ["old"]
+        assert tts.min_chars_for_tts == 10
+        assert tts.router is router  # provider_health unchanged: health history kept
+
+        disabled = {**reloaded, "provider_health": {**mock_config["provider_health"], "enabled": False}}
+        assert tts.apply_config(disabled) is False
+        assert tts.router is None
+
+        # A new API key in .env rebuilds the chain with it
+        assert tts.apply_config(disabled, env_changed=["OPENAI_API_KEY"]) is True
+
+
+FAKE_ESPEAK = '''#!{python}
+import os, sys
+log = {log!r}
+if "--stdout" in sys.argv:
+    text = sys.stdin.read()
+    sys.stdout.buffer.write(b"RIFF-fake-wav:" + text.encode())
+    sys.exit(0)
+for line in sys.stdin:
+    with open(log, "a") as f:
+        f.write(f"{{os.getpid()}}|{{line.strip()}}\\n")
+'''
+
+
+class TestSystemEngines:
+    """Tests for persistent system TTS engines and render-to-WAV."""
+
+    def test_espeak_engine_reuses_one_process(self, temp_dir):
+        """Consecutive messages go to the same espeak process over stdin."""
+        import sys
+        from voice_handler.tts.engines import EspeakEngine
+
+        log = temp_dir / "spoken.log"
+        script = temp_dir / "espeak"
+        script.write_text(FAKE_ESPEAK.format(python=sys.executable, log=str(log)))
+        script.chmod(0o755)
+
+        engine = EspeakEngine(binary=str(script), rate_wpm=6000)
+        try:
+            assert engine.speak("Primer mensaje") is True
+            assert engine.speak("Segundo\nmensaje") is True
+            assert engine.render("Hola") == b"RIFF-fake-wav:Hola"
+        finally:
+            engine.close()
+
+        lines = log.read_text().splitlines()
+        assert [line.split("|")[1] for line in lines] == ["Primer mensaje", "Segundo mensaje"]
+        assert len({line.split("|")[0] for line in lines}) == 1
+
+    def test_speech_dispatcher_waits_for_end_event(self, temp_dir):
+        """The SSIP client sends escaped text and returns on the message's END event."""
+        import socket
+        from voice_handler.tts.engines import SpeechDispatcherEngine
+
+        socket_path = temp_dir / "speechd.sock"
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(socket_path))
+        server.listen(1)
+        received = []
+
+        def serve():
+            conn, _ = server.accept()
+            reader = conn.makefile("rb")
+            data, message_id = None, 0
+            for raw in reader:
+                line = raw.decode().rstrip("\r\n")
+                if data is not None:
+                    if line == ".":
+                        message_id += 1
+                        received.append("\n".join(data))
+                        data = None
+                        conn.sendall(
+                            f"225-{message_id}\r\n225 OK MESSAGE QUEUED\r\n"
+                            f"702-{message_id}\r\n702-1\r\n702 END\r\n".encode()
+                        )
+                    else:
+                        data.append(line[1:] if line.startswith("..") else line)
+                elif line == "SPEAK":
+                    data = []
+                    conn.sendall(b"230 OK RECEIVING DATA\r\n")
+                elif line == "QUIT":
+                    break
+                else:
+                    code = {"CLIENT_NAME": 208, "NOTIFICATION": 218, "LANGUAGE": 201, "RATE": 203}[line.split()[2]]
+                    conn.sendall(f"{code} OK SET\r\n".encode())
+            conn.close()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+
+        engine = SpeechDispatcherEngine(socket_path=socket_path, timeout=5.0)
+        assert engine.available()
+        assert engine.speak("Hola mundo") is True
+        assert engine.speak("Línea uno\n.punto inicial") is True
+        engine.close()
+        thread.join(timeout=5.0)
+        server.close()
+
+        assert received == ["Hola mundo", "Línea uno\n.punto inicial"]
+
+    def test_render_mode_uses_audio_cache_and_shared_playback(self, mock_config, temp_dir, monkeypatch):
+        """Rendered system speech is cached and played through play_audio()."""
+        from voice_handler.tts import system_provider
+        from voice_handler.tts.audio_cache import AudioCache
+        from voice_handler.tts.engines import SystemEngine
+
+        class RenderingEngine(SystemEngine):
+            name = "fake"
+
+            def __init__(self):
+                self.renders = 0
+
+            def speak(self, text, voice=None):
+                raise AssertionError("render mode should not speak live")
+
+            def render(self, text, voice=None):
+                self.renders += 1
+                return b"WAV:" + text.encode("utf-8")
+
+        played = []
+        monkeypatch.setattr(system_provider, "play_audio", lambda audio, **kwargs: played.append(audio))
+
+        mock_config["tts_settings"]["system_render_wav"] = True
+        provider = system_provider.SystemTTSProvider(config=mock_config)
+        provider.audio_cache = AudioCache(temp_dir / "audio")
+        provider._engine, provider._engine_checked = RenderingEngine(), True
+
+        assert provider.speak("Compilación terminada") is True
+        assert provider.speak("Compilación terminada") is True
+        assert provider._engine.renders == 1
+        assert played == ["WAV:Compilación terminada".encode("utf-8")] * 2
+
+
+class TestPlaybackInterruption:
+    """Tests for interrupting playback."""
+
+    def test_fade_interrupt_stops_playback_and_skips_remaining_chunks(self, clean_singletons, monkeypatch):
+        """Interrupting fades the playing clip out and drops the chunks not yet played."""
+        from voice_handler.tts import playback
+        from voice_handler.tts.chunker import synthesize_in_order
+
+        np = pytest.importorskip("numpy")
+
+        class BlockingDevice:
+            """sounddevice stand-in whose wait() lasts until stop()."""
+
+            def __init__(self):
+                self.played = []
+                self._stopped = threading.Event()
+
+            def play(self, data, samplerate):
+                self._stopped.clear()
+                self.played.append(len(data))
+
+            def wait(self):
+                # The fade tail is short: let it "finish" on its own
+                if self.played[-1] > 1000:
+                    self._stopped.wait(10.0)
+
+            def stop(self):
+                self._stopped.set()
+
+        device = BlockingDevice()
+        monkeypatch.setattr(playback, "sd", device)
+        monkeypatch.setattr(playback, "sf", SimpleNamespace(read=lambda path: (np.ones(48000), 8000)))
+        monkeypatch.setattr(playback, "platform", SimpleNamespace(system=lambda: "Linux"))
+        monkeypatch.setattr(playback, "PLAYBACK_AVAILABLE", True)
+        controller = playback.get_playback_controller()
+        controller.fade_ms = 100
+
+        threading.Timer(0.2, controller.interrupt, args=("fade",)).start()
+        started = time.perf_counter()
+        played = synthesize_in_order(
+            ["uno", "dos", "tres"],
+            lambda chunk: chunk.encode(),
+            lambda index, audio: playback.play_audio(audio),
+            cancelled=lambda: controller.interrupted is not None,
+        )
+
+        assert time.perf_counter() - started < 2.0
+        assert played == 1
+        # First chunk, then its 100ms fade tail - nothing from the later chunks
+        assert device.played == [48000, 800]
+        assert controller.interrupt("cut") is False
+        controller.reset()
+        assert controller.interrupted is None
+
+
+SPANISH_GOLDEN = {
+    "Editando config.json": "Editando archivo yeison config",
+    "Editando app.js y package.jsonl": "Editando archivo javascript app y archivo yeison lines package",
+    "Componente App.jsx listo": "Componente componente javascript app listo",
+    "Tipos en types.d.ts": "Tipos en archivo typescript types d",
+    "Abriendo src/voice_handler/tts/provider.py.": "Abriendo archivo python provider.",
+    "Revisa /home/user/project/ ahora": "Revisa carpeta project ahora",
+    "Terminó en 200ms con 50% de cobertura": "Terminó en 200 milisegundos con 50 por ciento de cobertura",
+    "Esperé 1s": "Esperé 1 segundo",
+    "Entre 10-20 archivos": "Entre 10 a 20 archivos",
+    "Temperatura -5 grados": "Temperatura menos 5 grados",
+    "Publicada v1.2.3": "Publicada versión 1 punto 2 punto 3",
+    "Cerrado #42": "Cerrado número 42",
+    "Renombré getUserName a voice_handler": "Renombré get user name a voice handler",
+    "Editado __init__.py": "Editado archivo python init",
+    "Usa la API con npm": "Usa la a pe i con ene pe eme",
+    "Paso uno - paso dos": "Paso uno, paso dos",
+    "Mira https://github.com/org/repo.": "Mira un enlace a guit jab.",
+    "Reunión el 2024-01-31 y/o 1/2": "Reunión el 2024-01-31 y/o 1/2",
+    "Compilación terminada": "Compilación terminada",
+}
+
+ENGLISH_GOLDEN = {
+    "Editing config.json": "Editing config JSON file",
+    "Editing app.js": "Editing app javascript file",
+    "Opened src/voice_handler/tts/provider.py": "Opened provider python file",
+    "Took 200ms and 1s": "Took 200 milliseconds and 1 second",
+    "Coverage at 50%": "Coverage at 50 percent",
+    "Released v2.0.1": "Released version 2 point 0 point 1",
+    "Fixed the HTTPServer in my-component": "Fixed the HTTP server in my component",
+    "Ran the CLI with npm": "Ran the C L I with N P M",
+    "See https://www.example.com/docs": "See a link to example",
+}
+
+
+class TestSpeechNormalizer:
+    """Golden tests for the compiled speech-normalization lexicon."""
+
+    def test_spanish_golden(self):
+        """Spanish readings of file names, paths, numbers and identifiers."""
+        from voice_handler.tts.normalizer import SpeechNormalizer
+
+        normalizer = SpeechNormalizer("es")
+        for text, expected in SPANISH_GOLDEN.items():
+            assert normalizer.normalize(text) == expected, text
+
+    def test_english_golden(self):
+        """English puts the kind after the name and has its own units."""
+        from voice_handler.tts.normalizer import SpeechNormalizer
+
+        normalizer = SpeechNormalizer("en")
+        for text, expected in ENGLISH_GOLDEN.items():
+            assert normalizer.normalize(text) == expected, text
+
+    def test_normalization_is_idempotent(self):
+        """Normalized text normalizes to itself."""
+        from voice_handler.tts.normalizer import SpeechNormalizer
+
+        for language, golden in (("es", SPANISH_GOLDEN), ("en", ENGLISH_GOLDEN)):
+            normalizer = SpeechNormalizer(language)
+            for expected in golden.values():
+                assert normalizer.normalize(expected) == expected
+
+    def test_extensions_need_a_boundary(self):
+        """.js doesn't match inside .json/.jsx, and unknown extensions are left alone."""
+        from voice_handler.tts.normalizer import SpeechNormalizer
+
+        normalizer = SpeechNormalizer("en", lexicon={
+            "phrases": {"file": {"en": "{name} {kind}"}},
+            "extensions": {"js": {"en": "JS"}, "json": {"en": "JSON"}},
+        })
+        assert normalizer.normalize("a.js b.json c.jsx d.pyc") == "a JS b JSON c.jsx d.pyc"
+
+    def test_provider_uses_configured_language(self, mock_config):
+        """TTSProvider formats with the speech_language from tts_settings."""
+        from voice_handler.tts.provider import TTSProvider
+
+        mock_config["tts_settings"]["speech_language"] = "en"
+        provider = TTSProvider(config=mock_config)
+        assert provider.format_message_for_speech("Saved main.py") == "Saved main python file"
+
+
+class TestSessionIdentity:
+    """Tests for per-session voice identities and earcons."""
+
+    def test_assignment_keeps_sessions_apart_beyond_six_voices(self, temp_dir):
+        """Every new session gets the identity farthest from the active ones; earcons are pre-rendered."""
+        from voice_handler.core.session import SessionVoiceManager
+        from voice_handler.tts.audio_cache import AudioCache
+        from voice_handler.tts.earcons import EarconBank
+        from voice_handler.tts.identity import distance
+
+        config = {"timing": {"session_expiry_hours": 4}, "voice_settings": {}}
+        manager = SessionVoiceManager(storage_path=str(temp_dir / "sessions.json"), config=config)
+        cache = AudioCache(temp_dir / "audio")
+        manager._earcons = EarconBank(cache)
+
+        identities = [manager.get_identity_for_session(f"session-{i}", preferred_voice="echo") for i in range(12)]
+        assert identities[0].voice == "echo"
+        assert identities[1].voice in SessionVoiceManager.FEMALE_VOICES
+        assert len(set(identities)) == 12
+        assert len({identity.voice for identity in identities[:6]}) == 6
+        # The seventh session shares a voice, but differs in speed, style and earcon
+        assert min(distance(identities[6], other) for other in identities[:6]) >= 4.5
+        assert all(cache.contains(manager.earcon_bank().key(identity.earcon)) for identity in identities)
+
+        assert manager.get_identity_for_session("session-3") == identities[3]
+        assert manager.get_voice_for_session("session-3") == identities[3].voice
+
+    def test_provider_speaks_with_session_identity_after_earcon(self, mock_config, temp_dir, monkeypatch):
+        """The earcon plays as a cue, then the provider sees the session's identity."""
+        from voice_handler.core.session import SessionVoiceManager
+        from voice_handler.tts import provider as provider_module
+        from voice_handler.tts.earcons import EarconBank, render_earcon
+        from voice_handler.tts.identity import VoiceIdentity, current_identity
+        from voice_handler.tts.openai_provider import OpenAITTSProvider
+        from voice_handler.tts.provider import TTSProvider
+
+        class RecordingProvider(FaultyProvider):
+            def speak(self, message, voice=None):
+                heard.append(("speech", current_identity()))
+                return True
+
+        heard = []
+        monkeypatch.setattr(provider_module, "play_audio",
+                            lambda audio, **kwargs: heard.append(("cue" if kwargs.get("cue") else "audio", audio)))
+
+        manager = SessionVoiceManager(storage_path=str(temp_dir / "sessions.json"), config=mock_config)
+        manager._earcons = EarconBank(None)
+        manager.get_identity_for_session("first")
+        identity = manager.get_identity_for_session("second")
+
+        tts = TTSProvider(config=mock_config, session_voice_manager=manager)
+        tts.providers, tts.router = [RecordingProvider("fake")], None
+        tts.speak("Compilación terminada", voice=identity.voice, session_id="second")
+        assert heard == [("cue", render_earcon(identity.earcon)), ("speech", identity)]
+        assert current_identity() is None
+
+        # The OpenAI provider turns the identity into a tts-1 speed and steerable instructions
+        openai = OpenAITTSProvider(config=mock_config, use_steerable=True, client=None)
+        fast = VoiceIdentity("onyx", speed=1.12, variant="bright", earcon=2)
+        assert openai._speed(fast) == round(openai.openai_speed * 1.12, 3)
+        assert openai._speed(None) == openai.openai_speed
+        prompt = openai._steerable_messages("Hola", "neutral", openai._delivery(fast))[0]["content"]
+        assert "bright" in prompt and "faster" in prompt
@@ -217,3 +217,622 @@ class TestVoiceLogger:
         content = log_file.read_text()
         assert "key1" in content
         assert "value1" in content
+
+    def test_buffered_mode_writes_at_close(self, temp_dir):
+        """Buffered records reach the file only when the logger is closed (or on an error)."""
+        from voice_handler.utils.logger import VoiceLogger
+
+        log_file = temp_dir / "test.log"
+        logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="buffered")
+        logger.log_info("Held back", step=1)
+        assert not log_file.exists() or "Held back" not in log_file.read_text()
+
+        logger.log_error("Something broke")
+        assert "Held back" in log_file.read_text()
+
+        logger.log_info("After the error")
+        logger.close()
+        assert "After the error" in log_file.read_text()
+
+    def test_async_mode_writes_in_background(self, temp_dir):
+        """Async records are written by the listener thread; flush() waits for them."""
+        from voice_handler.utils.logger import VoiceLogger
+
+        log_file = temp_dir / "test.log"
+        logger = VoiceLogger(log_file=str(log_file), debug_mode=True, mode="async")
+        try:
+            logger.log_debug("From the queue", key="value")
+            logger.flush()
+            content = log_file.read_text()
+            assert "From the queue | Context: " in content
+            assert '"key": "value"' in content
+        finally:
+            logger.close()
+
+    def test_context_serialized_only_when_written(self, temp_dir):
+        """Disabled levels never serialize their context."""
+        from voice_handler.utils.logger import VoiceLogger
+
+        class Loud:
+            serialized = 0
+
+            def __str__(self):
+                Loud.serialized += 1
+                return "loud"
+
+        log_file = temp_dir / "test.log"
+        logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="buffered")
+        logger.log_debug("Filtered out", payload=Loud())
+        logger.log_info("Kept", payload=Loud())
+        assert Loud.serialized == 0
+
+        logger.close()
+        assert Loud.serialized == 1
+        content = log_file.read_text()
+        assert "Filtered out" not in content
+        assert 'Kept | {"payload": "loud"}' in content
+
+
+class TestLogRotation:
+    """Tests for the single-writer log with rotation and record shipping."""
+
+    def test_size_rotation_keeps_compressed_archives(self, temp_dir):
+        """Rotation shifts gzip archives and keeps only backup_count of them."""
+        import gzip
+        import logging
+        from voice_handler.utils.log_sink import RotatingLogWriter
+
+        log_file = temp_dir / "voice.log"
+        writer = RotatingLogWriter(log_file, max_bytes=200, max_age=None, backup_count=2)
+        writer.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            for i in range(12):
+                writer.emit(logging.makeLogRecord({"msg": f"line {i:02d} " + "x" * 40}))
+        finally:
+            writer.close()
+
+        assert writer.archive_path(1).exists()
+        assert writer.archive_path(2).exists()
+        assert not writer.archive_path(3).exists()
+        assert log_file.stat().st_size <= 200 + 100  # Rotation note plus the last lines
+        newest = gzip.decompress(writer.archive_path(1).read_bytes()).decode()
+        assert "line" in newest and "line 11" not in newest
+        assert "line 11" in log_file.read_text()
+
+    def test_age_rotation(self, temp_dir, monkeypatch):
+        """A log older than max_age is rotated on the next write."""
+        import logging
+        from voice_handler.utils import log_sink
+
+        now = [1000.0]
+        monkeypatch.setattr(log_sink.time, "time", lambda: now[0])
+        writer = log_sink.RotatingLogWriter(temp_dir / "voice.log", max_age=60.0, backup_count=1)
+        try:
+            writer.emit(logging.makeLogRecord({"msg": "first"}))
+            now[0] += 61.0
+            writer.emit(logging.makeLogRecord({"msg": "second"}))
+        finally:
+            writer.close()
+
+        assert writer.archive_path(1).exists()
+        assert "first" not in (temp_dir / "voice.log").read_text()
+
+    def test_hook_records_are_shipped_to_the_writer(self, temp_dir, monkeypatch):
+        """A non-writer logger sends its records to the daemon's sink instead of the file."""
+        from voice_handler.utils.log_sink import LogSinkServer, sink_address_file
+        from voice_handler.utils.logger import VoiceLogger
+        from voice_handler.utils.paths import VoiceHandlerPaths
+
+        monkeypatch.setattr(VoiceHandlerPaths, "_get_temp_dir", staticmethod(lambda: temp_dir))
+        log_file = temp_dir / "voice.log"
+        daemon_logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="sync", writer=True)
+        sink = LogSinkServer(log_file, daemon_logger.handle_record)
+        sink.start()
+        try:
+            assert sink_address_file(log_file).exists()
+            hook_logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="buffered")
+            hook_logger.log_info("From the hook", tool="Edit")
+            hook_logger.close()
+
+            deadline = time.time() + 5.0
+            while sink.records_received < 2 and time.time() < deadline:
+                time.sleep(0.02)
+            daemon_logger.close()
+        finally:
+            sink.stop()
+
+        assert sink.records_received >= 2  # Session banner and the message
+        assert 'From the hook | {"tool": "Edit"}' in log_file.read_text()
+        assert not sink_address_file(log_file).exists()
+
+    def test_sink_is_private_and_checks_the_run_token(self, temp_dir, monkeypatch):
+        """The sink is published owner-only; connections without the token are dropped unread."""
+        import json
+        import logging
+        import socket
+        import stat
+        from voice_handler.utils import log_sink
+        from voice_handler.utils.paths import VoiceHandlerPaths
+
+        monkeypatch.setattr(VoiceHandlerPaths, "_get_temp_dir", staticmethod(lambda: temp_dir))
+        log_file = temp_dir / "logs" / "voice.log"
+        log_file.parent.mkdir()
+
+        unix_sink = log_sink.LogSinkServer(log_file, lambda record: None)
+        unix_sink.start()
+        try:
+            address_file = log_sink.sink_address_file(log_file)
+            assert address_file.parent != log_file.parent
+            assert stat.S_IMODE(address_file.parent.stat().st_mode) == 0o700
+            assert stat.S_IMODE(unix_sink._socket_path.stat().st_mode) == 0o600
+        finally:
+            unix_sink.stop()
+
+        monkeypatch.setattr(log_sink, "_UnixSink", None)
+        received = []
+        sink = log_sink.LogSinkServer(log_file, received.append)
+        sink.start()
+        try:
+            address, token = log_sink.read_sink_address(log_sink.sink_address_file(log_file))
+            assert address.startswith("tcp:") and token == sink.token
+            record = json.dumps({"msg": "snooped"}).encode() + b"\n"
+            for first_line in (b"", b"0" * len(token) + b"\n"):
+                conn = log_sink._connect(address, timeout=1.0)
+                conn.sendall(first_line + record)
+                conn.shutdown(socket.SHUT_WR)
+                conn.recv(1)
+                conn.close()
+
+            shipper = log_sink.LogShipper(log_file)
+            shipper.emit(logging.makeLogRecord({"msg": "from the hook"}))
+            shipper.close()
+
+            deadline = time.time() + 5.0
+            while not received and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            sink.stop()
+
+        assert sink.connections_rejected == 2
+        assert [record.getMessage() for record in received] == ["from the hook"]
+
+
+class TestDaemonMetrics:
+    """Tests for worker metrics and the daemon status file."""
+
+    def test_metrics_snapshot(self):
+        """Counters, histograms and cache hit rates should be reported."""
+        from voice_handler.utils.metrics import DaemonMetrics
+
+        metrics = DaemonMetrics()
+        metrics.inc("messages_processed", 3)
+        for value in (0.01, 0.02, 0.2):
+            metrics.observe("llm_latency_seconds", value)
+        metrics.cache_hit("compression")
+        metrics.cache_miss("compression")
+        metrics.cache_hit("compression")
+
+        snapshot = metrics.snapshot()
+        assert snapshot["messages_processed"] == 3
+        llm = snapshot["histograms"]["llm_latency_seconds"]
+        assert llm["count"] == 3
+        assert llm["p50"] == 0.02
+        assert llm["buckets"]["0.025"] == 2
+        assert llm["buckets"]["0.25"] == 3
+        assert snapshot["caches"]["compression"]["hit_rate"] == round(2 / 3, 4)
+
+    def test_status_file_read_by_daemon(self, temp_dir, monkeypatch):
+        """The atomically written status file feeds VoiceDaemon.get_status()."""
+        import os
+        from voice_handler.queue.daemon import VoiceDaemon
+        from voice_handler.utils.metrics import DaemonMetrics, MetricsFlusher
+
+        metrics = DaemonMetrics()
+        metrics.inc("messages_processed", 7)
+        status_file = temp_dir / "daemon.status"
+        flusher = MetricsFlusher(metrics, status_file, interval=60)
+        flusher.start()
+        flusher.stop()
+
+        assert [p.name for p in temp_dir.iterdir()] == ["daemon.status"]
+
+        daemon = VoiceDaemon()
+        daemon.status_file = status_file
+        monkeypatch.setattr(daemon, "_read_pid", lambda: os.getpid())
+        status = daemon.get_status()
+        assert status["running"] is True
+        assert status["pid"] == os.getpid()
+        assert status["messages_processed"] == 7
+        assert "queue_wait_seconds" in status["histograms"]
+
+    def test_prometheus_rendering(self):
+        """Snapshots should render as Prometheus text."""
+        from voice_handler.utils.metrics import DaemonMetrics, render_prometheus
+
+        metrics = DaemonMetrics()
+        metrics.inc("messages_failed")
+        metrics.observe("playback_duration_seconds", 1.5)
+        metrics.cache_miss("audio")
+
+        text = render_prometheus(metrics.snapshot())
+        assert "voice_messages_failed_total 1" in text
+        assert "# TYPE voice_playback_duration_seconds histogram" in text
+        assert 'voice_playback_duration_seconds_bucket{le="2.5"} 1' in text
+        assert 'voice_playback_duration_seconds_bucket{le="+Inf"} 1' in text
+        assert "voice_playback_duration_seconds_count 1" in text
+        assert 'voice_cache_misses_total{cache="audio"} 1' in text
+
+
+class TestTracing:
+    """Tests for hook-to-audio latency tracing."""
+
+    def test_trace_travels_in_message_metadata(self, temp_dir, clean_singletons):
+        """The producer should embed the current trace in the queued message."""
+        from voice_handler.queue.broker import MessageBroker
+        from voice_handler.queue.producer import QueueProducer
+        from voice_handler.utils import tracing
+
+        broker = MessageBroker(queue_path=str(temp_dir / "queue"))
+        producer = QueueProducer(broker=broker)
+
+        trace = tracing.start_trace(label="Stop", process_start=100.0)
+        try:
+            tracing.mark("stdin_parsed", 100.5)
+            assert producer.speak("Listo") is True
+        finally:
+            tracing.activate(None)
+
+        message = broker.dequeue(timeout=1.0)
+        resumed = tracing.Trace.from_metadata(message.metadata)
+        assert resumed.trace_id == trace.trace_id
+        assert resumed.label == "Stop"
+        assert resumed.spans["process_start"] == 100.0
+        assert "enqueued" in resumed.spans
+
+    def test_ring_buffer_wraps_and_decodes(self, temp_dir):
+        """The ring keeps only the newest traces, with spans intact."""
+        from voice_handler.utils.tracing import Trace, TraceRing
+
+        ring = TraceRing(temp_dir / "traces.ring", capacity=3)
+        ids = []
+        for i in range(5):
+            trace = Trace(label=f"hook{i}")
+            trace.mark("process_start", 1000.0 + i)
+            trace.mark("enqueued", 1000.25 + i)
+            trace.mark("playback_end", 1001.0 + i)
+            ring.record(trace)
+            ids.append(trace.trace_id)
+
+        recent = ring.read()
+        assert [t.trace_id for t in recent] == ids[:1:-1]
+        assert (temp_dir / "traces.ring").stat().st_size < 1024
+
+        newest = ring.find(ids[-1])
+        assert newest.label == "hook4"
+        rows = newest.waterfall()
+        assert [r["stage"] for r in rows] == ["process_start", "enqueued", "playback_end"]
+        assert rows[1]["offset_ms"] == 250.0
+        assert rows[2]["delta_ms"] == 750.0
+        assert ring.find(ids[0]) is None
+
+    @pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs /proc")
+    def test_process_start_time_is_sub_second_precise(self):
+        """The /proc estimate should land within ~100ms of the interpreter's real start."""
+        import subprocess
+        import sys
+
+        # Bare interpreter (-S) and the module loaded by path, so "started" is
+        # taken as close to the real start as Python allows
+        tracing_py = Path(__file__).parent.parent / "src" / "voice_handler" / "utils" / "tracing.py"
+        script = (
+            "import time; started = time.time(); import importlib.util; "
+            f"spec = importlib.util.spec_from_file_location('tracing', {str(tracing_py)!r}); "
+            "tracing = importlib.util.module_from_spec(spec); spec.loader.exec_module(tracing); "
+            "print(started, tracing.process_start_time())"
+        )
+        output = subprocess.run([sys.executable, "-S", "-c", script], capture_output=True, text=True, check=True)
+        started, estimated = map(float, output.stdout.split())
+        assert abs(started - estimated) < 0.1
+
+    def test_consumer_records_finished_trace(self, temp_dir, clean_singletons):
+        """The consumer should resume the trace, mark stages and record it."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.utils import tracing
+
+        broker = MessageBroker(queue_path=str(temp_dir / "queue"))
+        ring = tracing.TraceRing(temp_dir / "traces.ring")
+
+        trace = tracing.Trace(label="Stop")
+        trace.mark("enqueued")
+        broker.enqueue(VoiceMessage(
+            message_type=MessageType.SPEAK,
+            text="Listo",
+            metadata={tracing.METADATA_KEY: trace.to_metadata()},
+        ))
+
+        def fake_speak(text, voice, session_id=None):
+            tracing.mark("playback_start")
+            tracing.mark("playback_end")
+
+        consumer = QueueConsumer(broker=broker, min_speech_delay=0, trace_ring=ring)
+        consumer.set_speak_callback(fake_speak)
+        consumer.start()
+        deadline = time.time() + 5.0
+        while time.time() < deadline and not ring.read():
+            time.sleep(0.05)
+        consumer.stop(wait=True)
+
+        recorded = ring.find(trace.trace_id)
+        assert recorded is not None
+        assert {"enqueued", "dequeued", "playback_start", "playback_end"} <= set(recorded.spans)
+
+
+class TestEventStore:
+    """Tests for the structured pipeline event store."""
+
+    def test_query_filters_and_summary(self, temp_dir):
+        """Events are found by indexed fields, time window and latency."""
+        from voice_handler.utils.events import EventStore, parse_time
+
+        store = EventStore(temp_dir / "events.db")
+        try:
+            store.record_many([
+                {"stage": "hook", "ts": 1000.0, "session_id": "s1", "hook": "PostToolUse", "tool": "Edit",
+                 "message_id": "m1", "status": "queued", "latency_ms": 80.0},
+                {"stage": "dequeued", "ts": 1000.5, "session_id": "s1", "hook": "PostToolUse",
+                 "message_id": "m1", "latency_ms": 400.0},
+                {"stage": "spoken", "ts": 1003.0, "session_id": "s1", "hook": "PostToolUse",
+                 "message_id": "m1", "status": "ok", "latency_ms": 3000.0, "detail": {"text": "Listo"}},
+                {"stage": "hook", "ts": 2000.0, "session_id": "s2", "hook": "Stop", "status": "logged_only",
+                 "latency_ms": 60.0},
+            ])
+
+            assert [e["stage"] for e in store.query(session_id="s1")] == ["spoken", "dequeued", "hook"]
+            assert [e["stage"] for e in store.timeline("m1")] == ["hook", "dequeued", "spoken"]
+            assert store.query(tool="Edit")[0]["message_id"] == "m1"
+            assert [e["session_id"] for e in store.query(since=1500.0)] == ["s2"]
+            assert [e["ts"] for e in store.query(until=1000.5)] == [1000.0]
+            slow = store.query(min_latency_ms=1000)
+            assert len(slow) == 1 and slow[0]["detail"] == {"text": "Listo"}
+
+            summary = store.summary()
+            assert summary["hook"] == {"count": 2, "avg_ms": 70.0, "max_ms": 80.0}
+            assert store.summary(session_id="s2") == {"hook": {"count": 1, "avg_ms": 60.0, "max_ms": 60.0}}
+
+            assert store.prune(older_than=1500.0) == 3
+            assert store.count() == 1
+            assert parse_time("2h", now=10000.0) == 10000.0 - 7200
+            with pytest.raises(ValueError):
+                store.query(colour="red")
+            with pytest.raises(ValueError):
+                parse_time("last tuesday")
+        finally:
+            store.close()
+
+    def test_consumer_records_stage_events(self, temp_dir, clean_singletons):
+        """The consumer records dequeue and outcome events tagged with the trace's hook and tool."""
+        from voice_handler.queue.broker import MessageBroker, VoiceMessage, MessageType
+        from voice_handler.queue.consumer import QueueConsumer
+        from voice_handler.utils import tracing
+        from voice_handler.utils.events import EventStore
+
+        broker = MessageBroker(queue_path=str(temp_dir / "queue"))
+        store = EventStore(temp_dir / "events.db")
+        trace = tracing.Trace(label="PostToolUse", tool="Bash")
+        trace.mark("enqueued")
+        broker.enqueue(VoiceMessage(
+            message_type=MessageType.SPEAK,
+            text="Tests pasando",
+            session_id="abc",
+            metadata={tracing.METADATA_KEY: trace.to_metadata()},
+        ))
+
+        consumer = QueueConsumer(broker=broker, min_speech_delay=0, event_store=store)
+        consumer.set_speak_callback(lambda text, voice, session_id=None: None)
+        consumer.start()
+        deadline = time.time() + 5.0
+        while time.time() < deadline and not store.query(stage="spoken"):
+            time.sleep(0.05)
+        consumer.stop(wait=True)
+
+        try:
+            timeline = store.timeline(trace.trace_id)
+            assert [e["stage"] for e in timeline] == ["dequeued", "speaking", "spoken"]
+            spoken = timeline[-1]
+            assert (spoken["session_id"], spoken["hook"], spoken["tool"]) == ("abc", "PostToolUse", "Bash")
+            assert spoken["status"] == "ok" and spoken["latency_ms"] >= timeline[0]["latency_ms"]
+        finally:
+            store.close()
+
+    def test_hook_events_reach_the_writers_store(self, temp_dir, monkeypatch):
+        """A hook's log_event travels through the log sink into the daemon's event store."""
+        from voice_handler.utils.events import EventStore
+        from voice_handler.utils.log_sink import LogSinkServer
+        from voice_handler.utils.logger import VoiceLogger
+        from voice_handler.utils.paths import VoiceHandlerPaths
+
+        monkeypatch.setattr(VoiceHandlerPaths, "_get_temp_dir", staticmethod(lambda: temp_dir))
+        log_file = temp_dir / "voice.log"
+        store = EventStore(temp_dir / "events.db")
+        daemon_logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="sync", writer=True)
+        daemon_logger.event_store = store
+        sink = LogSinkServer(log_file, daemon_logger.handle_record)
+        sink.start()
+        try:
+            hook_logger = VoiceLogger(log_file=str(log_file), debug_mode=False, mode="buffered")
+            hook_logger.log_event("hook", session_id="abc", hook="Stop", message_id="m9",
+                                  status="queued", latency_ms=42.5)
+            hook_logger.close()
+
+            deadline = time.time() + 5.0
+            while not store.query(message_id="m9") and time.time() < deadline:
+                time.sleep(0.02)
+            daemon_logger.close()
+        finally:
+            sink.stop()
+
+        try:
+            events = store.query(message_id="m9")
+            assert len(events) == 1
+            assert (events[0]["stage"], events[0]["hook"], events[0]["latency_ms"]) == ("hook", "Stop", 42.5)
+            assert "Event: hook" in log_file.read_text()
+        finally:
+            store.close()
+
+
+class TestEventStream:
+    """Tests for the daemon's live event stream and its relay."""
+
+    def test_slow_subscriber_drops_oldest_and_resumes(self):
+        """Full buffers drop the oldest events; resuming replays what the backlog still has."""
+        from voice_handler.utils.event_stream import EventStream
+
+        stream = EventStream(backlog=5)
+        slow = stream.subscribe(capacity=3)
+        for i in range(8):
+            stream.publish({"type": "event", "stage": "dequeued", "n": i})
+
+        events = slow.drain()
+        assert events[0] == {"type": "dropped", "count": 5}
+        assert [e["seq"] for e in events[1:]] == [6, 7, 8]
+
+        resumed = stream.subscribe(since=2)
+        replay = resumed.drain()
+        assert replay[0] == {"type": "gap", "from": 3, "to": 3}
+        assert [e["seq"] for e in replay[1:]] == [4, 5, 6, 7, 8]
+
+        slow.close()
+        resumed.close()
+        assert stream.subscribers == 0
+        replay = stream.subscribe(since=99).drain()  # Unknown seq: replay the whole backlog
+        assert replay[0]["type"] == "gap" and replay[1]["seq"] == 4
+
+    def test_relay_mirrors_daemon_stream(self, temp_dir):
+        """The API-side relay keeps upstream sequence numbers and resets when the daemon restarts."""
+        from voice_handler.utils.event_stream import EventStream, EventStreamRelay, EventStreamServer
+
+        address_file = temp_dir / "events.addr"
+
+        def wait_for(condition):
+            deadline = time.time() + 5.0
+            while not condition() and time.time() < deadline:
+                time.sleep(0.02)
+            return condition()
+
+        daemon_stream = EventStream()
+        server = EventStreamServer(daemon_stream, address_file=address_file)
+        server.start()
+        local = EventStream()
+        relay = EventStreamRelay(local, address_file=address_file, retry_interval=0.1)
+        relay.start()
+        try:
+            daemon_stream.publish({"type": "log", "message": "before the relay"})
+            assert wait_for(lambda: relay.connected)
+            client = local.subscribe()
+            daemon_stream.publish({"type": "event", "stage": "speaking"})
+            assert wait_for(lambda: local.seq == 2)
+            assert [e["stage"] for e in client.drain() if e.get("type") == "event"] == ["speaking"]
+            assert local.stream_id == daemon_stream.stream_id
+
+            server.stop()
+            restarted = EventStream()
+            server = EventStreamServer(restarted, address_file=address_file)
+            server.start()
+            restarted.publish({"type": "event", "stage": "dequeued"})
+            assert wait_for(lambda: local.stream_id == restarted.stream_id and local.seq == 1)
+            kinds = [e["type"] for e in client.drain()]
+            assert "reset" in kinds and kinds[-1] == "event"
+        finally:
+            relay.stop()
+            server.stop()
+
+    def test_logger_tap_and_metrics_ticks(self, temp_dir):
+        """The writer's tap sees local and shipped records; the flusher publishes each snapshot."""
+        import logging
+        from voice_handler.utils.logger import VoiceLogger
+        from voice_handler.utils.metrics import DaemonMetrics, MetricsFlusher
+
+        tapped = []
+        daemon_logger = VoiceLogger(log_file=str(temp_dir / "voice.log"), debug_mode=False,
+                                    mode="async", writer=True)
+        daemon_logger.set_tap(tapped.append, level=logging.WARNING)
+        daemon_logger.log_info("Not streamed")
+        daemon_logger.log_warning("Streamed")
+        daemon_logger.handle_record(logging.makeLogRecord(
+            {"name": "VoiceHandler", "levelno": logging.ERROR, "levelname": "ERROR", "msg": "From a hook"}))
+        daemon_logger.close()
+        assert [(r["level"], r["message"]) for r in tapped] == [("WARNING", "Streamed"), ("ERROR", "From a hook")]
+        assert "Not streamed" in (temp_dir / "voice.log").read_text()
+
+        ticks = []
+        metrics = DaemonMetrics()
+        metrics.inc("messages_processed")
+        MetricsFlusher(metrics, temp_dir / "status.json", listener=ticks.append).flush()
+        assert ticks[0]["counters"]["messages_processed"] == 1
+
+
+class TestSessionRegistry:
+    """Tests for the indexed, debounced session registry."""
+
+    def test_touch_is_debounced_and_format_is_compact(self, temp_dir):
+        """Existing sessions only hit the disk once last_used drifts past the touch interval."""
+        import json
+        from voice_handler.core.session import SessionVoiceManager
+
+        path = temp_dir / "sessions.json"
+        config = {"timing": {"session_expiry_hours": 4, "session_touch_interval": 60.0}}
+        manager = SessionVoiceManager(storage_path=str(path), config=config)
+
+        voice = manager.get_voice_for_session("session-a", project_name="rock")
+        stamp = path.stat().st_mtime_ns
+        data = json.loads(path.read_text())
+        assert data["v"] == 2 and data["sessions"]["session-a"][0] == voice
+        assert "\n" not in path.read_text()
+
+        for _ in range(20):
+            assert manager.get_voice_for_session("session-a", project_name="rock") == voice
+        assert path.stat().st_mtime_ns == stamp
+
+        manager.registry._saved_last_used["session-a"] -= 120  # Last write was two minutes ago
+        manager.get_voice_for_session("session-a", project_name="rock")
+        assert path.stat().st_mtime_ns != stamp
+
+        manager.get_voice_for_session("session-a", project_name="jazz")  # Renames are written right away
+        assert json.loads(path.read_text())["sessions"]["session-a"][3] == "jazz"
+        assert manager.get_session_prefix("session-a") == "[jazz]"
+
+    def test_expiry_reuse_and_processes_sharing_the_file(self, temp_dir):
+        """Expired sessions free their voices; a second manager sees and keeps the first's sessions."""
+        import json
+        import time
+        from voice_handler.core.session import SessionVoiceManager
+
+        path = temp_dir / "sessions.json"
+        now = time.time()
+        path.write_text(json.dumps({"sessions": {  # Legacy indented format
+            "stale": {"voice": "nova", "created_at": now - 10 * 3600, "last_used": now - 9 * 3600, "project_name": "old"},
+            "live": {"voice": "echo", "created_at": now - 60, "last_used": now - 60, "project_name": "new"},
+        }}, indent=2))
+        config = {"timing": {"session_expiry_hours": 4, "session_touch_interval": 60.0}}
+
+        daemon = SessionVoiceManager(storage_path=str(path), config=config)
+        assert set(daemon.sessions) == {"live"}
+        assert daemon.registry.voices_in_use() == {"echo"}
+        assert daemon.session_expiry_seconds == daemon.SESSION_EXPIRY_SECONDS == 4 * 3600
+
+        hook = SessionVoiceManager(storage_path=str(path), config=config)
+        new_voice = hook.get_voice_for_session("fresh", preferred_voice="nova")
+        assert new_voice == "nova"
+
+        assert daemon.get_voice_for_session("fresh") == "nova"  # Picked up from disk
+        daemon.clear_session("live")
+        assert set(json.loads(path.read_text())["sessions"]) == {"fresh"}
+
+        # Identities are stored with the session and survive a reload
+        for i in range(5):
+            hook.get_voice_for_session(f"extra-{i}")
+        assert hook.registry.voices_in_use() == set(SessionVoiceManager.VOICES)
+        reloaded = SessionVoiceManager(storage_path=str(path), config=config)
+        assert reloaded.get_session_identity("extra-4") == hook.get_session_identity("extra-4")
+        assert reloaded.registry.least_recent() == "fresh"